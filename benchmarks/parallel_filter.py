@@ -0,0 +1,62 @@
+"""Compares serial and process-pool filtering of a large `ListBasedCrudRepository`.
+
+Run from the repository root: `python -m benchmarks.parallel_filter [--items N] [--workers 1 2 4]`.
+The parallel mode only pays off when the filter costs more per item than sending the filtered
+attribute values to a worker, so the results depend heavily on the number of cores.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List
+
+from abstractrepo.specification import AttributeSpecification, AndSpecification, OrSpecification, Operator
+from tests.fixtures.models import News
+from tests.fixtures.repo import ListBasedNewsRepository
+
+
+def measure(function: Callable[[], object], repeat: int) -> float:
+    """Returns the best time in seconds of the given number of calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(items: int, workers: List[int], repeat: int) -> None:
+    data = [News(id=i, title=f'Title {i}', text=f'Text {i % 1000}') for i in range(items)]
+    spec = AndSpecification(
+        OrSpecification(
+            AttributeSpecification('title', '%7%', Operator.ILIKE),
+            AttributeSpecification('text', [f'Text {i}' for i in range(0, 1000, 3)], Operator.IN),
+        ),
+        AttributeSpecification('id', items // 10, Operator.GTE),
+    )
+
+    repo = ListBasedNewsRepository(data)
+    serial = measure(lambda: repo.count(spec), repeat)
+    print(f'{items} items, {os.cpu_count()} CPUs')
+    print(f'serial: {serial:.3f}s')
+
+    for count in workers:
+        with ProcessPoolExecutor(count) as executor:
+            class ParallelNewsRepository(ListBasedNewsRepository):
+                _parallel_executor = executor
+                _parallel_threshold = 0
+                _parallel_partitions = count
+
+            parallel_repo = ParallelNewsRepository(data)
+            assert parallel_repo.count(spec) == repo.count(spec)
+            parallel = measure(lambda: parallel_repo.count(spec), repeat)
+        print(f'{count} workers: {parallel:.3f}s, speedup {serial / parallel:.2f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+    main(arguments.items, arguments.workers, arguments.repeat)
@@ -0,0 +1,65 @@
+"""Measures the read throughput of `ThreadSafeListBasedCrudRepository` for a growing number of reader threads.
+
+Run from the repository root: `python -m benchmarks.thread_safe_reads [--threads 1 2 4 8] [--writer]`.
+Readers share the lock, so they never wait for one another; whether the throughput scales with
+the number of threads depends on the interpreter: with the GIL, pure-Python scans run one at a time.
+"""
+import argparse
+import os
+import threading
+import time
+from typing import List
+
+from abstractrepo.specification import AttributeSpecification, Operator
+from tests.fixtures.models import News, NewsUpdateForm
+from tests.fixtures.repo import ThreadSafeListBasedNewsRepository
+
+
+def run(repo: ThreadSafeListBasedNewsRepository, threads: int, duration: float, writer: bool) -> float:
+    """Returns the number of reads per second done by the given number of threads."""
+    spec = AttributeSpecification('title', 'Title 1%', Operator.LIKE)
+    stop = threading.Event()
+    reads = [0] * threads
+
+    def read(index: int) -> None:
+        while not stop.is_set():
+            repo.count(spec)
+            reads[index] += 1
+
+    def write() -> None:
+        item_id = 0
+        while not stop.is_set():
+            repo.update(item_id % 1000, NewsUpdateForm(title=f'Title {item_id}'))
+            item_id += 1
+
+    workers = [threading.Thread(target=read, args=(index,)) for index in range(threads)]
+    if writer:
+        workers.append(threading.Thread(target=write))
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    time.sleep(duration)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(reads) / (time.perf_counter() - start)
+
+
+def main(items: int, threads: List[int], duration: float, writer: bool) -> None:
+    repo = ThreadSafeListBasedNewsRepository([News(id=i, title=f'Title {i}') for i in range(items)])
+    print(f'{items} items, {os.cpu_count()} CPUs{", one writer" if writer else ""}')
+    baseline = None
+    for count in threads:
+        throughput = run(repo, count, duration, writer)
+        baseline = baseline or throughput
+        print(f'{count} threads: {throughput:.1f} reads/s, {throughput / baseline:.2f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=10_000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--duration', type=float, default=2.0)
+    parser.add_argument('--writer', action='store_true')
+    arguments = parser.parse_args()
+    main(arguments.items, arguments.threads, arguments.duration, arguments.writer)
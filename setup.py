@@ -46,6 +46,7 @@ setuptools.setup(
     install_requires=[],
     extras_require={
         'dev': ['check-manifest', 'coverage'],
-        'test': ['coverage', 'pytest-asyncio'],
+        'test': ['coverage', 'pytest-asyncio', 'numpy'],
+        'numpy': ['numpy'],
     },
 )
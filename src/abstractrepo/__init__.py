@@ -5,3 +5,13 @@ import abstractrepo.specification
 import abstractrepo.order
 import abstractrepo.paging
 import abstractrepo.exceptions
+import abstractrepo.index
+import abstractrepo.columnar
+import abstractrepo.vectorized
+import abstractrepo.compiler
+import abstractrepo.locking
+import abstractrepo.live
+import abstractrepo.sql
+import abstractrepo.pool
+import abstractrepo.cache
+import abstractrepo.fingerprint
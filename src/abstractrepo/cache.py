@@ -0,0 +1,982 @@
+import abc
+import collections
+import contextlib
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Generic, Hashable, Iterable, Iterator, List, Optional, Set, \
+    Tuple, Type, TypeVar, Union
+
+from abstractrepo.exceptions import ItemNotFoundException
+from abstractrepo.order import OrderOptions
+from abstractrepo.paging import PagingOptions
+from abstractrepo.repo import CrudRepositoryInterface, AsyncCrudRepositoryInterface
+from abstractrepo.specification import SpecificationInterface
+
+TKey = TypeVar('TKey', bound=Hashable)
+TValue = TypeVar('TValue')
+TModel = TypeVar('TModel')
+TIdValueType = TypeVar('TIdValueType')
+TCreateSchema = TypeVar('TCreateSchema')
+TUpdateSchema = TypeVar('TUpdateSchema')
+
+_MISSING = object()
+
+
+class LruCache(Generic[TKey, TValue]):
+    """A bounded mapping evicting its least recently used entries and, optionally, the entries older than a TTL.
+
+    The cache is not thread-safe; callers sharing it between threads have to lock around it.
+
+    Attributes:
+        hits: The number of lookups that found a live entry.
+        misses: The number of lookups that found no entry or an expired one.
+        evictions: The number of entries dropped to make room for new ones.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    _max_size: int
+    _ttl: Optional[float]
+    _clock: Callable[[], float]
+    _entries: 'collections.OrderedDict[TKey, Tuple[float, TValue]]'
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """Initializes a new LruCache.
+
+        Args:
+            max_size: The maximum number of entries.
+            ttl: The number of seconds an entry stays valid after it is stored, or None to keep it until evicted.
+            clock: The function returning the current time in seconds.
+
+        Raises:
+            ValueError: If the maximum size or the TTL is not positive.
+        """
+        if max_size < 1:
+            raise ValueError('Cache size must be positive')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('TTL must be positive')
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._entries = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        """Returns the number of stored entries, including the expired ones not dropped yet."""
+        return len(self._entries)
+
+    def get(self, key: TKey, default: Optional[TValue] = None) -> Optional[TValue]:
+        """Returns the value stored for the key and marks it as recently used.
+
+        Args:
+            key: The key to look up.
+            default: The value to return if there is no live entry for the key.
+
+        Returns:
+            The stored value, or the default.
+        """
+        entry = self._entries.get(key)
+        if entry is None or self._is_expired(entry):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: TKey, value: TValue) -> None:
+        """Stores the value for the key, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: The key to store the value for.
+            value: The value to store.
+        """
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: TKey) -> None:
+        """Removes the entry for the key, if any.
+
+        Args:
+            key: The key to remove.
+        """
+        self._entries.pop(key, None)
+
+    def items(self) -> List[Tuple[TKey, TValue]]:
+        """Returns the live entries from the least to the most recently used, without marking them as used."""
+        return [(key, entry[1]) for key, entry in self._entries.items() if not self._is_expired(entry)]
+
+    def clear(self) -> None:
+        """Removes all entries; the counters are kept."""
+        self._entries.clear()
+
+    def _is_expired(self, entry: Tuple[float, TValue]) -> bool:
+        """Returns whether the entry is older than the TTL."""
+        return self._ttl is not None and self._clock() - entry[0] >= self._ttl
+
+
+def get_query_key(
+    filter_spec: Optional[SpecificationInterface[Any, bool]],
+    order_options: Optional[OrderOptions],
+    paging_options: Optional[PagingOptions],
+) -> Optional[Hashable]:
+    """Returns a key identifying a query by the fingerprints of its options, e.g. for caching its results.
+
+    Queries with equal keys select the same items in the same order (see `SpecificationInterface.get_fingerprint`,
+    `OrderOptions.get_fingerprint` and `PagingOptions.get_fingerprint`). Keys are snapshots: modifying
+    the options later does not change them.
+
+    Args:
+        filter_spec: The filter specification of the query.
+        order_options: The order options of the query.
+        paging_options: The paging options of the query.
+
+    Returns:
+        A hashable key, or None if the query cannot be identified by value (e.g. it contains custom specifications
+        without fingerprints or unhashable operands).
+    """
+    try:
+        return (
+            filter_spec.get_fingerprint() if filter_spec is not None else None,
+            order_options.get_fingerprint() if order_options is not None else None,
+            paging_options.get_fingerprint() if paging_options is not None else None,
+        )
+    except TypeError:
+        return None
+
+
+class BaseCachingRepository(abc.ABC, Generic[TModel, TIdValueType]):
+    """Base abstract class for repositories caching the reads of another repository.
+
+    Items are cached by ID in `item_cache`, and the results of `get_collection` and `count` in `query_cache`
+    by query (see `get_query_key`); queries that cannot be identified by value are not cached.
+
+    Writes through the caching repository invalidate precisely: a cached query result is dropped if its filter
+    matches one of the changed items before or after the write, and the changed items replace the cached ones.
+    Results read while a write is in progress are not stored, so the caches never hold results older than
+    the last write through the caching repository. Changes made to the wrapped repository directly are
+    only seen once the entries expire (see the `ttl` argument).
+
+    The cached lists are copied for every caller, but the models are shared and must not be modified.
+    """
+    _id_attribute: str
+    _item_cache: LruCache[Any, TModel]
+    _query_cache: LruCache[Hashable, Tuple[Optional[SpecificationInterface[TModel, bool]], Any]]
+    _cache_lock: threading.Lock
+    _generation: int
+    _pending_writes: int
+
+    def _init_cache(self, id_attribute: str, item_cache_size: int, query_cache_size: int, ttl: Optional[float]) -> None:
+        """Creates the caches.
+
+        Raises:
+            ValueError: If a cache size or the TTL is not positive.
+        """
+        self._id_attribute = id_attribute
+        self._item_cache = LruCache(item_cache_size, ttl)
+        self._query_cache = LruCache(query_cache_size, ttl)
+        self._cache_lock = threading.Lock()
+        self._generation = 0
+        self._pending_writes = 0
+
+    @property
+    def item_cache(self) -> LruCache[Any, TModel]:
+        """Returns the cache of items by ID, whose counters record its hits and misses."""
+        return self._item_cache
+
+    @property
+    def query_cache(self) -> LruCache[Hashable, Tuple[Optional[SpecificationInterface[TModel, bool]], Any]]:
+        """Returns the cache of query results, whose counters record its hits and misses."""
+        return self._query_cache
+
+    def clear_cache(self) -> None:
+        """Drops all cached items and query results, e.g. after changing the wrapped repository directly."""
+        with self._cache_lock:
+            self._item_cache.clear()
+            self._query_cache.clear()
+            self._generation += 1
+
+    def _read_query(
+        self,
+        kind: str,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+    ) -> Tuple[Optional[Hashable], int, Any]:
+        """Returns the key of a query, the generation its result has to be stored with, and its cached result or `_MISSING`."""
+        key = get_query_key(filter_spec, order_options, paging_options)
+        generation = self._begin_read()
+        return key, generation, self._get_cached_query(kind, key)
+
+    def _begin_read(self) -> int:
+        """Returns the generation of the caches, which a read has to pass back to store its results."""
+        with self._cache_lock:
+            return self._generation
+
+    def _get_cached_query(self, kind: str, key: Optional[Hashable]) -> Any:
+        """Returns the cached result of the query, or `_MISSING`."""
+        if key is None:
+            return _MISSING
+        with self._cache_lock:
+            entry = self._query_cache.get((kind, key))
+        return _MISSING if entry is None else entry[1]
+
+    def _store_query(
+        self,
+        generation: int,
+        kind: str,
+        key: Optional[Hashable],
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+        result: Any,
+    ) -> None:
+        """Caches the result of a query unless a write started or ended since the read began."""
+        if key is None:
+            return
+        with self._cache_lock:
+            if self._is_current(generation):
+                self._query_cache.put((kind, key), (filter_spec, result))
+
+    def _split_cached_items(self, item_ids: List[TIdValueType]) -> Tuple[List[Any], List[TIdValueType]]:
+        """Returns the cached item or `_MISSING` for each ID, and the IDs of the missing items."""
+        cached = []
+        with self._cache_lock:
+            for item_id in item_ids:
+                try:
+                    cached.append(self._item_cache.get(item_id, _MISSING))
+                except TypeError:
+                    cached.append(_MISSING)
+        return cached, [item_id for item_id, item in zip(item_ids, cached) if item is _MISSING]
+
+    def _store_items(self, generation: int, items: Iterable[TModel]) -> None:
+        """Caches the items unless a write started or ended since the read began."""
+        with self._cache_lock:
+            if self._is_current(generation):
+                for item in items:
+                    self._item_cache.put(getattr(item, self._id_attribute), item)
+
+    @contextlib.contextmanager
+    def _write(
+        self,
+        item_ids: Optional[List[TIdValueType]],
+        deleted: bool = False,
+        single: bool = False,
+    ) -> Iterator['_CacheWrite[TModel]']:
+        """Returns a context manager updating the caches around a write to the wrapped repository.
+
+        The write operation stores the written items in the yielded `_CacheWrite`, and the keys of the query
+        results matching their previous versions if `match_previous` is set. If the operation succeeds,
+        these results are invalidated and the items cached; if it fails, every result it may have changed is.
+
+        Args:
+            item_ids: The IDs of the items the write targets, or None if they are unknown.
+            deleted: Whether the write deletes the items.
+            single: Whether the write targets a single item, so that nothing changed if it fails with
+                    ItemNotFoundException.
+        """
+        write = _CacheWrite(self._begin_write())
+        try:
+            yield write
+        except ItemNotFoundException:
+            if single:
+                self._end_write(write.previous_keys, [])
+            else:
+                self._abort_write(item_ids)
+            raise
+        except BaseException:
+            self._abort_write(item_ids)
+            raise
+        self._end_write(write.previous_keys, write.items, deleted)
+
+    def _begin_write(self) -> bool:
+        """Stops storing the results of reads until the write ends.
+
+        Returns:
+            Whether query results are cached, i.e. whether the previous versions of the changed items
+            have to be matched with `_match_queries` before the write.
+        """
+        with self._cache_lock:
+            self._pending_writes += 1
+            self._generation += 1
+            return len(self._query_cache) > 0
+
+    def _match_queries(self, items: Iterable[TModel]) -> Set[Hashable]:
+        """Returns the keys of the cached query results whose filter matches one of the items."""
+        items = list(items)
+        if not items:
+            return set()
+        with self._cache_lock:
+            entries = self._query_cache.items()
+        return {key for key, (filter_spec, _) in entries if self._matches_any(filter_spec, items)}
+
+    def _end_write(self, previous_keys: Set[Hashable], items: List[TModel], deleted: bool = False) -> None:
+        """Invalidates the cached results affected by a successful write and caches the written items.
+
+        Args:
+            previous_keys: The keys of the query results matching the previous versions of the items.
+            items: The items created, updated or deleted by the write.
+            deleted: Whether the items were deleted.
+        """
+        keys = previous_keys | self._match_queries(items)
+        with self._cache_lock:
+            for key in keys:
+                self._query_cache.pop(key)
+            for item in items:
+                if deleted:
+                    self._item_cache.pop(getattr(item, self._id_attribute))
+                else:
+                    self._item_cache.put(getattr(item, self._id_attribute), item)
+            self._pending_writes -= 1
+            self._generation += 1
+
+    def _abort_write(self, item_ids: Optional[List[TIdValueType]]) -> None:
+        """Invalidates every cached result a failed write may have changed.
+
+        Args:
+            item_ids: The IDs of the items the write targeted, or None if they are unknown.
+        """
+        with self._cache_lock:
+            self._query_cache.clear()
+            if item_ids is None:
+                self._item_cache.clear()
+            else:
+                for item_id in item_ids:
+                    try:
+                        self._item_cache.pop(item_id)
+                    except TypeError:
+                        pass
+            self._pending_writes -= 1
+            self._generation += 1
+
+    def _is_current(self, generation: int) -> bool:
+        """Returns whether no write is in progress and none started since the generation was read."""
+        return not self._pending_writes and generation == self._generation
+
+    @staticmethod
+    def _matches_any(filter_spec: Optional[SpecificationInterface[TModel, bool]], items: List[TModel]) -> bool:
+        """Returns whether one of the items satisfies the filter, counting evaluation errors as matches."""
+        if filter_spec is None:
+            return True
+        for item in items:
+            try:
+                if filter_spec.is_satisfied_by(item):
+                    return True
+            except Exception:
+                return True
+        return False
+
+
+class CachingCrudRepository(
+    Generic[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    CrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    BaseCachingRepository[TModel, TIdValueType],
+):
+    """Implements a synchronous CRUD repository caching the reads of another repository.
+
+    See `BaseCachingRepository` for the caching and the invalidation. `iter_collection` is not cached.
+    The caches can be shared by threads if the wrapped repository can.
+    """
+    _repository: CrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema]
+
+    def __init__(
+        self,
+        repository: CrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+        id_attribute: str = 'id',
+        item_cache_size: int = 1024,
+        query_cache_size: int = 256,
+        ttl: Optional[float] = None,
+    ):
+        """Initializes the repository.
+
+        Args:
+            repository: The repository to cache the reads of.
+            id_attribute: The name of the ID attribute of the models.
+            item_cache_size: The maximum number of cached items.
+            query_cache_size: The maximum number of cached query results.
+            ttl: The number of seconds cached entries stay valid, or None to keep them until evicted or invalidated.
+
+        Raises:
+            ValueError: If a cache size or the TTL is not positive.
+        """
+        self._repository = repository
+        self._init_cache(id_attribute, item_cache_size, query_cache_size, ttl)
+
+    @property
+    def repository(self) -> CrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema]:
+        """Returns the wrapped repository."""
+        return self._repository
+
+    @property
+    def model_class(self) -> Type[TModel]:
+        """Returns the model class of the wrapped repository."""
+        return self._repository.model_class
+
+    def get_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+    ) -> List[TModel]:
+        """Retrieves a collection of items based on filtering, sorting, and pagination options.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+
+        Returns:
+            A list of TModel instances matching the criteria.
+        """
+        key, generation, result = self._read_query('collection', filter_spec, order_options, paging_options)
+        if result is _MISSING:
+            result = tuple(self._repository.get_collection(filter_spec, order_options, paging_options))
+            self._store_query(generation, 'collection', key, filter_spec, result)
+        return list(result)
+
+    def iter_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[TModel]:
+        """Lazily iterates over a collection of items read from the wrapped repository.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+            chunk_size: The number of items to fetch from the storage at once.
+
+        Returns:
+            An iterator over the TModel instances matching the criteria.
+
+        Raises:
+            ValueError: If the chunk size is not positive.
+        """
+        return self._repository.iter_collection(filter_spec, order_options, paging_options, chunk_size)
+
+    def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
+        """Returns the total count of items matching the given filter specification.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the items.
+
+        Returns:
+            The number of items matching the filter.
+        """
+        key, generation, result = self._read_query('count', filter_spec)
+        if result is _MISSING:
+            result = self._repository.count(filter_spec)
+            self._store_query(generation, 'count', key, filter_spec, result)
+        return result
+
+    def get_item(self, item_id: TIdValueType) -> TModel:
+        """Retrieves a single item by its unique identifier.
+
+        Args:
+            item_id: The unique identifier of the item to retrieve.
+
+        Returns:
+            The TModel instance corresponding to the item_id.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        generation = self._begin_read()
+        (item,), missing = self._split_cached_items([item_id])
+        if missing:
+            item = self._repository.get_item(item_id)
+            self._store_items(generation, [item])
+        return item
+
+    def get_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool = False) -> Dict[TIdValueType, TModel]:
+        """Retrieves multiple items by their unique identifiers, reading only the uncached ones.
+
+        Args:
+            item_ids: The unique identifiers of the items to retrieve.
+            skip_missing: Whether IDs with no item are left out of the result instead of raising an exception.
+
+        Returns:
+            A dictionary mapping the IDs to the corresponding TModel instances, in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found and `skip_missing` is False.
+        """
+        item_ids = list(item_ids)
+        generation = self._begin_read()
+        cached, missing = self._split_cached_items(item_ids)
+        fetched = self._repository.get_items(missing, skip_missing) if missing else {}
+        self._store_items(generation, fetched.values())
+        return _merge_cached_items(item_ids, cached, fetched)
+
+    def exists(self, item_id: TIdValueType) -> bool:
+        """Checks if an item with the specified ID exists in the repository.
+
+        Args:
+            item_id: The unique identifier of the item to check.
+
+        Returns:
+            True if an item with the specified ID exists, False otherwise.
+        """
+        _, missing = self._split_cached_items([item_id])
+        return not missing or self._repository.exists(item_id)
+
+    def create(self, form: TCreateSchema) -> TModel:
+        """Creates a new item in the wrapped repository.
+
+        Args:
+            form: The TCreateSchema instance containing data for the new item.
+
+        Returns:
+            The newly created TModel instance.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        with self._write([]) as write:
+            write.items = [self._repository.create(form)]
+        return write.items[0]
+
+    def update(self, item_id: TIdValueType, form: TUpdateSchema) -> TModel:
+        """Updates an existing item of the wrapped repository.
+
+        Args:
+            item_id: The unique identifier of the item to update.
+            form: The TUpdateSchema instance containing data for updating the item.
+
+        Returns:
+            The updated TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        with self._write([item_id], single=True) as write:
+            if write.match_previous:
+                write.previous_keys = self._match_queries(self._get_previous_items([item_id]))
+            write.items = [self._repository.update(item_id, form)]
+        return write.items[0]
+
+    def delete(self, item_id: TIdValueType) -> TModel:
+        """Deletes an item from the wrapped repository.
+
+        Args:
+            item_id: The unique identifier of the item to delete.
+
+        Returns:
+            The deleted TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        with self._write([item_id], deleted=True, single=True) as write:
+            write.items = [self._repository.delete(item_id)]
+        return write.items[0]
+
+    def create_many(self, forms: Iterable[TCreateSchema]) -> List[TModel]:
+        """Creates new items in the wrapped repository.
+
+        Args:
+            forms: The TCreateSchema instances containing data for the new items.
+
+        Returns:
+            The list of newly created TModel instances, in the order of the forms.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        with self._write([]) as write:
+            write.items = self._repository.create_many(forms)
+        return write.items
+
+    def update_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+        form: TUpdateSchema,
+    ) -> List[TModel]:
+        """Updates the items of the wrapped repository selected by IDs or by a specification.
+
+        Args:
+            target: The unique identifiers of the items to update, or a specification selecting them.
+            form: The TUpdateSchema instance containing data for updating the items.
+
+        Returns:
+            The list of updated TModel instances.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        target_ids = None if isinstance(target, SpecificationInterface) else list(target)
+        with self._write(target_ids) as write:
+            if write.match_previous:
+                if target_ids is None:
+                    previous = self._repository.get_collection(target)
+                else:
+                    previous = self._get_previous_items(target_ids)
+                write.previous_keys = self._match_queries(previous)
+            write.items = self._repository.update_many(target if target_ids is None else target_ids, form)
+        return write.items
+
+    def delete_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TModel]:
+        """Deletes the items of the wrapped repository selected by IDs or by a specification.
+
+        Args:
+            target: The unique identifiers of the items to delete, or a specification selecting them.
+
+        Returns:
+            The list of deleted TModel instances.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+        """
+        target_ids = None if isinstance(target, SpecificationInterface) else list(target)
+        with self._write(target_ids, deleted=True) as write:
+            write.items = self._repository.delete_many(target if target_ids is None else target_ids)
+        return write.items
+
+    def _get_previous_items(self, item_ids: List[TIdValueType]) -> List[TModel]:
+        """Returns the current versions of the existing items with the given IDs, from the cache where possible."""
+        cached, missing = self._split_cached_items(item_ids)
+        fetched = self._repository.get_items(missing, skip_missing=True) if missing else {}
+        return [item for item in cached if item is not _MISSING] + list(fetched.values())
+
+
+class AsyncCachingCrudRepository(
+    Generic[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    AsyncCrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    BaseCachingRepository[TModel, TIdValueType],
+):
+    """Implements an asynchronous CRUD repository caching the reads of another repository.
+
+    See `BaseCachingRepository` for the caching and the invalidation. `iter_collection` is not cached.
+    """
+    _repository: AsyncCrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema]
+
+    def __init__(
+        self,
+        repository: AsyncCrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+        id_attribute: str = 'id',
+        item_cache_size: int = 1024,
+        query_cache_size: int = 256,
+        ttl: Optional[float] = None,
+    ):
+        """Initializes the repository.
+
+        Args:
+            repository: The repository to cache the reads of.
+            id_attribute: The name of the ID attribute of the models.
+            item_cache_size: The maximum number of cached items.
+            query_cache_size: The maximum number of cached query results.
+            ttl: The number of seconds cached entries stay valid, or None to keep them until evicted or invalidated.
+
+        Raises:
+            ValueError: If a cache size or the TTL is not positive.
+        """
+        self._repository = repository
+        self._init_cache(id_attribute, item_cache_size, query_cache_size, ttl)
+
+    @property
+    def repository(self) -> AsyncCrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema]:
+        """Returns the wrapped repository."""
+        return self._repository
+
+    @property
+    def model_class(self) -> Type[TModel]:
+        """Returns the model class of the wrapped repository."""
+        return self._repository.model_class
+
+    async def get_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+    ) -> List[TModel]:
+        """Retrieves a collection of items based on filtering, sorting, and pagination options.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+
+        Returns:
+            A list of TModel instances matching the criteria.
+        """
+        key, generation, result = self._read_query('collection', filter_spec, order_options, paging_options)
+        if result is _MISSING:
+            result = tuple(await self._repository.get_collection(filter_spec, order_options, paging_options))
+            self._store_query(generation, 'collection', key, filter_spec, result)
+        return list(result)
+
+    async def iter_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[TModel]:
+        """Lazily iterates over a collection of items read from the wrapped repository.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+            chunk_size: The number of items to fetch from the storage at once.
+
+        Returns:
+            An asynchronous iterator over the TModel instances matching the criteria.
+
+        Raises:
+            ValueError: If the chunk size is not positive.
+        """
+        async for item in self._repository.iter_collection(filter_spec, order_options, paging_options, chunk_size):
+            yield item
+
+    async def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
+        """Returns the total count of items matching the given filter specification.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the items.
+
+        Returns:
+            The number of items matching the filter.
+        """
+        key, generation, result = self._read_query('count', filter_spec)
+        if result is _MISSING:
+            result = await self._repository.count(filter_spec)
+            self._store_query(generation, 'count', key, filter_spec, result)
+        return result
+
+    async def get_item(self, item_id: TIdValueType) -> TModel:
+        """Retrieves a single item by its unique identifier.
+
+        Args:
+            item_id: The unique identifier of the item to retrieve.
+
+        Returns:
+            The TModel instance corresponding to the item_id.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        generation = self._begin_read()
+        (item,), missing = self._split_cached_items([item_id])
+        if missing:
+            item = await self._repository.get_item(item_id)
+            self._store_items(generation, [item])
+        return item
+
+    async def get_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool = False) -> Dict[TIdValueType, TModel]:
+        """Retrieves multiple items by their unique identifiers, reading only the uncached ones.
+
+        Args:
+            item_ids: The unique identifiers of the items to retrieve.
+            skip_missing: Whether IDs with no item are left out of the result instead of raising an exception.
+
+        Returns:
+            A dictionary mapping the IDs to the corresponding TModel instances, in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found and `skip_missing` is False.
+        """
+        item_ids = list(item_ids)
+        generation = self._begin_read()
+        cached, missing = self._split_cached_items(item_ids)
+        fetched = await self._repository.get_items(missing, skip_missing) if missing else {}
+        self._store_items(generation, fetched.values())
+        return _merge_cached_items(item_ids, cached, fetched)
+
+    async def exists(self, item_id: TIdValueType) -> bool:
+        """Checks if an item with the specified ID exists in the repository.
+
+        Args:
+            item_id: The unique identifier of the item to check.
+
+        Returns:
+            True if an item with the specified ID exists, False otherwise.
+        """
+        _, missing = self._split_cached_items([item_id])
+        return not missing or await self._repository.exists(item_id)
+
+    async def create(self, form: TCreateSchema) -> TModel:
+        """Creates a new item in the wrapped repository.
+
+        Args:
+            form: The TCreateSchema instance containing data for the new item.
+
+        Returns:
+            The newly created TModel instance.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        with self._write([]) as write:
+            write.items = [await self._repository.create(form)]
+        return write.items[0]
+
+    async def update(self, item_id: TIdValueType, form: TUpdateSchema) -> TModel:
+        """Updates an existing item of the wrapped repository.
+
+        Args:
+            item_id: The unique identifier of the item to update.
+            form: The TUpdateSchema instance containing data for updating the item.
+
+        Returns:
+            The updated TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        with self._write([item_id], single=True) as write:
+            if write.match_previous:
+                write.previous_keys = self._match_queries(await self._get_previous_items([item_id]))
+            write.items = [await self._repository.update(item_id, form)]
+        return write.items[0]
+
+    async def delete(self, item_id: TIdValueType) -> TModel:
+        """Deletes an item from the wrapped repository.
+
+        Args:
+            item_id: The unique identifier of the item to delete.
+
+        Returns:
+            The deleted TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        with self._write([item_id], deleted=True, single=True) as write:
+            write.items = [await self._repository.delete(item_id)]
+        return write.items[0]
+
+    async def create_many(self, forms: Iterable[TCreateSchema]) -> List[TModel]:
+        """Creates new items in the wrapped repository.
+
+        Args:
+            forms: The TCreateSchema instances containing data for the new items.
+
+        Returns:
+            The list of newly created TModel instances, in the order of the forms.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        with self._write([]) as write:
+            write.items = await self._repository.create_many(forms)
+        return write.items
+
+    async def update_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+        form: TUpdateSchema,
+    ) -> List[TModel]:
+        """Updates the items of the wrapped repository selected by IDs or by a specification.
+
+        Args:
+            target: The unique identifiers of the items to update, or a specification selecting them.
+            form: The TUpdateSchema instance containing data for updating the items.
+
+        Returns:
+            The list of updated TModel instances.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        target_ids = None if isinstance(target, SpecificationInterface) else list(target)
+        with self._write(target_ids) as write:
+            if write.match_previous:
+                if target_ids is None:
+                    previous = await self._repository.get_collection(target)
+                else:
+                    previous = await self._get_previous_items(target_ids)
+                write.previous_keys = self._match_queries(previous)
+            write.items = await self._repository.update_many(target if target_ids is None else target_ids, form)
+        return write.items
+
+    async def delete_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TModel]:
+        """Deletes the items of the wrapped repository selected by IDs or by a specification.
+
+        Args:
+            target: The unique identifiers of the items to delete, or a specification selecting them.
+
+        Returns:
+            The list of deleted TModel instances.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+        """
+        target_ids = None if isinstance(target, SpecificationInterface) else list(target)
+        with self._write(target_ids, deleted=True) as write:
+            write.items = await self._repository.delete_many(target if target_ids is None else target_ids)
+        return write.items
+
+    async def _get_previous_items(self, item_ids: List[TIdValueType]) -> List[TModel]:
+        """Returns the current versions of the existing items with the given IDs, from the cache where possible."""
+        cached, missing = self._split_cached_items(item_ids)
+        fetched = await self._repository.get_items(missing, skip_missing=True) if missing else {}
+        return [item for item in cached if item is not _MISSING] + list(fetched.values())
+
+
+def _merge_cached_items(
+    item_ids: List[TIdValueType],
+    cached: List[Any],
+    fetched: Dict[TIdValueType, TModel],
+) -> Dict[TIdValueType, TModel]:
+    """Combines cached and fetched items into a dictionary in the order of the IDs, leaving out the missing ones.
+
+    Args:
+        item_ids: The requested IDs.
+        cached: The cached item or `_MISSING` for each ID.
+        fetched: The items read from the storage by ID.
+
+    Returns:
+        The items by ID.
+    """
+    result = {}
+    for item_id, item in zip(item_ids, cached):
+        if item is _MISSING:
+            item = fetched.get(item_id, _MISSING)
+        if item is not _MISSING:
+            result[item_id] = item
+    return result
+
+
+class _CacheWrite(Generic[TModel]):
+    """The state of a write through a caching repository, filled in by the write operation.
+
+    Attributes:
+        match_previous: Whether query results are cached, so the previous versions of the changed items
+                        have to be matched with `BaseCachingRepository._match_queries` before the write.
+        previous_keys: The keys of the query results matching the previous versions of the changed items.
+        items: The items created, updated or deleted by the write.
+    """
+    match_previous: bool
+    previous_keys: Set[Hashable]
+    items: List[TModel]
+
+    def __init__(self, match_previous: bool):
+        self.match_previous = match_previous
+        self.previous_keys = set()
+        self.items = []
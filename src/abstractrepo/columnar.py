@@ -0,0 +1,1290 @@
+import abc
+import functools
+import itertools
+import operator
+from array import array
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from abstractrepo.compiler import StrictSpecificationCompiler, _identity
+from abstractrepo.exceptions import ItemNotFoundException
+from abstractrepo.order import OrderOptions, SortKey
+from abstractrepo.paging import PagingOptions
+from abstractrepo.repo import CrudRepositoryInterface, AsyncCrudRepositoryInterface, _apply_cursor, _get_paging_end
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, NotSpecification, Operator
+
+if TYPE_CHECKING:
+    from abstractrepo.vectorized import NumpySpecificationEvaluator
+
+TModel = TypeVar('TModel')
+TIdValueType = TypeVar('TIdValueType')
+TCreateSchema = TypeVar('TCreateSchema')
+TUpdateSchema = TypeVar('TUpdateSchema')
+
+
+class ColumnType(Enum):
+    """Enumeration of the storage types of columnar repository columns.
+
+    Attributes:
+        INT: 64-bit signed integers, stored in an `array`.
+        FLOAT: Double-precision floats, stored in an `array`.
+        BOOL: Booleans, stored in an `array` of bytes.
+        STR: Dictionary-encoded values: each distinct value is stored once and rows hold integer codes.
+             Meant for strings, but suitable for any hashable values.
+        OBJECT: Arbitrary values, stored in a list.
+    """
+    INT = 'INT'
+    FLOAT = 'FLOAT'
+    BOOL = 'BOOL'
+    STR = 'STR'
+    OBJECT = 'OBJECT'
+
+
+class ColumnInterface(abc.ABC):
+    """Abstract base class for the columns of columnar repositories.
+
+    A column stores the values of a single model attribute for all rows, addressed by position.
+    Every column can store None.
+
+    Conditions on the column are evaluated for all rows at once by `match`, which returns a mask:
+    a bytes object holding 1 for each matching row and 0 for the other rows.
+    """
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Returns the number of rows in the column."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def append(self, value: Any) -> None:
+        """Appends a value to the column.
+
+        Args:
+            value: The value to append.
+
+        Raises:
+            TypeError: If the column cannot store the value.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get(self, position: int) -> Any:
+        """Returns the value stored at the given position.
+
+        Args:
+            position: The position of the row.
+
+        Returns:
+            The stored value.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_values(self, positions: Iterable[int]) -> List[Any]:
+        """Returns the values stored at the given positions.
+
+        Args:
+            positions: The positions of the rows.
+
+        Returns:
+            The stored values, in the order of the positions.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def set(self, position: int, value: Any) -> None:
+        """Replaces the value stored at the given position.
+
+        Args:
+            position: The position of the row.
+            value: The new value.
+
+        Raises:
+            TypeError: If the column cannot store the value.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def truncate(self, size: int) -> None:
+        """Removes the rows from the given position to the end.
+
+        Args:
+            size: The number of rows to keep.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def keep(self, mask: bytes) -> None:
+        """Removes the rows not selected by the mask, keeping the order of the others.
+
+        Args:
+            mask: The mask of the rows to keep.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_getter(self) -> Callable[[int], Any]:
+        """Returns a function reading the value stored at a position.
+
+        The function is only valid until the column is modified.
+
+        Returns:
+            The getter function.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def match(self, specification: AttributeSpecification) -> bytes:
+        """Evaluates the condition on the column for all rows.
+
+        The result is the same as calling `is_satisfied_by` of the specification on every row.
+
+        Args:
+            specification: The condition on the attribute stored in the column.
+
+        Returns:
+            The mask of the rows satisfying the condition.
+
+        Raises:
+            NotImplementedError: If the condition cannot be evaluated on the column, e.g. because of
+                                 an unusual operand. It has to be evaluated on the models then.
+        """
+        raise NotImplementedError()
+
+    def match_positions(self, specification: AttributeSpecification, positions: List[int]) -> List[int]:
+        """Evaluates the condition on the rows at the given positions only.
+
+        Unlike `match`, no other row is read, so a value the operand cannot be compared with only raises
+        an error if it is stored at one of the positions, as when calling `is_satisfied_by` on those rows.
+
+        Args:
+            specification: The condition on the attribute stored in the column.
+            positions: The positions of the rows to evaluate.
+
+        Returns:
+            The positions of the rows satisfying the condition, in the order of the positions.
+
+        Raises:
+            NotImplementedError: If the condition cannot be evaluated on the column.
+        """
+        predicate = _compile_value_predicate(specification)
+        return list(itertools.compress(positions, map(predicate, self.get_values(positions))))
+
+
+class ArrayColumn(ColumnInterface):
+    """A column of numbers stored in an `array`, with None tracked in a separate mask.
+
+    The rows holding None store a placeholder value in the array. Values the array cannot hold,
+    including integers out of its range (e.g. 2 ** 63 in a 64-bit column), raise `TypeError`.
+    """
+    _typecode: str
+    _placeholder: Any
+    _values: array
+    _nulls: bytearray
+
+    def __init__(self, typecode: str, placeholder: Any = 0):
+        """Initializes a new ArrayColumn.
+
+        Args:
+            typecode: The type code of the array (see the `array` module).
+            placeholder: The value stored in the array for the rows holding None.
+        """
+        self._typecode = typecode
+        self._placeholder = placeholder
+        self._values = array(typecode)
+        self._nulls = bytearray()
+
+    @property
+    def values(self) -> array:
+        """Returns the array of the stored values, with placeholders in the rows holding None."""
+        return self._values
+
+    @property
+    def nulls(self) -> bytearray:
+        """Returns the mask of the rows holding None."""
+        return self._nulls
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def append(self, value: Any) -> None:
+        try:
+            self._values.append(self._placeholder if value is None else value)
+        except OverflowError as error:
+            raise TypeError(f'Value out of the range of the column: {value!r}') from error
+        self._nulls.append(value is None)
+
+    def get(self, position: int) -> Any:
+        return None if self._nulls[position] else self._values[position]
+
+    def get_values(self, positions: Iterable[int]) -> List[Any]:
+        if 1 not in self._nulls:
+            return list(map(self._values.__getitem__, positions))
+        return list(map(self.get, positions))
+
+    def set(self, position: int, value: Any) -> None:
+        try:
+            self._values[position] = self._placeholder if value is None else value
+        except OverflowError as error:
+            raise TypeError(f'Value out of the range of the column: {value!r}') from error
+        self._nulls[position] = value is None
+
+    def truncate(self, size: int) -> None:
+        del self._values[size:]
+        del self._nulls[size:]
+
+    def keep(self, mask: bytes) -> None:
+        self._values = array(self._typecode, itertools.compress(self._values, mask))
+        self._nulls = bytearray(itertools.compress(self._nulls, mask))
+
+    def get_getter(self) -> Callable[[int], Any]:
+        if 1 not in self._nulls:
+            return self._values.__getitem__
+        return self.get
+
+    def match(self, specification: AttributeSpecification) -> bytes:
+        predicate = _compile_value_predicate(specification)
+        value = specification.attribute_value
+        comparator = _VALUE_COMPARATORS.get(specification.operator)
+        if comparator is not None and isinstance(value, (int, float)):
+            matches = bytes(map(comparator, self._values, itertools.repeat(value)))
+        else:
+            matches = bytes(map(bool, map(predicate, self._values)))
+        if 1 not in self._nulls:
+            return matches
+
+        nulls = int.from_bytes(self._nulls, 'little')
+        mask = int.from_bytes(matches, 'little')
+        mask = mask | nulls if predicate(None) else mask & ~nulls
+        return mask.to_bytes(len(self._values), 'little')
+
+
+class BoolColumn(ArrayColumn):
+    """A column of booleans stored in an `array` of bytes."""
+
+    def __init__(self):
+        """Initializes a new BoolColumn."""
+        super().__init__('b', False)
+
+    def get(self, position: int) -> Any:
+        return None if self._nulls[position] else bool(self._values[position])
+
+    def get_values(self, positions: Iterable[int]) -> List[Any]:
+        return list(map(self.get, positions))
+
+    def get_getter(self) -> Callable[[int], Any]:
+        return self.get
+
+
+class DictionaryColumn(ColumnInterface):
+    """A dictionary-encoded column.
+
+    Each distinct value is stored once in the dictionary and the rows hold the codes of their values
+    in an `array`. Conditions are evaluated once per distinct value instead of once per row.
+
+    The dictionary keeps the values that are no longer used until the unused rows are removed with `keep`.
+    """
+    _codes: array
+    _dictionary: List[Any]
+    _lookup: Dict[Any, int]
+
+    def __init__(self):
+        """Initializes a new DictionaryColumn."""
+        self._codes = array('l')
+        self._dictionary = [None]
+        self._lookup = {None: 0}
+
+    @property
+    def codes(self) -> array:
+        """Returns the array of the codes of the stored values."""
+        return self._codes
+
+    @property
+    def dictionary(self) -> List[Any]:
+        """Returns the distinct values, indexed by their codes. Code 0 stands for None."""
+        return self._dictionary
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def append(self, value: Any) -> None:
+        self._codes.append(self._encode(value))
+
+    def get(self, position: int) -> Any:
+        return self._dictionary[self._codes[position]]
+
+    def get_values(self, positions: Iterable[int]) -> List[Any]:
+        return list(map(self._dictionary.__getitem__, map(self._codes.__getitem__, positions)))
+
+    def set(self, position: int, value: Any) -> None:
+        self._codes[position] = self._encode(value)
+
+    def truncate(self, size: int) -> None:
+        del self._codes[size:]
+
+    def keep(self, mask: bytes) -> None:
+        codes = array('l', itertools.compress(self._codes, mask))
+        used = sorted(set(codes) | {0})
+        remap = [0] * len(self._dictionary)
+        for new_code, code in enumerate(used):
+            remap[code] = new_code
+
+        self._codes = array('l', map(remap.__getitem__, codes))
+        self._dictionary = [self._dictionary[code] for code in used]
+        self._lookup = {value: code for code, value in enumerate(self._dictionary)}
+
+    def get_getter(self) -> Callable[[int], Any]:
+        dictionary, codes = self._dictionary, self._codes
+        return lambda position: dictionary[codes[position]]
+
+    def match(self, specification: AttributeSpecification) -> bytes:
+        return bytes(map(self.match_dictionary(specification).__getitem__, self._codes))
+
+    def match_dictionary(self, specification: AttributeSpecification) -> bytes:
+        """Evaluates the condition on each distinct value.
+
+        Args:
+            specification: The condition on the attribute stored in the column.
+
+        Returns:
+            The mask of the dictionary values satisfying the condition, indexed by their codes.
+
+        Raises:
+            NotImplementedError: If the condition cannot be evaluated on the column.
+        """
+        predicate = _compile_value_predicate(specification)
+        return bytes(map(bool, map(predicate, self._dictionary)))
+
+    def _encode(self, value: Any) -> int:
+        """Returns the code of the value, adding the value to the dictionary if needed.
+
+        Raises:
+            TypeError: If the value is not hashable.
+        """
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self._dictionary)
+            self._lookup[value] = code
+            self._dictionary.append(value)
+        return code
+
+
+class ObjectColumn(ColumnInterface):
+    """A column of arbitrary values stored in a list."""
+    _values: List[Any]
+
+    def __init__(self):
+        """Initializes a new ObjectColumn."""
+        self._values = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def append(self, value: Any) -> None:
+        self._values.append(value)
+
+    def get(self, position: int) -> Any:
+        return self._values[position]
+
+    def get_values(self, positions: Iterable[int]) -> List[Any]:
+        return list(map(self._values.__getitem__, positions))
+
+    def set(self, position: int, value: Any) -> None:
+        self._values[position] = value
+
+    def truncate(self, size: int) -> None:
+        del self._values[size:]
+
+    def keep(self, mask: bytes) -> None:
+        self._values = list(itertools.compress(self._values, mask))
+
+    def get_getter(self) -> Callable[[int], Any]:
+        return self._values.__getitem__
+
+    def match(self, specification: AttributeSpecification) -> bytes:
+        predicate = _compile_value_predicate(specification)
+        return bytes(map(bool, map(predicate, self._values)))
+
+
+def create_column(column_type: ColumnType) -> ColumnInterface:
+    """Creates an empty column of the given type.
+
+    Args:
+        column_type: The storage type of the column.
+
+    Returns:
+        The new column.
+    """
+    if column_type == ColumnType.INT:
+        return ArrayColumn('q')
+    if column_type == ColumnType.FLOAT:
+        return ArrayColumn('d', 0.0)
+    if column_type == ColumnType.BOOL:
+        return BoolColumn()
+    if column_type == ColumnType.STR:
+        return DictionaryColumn()
+    if column_type == ColumnType.OBJECT:
+        return ObjectColumn()
+    raise TypeError(f'Unsupported column type: {column_type}')
+
+
+class BaseColumnarRepository(abc.ABC, Generic[TModel, TIdValueType]):
+    """Base abstract class for repositories storing their items column by column.
+
+    Each model attribute declared by `_create_columns` is stored in its own column (see `ColumnInterface`):
+    numbers in arrays, strings dictionary-encoded. Filters made of the standard specification classes are
+    evaluated column by column into row masks, sorting reads the columns directly, and models are only built
+    for the rows that are returned. Other specifications are evaluated on models, but only for the rows
+    left by the column conditions they are combined with. When NumPy is installed and `_vectorize` is True,
+    the column conditions are evaluated with `abstractrepo.vectorized.NumpySpecificationEvaluator`.
+
+    Models are rebuilt from the columns on every read, so the returned objects are detached from the storage:
+    modifying them does not affect the repository. Attributes without a column are not stored.
+
+    Lookups by ID use a dictionary mapping the values of the `_id_column` column to row positions.
+    Deleted rows are marked as dead instead of being removed, and are dropped once their share
+    exceeds `_compaction_ratio`.
+    """
+    _id_column: str = 'id'
+    _compaction_ratio: float = 0.5
+    _vectorize: bool = True
+    _columns: Dict[str, ColumnInterface]
+    _alive: bytearray
+    _tombstones: int
+    _id_index: Dict[Any, int]
+
+    def __init__(self, items: Optional[List[TModel]] = None):
+        """Initializes the repository.
+
+        Args:
+            items: The items to store initially.
+
+        Raises:
+            ValueError: If no column is declared for the ID attribute.
+            TypeError: If a column cannot store the value of an item.
+        """
+        self._columns = {name: create_column(column_type) for name, column_type in self._create_columns().items()}
+        if self._id_column not in self._columns:
+            raise ValueError(f'No column declared for the ID attribute {self._id_column}')
+
+        self._alive = bytearray()
+        self._tombstones = 0
+        self._id_index = {}
+        for item in items or ():
+            self._append_row(item)
+
+    @abc.abstractmethod
+    def _create_columns(self) -> Dict[str, ColumnType]:
+        """Returns the stored attributes and their column types.
+
+        E.g. `return {'id': ColumnType.INT, 'title': ColumnType.STR, 'rating': ColumnType.FLOAT}`.
+
+        Returns:
+            A dictionary mapping attribute names to column types.
+        """
+        raise NotImplementedError()
+
+    def _build_model(self, values: Dict[str, Any]) -> TModel:
+        """Builds a model from the values stored in the columns.
+
+        Args:
+            values: A dictionary mapping attribute names to values.
+
+        Returns:
+            The new model. By default, `model_class` is called with the values as keyword arguments.
+        """
+        return self.model_class(**values)
+
+    def _read_row(self, position: int) -> TModel:
+        """Builds the model stored at the given position."""
+        return self._build_model({name: column.get(position) for name, column in self._columns.items()})
+
+    def _read_rows(self, positions: List[int]) -> List[TModel]:
+        """Builds the models stored at the given positions, reading each column once."""
+        names = list(self._columns)
+        columns = [column.get_values(positions) for column in self._columns.values()]
+        return [self._build_model(dict(zip(names, values))) for values in zip(*columns)]
+
+    def _append_row(self, item: TModel) -> None:
+        """Appends a row with the values of the item.
+
+        Raises:
+            TypeError: If a column cannot store the value of the item. Nothing is appended then.
+        """
+        size = len(self._alive)
+        try:
+            for name, column in self._columns.items():
+                column.append(getattr(item, name))
+        except BaseException:
+            self._truncate(size)
+            raise
+
+        self._alive.append(1)
+        self._id_index.setdefault(getattr(item, self._id_column), size)
+
+    def _write_row(self, position: int, item: TModel) -> None:
+        """Replaces the values stored at the given position with the values of the item.
+
+        Raises:
+            TypeError: If a column cannot store the value of the item. Nothing is changed then.
+        """
+        previous = {name: column.get(position) for name, column in self._columns.items()}
+        try:
+            for name, column in self._columns.items():
+                column.set(position, getattr(item, name))
+        except BaseException:
+            for name, column in self._columns.items():
+                column.set(position, previous[name])
+            raise
+
+        old_id, new_id = previous[self._id_column], getattr(item, self._id_column)
+        if old_id != new_id and self._id_index.get(old_id) == position:
+            del self._id_index[old_id]
+            self._id_index.setdefault(new_id, position)
+
+    def _truncate(self, size: int) -> None:
+        """Removes the rows appended after the given number of rows."""
+        for position in range(size, len(self._alive)):
+            if self._alive[position]:
+                self._remove_from_id_index(position)
+        for column in self._columns.values():
+            column.truncate(size)
+        self._tombstones -= self._alive[size:].count(0)
+        del self._alive[size:]
+
+    def _delete_rows(self, positions: List[int]) -> None:
+        """Marks the rows at the given positions as deleted."""
+        for position in positions:
+            self._remove_from_id_index(position)
+            self._alive[position] = 0
+        self._tombstones += len(positions)
+        if self._tombstones > len(self._alive) * self._compaction_ratio:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drops the deleted rows from the columns and rebuilds the ID index."""
+        mask = bytes(self._alive)
+        for column in self._columns.values():
+            column.keep(mask)
+
+        size = len(self._alive) - self._tombstones
+        self._alive = bytearray(b'\x01' * size)
+        self._tombstones = 0
+        get_id = self._columns[self._id_column].get_getter()
+        self._id_index = {}
+        for position in range(size):
+            self._id_index.setdefault(get_id(position), position)
+
+    def _remove_from_id_index(self, position: int) -> None:
+        """Removes the row at the given position from the ID index."""
+        item_id = self._columns[self._id_column].get(position)
+        if self._id_index.get(item_id) == position:
+            del self._id_index[item_id]
+
+    def _find_position(self, item_id: TIdValueType) -> Optional[int]:
+        """Returns the position of the row with the given ID, or None if there is no such row."""
+        try:
+            return self._id_index.get(item_id)
+        except TypeError:
+            return None
+
+    def _find_target_positions(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> Tuple[List[int], List[TIdValueType]]:
+        """Returns the sorted positions of the rows selected by IDs or by a specification, and the missing IDs."""
+        if isinstance(target, SpecificationInterface):
+            return self._get_positions(self._match(target)), []
+
+        positions, missing = set(), []
+        for item_id in target:
+            position = self._find_position(item_id)
+            if position is None:
+                missing.append(item_id)
+            else:
+                positions.add(position)
+        return sorted(positions), missing
+
+    def _match(self, filter_spec: Optional[SpecificationInterface[TModel, bool]]) -> int:
+        """Returns the mask of the stored rows satisfying the specification.
+
+        Masks are integers with the lowest bit of byte `i` set when row `i` is selected,
+        so they combine with bitwise operators and convert from and to column masks as they are.
+        """
+        alive = int.from_bytes(self._alive, 'little')
+        if filter_spec is None:
+            return alive
+        evaluator = self._create_evaluator()
+        if evaluator is not None:
+            try:
+                return int.from_bytes(evaluator.evaluate(filter_spec).tobytes(), 'little') & alive
+            except (NotImplementedError, TypeError, KeyError):
+                # Besides unsupported nodes, a value of a dead or excluded row may not be comparable
+                # with an operand: `_evaluate` only reads the candidate rows.
+                pass
+        return self._evaluate(filter_spec, alive)
+
+    def _create_evaluator(self) -> Optional['NumpySpecificationEvaluator']:
+        """Returns a NumPy evaluator of the columns, or None if vectorized evaluation is disabled or unavailable."""
+        # Imported here, since `abstractrepo.vectorized` depends on the column classes of this module.
+        from abstractrepo import vectorized
+
+        if not self._vectorize or not vectorized.is_available():
+            return None
+        return vectorized.NumpySpecificationEvaluator(self._columns, len(self._alive))
+
+    def _match_column(self, specification: AttributeSpecification[TModel]) -> bytes:
+        """Evaluates the condition on its column, with NumPy if possible.
+
+        Raises:
+            KeyError: If the attribute has no column.
+            NotImplementedError: If the condition cannot be evaluated on the column.
+        """
+        column = self._columns[specification.attribute_name]
+        evaluator = self._create_evaluator()
+        if evaluator is not None:
+            try:
+                return evaluator.evaluate_attribute(specification).tobytes()
+            except NotImplementedError:
+                pass
+        return column.match(specification)
+
+    def _evaluate(self, specification: SpecificationInterface[TModel, bool], candidates: int) -> int:
+        """Returns the mask of the candidate rows satisfying the specification."""
+        spec_type = type(specification)
+        if spec_type is AttributeSpecification:
+            try:
+                return int.from_bytes(self._match_column(specification), 'little') & candidates
+            except (KeyError, NotImplementedError):
+                pass
+            except TypeError:
+                return self._match_candidates(specification, candidates)
+        elif spec_type is AndSpecification:
+            specs = sorted(specification.specifications, key=lambda spec: type(spec) not in _COLUMNAR_SPECIFICATIONS)
+            for spec in specs:
+                if not candidates:
+                    break
+                candidates = self._evaluate(spec, candidates)
+            return candidates
+        elif spec_type is OrSpecification:
+            result = 0
+            for spec in specification.specifications:
+                result |= self._evaluate(spec, candidates & ~result)
+            return result
+        elif spec_type is NotSpecification:
+            return candidates & ~self._evaluate(specification.specification, candidates)
+
+        size = len(self._alive)
+        result = bytearray(size)
+        for position in self._get_positions(candidates):
+            if specification.is_satisfied_by(self._read_row(position)):
+                result[position] = 1
+        return int.from_bytes(result, 'little')
+
+    def _match_candidates(self, specification: AttributeSpecification[TModel], candidates: int) -> int:
+        """Evaluates the condition on its column for the candidate rows only.
+
+        Used when evaluating the whole column fails, e.g. because a dead row or a row excluded by another
+        condition holds a value the operand cannot be compared with. Errors raised by the values
+        of the candidate rows propagate, as with row-wise evaluation.
+        """
+        result = bytearray(len(self._alive))
+        column = self._columns[specification.attribute_name]
+        for position in column.match_positions(specification, self._get_positions(candidates)):
+            result[position] = 1
+        return int.from_bytes(result, 'little')
+
+    def _get_positions(self, mask: int) -> List[int]:
+        """Returns the positions of the rows selected by the mask in ascending order."""
+        size = len(self._alive)
+        return list(itertools.compress(range(size), mask.to_bytes(size, 'little')))
+
+    def _get_value_getter(self, attribute: str, positions: List[int]) -> Callable[[int], Any]:
+        """Returns a function reading the value of the attribute from the row at one of the positions."""
+        column = self._columns.get(attribute)
+        if column is None:
+            values = [getattr(item, attribute) for item in self._read_rows(positions)]
+        else:
+            values = column.get_values(positions)
+        return dict(zip(positions, values)).__getitem__
+
+    def _select(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+        order_options: Optional[OrderOptions],
+        paging_options: Optional[PagingOptions],
+    ) -> List[int]:
+        """Returns the positions of the rows matching the criteria, in the requested order."""
+        filter_spec = _apply_cursor(filter_spec, order_options, paging_options)
+        positions = self._get_positions(self._match(filter_spec))
+        end = _get_paging_end(paging_options)
+        if order_options is not None and order_options.options:
+            getter_factory = functools.partial(self._get_value_getter, positions=positions)
+            positions = SortKey(order_options, getter_factory).sort(positions, end)
+        if paging_options is not None:
+            positions = positions[paging_options.offset or 0:end]
+        return positions
+
+    def _count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]]) -> int:
+        """Returns the number of stored rows satisfying the specification."""
+        return self._match(filter_spec).to_bytes(len(self._alive), 'little').count(1)
+
+    def _get_position(self, item_id: TIdValueType) -> int:
+        """Returns the position of the row with the given ID.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If there is no such row.
+        """
+        position = self._find_position(item_id)
+        if position is None:
+            raise ItemNotFoundException[TIdValueType](self.model_class, item_id)
+        return position
+
+    def _read_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool) -> Dict[TIdValueType, TModel]:
+        """Builds the models with the given IDs, mapped by ID in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If there is no row with one of the IDs and `skip_missing` is False.
+        """
+        result = {}
+        for item_id in item_ids:
+            position = self._find_position(item_id)
+            if position is not None:
+                result[item_id] = self._read_row(position)
+            elif not skip_missing:
+                raise ItemNotFoundException[TIdValueType](self.model_class, item_id)
+        return result
+
+    def _get_target_positions(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[int]:
+        """Returns the sorted positions of the rows selected by IDs or by a specification.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If there is no row with one of the IDs.
+        """
+        positions, missing = self._find_target_positions(target)
+        if missing:
+            raise ItemNotFoundException[TIdValueType](self.model_class, missing[0])
+        return positions
+
+    def _delete_positions(self, positions: List[int]) -> List[TModel]:
+        """Deletes the rows at the given positions and returns their models in storage order."""
+        result = self._read_rows(positions)
+        self._delete_rows(positions)
+        return result
+
+
+class ColumnarCrudRepository(
+    Generic[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    CrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    BaseColumnarRepository[TModel, TIdValueType],
+    abc.ABC,
+):
+    """Implements a synchronous CRUD repository storing its items column by column in memory.
+
+    See `BaseColumnarRepository` for the storage. Compared to `ListBasedCrudRepository`, large collections
+    take much less memory and are filtered and sorted faster, while every returned item is a new model object.
+    """
+
+    def get_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+    ) -> List[TModel]:
+        """Retrieves a collection of items based on filtering, sorting, and pagination options.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+
+        Returns:
+            A list of TModel instances matching the criteria.
+        """
+        return self._read_rows(self._select(filter_spec, order_options, paging_options))
+
+    def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
+        """Returns the total count of items matching the given filter specification.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the items.
+
+        Returns:
+            The number of items matching the filter.
+        """
+        return self._count(filter_spec)
+
+    def get_item(self, item_id: TIdValueType) -> TModel:
+        """Retrieves a single item by its unique identifier.
+
+        Args:
+            item_id: The unique identifier of the item to retrieve.
+
+        Returns:
+            The TModel instance corresponding to the item_id.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        return self._read_row(self._get_position(item_id))
+
+    def get_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool = False) -> Dict[TIdValueType, TModel]:
+        """Retrieves multiple items by their unique identifiers.
+
+        Args:
+            item_ids: The unique identifiers of the items to retrieve.
+            skip_missing: Whether IDs with no item are left out of the result instead of raising an exception.
+
+        Returns:
+            A dictionary mapping the IDs to the corresponding TModel instances, in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found and `skip_missing` is False.
+        """
+        return self._read_items(item_ids, skip_missing)
+
+    def exists(self, item_id: TIdValueType) -> bool:
+        """Checks if an item with the specified ID exists in the repository.
+
+        Args:
+            item_id: The unique identifier of the item to check.
+
+        Returns:
+            True if an item with the specified ID exists, False otherwise.
+        """
+        return self._find_position(item_id) is not None
+
+    def create(self, form: TCreateSchema) -> TModel:
+        """Creates a new item in the repository using the provided creation form.
+
+        Args:
+            form: The TCreateSchema instance containing data for the new item.
+
+        Returns:
+            The newly created TModel instance.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            TypeError: If a column cannot store a value of the new item.
+        """
+        item = self._create_model(form, self._generate_id())
+        self._append_row(item)
+        return item
+
+    def update(self, item_id: TIdValueType, form: TUpdateSchema) -> TModel:
+        """Updates an existing item identified by its ID with data from the update form.
+
+        Args:
+            item_id: The unique identifier of the item to update.
+            form: The TUpdateSchema instance containing data for updating the item.
+
+        Returns:
+            The updated TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            TypeError: If a column cannot store a value of the updated item.
+        """
+        position = self._get_position(item_id)
+        item = self._update_model(self._read_row(position), form)
+        self._write_row(position, item)
+        return item
+
+    def delete(self, item_id: TIdValueType) -> TModel:
+        """Deletes an item from the repository by its ID.
+
+        Args:
+            item_id: The unique identifier of the item to delete.
+
+        Returns:
+            The deleted TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        return self._delete_positions([self._get_position(item_id)])[0]
+
+    def create_many(self, forms: Iterable[TCreateSchema]) -> List[TModel]:
+        """Creates new items in the repository using the provided creation forms.
+
+        If creating one of the items fails, the items created before it are removed again.
+
+        Args:
+            forms: The TCreateSchema instances containing data for the new items.
+
+        Returns:
+            The list of newly created TModel instances, in the order of the forms.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            TypeError: If a column cannot store a value of a new item.
+        """
+        size = len(self._alive)
+        result = []
+        try:
+            for form in forms:
+                item = self._create_model(form, self._generate_id())
+                self._append_row(item)
+                result.append(item)
+        except BaseException:
+            self._truncate(size)
+            raise
+        return result
+
+    def update_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+        form: TUpdateSchema,
+    ) -> List[TModel]:
+        """Updates the items selected by IDs or by a specification with data from the update form.
+
+        Nothing is updated if an item with one of the IDs does not exist.
+
+        Args:
+            target: The unique identifiers of the items to update, or a specification selecting them.
+            form: The TUpdateSchema instance containing data for updating the items.
+
+        Returns:
+            The list of updated TModel instances in storage order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            TypeError: If a column cannot store a value of an updated item.
+        """
+        result = []
+        for position in self._get_target_positions(target):
+            item = self._update_model(self._read_row(position), form)
+            self._write_row(position, item)
+            result.append(item)
+        return result
+
+    def delete_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TModel]:
+        """Deletes the items selected by IDs or by a specification from the repository.
+
+        Nothing is deleted if an item with one of the IDs does not exist.
+
+        Args:
+            target: The unique identifiers of the items to delete, or a specification selecting them.
+
+        Returns:
+            The list of deleted TModel instances in storage order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+        """
+        return self._delete_positions(self._get_target_positions(target))
+
+    @abc.abstractmethod
+    def _create_model(self, form: TCreateSchema, new_id: TIdValueType) -> TModel:
+        """Creates a new item from the provided creation form and ID.
+
+        Args:
+            form: The TCreateSchema instance containing data for the new item.
+            new_id: The new ID for the item.
+
+        Returns:
+            The newly created TModel instance.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _update_model(self, model: TModel, form: TUpdateSchema) -> TModel:
+        """Updates an item read from the storage with data from the update form.
+
+        Args:
+            model: The TModel instance to update.
+            form: The TUpdateSchema instance containing data for updating the item.
+
+        Returns:
+            The updated TModel instance, which is written back to the storage.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _generate_id(self) -> TIdValueType:
+        """Generates a new unique identifier for a new item.
+
+        Returns:
+            The new unique identifier.
+        """
+        raise NotImplementedError()
+
+
+class AsyncColumnarCrudRepository(
+    Generic[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    AsyncCrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    BaseColumnarRepository[TModel, TIdValueType],
+    abc.ABC,
+):
+    """Implements an asynchronous CRUD repository storing its items column by column in memory.
+
+    See `BaseColumnarRepository` for the storage. Queries run synchronously, since evaluating
+    the columns is fast compared to per-item scans.
+    """
+
+    async def get_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+    ) -> List[TModel]:
+        """Retrieves a collection of items based on filtering, sorting, and pagination options.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the items.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+
+        Returns:
+            A list of TModel instances matching the criteria.
+        """
+        return self._read_rows(self._select(filter_spec, order_options, paging_options))
+
+    async def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
+        """Returns the total count of items matching the given filter specification.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the items.
+
+        Returns:
+            The number of items matching the filter.
+        """
+        return self._count(filter_spec)
+
+    async def get_item(self, item_id: TIdValueType) -> TModel:
+        """Retrieves a single item by its unique identifier.
+
+        Args:
+            item_id: The unique identifier of the item to retrieve.
+
+        Returns:
+            The TModel instance corresponding to the item_id.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        return self._read_row(self._get_position(item_id))
+
+    async def get_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool = False) -> Dict[TIdValueType, TModel]:
+        """Retrieves multiple items by their unique identifiers.
+
+        Args:
+            item_ids: The unique identifiers of the items to retrieve.
+            skip_missing: Whether IDs with no item are left out of the result instead of raising an exception.
+
+        Returns:
+            A dictionary mapping the IDs to the corresponding TModel instances, in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found and `skip_missing` is False.
+        """
+        return self._read_items(item_ids, skip_missing)
+
+    async def exists(self, item_id: TIdValueType) -> bool:
+        """Checks if an item with the specified ID exists in the repository.
+
+        Args:
+            item_id: The unique identifier of the item to check.
+
+        Returns:
+            True if an item with the specified ID exists, False otherwise.
+        """
+        return self._find_position(item_id) is not None
+
+    async def create(self, form: TCreateSchema) -> TModel:
+        """Creates a new item in the repository using the provided creation form.
+
+        Args:
+            form: The TCreateSchema instance containing data for the new item.
+
+        Returns:
+            The newly created TModel instance.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            TypeError: If a column cannot store a value of the new item.
+        """
+        item = await self._create_model(form, await self._generate_id())
+        self._append_row(item)
+        return item
+
+    async def update(self, item_id: TIdValueType, form: TUpdateSchema) -> TModel:
+        """Updates an existing item identified by its ID with data from the update form.
+
+        Args:
+            item_id: The unique identifier of the item to update.
+            form: The TUpdateSchema instance containing data for updating the item.
+
+        Returns:
+            The updated TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            TypeError: If a column cannot store a value of the updated item.
+        """
+        position = self._get_position(item_id)
+        item = await self._update_model(self._read_row(position), form)
+        self._write_row(position, item)
+        return item
+
+    async def delete(self, item_id: TIdValueType) -> TModel:
+        """Deletes an item from the repository by its ID.
+
+        Args:
+            item_id: The unique identifier of the item to delete.
+
+        Returns:
+            The deleted TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        return self._delete_positions([self._get_position(item_id)])[0]
+
+    async def create_many(self, forms: Iterable[TCreateSchema]) -> List[TModel]:
+        """Creates new items in the repository using the provided creation forms.
+
+        If creating one of the items fails, the items created before it are removed again.
+
+        Args:
+            forms: The TCreateSchema instances containing data for the new items.
+
+        Returns:
+            The list of newly created TModel instances, in the order of the forms.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            TypeError: If a column cannot store a value of a new item.
+        """
+        size = len(self._alive)
+        result = []
+        try:
+            for form in forms:
+                item = await self._create_model(form, await self._generate_id())
+                self._append_row(item)
+                result.append(item)
+        except BaseException:
+            self._truncate(size)
+            raise
+        return result
+
+    async def update_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+        form: TUpdateSchema,
+    ) -> List[TModel]:
+        """Updates the items selected by IDs or by a specification with data from the update form.
+
+        Nothing is updated if an item with one of the IDs does not exist.
+
+        Args:
+            target: The unique identifiers of the items to update, or a specification selecting them.
+            form: The TUpdateSchema instance containing data for updating the items.
+
+        Returns:
+            The list of updated TModel instances in storage order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            TypeError: If a column cannot store a value of an updated item.
+        """
+        result = []
+        for position in self._get_target_positions(target):
+            item = await self._update_model(self._read_row(position), form)
+            self._write_row(position, item)
+            result.append(item)
+        return result
+
+    async def delete_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TModel]:
+        """Deletes the items selected by IDs or by a specification from the repository.
+
+        Nothing is deleted if an item with one of the IDs does not exist.
+
+        Args:
+            target: The unique identifiers of the items to delete, or a specification selecting them.
+
+        Returns:
+            The list of deleted TModel instances in storage order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+        """
+        return self._delete_positions(self._get_target_positions(target))
+
+    @abc.abstractmethod
+    async def _create_model(self, form: TCreateSchema, new_id: TIdValueType) -> TModel:
+        """Creates a new item from the provided creation form and ID.
+
+        Args:
+            form: The creation form to create the item with.
+            new_id: The ID to assign to the new item.
+
+        Returns:
+            The created item.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def _update_model(self, model: TModel, form: TUpdateSchema) -> TModel:
+        """Updates an item read from the storage with data from the update form.
+
+        Args:
+            model: The item to update.
+            form: The update form to update the item with.
+
+        Returns:
+            The updated item, which is written back to the storage.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def _generate_id(self) -> TIdValueType:
+        """Generates a new unique ID for the next created item.
+
+        Returns:
+            The generated ID.
+        """
+        raise NotImplementedError()
+
+
+def _compile_value_predicate(specification: AttributeSpecification) -> Callable[[Any], bool]:
+    """Compiles the condition into a predicate receiving the attribute value instead of the model.
+
+    Raises:
+        NotImplementedError: If the condition can only be evaluated with `is_satisfied_by`.
+    """
+    return StrictSpecificationCompiler(lambda name: _identity).compile(specification)
+
+
+_VALUE_COMPARATORS = {
+    Operator.E: operator.eq,
+    Operator.NE: operator.ne,
+    Operator.GT: operator.gt,
+    Operator.LT: operator.lt,
+    Operator.GTE: operator.ge,
+    Operator.LTE: operator.le,
+}
+
+_COLUMNAR_SPECIFICATIONS = (AttributeSpecification, AndSpecification, OrSpecification, NotSpecification)
@@ -0,0 +1,224 @@
+import operator
+from typing import Any, Callable, Generic, Iterable, List, TypeVar
+
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, NotSpecification, Operator
+
+TModel = TypeVar('TModel')
+
+Predicate = Callable[[TModel], bool]
+ValueGetterFactory = Callable[[str], Callable[[Any], Any]]
+
+
+class SpecificationCompiler(Generic[TModel]):
+    """Compiles specification trees into single predicate functions.
+
+    `AndSpecification`, `OrSpecification`, `NotSpecification` and `AttributeSpecification` nodes are
+    turned into nested closures with attribute getters and comparison functions resolved once,
+    so evaluating the predicate avoids per-node method calls and operator dispatch.
+    The compiled predicate evaluates like `is_satisfied_by` of the original specification,
+    including the rule that a None attribute fails every comparison with a non-None value.
+
+    Subclasses of these specifications, custom specifications and conditions with unusual operands
+    (e.g. an `Operator.IN` value that is not a collection) are evaluated with their own `is_satisfied_by`.
+    The specification is read at compile time, so modifying it afterwards does not affect the predicate.
+    """
+    _getter_factory: ValueGetterFactory
+
+    def __init__(self, getter_factory: ValueGetterFactory = operator.attrgetter):
+        """Initializes a new SpecificationCompiler.
+
+        Args:
+            getter_factory: A function returning, for an attribute name, a function reading the attribute value
+                            from the evaluated object. Defaults to `operator.attrgetter`.
+        """
+        self._getter_factory = getter_factory
+
+    def compile(self, specification: SpecificationInterface[TModel, bool]) -> Predicate:
+        """Compiles the specification into a predicate.
+
+        Args:
+            specification: The specification to compile.
+
+        Returns:
+            A function returning whether the given object satisfies the specification.
+        """
+        spec_type = type(specification)
+        if spec_type is AttributeSpecification:
+            return self._compile_attribute(specification)
+        if spec_type is AndSpecification:
+            return self._compile_and([self.compile(spec) for spec in specification.specifications])
+        if spec_type is OrSpecification:
+            return self._compile_or([self.compile(spec) for spec in specification.specifications])
+        if spec_type is NotSpecification:
+            predicate = self.compile(specification.specification)
+            return lambda model: not predicate(model)
+        return self._compile_fallback(specification)
+
+    def _compile_fallback(self, specification: SpecificationInterface[TModel, bool]) -> Predicate:
+        """Returns the predicate for a specification the compiler does not handle itself.
+
+        Args:
+            specification: The specification to evaluate.
+
+        Returns:
+            The bound `is_satisfied_by` method of the specification.
+        """
+        return specification.is_satisfied_by
+
+    def _compile_attribute(self, specification: AttributeSpecification[TModel]) -> Predicate:
+        """Compiles a single attribute condition.
+
+        Args:
+            specification: The attribute specification to compile.
+
+        Returns:
+            The predicate for the condition.
+        """
+        get = self._getter_factory(specification.attribute_name)
+        value = specification.attribute_value
+        op = specification.operator
+
+        if op == Operator.E:
+            if value is None:
+                return lambda model: get(model) is None
+
+            def predicate(model):
+                attr = get(model)
+                return attr is not None and attr == value
+            return predicate
+
+        if op == Operator.NE:
+            if value is None:
+                return lambda model: get(model) is not None
+
+            def predicate(model):
+                attr = get(model)
+                return attr is not None and attr != value
+            return predicate
+
+        comparator = _COMPARATORS.get(op)
+        if comparator is not None and value is not None:
+            def predicate(model):
+                attr = get(model)
+                return attr is not None and comparator(attr, value)
+            return predicate
+
+        if op == Operator.LIKE and value is not None:
+            match = specification.get_like_pattern().match
+
+            def predicate(model):
+                attr = get(model)
+                return attr is not None and match(attr)
+            return predicate
+
+        if op == Operator.ILIKE and value is not None:
+            match = specification.get_like_pattern().match
+
+            def predicate(model):
+                attr = get(model)
+                return attr is not None and match(attr.lower())
+            return predicate
+
+        if op in (Operator.IN, Operator.NOT_IN) and AttributeSpecification.is_collection_value(value):
+            contains = self._compile_membership(value)
+            if op == Operator.IN:
+                def predicate(model):
+                    attr = get(model)
+                    return attr is not None and contains(attr)
+            else:
+                def predicate(model):
+                    attr = get(model)
+                    return attr is not None and not contains(attr)
+            return predicate
+
+        return self._compile_fallback(specification)
+
+    @staticmethod
+    def _compile_membership(values: Iterable) -> Callable[[Any], bool]:
+        """Builds a membership test for an IN/NOT_IN operand.
+
+        Hashable operands are frozen into a frozenset once. Unhashable operands, and unhashable
+        attribute values tested against a frozenset, fall back to a linear scan of the operand.
+
+        Args:
+            values: The collection of values.
+
+        Returns:
+            A function returning whether the given value is in the collection.
+        """
+        try:
+            frozen = frozenset(values)
+        except TypeError:
+            return values.__contains__
+
+        def contains(attr):
+            try:
+                return attr in frozen
+            except TypeError:
+                return attr in values
+        return contains
+
+    @staticmethod
+    def _compile_and(predicates: List[Predicate]) -> Predicate:
+        """Combines predicates with logical AND."""
+        if not predicates:
+            return lambda model: True
+        if len(predicates) == 1:
+            return predicates[0]
+        if len(predicates) == 2:
+            first, second = predicates
+            return lambda model: first(model) and second(model)
+
+        def predicate(model):
+            for item in predicates:
+                if not item(model):
+                    return False
+            return True
+        return predicate
+
+    @staticmethod
+    def _compile_or(predicates: List[Predicate]) -> Predicate:
+        """Combines predicates with logical OR."""
+        if not predicates:
+            return lambda model: False
+        if len(predicates) == 1:
+            return predicates[0]
+        if len(predicates) == 2:
+            first, second = predicates
+            return lambda model: first(model) or second(model)
+
+        def predicate(model):
+            for item in predicates:
+                if item(model):
+                    return True
+            return False
+        return predicate
+
+
+class StrictSpecificationCompiler(SpecificationCompiler[TModel]):
+    """A compiler refusing the specifications it cannot turn into predicates itself.
+
+    Useful with a custom `getter_factory` when the predicates do not receive models,
+    so falling back to `is_satisfied_by` of the specification is not possible.
+    """
+
+    def _compile_fallback(self, specification: SpecificationInterface[TModel, bool]) -> Predicate:
+        """Refuses to compile the specification.
+
+        Raises:
+            NotImplementedError: Always.
+        """
+        raise NotImplementedError(f'Cannot compile {type(specification).__name__}')
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+_COMPARATORS = {
+    Operator.GT: operator.gt,
+    Operator.LT: operator.lt,
+    Operator.GTE: operator.ge,
+    Operator.LTE: operator.le,
+}
@@ -150,3 +150,26 @@ class RelationViolationException(RepositoryExceptionInterface):
     def form(self) -> object:
         """Returns the form data that led to the relation violation."""
         return self._form
+
+
+class PoolTimeoutException(RepositoryExceptionInterface, TimeoutError):
+    """Exception raised when no connection of a connection pool becomes available in time.
+
+    This typically occurs when more operations run concurrently than the pool has connections
+    and the operations holding them take longer than the acquire timeout.
+    """
+    _timeout: Optional[float]
+
+    def __init__(self, timeout: Optional[float]):
+        """Initializes a new PoolTimeoutException.
+
+        Args:
+            timeout: The number of seconds the acquisition waited for a connection.
+        """
+        super().__init__(f'No connection available within {timeout} seconds')
+        self._timeout = timeout
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """Returns the acquire timeout that expired."""
+        return self._timeout
@@ -0,0 +1,78 @@
+from typing import Any, Hashable, Iterable
+
+
+class FingerprintMixin:
+    """Compares and hashes instances by the values returned by their `get_fingerprint` method.
+
+    Fingerprints include the type of the instance, so instances of different classes are never equal.
+    An instance whose fingerprint cannot be computed (`get_fingerprint` raises TypeError) is only equal
+    to itself and is hashed by identity.
+    """
+    def get_fingerprint(self) -> Hashable:
+        """Returns a hashable value identifying the instance.
+
+        Raises:
+            TypeError: If the instance cannot be identified by value.
+        """
+        raise TypeError(f'{type(self).__name__} has no fingerprint')
+
+    def __eq__(self, other: object) -> bool:
+        """Compares instances by their fingerprints, or by identity if they have none."""
+        if self is other:
+            return True
+        if not isinstance(other, FingerprintMixin):
+            return NotImplemented
+        try:
+            return self.get_fingerprint() == other.get_fingerprint()
+        except TypeError:
+            return False
+
+    def __hash__(self) -> int:
+        """Hashes the fingerprint of the instance, or its identity if it has none."""
+        try:
+            return hash(self.get_fingerprint())
+        except TypeError:
+            return object.__hash__(self)
+
+
+def get_value_fingerprint(value: Any) -> Hashable:
+    """Returns a hashable value identifying an operand by its type and value.
+
+    Tuples and frozensets are converted recursively into fingerprints that keep their type, so e.g. `(1, 2)`
+    and `(True, 2)` differ, as do `1` and `True`. Other values are used as they are. Mutable containers
+    such as lists, sets and dictionaries have no fingerprint, since their contents may change after it is computed.
+
+    Args:
+        value: The operand to identify.
+
+    Returns:
+        The fingerprint of the operand.
+
+    Raises:
+        TypeError: If the operand or one of the values inside it is unhashable.
+    """
+    if isinstance(value, tuple):
+        return type(value), tuple(map(get_value_fingerprint, value))
+    if isinstance(value, frozenset):
+        return type(value), frozenset(map(get_value_fingerprint, value))
+    hash(value)
+    return type(value), value
+
+
+def get_collection_fingerprint(value: Iterable[Any]) -> Hashable:
+    """Returns a hashable value identifying the operand of an IN or NOT_IN operation.
+
+    Only membership matters for these operations, so the fingerprint is the set of the fingerprints
+    of the members: the order, the duplicates and the type of the collection are ignored, e.g. `(1, 2)`,
+    `(2, 1, 1)` and `frozenset({1, 2})` are equal. The collection itself must be immutable.
+
+    Args:
+        value: The collection to identify.
+
+    Returns:
+        The fingerprint of the collection.
+
+    Raises:
+        TypeError: If one of the values in the collection is unhashable.
+    """
+    return frozenset(map(get_value_fingerprint, value))
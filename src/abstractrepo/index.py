@@ -0,0 +1,341 @@
+import abc
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, Operator
+
+
+class IndexInterface(abc.ABC):
+    """Abstract base class for secondary indexes of in-memory repositories.
+
+    An index maps the values of a single model attribute to the positions of the items
+    holding them in the storage list, and answers `AttributeSpecification` conditions
+    on that attribute without scanning the storage.
+
+    An index that met a value it cannot store (e.g. an unhashable value in a hash index)
+    becomes invalid and refuses to answer lookups until it is rebuilt.
+
+    Attributes:
+        attribute_name: The name of the indexed attribute.
+    """
+    attribute_name: str
+    _valid: bool
+
+    def __init__(self, attribute_name: str):
+        """Initializes a new index.
+
+        Args:
+            attribute_name: The name of the model attribute to index.
+        """
+        self.attribute_name = attribute_name
+        self._valid = True
+
+    @property
+    def valid(self) -> bool:
+        """Returns whether the index can answer lookups."""
+        return self._valid
+
+    def rebuild(self, entries: Iterable[Tuple[Any, int]]) -> None:
+        """Replaces the content of the index.
+
+        Args:
+            entries: Pairs of attribute values and positions to index.
+        """
+        self._valid = True
+        try:
+            self._rebuild(entries)
+        except TypeError:
+            self._valid = False
+
+    def add(self, value: Any, position: int) -> None:
+        """Adds a value stored at the given position to the index.
+
+        Args:
+            value: The value of the indexed attribute.
+            position: The position of the item in the storage.
+        """
+        if not self._valid:
+            return
+        try:
+            self._add(value, position)
+        except TypeError:
+            self._valid = False
+
+    def remove(self, value: Any, position: int) -> None:
+        """Removes a value stored at the given position from the index.
+
+        Args:
+            value: The value of the indexed attribute.
+            position: The position of the item in the storage.
+        """
+        if not self._valid:
+            return
+        try:
+            self._remove(value, position)
+        except TypeError:
+            self._valid = False
+
+    def lookup(self, operator: Operator, value: Any) -> Optional[Set[int]]:
+        """Returns the positions of the items whose attribute satisfies the condition.
+
+        The result follows the semantics of `AttributeSpecification.is_satisfied_by`.
+
+        Args:
+            operator: The comparison operator.
+            value: The value to compare the attribute with.
+
+        Returns:
+            The set of matching positions, or None if the index cannot answer the condition.
+        """
+        if not self._valid:
+            return None
+        try:
+            return self._lookup(operator, value)
+        except TypeError:
+            return None
+
+    @abc.abstractmethod
+    def _rebuild(self, entries: Iterable[Tuple[Any, int]]) -> None:
+        """Replaces the content of the index. May raise TypeError for values the index cannot store."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _add(self, value: Any, position: int) -> None:
+        """Adds a value to the index. May raise TypeError for values the index cannot store."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _remove(self, value: Any, position: int) -> None:
+        """Removes a value from the index."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _lookup(self, operator: Operator, value: Any) -> Optional[Set[int]]:
+        """Returns the matching positions, or None if the condition is not supported."""
+        raise NotImplementedError()
+
+
+class HashIndex(IndexInterface):
+    """A dictionary-based index answering `Operator.E`, `Operator.IN` and `Operator.NOT_IN` conditions.
+
+    Indexed values must be hashable.
+    """
+    _buckets: Dict[Any, Set[int]]
+
+    def __init__(self, attribute_name: str):
+        """Initializes a new HashIndex.
+
+        Args:
+            attribute_name: The name of the model attribute to index.
+        """
+        super().__init__(attribute_name)
+        self._buckets = {}
+
+    def _rebuild(self, entries: Iterable[Tuple[Any, int]]) -> None:
+        self._buckets = {}
+        for value, position in entries:
+            self._add(value, position)
+
+    def _add(self, value: Any, position: int) -> None:
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            self._buckets[value] = {position}
+        else:
+            bucket.add(position)
+
+    def _remove(self, value: Any, position: int) -> None:
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            return
+        bucket.discard(position)
+        if not bucket:
+            del self._buckets[value]
+
+    def _lookup(self, operator: Operator, value: Any) -> Optional[Set[int]]:
+        if operator == Operator.E:
+            return set(self._buckets.get(value, ()))
+        if operator == Operator.IN and AttributeSpecification.is_collection_value(value):
+            return self._union(value)
+        if operator == Operator.NOT_IN and AttributeSpecification.is_collection_value(value):
+            excluded = {item for item in value if item is not None}
+            result = set()
+            for key, bucket in self._buckets.items():
+                if key is not None and key not in excluded:
+                    result.update(bucket)
+            return result
+        return None
+
+    def _union(self, values: Iterable[Any]) -> Set[int]:
+        result = set()
+        for value in values:
+            if value is not None:
+                result.update(self._buckets.get(value, ()))
+        return result
+
+
+class SortedIndex(IndexInterface):
+    """A sorted-list index answering `Operator.E`, `Operator.IN` and range conditions
+    (`Operator.GT`, `Operator.LT`, `Operator.GTE`, `Operator.LTE`).
+
+    Indexed values must be mutually comparable. None values are not stored, since they
+    never satisfy a comparison with a non-None value.
+    """
+    _keys: List[Any]
+    _positions: List[int]
+
+    def __init__(self, attribute_name: str):
+        """Initializes a new SortedIndex.
+
+        Args:
+            attribute_name: The name of the model attribute to index.
+        """
+        super().__init__(attribute_name)
+        self._keys = []
+        self._positions = []
+
+    def _rebuild(self, entries: Iterable[Tuple[Any, int]]) -> None:
+        pairs = sorted((value, position) for value, position in entries if value is not None)
+        self._keys = [value for value, _ in pairs]
+        self._positions = [position for _, position in pairs]
+
+    def _add(self, value: Any, position: int) -> None:
+        if value is None:
+            return
+        index = bisect.bisect_right(self._keys, value)
+        self._keys.insert(index, value)
+        self._positions.insert(index, position)
+
+    def _remove(self, value: Any, position: int) -> None:
+        if value is None:
+            return
+        start = bisect.bisect_left(self._keys, value)
+        end = bisect.bisect_right(self._keys, value, start)
+        for index in range(start, end):
+            if self._positions[index] == position:
+                del self._keys[index]
+                del self._positions[index]
+                return
+
+    def _lookup(self, operator: Operator, value: Any) -> Optional[Set[int]]:
+        if operator == Operator.IN and AttributeSpecification.is_collection_value(value):
+            result = set()
+            for item in value:
+                if item is not None:
+                    result.update(self._range(item, True, item, True))
+            return result
+
+        if value is None:
+            return None
+        if operator == Operator.E:
+            return set(self._range(value, True, value, True))
+        if operator == Operator.GT:
+            return set(self._range(value, False, None, False))
+        if operator == Operator.GTE:
+            return set(self._range(value, True, None, False))
+        if operator == Operator.LT:
+            return set(self._range(None, False, value, False))
+        if operator == Operator.LTE:
+            return set(self._range(None, False, value, True))
+        return None
+
+    def _range(self, lower: Any, lower_inclusive: bool, upper: Any, upper_inclusive: bool) -> List[int]:
+        if lower is None:
+            start = 0
+        elif lower_inclusive:
+            start = bisect.bisect_left(self._keys, lower)
+        else:
+            start = bisect.bisect_right(self._keys, lower)
+
+        if upper is None:
+            end = len(self._keys)
+        elif upper_inclusive:
+            end = bisect.bisect_right(self._keys, upper)
+        else:
+            end = bisect.bisect_left(self._keys, upper)
+
+        return self._positions[start:end]
+
+
+class IndexPlan:
+    """The result of answering a specification with indexes.
+
+    Attributes:
+        positions: The positions of the candidate items.
+        exact: Whether all candidates satisfy the specification. Otherwise, the candidates
+               are a superset of the matching items and have to be checked against the specification.
+    """
+    positions: Set[int]
+    exact: bool
+
+    def __init__(self, positions: Set[int], exact: bool):
+        """Initializes a new IndexPlan.
+
+        Args:
+            positions: The positions of the candidate items.
+            exact: Whether all candidates satisfy the planned specification.
+        """
+        self.positions = positions
+        self.exact = exact
+
+
+class IndexPlanner:
+    """Answers specification trees with secondary indexes instead of a full scan.
+
+    `AttributeSpecification` leaves are looked up in the indexes over their attributes,
+    `AndSpecification` nodes intersect the results of their children and `OrSpecification`
+    nodes unite them. Subclasses of these specifications and any other specifications
+    are not planned, since their semantics may differ.
+    """
+    _indexes: Dict[str, List[IndexInterface]]
+
+    def __init__(self, indexes: Iterable[IndexInterface]):
+        """Initializes a new IndexPlanner.
+
+        Args:
+            indexes: The indexes available to the planner.
+        """
+        self._indexes = {}
+        for index in indexes:
+            self._indexes.setdefault(index.attribute_name, []).append(index)
+
+    def plan(self, specification: SpecificationInterface) -> Optional[IndexPlan]:
+        """Plans the given specification.
+
+        Args:
+            specification: The specification to plan.
+
+        Returns:
+            The plan, or None if the specification cannot be answered with the indexes.
+        """
+        spec_type = type(specification)
+
+        if spec_type is AttributeSpecification:
+            for index in self._indexes.get(specification.attribute_name, ()):
+                positions = index.lookup(specification.operator, specification.attribute_value)
+                if positions is not None:
+                    return IndexPlan(positions, True)
+            return None
+
+        if spec_type is AndSpecification:
+            plans = [self.plan(child) for child in specification.specifications]
+            planned = sorted((plan for plan in plans if plan is not None), key=lambda plan: len(plan.positions))
+            if not planned:
+                return None
+            positions = planned[0].positions
+            for plan in planned[1:]:
+                positions = positions & plan.positions
+            return IndexPlan(positions, len(planned) == len(plans) and all(plan.exact for plan in planned))
+
+        if spec_type is OrSpecification:
+            positions = set()
+            exact = True
+            for child in specification.specifications:
+                plan = self.plan(child)
+                if plan is None:
+                    return None
+                positions |= plan.positions
+                exact = exact and plan.exact
+            return IndexPlan(positions, exact)
+
+        return None
@@ -0,0 +1,203 @@
+import bisect
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from abstractrepo.compiler import SpecificationCompiler
+from abstractrepo.locking import ReadWriteLock
+from abstractrepo.order import OrderOptions, SortKey
+from abstractrepo.paging import PagingOptions, CursorPagingOptions
+from abstractrepo.specification import SpecificationInterface
+
+TModel = TypeVar('TModel')
+
+_State = Tuple[List[Any], List[TModel], Dict[int, Any]]
+
+
+class LiveQuery(Generic[TModel]):
+    """A registered query whose ordered result is kept up to date by its repository.
+
+    Live queries are created with `register_live_query` of the list-based repositories. Every item created,
+    updated or deleted through the repository is checked against the filter specification alone and moved
+    into, within or out of the result with `bisect`, so reading a page costs O(page) instead of
+    a full filter and sort.
+
+    The result equals `get_collection(filter_spec, order_options)` of the repository: ties in the order
+    keep the storage order. Like the indexes, a live query assumes that stored items are modified
+    only through the repository. After the storage is compacted, or if evaluating a changed item fails,
+    the result is rebuilt with a full scan on the next read.
+
+    Attributes:
+        filter_spec: The filter specification of the query.
+        order_options: The order options of the query.
+    """
+    filter_spec: Optional[SpecificationInterface[TModel, bool]]
+    order_options: Optional[OrderOptions]
+    _predicate: Optional[Callable[[TModel], bool]]
+    _sort_key: Optional[SortKey]
+    _source: Callable[[], Iterable[Tuple[int, TModel]]]
+    _lock: Optional[ReadWriteLock]
+    _state: Optional[_State]
+
+    def __init__(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+        order_options: Optional[OrderOptions],
+        source: Callable[[], Iterable[Tuple[int, TModel]]],
+        lock: Optional[ReadWriteLock] = None,
+    ):
+        """Initializes a new LiveQuery.
+
+        Args:
+            filter_spec: The filter specification of the query.
+            order_options: The order options of the query.
+            source: A function returning the stored items with their positions in storage order,
+                    used to build the result.
+            lock: The lock of the repository to hold for reading while the result is read, if any.
+        """
+        self.filter_spec = filter_spec
+        self.order_options = order_options
+        self._predicate = SpecificationCompiler().compile(filter_spec) if filter_spec is not None else None
+        self._sort_key = SortKey(order_options) if order_options is not None and order_options.options else None
+        self._source = source
+        self._lock = lock
+        self._state = None
+
+    def get_collection(self, paging_options: Optional[PagingOptions] = None) -> List[TModel]:
+        """Returns a page of the current result.
+
+        Args:
+            paging_options: An optional PagingOptions instance to control pagination.
+                            Cursor paging is supported for ordered queries.
+
+        Returns:
+            A list of the items on the page.
+
+        Raises:
+            ValueError: If the cursor does not match the order options.
+        """
+        if self._lock is None:
+            return self._get_page(paging_options)
+        with self._lock.read():
+            return self._get_page(paging_options)
+
+    def count(self) -> int:
+        """Returns the number of items in the current result."""
+        if self._lock is None:
+            return len(self._get_state()[1])
+        with self._lock.read():
+            return len(self._get_state()[1])
+
+    def invalidate(self) -> None:
+        """Discards the result, so it is rebuilt with a full scan on the next read."""
+        self._state = None
+
+    def add(self, item: TModel, position: int) -> None:
+        """Adds a newly stored item to the result if it matches the filter.
+
+        Called by the repository.
+
+        Args:
+            item: The stored item.
+            position: The position of the item in the storage.
+        """
+        state = self._state
+        if state is None:
+            return
+        try:
+            if self._predicate is None or self._predicate(item):
+                self._insert(state, item, self._make_key(item, position))
+        except Exception:
+            self.invalidate()
+
+    def update(self, item: TModel, position: int) -> None:
+        """Moves an updated item into, within or out of the result.
+
+        Called by the repository.
+
+        Args:
+            item: The updated item.
+            position: The position of the item in the storage.
+        """
+        state = self._state
+        if state is None:
+            return
+        try:
+            self._discard(state, item)
+            if self._predicate is None or self._predicate(item):
+                self._insert(state, item, self._make_key(item, position))
+        except Exception:
+            self.invalidate()
+
+    def remove(self, item: TModel) -> None:
+        """Removes a deleted item from the result.
+
+        Called by the repository.
+
+        Args:
+            item: The deleted item.
+        """
+        state = self._state
+        if state is None:
+            return
+        try:
+            self._discard(state, item)
+        except Exception:
+            self.invalidate()
+
+    def _get_page(self, paging_options: Optional[PagingOptions]) -> List[TModel]:
+        """Returns a page of the result, building the result if needed."""
+        keys, items, _ = self._get_state()
+        start = 0
+        if isinstance(paging_options, CursorPagingOptions) and paging_options.after is not None:
+            if self._sort_key is None:
+                raise ValueError('Cursor paging requires order options')
+            if len(paging_options.after) != len(self.order_options.options):
+                raise ValueError('Cursor values do not match the order options')
+            bound = self._sort_key.to_ascending(self._sort_key.from_values(paging_options.after))
+            start = bisect.bisect_right(keys, (bound, float('inf')))
+
+        if paging_options is None:
+            return items.copy()
+        start += paging_options.offset or 0
+        end = None if paging_options.limit is None else start + paging_options.limit
+        return items[start:end]
+
+    def _get_state(self) -> _State:
+        """Returns the keys, items and key lookup of the result, building them if needed."""
+        state = self._state
+        if state is None:
+            entries = []
+            for position, item in self._source():
+                if self._predicate is None or self._predicate(item):
+                    entries.append((self._make_key(item, position), item))
+            entries.sort(key=lambda entry: entry[0])
+            keys = [key for key, _ in entries]
+            items = [item for _, item in entries]
+            state = (keys, items, {id(item): key for key, item in entries})
+            self._state = state
+        return state
+
+    def _make_key(self, item: TModel, position: int) -> Any:
+        """Returns the key of the item in the result, which ends with its storage position to keep ties stable."""
+        if self._sort_key is None:
+            return (position,)
+        return self._sort_key.to_ascending(self._sort_key(item)), position
+
+    @staticmethod
+    def _insert(state: _State, item: TModel, key: Any) -> None:
+        """Inserts the item into the result."""
+        keys, items, lookup = state
+        index = bisect.bisect_right(keys, key)
+        keys.insert(index, key)
+        items.insert(index, item)
+        lookup[id(item)] = key
+
+    @staticmethod
+    def _discard(state: _State, item: TModel) -> None:
+        """Removes the item from the result if it is there."""
+        keys, items, lookup = state
+        key = lookup.pop(id(item), None)
+        if key is None:
+            return
+        index = bisect.bisect_left(keys, key)
+        del keys[index]
+        del items[index]
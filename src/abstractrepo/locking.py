@@ -0,0 +1,120 @@
+import contextlib
+import threading
+from typing import Iterator, Optional
+
+
+class ReadWriteLock:
+    """A reader-writer lock for threads.
+
+    Any number of threads can hold the lock for reading at the same time, while a writer holds it exclusively.
+    Waiting writers take precedence over new readers, so a steady stream of readers cannot starve them.
+
+    Both kinds of locks are reentrant within a thread, and the writer may also acquire the lock for reading
+    (e.g. when a write operation calls a read operation). Upgrading a read lock to a write lock is not supported,
+    since two upgrading readers would wait for each other forever.
+    """
+    _condition: threading.Condition
+    _readers: int
+    _writer: Optional[int]
+    _writer_depth: int
+    _waiting_writers: int
+    _local: threading.local
+
+    def __init__(self):
+        """Initializes a new ReadWriteLock."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    def acquire_read(self) -> None:
+        """Acquires the lock for reading, blocking while another thread holds or waits for the write lock."""
+        depth = getattr(self._local, 'read_depth', 0)
+        if depth or self._writer == threading.get_ident():
+            self._local.read_depth = depth + 1
+            return
+
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        self._local.read_depth = 1
+
+    def release_read(self) -> None:
+        """Releases the lock acquired for reading.
+
+        Raises:
+            RuntimeError: If the current thread does not hold the lock for reading.
+        """
+        depth = getattr(self._local, 'read_depth', 0)
+        if not depth:
+            raise RuntimeError('Cannot release a read lock that is not held')
+
+        self._local.read_depth = depth - 1
+        if depth > 1 or self._writer == threading.get_ident():
+            return
+
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """Acquires the lock for writing, blocking while other threads hold the lock.
+
+        Raises:
+            RuntimeError: If the current thread holds the lock for reading only.
+        """
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            return
+        if getattr(self._local, 'read_depth', 0):
+            raise RuntimeError('Cannot upgrade a read lock to a write lock')
+
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        """Releases the lock acquired for writing.
+
+        Raises:
+            RuntimeError: If the current thread does not hold the lock for writing.
+        """
+        if self._writer != threading.get_ident():
+            raise RuntimeError('Cannot release a write lock that is not held')
+
+        self._writer_depth -= 1
+        if self._writer_depth:
+            return
+
+        with self._condition:
+            self._writer = None
+            self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def read(self) -> Iterator[None]:
+        """Returns a context manager holding the lock for reading."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextlib.contextmanager
+    def write(self) -> Iterator[None]:
+        """Returns a context manager holding the lock for writing."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -1,6 +1,10 @@
 import abc
+import heapq
+import operator
 from enum import Enum
-from typing import List, Tuple, Union, Optional
+from typing import List, Tuple, Union, Optional, Any, Callable, Sequence, Hashable
+
+from abstractrepo.fingerprint import FingerprintMixin
 
 
 class OrderDirection(Enum):
@@ -28,7 +32,7 @@ class NonesOrder(Enum):
 OrderOptionsTuple = Union[Tuple[str], Tuple[str, OrderDirection], Tuple[str, OrderDirection, NonesOrder]]
 
 
-class OrderOption:
+class OrderOption(FingerprintMixin):
     """Represents a single ordering criterion for a collection.
 
     Defines an attribute to sort by, the direction of sorting (ascending/descending),
@@ -56,6 +60,10 @@ class OrderOption:
         self.direction = direction
         self._set_nones(nones)
 
+    def get_fingerprint(self) -> Hashable:
+        """Returns a hashable value identifying the option by its type, attribute, direction and placement of None values."""
+        return type(self), self.attribute, self.direction, self.nones
+
     def _set_nones(self, nones: NonesOrder) -> None:
         """Sets the nones order, applying defaults if not explicitly provided."""
         if nones is not None:
@@ -68,7 +76,7 @@ class OrderOption:
             self.nones = NonesOrder.FIRST
 
 
-class OrderOptions:
+class OrderOptions(FingerprintMixin):
     """A collection of OrderOption instances, defining multiple sorting criteria.
 
     Sorting is applied in the order the options are added.
@@ -92,6 +100,170 @@ class OrderOptions:
         """
         return self._options
 
+    def get_fingerprint(self) -> Hashable:
+        """Returns a hashable value identifying the order options by their type and the fingerprints of the options, in order."""
+        return (type(self),) + tuple(option.get_fingerprint() for option in self._options)
+
+
+class SortKey:
+    """A key function sorting items by all OrderOptions criteria in a single sort.
+
+    The key of an item is a flat tuple with a None-placement rank and the attribute value for each
+    order option. When all options share the same direction, the values are used as they are and
+    `reverse` tells whether the sort must be reversed. When directions are mixed, values of
+    descending options are wrapped into an object with inverted comparison.
+
+    Sorting with `sorted(items, key=sort_key, reverse=sort_key.reverse)` gives the same result as
+    stable sorting by each option in turn, from the last option to the first.
+
+    Attributes:
+        reverse: Whether the sort using this key must be reversed.
+        HEAP_SELECTION_RATIO: `sort` selects the leading items with a heap instead of a full sort
+                              when the number of items exceeds the limit by more than this factor.
+    """
+    HEAP_SELECTION_RATIO: int = 8
+
+    reverse: bool
+    _getters: List[Tuple[Callable[[Any], Any], bool, bool]]
+
+    def __init__(self, order_options: OrderOptions, getter_factory: Callable[[str], Callable[[Any], Any]] = operator.attrgetter):
+        """Initializes a new SortKey.
+
+        Args:
+            order_options: The order options to build the keys for.
+            getter_factory: A function returning, for an attribute name, a function reading the attribute value
+                            from the sorted object. Defaults to `operator.attrgetter`.
+        """
+        options = order_options.options
+        self.reverse = bool(options) and all(option.direction == OrderDirection.DESC for option in options)
+        self._getters = []
+        for option in options:
+            descending = (option.direction == OrderDirection.DESC) != self.reverse
+            nones_first = (option.nones == NonesOrder.FIRST) != self.reverse
+            self._getters.append((getter_factory(option.attribute), nones_first, descending))
+
+    def __call__(self, item: Any) -> tuple:
+        """Returns the sort key of the item.
+
+        Args:
+            item: The item to build the key for.
+
+        Returns:
+            The composite sort key.
+        """
+        key = []
+        for get, nones_first, descending in self._getters:
+            value = get(item)
+            key.append((value is None) != nones_first)
+            key.append(_DescendingValue(value) if descending else value)
+        return tuple(key)
+
+    def from_values(self, values: Sequence[Any]) -> tuple:
+        """Returns the sort key of an item having the given values of the order attributes.
+
+        Args:
+            values: The values of the order attributes, in the order of the order options.
+
+        Returns:
+            The composite sort key.
+        """
+        key = []
+        for (_, nones_first, descending), value in zip(self._getters, values):
+            key.append((value is None) != nones_first)
+            key.append(_DescendingValue(value) if descending else value)
+        return tuple(key)
+
+    def to_ascending(self, key: tuple) -> Any:
+        """Returns an object comparing like the key in the sorted order, even when `reverse` is set.
+
+        Useful when keys are kept in ascending sorted lists, e.g. with `bisect`.
+
+        Args:
+            key: The sort key (see `__call__` and `from_values`).
+
+        Returns:
+            The key itself, or the key wrapped to invert its ordering when `reverse` is set.
+        """
+        return _DescendingValue(key) if self.reverse else key
+
+    def follows(self, item: Any, key: tuple) -> bool:
+        """Returns whether the item comes strictly after the given key in the sorted order.
+
+        Args:
+            item: The item to check.
+            key: The sort key to compare with (see `from_values`).
+
+        Returns:
+            True if the item is sorted after the key, False otherwise.
+        """
+        return self(item) < key if self.reverse else self(item) > key
+
+    def sort(self, items: List[Any], limit: Optional[int] = None) -> List[Any]:
+        """Sorts the items in a single pass.
+
+        Equivalent to `sorted(items, key=self, reverse=self.reverse)[:limit]`. With mixed directions, values of
+        descending options are replaced with negated dense ranks when they are hashable, which avoids
+        comparing wrapped values in Python code.
+
+        When the limit is small compared to the number of items, only the first `limit` items are selected
+        with a bounded heap in O(n log k) instead of sorting all of them. Ties keep the original order of the items,
+        as with a stable sort.
+
+        Args:
+            items: The items to sort.
+            limit: The maximum number of leading items to return. If None, all items are returned.
+
+        Returns:
+            A new sorted list.
+        """
+        if limit is not None and limit <= 0:
+            return []
+        use_heap = limit is not None and limit * self.HEAP_SELECTION_RATIO < len(items)
+
+        if not any(descending for _, _, descending in self._getters):
+            if not use_heap:
+                return sorted(items, key=self, reverse=self.reverse)[:limit]
+            select = heapq.nlargest if self.reverse else heapq.nsmallest
+            return select(limit, items, key=self)
+
+        components = []
+        try:
+            for get, nones_first, descending in self._getters:
+                values = [get(item) for item in items]
+                components.append([(value is None) != nones_first for value in values])
+                if descending:
+                    ranks = {value: -rank for rank, value in enumerate(sorted({value for value in values if value is not None}))}
+                    ranks[None] = 0
+                    values = [ranks[value] for value in values]
+                components.append(values)
+        except (TypeError, KeyError):
+            if use_heap:
+                return heapq.nsmallest(limit, items, key=self)
+            return sorted(items, key=self)[:limit]
+
+        keys = list(zip(*components))
+        if use_heap:
+            indexes = heapq.nsmallest(limit, range(len(items)), key=keys.__getitem__)
+        else:
+            indexes = sorted(range(len(items)), key=keys.__getitem__)[:limit]
+        return [items[index] for index in indexes]
+
+
+class _DescendingValue:
+    """Wraps a value to invert its ordering inside a composite sort key."""
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __eq__(self, other: '_DescendingValue') -> bool:
+        return self.value == other.value
+
+    def __lt__(self, other: '_DescendingValue') -> bool:
+        return other.value < self.value
+
+    __hash__ = None
+
 
 class OrderOptionsBuilder:
     """A builder class for constructing OrderOptions instances.
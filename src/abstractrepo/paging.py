@@ -1,8 +1,18 @@
 import abc
-from typing import Optional
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import operator
+import uuid
+from typing import Any, Hashable, List, Optional, Sequence, Tuple
 
+from abstractrepo.fingerprint import FingerprintMixin, get_value_fingerprint
+from abstractrepo.order import OrderOptions
 
-class PagingOptions:
+
+class PagingOptions(FingerprintMixin):
     """Represents options for pagination, including limit and offset.
 
     Attributes:
@@ -16,6 +26,10 @@ class PagingOptions:
         self.limit = limit
         self.offset = offset
 
+    def get_fingerprint(self) -> Hashable:
+        """Returns a hashable value identifying the paging options by their type, limit and offset."""
+        return type(self), self.limit, self.offset
+
 
 class PageResolver:
     """A utility class for resolving page numbers into PagingOptions.
@@ -48,6 +62,147 @@ class PageResolver:
         return PagingOptions(limit=self._page_size, offset=(page_number - self._start_page) * self._page_size)
 
 
+class CursorPagingOptions(PagingOptions):
+    """Represents options for keyset (cursor) pagination.
+
+    The page starts strictly after the item whose values of the order attributes are `after`,
+    instead of skipping `offset` items, so deep pages do not depend on the items before them.
+    Cursor paging requires order options; to resume unambiguously, the last order option
+    should be a unique attribute (e.g. the ID).
+
+    Attributes:
+        limit: The maximum number of items to return. If None, no limit is applied.
+        offset: The number of items to skip after the cursor. If None, no offset is applied.
+        after: The values of the order attributes of the last seen item, in the order of the order options.
+               If None, the page starts at the beginning of the collection.
+    """
+    after: Optional[Tuple[Any, ...]]
+
+    def __init__(self, limit: Optional[int] = None, after: Optional[Sequence[Any]] = None, offset: Optional[int] = None):
+        """Initializes a new CursorPagingOptions.
+
+        Args:
+            limit: The maximum number of items to return.
+            after: The values of the order attributes of the last seen item, or None for the first page.
+            offset: The number of items to skip after the cursor.
+        """
+        super().__init__(limit, offset)
+        self.after = tuple(after) if after is not None else None
+
+    def get_fingerprint(self) -> Hashable:
+        """Returns a hashable value identifying the paging options by their type, limit, offset and cursor values.
+
+        Raises:
+            TypeError: If a cursor value is mutable (e.g. a list) or unhashable.
+        """
+        after = get_value_fingerprint(self.after) if self.after is not None else None
+        return type(self), self.limit, self.offset, after
+
+    @staticmethod
+    def encode_cursor(values: Sequence[Any]) -> str:
+        """Encodes the values of the order attributes into an opaque URL-safe cursor string.
+
+        Supported values are None, bool, int, float, str, datetime, date, Decimal and UUID.
+
+        Args:
+            values: The values to encode.
+
+        Returns:
+            The cursor string.
+
+        Raises:
+            ValueError: If a value is of an unsupported type.
+        """
+        data = json.dumps([_encode_cursor_value(value) for value in values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[Any, ...]:
+        """Decodes a cursor string built by `encode_cursor`.
+
+        Args:
+            cursor: The cursor string.
+
+        Returns:
+            The tuple of the encoded values.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            encoded = json.loads(data.decode('utf-8'))
+            if not isinstance(encoded, list):
+                raise ValueError()
+            return tuple(_decode_cursor_value(value) for value in encoded)
+        except (ValueError, TypeError, KeyError, IndexError, binascii.Error, decimal.InvalidOperation):
+            raise ValueError('Invalid cursor')
+
+
+class CursorPageResolver:
+    """A utility class for keyset (cursor) pagination over a fixed ordering.
+
+    Converts opaque cursors into CursorPagingOptions, and builds the cursor of the next page
+    from the last item of the current one.
+    """
+    _page_size: int
+    _getters: List[Any]
+
+    def __init__(self, page_size: int, order_options: OrderOptions):
+        """Initializes a new CursorPageResolver.
+
+        Args:
+            page_size: The number of items to include in each page.
+            order_options: The order options the pages are retrieved with.
+        """
+        self._page_size = page_size
+        self._getters = [operator.attrgetter(option.attribute) for option in order_options.options]
+
+    def get_page(self, cursor: Optional[str] = None) -> CursorPagingOptions:
+        """Calculates the CursorPagingOptions for the page starting after the given cursor.
+
+        Args:
+            cursor: The cursor returned by `get_next_cursor`, or None for the first page.
+
+        Returns:
+            A CursorPagingOptions instance for the page.
+
+        Raises:
+            ValueError: If the cursor is malformed or does not match the order options.
+        """
+        if cursor is None:
+            return CursorPagingOptions(limit=self._page_size)
+
+        after = CursorPagingOptions.decode_cursor(cursor)
+        if len(after) != len(self._getters):
+            raise ValueError('Invalid cursor')
+        return CursorPagingOptions(limit=self._page_size, after=after)
+
+    def get_cursor(self, item: Any) -> str:
+        """Returns the cursor pointing after the given item.
+
+        Args:
+            item: The item to build the cursor for.
+
+        Returns:
+            The cursor string.
+        """
+        return CursorPagingOptions.encode_cursor([get(item) for get in self._getters])
+
+    def get_next_cursor(self, items: Sequence[Any]) -> Optional[str]:
+        """Returns the cursor of the page following the given page.
+
+        Args:
+            items: The items of the current page.
+
+        Returns:
+            The cursor string, or None if the page is the last one.
+        """
+        if len(items) < self._page_size or not items:
+            return None
+        return self.get_cursor(items[-1])
+
+
 class PagingOptionsConverterInterface(abc.ABC):
     """Abstract base class for converting PagingOptions.
 
@@ -66,3 +221,51 @@ class PagingOptionsConverterInterface(abc.ABC):
             A new PagingOptions instance after conversion.
         """
         raise NotImplementedError()
+
+
+def _encode_cursor_value(value: Any) -> List[Any]:
+    """Encodes a cursor value into a type-tagged JSON-compatible list."""
+    if value is None:
+        return ['n']
+    if isinstance(value, bool):
+        return ['b', value]
+    if isinstance(value, int):
+        return ['i', value]
+    if isinstance(value, float):
+        return ['f', repr(value)]
+    if isinstance(value, str):
+        return ['s', value]
+    if isinstance(value, datetime.datetime):
+        return ['dt', value.isoformat()]
+    if isinstance(value, datetime.date):
+        return ['d', value.isoformat()]
+    if isinstance(value, decimal.Decimal):
+        return ['dec', str(value)]
+    if isinstance(value, uuid.UUID):
+        return ['u', str(value)]
+    raise ValueError(f'Unsupported cursor value type: {type(value).__name__}')
+
+
+def _decode_cursor_value(encoded: List[Any]) -> Any:
+    """Decodes a type-tagged value built by `_encode_cursor_value`."""
+    tag = encoded[0]
+    if tag == 'n':
+        return None
+    value = encoded[1]
+    if tag == 'b' and isinstance(value, bool):
+        return value
+    if tag == 'i' and isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if tag == 'f' and isinstance(value, str):
+        return float(value)
+    if tag == 's' and isinstance(value, str):
+        return value
+    if tag == 'dt' and isinstance(value, str):
+        return datetime.datetime.fromisoformat(value)
+    if tag == 'd' and isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    if tag == 'dec' and isinstance(value, str):
+        return decimal.Decimal(value)
+    if tag == 'u' and isinstance(value, str):
+        return uuid.UUID(value)
+    raise ValueError('Invalid cursor value')
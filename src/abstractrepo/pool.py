@@ -0,0 +1,177 @@
+import contextlib
+import threading
+import time
+from typing import Callable, Generic, Iterator, List, Optional, TypeVar
+
+from abstractrepo.exceptions import PoolTimeoutException
+
+TConnection = TypeVar('TConnection')
+
+
+class ConnectionPool(Generic[TConnection]):
+    """A bounded pool of connections shared by threads.
+
+    Connections are opened lazily with the `connect` callable, up to `size` of them, and are kept open until
+    the pool is closed. A thread acquiring a connection while all of them are in use waits until another thread
+    releases one or the acquire timeout expires. The most recently released connection is handed out first,
+    so a lightly loaded pool keeps reusing the same warm connection.
+
+    The pool records how long the acquisitions waited: `wait_time` is the total, `max_wait_time` the longest
+    single wait, `acquisitions` and `timeouts` count the successful and expired acquisitions, and `waiting`
+    is the number of threads waiting right now.
+
+    Attributes:
+        acquisitions: The number of connections handed out.
+        timeouts: The number of acquisitions that timed out.
+        wait_time: The total time in seconds the acquisitions waited.
+        max_wait_time: The longest time in seconds a single acquisition waited.
+        waiting: The number of threads currently waiting for a connection.
+    """
+    acquisitions: int
+    timeouts: int
+    wait_time: float
+    max_wait_time: float
+    waiting: int
+    _connect: Callable[[], TConnection]
+    _size: int
+    _timeout: Optional[float]
+    _idle: List[TConnection]
+    _opened: int
+    _closed: bool
+    _condition: threading.Condition
+
+    def __init__(self, connect: Callable[[], TConnection], size: int, timeout: Optional[float] = None):
+        """Initializes a new ConnectionPool.
+
+        Args:
+            connect: The callable opening a new connection.
+            size: The maximum number of open connections.
+            timeout: The default number of seconds to wait for a connection, or None to wait forever.
+
+        Raises:
+            ValueError: If the size is not positive or the timeout is negative.
+        """
+        if size < 1:
+            raise ValueError('Pool size must be positive')
+        if timeout is not None and timeout < 0:
+            raise ValueError('Timeout must not be negative')
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.waiting = 0
+        self._connect = connect
+        self._size = size
+        self._timeout = timeout
+        self._idle = []
+        self._opened = 0
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+
+    @property
+    def size(self) -> int:
+        """Returns the maximum number of open connections."""
+        return self._size
+
+    @property
+    def open_connections(self) -> int:
+        """Returns the number of connections currently open, idle or in use."""
+        return self._opened
+
+    def acquire(self, timeout: Optional[float] = None, waiting_since: Optional[float] = None) -> TConnection:
+        """Takes an idle connection from the pool, opening a new one if the pool is not full.
+
+        Args:
+            timeout: The number of seconds to wait for a connection, or None for the default timeout of the pool.
+            waiting_since: The `time.monotonic()` value at which the caller started waiting, e.g. when a task was
+                           queued for a worker thread. The timeout and the recorded wait time count from it.
+                           If None, they count from the call.
+
+        Returns:
+            The connection, which has to be given back with `release`.
+
+        Raises:
+            PoolTimeoutException: If no connection became available in time.
+            RuntimeError: If the pool is closed.
+            Exception: Any exception raised by `connect`.
+        """
+        timeout = self._timeout if timeout is None else timeout
+        start = time.monotonic() if waiting_since is None else waiting_since
+        deadline = None if timeout is None else start + timeout
+        with self._condition:
+            self.waiting += 1
+            try:
+                while not self._idle and self._opened >= self._size and not self._closed:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeoutException(timeout)
+                    self._condition.wait(remaining)
+            finally:
+                self.waiting -= 1
+            if self._closed:
+                raise RuntimeError('Connection pool is closed')
+
+            self._record_wait(time.monotonic() - start)
+            if self._idle:
+                return self._idle.pop()
+            self._opened += 1
+
+        try:
+            return self._connect()
+        except BaseException:
+            with self._condition:
+                self._opened -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, connection: TConnection) -> None:
+        """Gives a connection acquired with `acquire` back to the pool, or closes it if the pool is closed.
+
+        Args:
+            connection: The connection to give back.
+        """
+        with self._condition:
+            if not self._closed:
+                self._idle.append(connection)
+                self._condition.notify()
+                return
+            self._opened -= 1
+        connection.close()
+
+    @contextlib.contextmanager
+    def connection(self, timeout: Optional[float] = None, waiting_since: Optional[float] = None) -> Iterator[TConnection]:
+        """Returns a context manager holding a connection of the pool.
+
+        Args:
+            timeout: The number of seconds to wait for a connection, or None for the default timeout of the pool.
+            waiting_since: The `time.monotonic()` value at which the caller started waiting.
+
+        Raises:
+            PoolTimeoutException: If no connection became available in time.
+            RuntimeError: If the pool is closed.
+        """
+        connection = self.acquire(timeout, waiting_since)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self) -> None:
+        """Closes the idle connections and makes the connections in use be closed when they are released.
+
+        Threads waiting for a connection and later acquisitions raise `RuntimeError`.
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+            self._condition.notify_all()
+        for connection in idle:
+            connection.close()
+
+    def _record_wait(self, wait_time: float) -> None:
+        """Records a successful acquisition; called with the condition held."""
+        self.acquisitions += 1
+        self.wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
@@ -1,17 +1,33 @@
-from typing import List, TypeVar, Generic, Optional, Type
+from typing import List, TypeVar, Generic, Optional, Type, Dict, Any, Tuple, Iterable, Iterator, AsyncIterator, \
+    Callable, Union, Hashable
 import abc
-
+import asyncio
+import functools
+import itertools
+import operator
+import os
+import threading
+from concurrent.futures import Executor
+
+from abstractrepo.compiler import SpecificationCompiler, StrictSpecificationCompiler, _identity
 from abstractrepo.exceptions import ItemNotFoundException
+from abstractrepo.fingerprint import get_value_fingerprint
+from abstractrepo.index import IndexInterface, IndexPlanner
+from abstractrepo.live import LiveQuery
+from abstractrepo.locking import ReadWriteLock
 
-from abstractrepo.order import OrderOptions, OrderDirection, NonesOrder, OrderOption
-from abstractrepo.paging import PagingOptions
-from abstractrepo.specification import SpecificationInterface
+from abstractrepo.order import OrderOptions, OrderDirection, NonesOrder, SortKey
+from abstractrepo.paging import PagingOptions, CursorPagingOptions
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, Operator
 
 TModel = TypeVar('TModel')
 TIdValueType = TypeVar('TIdValueType')
 TCreateSchema = TypeVar('TCreateSchema')
 TUpdateSchema = TypeVar('TUpdateSchema')
 
+_TOMBSTONE = object()
+
 
 class CrudRepositoryInterface(abc.ABC, Generic[TModel, TIdValueType, TCreateSchema, TUpdateSchema]):
     """Abstract Base Class defining the contract for synchronous CRUD repository operations.
@@ -46,6 +62,43 @@ class CrudRepositoryInterface(abc.ABC, Generic[TModel, TIdValueType, TCreateSche
         """
         raise NotImplementedError()
 
+    def iter_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[TModel]:
+        """Lazily iterates over a collection of items based on filtering, sorting, and pagination options.
+
+        Unlike `get_collection`, the items are not collected into a single list, so large collections
+        can be processed without holding all of them in memory. The default implementation fetches
+        the items with `get_collection` in pages of `chunk_size` items; items created or deleted
+        during the iteration may therefore be skipped or repeated.
+
+        Streaming is only guaranteed without order options. Ordered iteration is not streaming in every
+        implementation: the in-memory repositories sort all matching items before yielding the first one,
+        so they hold a reference to each of them until the iteration ends.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+            chunk_size: The number of items to fetch from the storage at once.
+
+        Returns:
+            An iterator over the TModel instances matching the criteria.
+
+        Raises:
+            ValueError: If the chunk size is not positive.
+        """
+        _check_chunk_size(chunk_size)
+        for chunk_paging in _iter_chunk_paging(paging_options, chunk_size):
+            chunk = self.get_collection(filter_spec, order_options, chunk_paging)
+            yield from chunk
+            if len(chunk) < chunk_paging.limit:
+                return
+
     @abc.abstractmethod
     def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
         """Returns the total count of items matching the given filter specification.
@@ -73,6 +126,30 @@ class CrudRepositoryInterface(abc.ABC, Generic[TModel, TIdValueType, TCreateSche
         """
         raise NotImplementedError()
 
+    def get_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool = False) -> Dict[TIdValueType, TModel]:
+        """Retrieves multiple items by their unique identifiers.
+
+        The default implementation calls `get_item` for each ID.
+
+        Args:
+            item_ids: The unique identifiers of the items to retrieve.
+            skip_missing: Whether IDs with no item are left out of the result instead of raising an exception.
+
+        Returns:
+            A dictionary mapping the IDs to the corresponding TModel instances, in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found and `skip_missing` is False.
+        """
+        result = {}
+        for item_id in item_ids:
+            try:
+                result[item_id] = self.get_item(item_id)
+            except ItemNotFoundException:
+                if not skip_missing:
+                    raise
+        return result
+
     @abc.abstractmethod
     def exists(self, item_id: TIdValueType) -> bool:
         """Checks if an item with the specified ID exists in the repository.
@@ -134,6 +211,102 @@ class CrudRepositoryInterface(abc.ABC, Generic[TModel, TIdValueType, TCreateSche
         """
         raise NotImplementedError()
 
+    def create_many(self, forms: Iterable[TCreateSchema]) -> List[TModel]:
+        """Creates new items in the repository using the provided creation forms.
+
+        The default implementation calls `create` for each form.
+
+        Args:
+            forms: The TCreateSchema instances containing data for the new items.
+
+        Returns:
+            The list of newly created TModel instances, in the order of the forms.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        return [self.create(form) for form in forms]
+
+    def update_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+        form: TUpdateSchema,
+    ) -> List[TModel]:
+        """Updates the items selected by IDs or by a specification with data from the update form.
+
+        Nothing is updated if an item with one of the IDs does not exist. The default implementation resolves
+        a specification with `get_collection`, checks that all items exist and then calls `update` for each ID.
+
+        Args:
+            target: The unique identifiers of the items to update, or a specification selecting them.
+            form: The TUpdateSchema instance containing data for updating the items.
+
+        Returns:
+            The list of updated TModel instances.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        return [self.update(item_id, form) for item_id in self._resolve_target_ids(target)]
+
+    def delete_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TModel]:
+        """Deletes the items selected by IDs or by a specification from the repository.
+
+        Nothing is deleted if an item with one of the IDs does not exist. The default implementation resolves
+        a specification with `get_collection`, checks that all items exist and then calls `delete` for each ID.
+
+        Args:
+            target: The unique identifiers of the items to delete, or a specification selecting them.
+
+        Returns:
+            The list of deleted TModel instances.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+        """
+        return [self.delete(item_id) for item_id in self._resolve_target_ids(target)]
+
+    def _resolve_target_ids(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TIdValueType]:
+        """Returns the IDs of the items selected by the target of a bulk operation, without repetitions.
+
+        Args:
+            target: The unique identifiers of the items, or a specification selecting them.
+
+        Returns:
+            The IDs of the selected items.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+        """
+        if isinstance(target, SpecificationInterface):
+            return [self._get_item_id(item) for item in self.get_collection(target)]
+
+        item_ids = list(dict.fromkeys(target))
+        for item_id in item_ids:
+            if not self.exists(item_id):
+                raise ItemNotFoundException[TIdValueType](self.model_class, item_id)
+        return item_ids
+
+    def _get_item_id(self, item: TModel) -> TIdValueType:
+        """Returns the ID of an item; used by the default bulk implementations to resolve specifications.
+
+        Args:
+            item: The item to get the ID of.
+
+        Returns:
+            The value of the `id` attribute of the item. Override for other ID attributes.
+        """
+        return getattr(item, 'id')
+
     @property
     @abc.abstractmethod
     def model_class(self) -> Type[TModel]:
@@ -181,6 +354,44 @@ class AsyncCrudRepositoryInterface(abc.ABC, Generic[TModel, TIdValueType, TCreat
         """
         raise NotImplementedError()
 
+    async def iter_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[TModel]:
+        """Lazily iterates over a collection of items based on filtering, sorting, and pagination options.
+
+        Unlike `get_collection`, the items are not collected into a single list, so large collections
+        can be processed without holding all of them in memory. The default implementation fetches
+        the items with `get_collection` in pages of `chunk_size` items; items created or deleted
+        during the iteration may therefore be skipped or repeated.
+
+        Streaming is only guaranteed without order options. Ordered iteration is not streaming in every
+        implementation: the in-memory repositories sort all matching items before yielding the first one,
+        so they hold a reference to each of them until the iteration ends.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+            chunk_size: The number of items to fetch from the storage at once.
+
+        Returns:
+            An asynchronous iterator over the TModel instances matching the criteria.
+
+        Raises:
+            ValueError: If the chunk size is not positive.
+        """
+        _check_chunk_size(chunk_size)
+        for chunk_paging in _iter_chunk_paging(paging_options, chunk_size):
+            chunk = await self.get_collection(filter_spec, order_options, chunk_paging)
+            for item in chunk:
+                yield item
+            if len(chunk) < chunk_paging.limit:
+                return
+
     @abc.abstractmethod
     async def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
         """Returns the total count of items matching the given filter specification.
@@ -208,6 +419,30 @@ class AsyncCrudRepositoryInterface(abc.ABC, Generic[TModel, TIdValueType, TCreat
         """
         raise NotImplementedError()
 
+    async def get_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool = False) -> Dict[TIdValueType, TModel]:
+        """Retrieves multiple items by their unique identifiers.
+
+        The default implementation calls `get_item` for each ID.
+
+        Args:
+            item_ids: The unique identifiers of the items to retrieve.
+            skip_missing: Whether IDs with no item are left out of the result instead of raising an exception.
+
+        Returns:
+            A dictionary mapping the IDs to the corresponding TModel instances, in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found and `skip_missing` is False.
+        """
+        result = {}
+        for item_id in item_ids:
+            try:
+                result[item_id] = await self.get_item(item_id)
+            except ItemNotFoundException:
+                if not skip_missing:
+                    raise
+        return result
+
     @abc.abstractmethod
     async def exists(self, item_id: TIdValueType) -> bool:
         """Checks if an item with the specified ID exists in the repository.
@@ -269,6 +504,102 @@ class AsyncCrudRepositoryInterface(abc.ABC, Generic[TModel, TIdValueType, TCreat
         """
         raise NotImplementedError()
 
+    async def create_many(self, forms: Iterable[TCreateSchema]) -> List[TModel]:
+        """Creates new items in the repository using the provided creation forms.
+
+        The default implementation calls `create` for each form.
+
+        Args:
+            forms: The TCreateSchema instances containing data for the new items.
+
+        Returns:
+            The list of newly created TModel instances, in the order of the forms.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        return [await self.create(form) for form in forms]
+
+    async def update_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+        form: TUpdateSchema,
+    ) -> List[TModel]:
+        """Updates the items selected by IDs or by a specification with data from the update form.
+
+        Nothing is updated if an item with one of the IDs does not exist. The default implementation resolves
+        a specification with `get_collection`, checks that all items exist and then calls `update` for each ID.
+
+        Args:
+            target: The unique identifiers of the items to update, or a specification selecting them.
+            form: The TUpdateSchema instance containing data for updating the items.
+
+        Returns:
+            The list of updated TModel instances.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        return [await self.update(item_id, form) for item_id in await self._resolve_target_ids(target)]
+
+    async def delete_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TModel]:
+        """Deletes the items selected by IDs or by a specification from the repository.
+
+        Nothing is deleted if an item with one of the IDs does not exist. The default implementation resolves
+        a specification with `get_collection`, checks that all items exist and then calls `delete` for each ID.
+
+        Args:
+            target: The unique identifiers of the items to delete, or a specification selecting them.
+
+        Returns:
+            The list of deleted TModel instances.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+        """
+        return [await self.delete(item_id) for item_id in await self._resolve_target_ids(target)]
+
+    async def _resolve_target_ids(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TIdValueType]:
+        """Returns the IDs of the items selected by the target of a bulk operation, without repetitions.
+
+        Args:
+            target: The unique identifiers of the items, or a specification selecting them.
+
+        Returns:
+            The IDs of the selected items.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+        """
+        if isinstance(target, SpecificationInterface):
+            return [self._get_item_id(item) for item in await self.get_collection(target)]
+
+        item_ids = list(dict.fromkeys(target))
+        for item_id in item_ids:
+            if not await self.exists(item_id):
+                raise ItemNotFoundException[TIdValueType](self.model_class, item_id)
+        return item_ids
+
+    def _get_item_id(self, item: TModel) -> TIdValueType:
+        """Returns the ID of an item; used by the default bulk implementations to resolve specifications.
+
+        Args:
+            item: The item to get the ID of.
+
+        Returns:
+            The value of the `id` attribute of the item. Override for other ID attributes.
+        """
+        return getattr(item, 'id')
+
     @property
     @abc.abstractmethod
     def model_class(self) -> Type[TModel]:
@@ -283,152 +614,968 @@ class AsyncCrudRepositoryInterface(abc.ABC, Generic[TModel, TIdValueType, TCreat
         raise NotImplementedError()
 
 
-class ListBasedCrudRepository(
-    Generic[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
-    CrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
-    abc.ABC,
-):
-    """Implements a synchronous CRUD repository using an in-memory list.
+class BaseListBasedRepository(abc.ABC, Generic[TModel, TIdValueType]):
+    """Base abstract class for repositories storing their items in an in-memory list.
 
-    This class is a concrete implementation of the `CrudRepositoryInterface` using an in-memory list of items.
+    Holds the list of items together with a primary-key index shared by the synchronous and
+    asynchronous list-based implementations.
+
+    The primary-key index is a dictionary mapping ID values to positions in `_db`. It is built lazily
+    on the first lookup by ID and kept in sync by `create`, `update` and `delete`. It is used only when
+    `_get_id_filter_specification` returns a plain equality `AttributeSpecification`; any other ID
+    specification falls back to a full scan of the list. The index assumes that ID attributes are unique
+    and that the list is modified only through the repository.
+
+    Secondary indexes declared by `_create_indexes` are kept in sync the same way and are used by
+    `IndexPlanner` to answer filter specifications without scanning the whole list.
+
+    Deleted items are replaced with tombstones instead of being removed from the list, so deletion
+    does not shift or reallocate `_db`. Tombstones are dropped in place once their share of the list
+    exceeds `_compaction_ratio`. Code reading `_db` directly should use `_get_items` instead.
+    Compaction is postponed while `iter_collection` iterators are open, so their positions stay valid.
     """
     _db: List[TModel]
+    _tombstones: int
+    _open_iterators: int
+    _compaction_ratio: float = 0.5
+    _id_index: Optional[Dict[Any, int]]
+    _id_index_attribute: Optional[str]
+    _id_index_source: Optional[List[TModel]]
+    _id_index_size: int
+    _indexes: List[IndexInterface]
+    _index_planner: IndexPlanner
+    _indexes_source: Optional[List[TModel]]
+    _indexes_size: int
+    _live_queries: List[LiveQuery[TModel]]
 
     def __init__(self, items: Optional[List[TModel]] = None):
         """Initializes the repository with an optional list of items.
 
         Args:
-            items: The list of items to initialize the repository with.
+            items: The optional list of items to initialize the repository with.
         """
         self._db = items.copy() if items is not None else []
-
-    def get_collection(
+        self._tombstones = 0
+        self._open_iterators = 0
+        self._live_queries = []
+        self._reset_id_index()
+        self._indexes = list(self._create_indexes())
+        self._index_planner = IndexPlanner(self._indexes)
+        self._rebuild_indexes()
+
+    def register_live_query(
         self,
         filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
         order_options: Optional[OrderOptions] = None,
-        paging_options: Optional[PagingOptions] = None,
-    ) -> List[TModel]:
-        """Retrieves a collection of items based on filtering, sorting, and pagination options.
+    ) -> LiveQuery[TModel]:
+        """Registers a query whose result is kept up to date incrementally.
+
+        Every item created, updated or deleted through the repository is checked against the filter
+        of each registered query only, so reading a page of the result costs O(page). Each registered
+        query slows down writes, so queries no longer read should be unregistered.
 
         Args:
-            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            filter_spec: An optional SpecificationInterface instance to filter the items.
             order_options: An optional OrderOptions instance to specify the sorting order.
-            paging_options: An optional PagingOptions instance to control pagination.
 
         Returns:
-            A list of TModel instances matching the criteria.
+            The LiveQuery instance giving access to the result.
         """
-        result = self._db.copy()
-        result = self._apply_filter(result, filter_spec)
-        result = self._apply_order(result, order_options)
-        result = self._apply_paging(result, paging_options)
-        return result
+        live_query = LiveQuery(filter_spec, order_options, self._iter_positioned_items)
+        self._live_queries.append(live_query)
+        return live_query
 
-    def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
-        """Returns the total count of items matching the given filter specification.
+    def unregister_live_query(self, live_query: LiveQuery[TModel]) -> None:
+        """Stops updating a query registered with `register_live_query`.
 
         Args:
-            filter_spec: An optional SpecificationInterface instance to filter the items.
+            live_query: The registered LiveQuery instance.
 
-        Returns:
-            The number of items matching the filter.
+        Raises:
+            ValueError: If the query is not registered in this repository.
         """
-        return len(self._apply_filter(self._db, filter_spec))
+        self._live_queries.remove(live_query)
 
-    def get_item(self, item_id: TIdValueType) -> TModel:
-        """Retrieves a single item by its unique identifier.
+    @abc.abstractmethod
+    def _get_id_filter_specification(self, item_id: TIdValueType) -> SpecificationInterface[TModel, bool]:
+        """Returns a SpecificationInterface instance that filters items by their ID.
 
         Args:
-            item_id: The unique identifier of the item to retrieve.
+            item_id: The ID of the item to filter by.
 
         Returns:
-            The TModel instance corresponding to the item_id.
-
-        Raises:
-            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+            The SpecificationInterface instance.
         """
-        return self._find_by_id(item_id)
+        raise NotImplementedError()
 
-    def exists(self, item_id: TIdValueType) -> bool:
-        """Checks if an item with the specified ID exists in the repository.
+    def _create_indexes(self) -> List[IndexInterface]:
+        """Returns the secondary indexes of the repository.
 
-        Args:
-            item_id: The unique identifier of the item to check.
+        Override this method to declare indexes, e.g. `return [HashIndex('username'), SortedIndex('created_at')]`.
+        Each call must return new index instances.
 
         Returns:
-            True if an item with the specified ID exists, False otherwise.
+            The list of indexes. Empty by default.
         """
-        return bool(len(list(filter(lambda item: self._get_id_filter_specification(item_id).is_satisfied_by(item), self._db))))
+        return []
 
-    def create(self, form: TCreateSchema) -> TModel:
-        """Creates a new item in the repository using the provided creation form.
+    def _get_items(self, copy: bool = False) -> List[TModel]:
+        """Returns the stored items without tombstones.
 
         Args:
-            form: The TCreateSchema instance containing data for the new item.
+            copy: Whether the result must be a new list. Otherwise, the result may be `_db` itself and must not be modified.
 
         Returns:
-            The newly created TModel instance.
-
-        Raises:
-            UniqueConstraintViolation: If a unique constraint violation occurs.
-            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            The list of stored items.
         """
-        item = self._create_model(form, self._generate_id())
-        self._db.append(item)
-        return item
+        if not self._tombstones:
+            return self._db.copy() if copy else self._db
+        return [item for item in self._db if item is not _TOMBSTONE]
 
-    def update(self, item_id: TIdValueType, form: TUpdateSchema) -> TModel:
-        """Updates an existing item identified by its ID with data from the update form.
+    def _iter_items(self) -> Iterator[TModel]:
+        """Lazily iterates over the stored items without tombstones.
 
-        Args:
-            item_id: The unique identifier of the item to update.
-            form: The TUpdateSchema instance containing data for updating the item.
+        Items deleted during the iteration are skipped, and items created during the iteration are included.
 
         Returns:
-            The updated TModel instance.
-
-        Raises:
-            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
-            UniqueConstraintViolation: If a unique constraint violation occurs.
-            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            An iterator over the stored items.
         """
-        return self._update_model(self._find_by_id(item_id), form)
+        return (item for item in self._db if item is not _TOMBSTONE)
 
-    def delete(self, item_id: int) -> TModel:
-        """Deletes an item from the repository by its ID.
+    def _iter_positioned_items(self) -> Iterator[Tuple[int, TModel]]:
+        """Iterates over the stored items and their positions in `_db`, without tombstones."""
+        return ((position, item) for position, item in enumerate(self._db) if item is not _TOMBSTONE)
+
+    def _select_candidates(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+        lazy: bool = False,
+    ) -> Tuple[Iterable[TModel], Optional[SpecificationInterface[TModel, bool]]]:
+        """Narrows the stored items down with the secondary indexes.
 
         Args:
-            item_id: The unique identifier of the item to delete.
+            filter_spec: The filter specification to answer.
+            lazy: Whether the candidates may be a lazy iterator instead of a list.
 
         Returns:
-            The deleted TModel instance.
-
-        Raises:
-            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+            A tuple of the candidate items in storage order, and the specification the candidates
+            still have to be filtered with (None if the indexes answered the specification exactly).
+            The candidates may be `_db` itself and must not be modified.
         """
-        item = self._find_by_id(item_id)
-        self._db = self._exclude_by_id(item_id)
-        return item
+        if filter_spec is not None and self._indexes:
+            self._ensure_indexes()
+            plan = self._index_planner.plan(filter_spec)
+            if plan is not None:
+                db = self._db
+                positions = sorted(plan.positions)
+                if lazy:
+                    items = (db[position] for position in positions if db[position] is not _TOMBSTONE)
+                else:
+                    items = [db[position] for position in positions]
+                return items, None if plan.exact else filter_spec
+
+        return self._iter_items() if lazy else self._get_items(), filter_spec
+
+    def _iter_matching(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+        paging_options: Optional[PagingOptions],
+    ) -> Iterator[TModel]:
+        """Lazily iterates over the unordered items matching the specification.
 
-    @abc.abstractmethod
-    def _create_model(self, form: TCreateSchema, new_id: TIdValueType) -> TModel:
-        """Creates a new item from the provided creation form and ID.
+        The iteration stops as soon as the page is complete.
 
         Args:
-            form: The TCreateSchema instance containing data for the new item.
-            new_id: The new ID for the item.
+            filter_spec: The filter specification to apply.
+            paging_options: The paging options to apply.
 
         Returns:
-            The newly created TModel instance.
+            An iterator over the matching items in storage order.
         """
-        raise NotImplementedError()
+        items, filter_spec = self._select_candidates(filter_spec, lazy=True)
+        if filter_spec is not None:
+            items = filter(SpecificationCompiler().compile(filter_spec), items)
+        if paging_options is not None:
+            items = itertools.islice(items, paging_options.offset or 0, _get_paging_end(paging_options))
+        return items
 
-    @abc.abstractmethod
-    def _update_model(self, model: TModel, form: TUpdateSchema) -> TModel:
-        """Updates an existing item with data from the update form.
+    def _open_iterator(self, get_items: Callable[[], Iterable[TModel]]) -> Iterator[TModel]:
+        """Yields the items while postponing compaction of `_db`.
+
+        The items are only selected on the first `next()`, once compaction is postponed, since candidates
+        resolved by the indexes refer to positions in `_db` that compaction would shift.
 
         Args:
-            model: The TModel instance to update.
+            get_items: The callable returning the items to yield.
+
+        Returns:
+            An iterator over the items.
+        """
+        self._open_iterators += 1
+        try:
+            yield from get_items()
+        finally:
+            self._open_iterators -= 1
+
+    def _count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]]) -> int:
+        """Counts the stored items matching the specification without collecting them.
+
+        Without a specification, the count is the number of stored items minus tombstones.
+        When the indexes answer the specification exactly, the count is the size of their result.
+
+        Args:
+            filter_spec: The specification to match the items against.
+
+        Returns:
+            The number of matching items.
+        """
+        count, items, predicate = self._prepare_count(filter_spec)
+        if count is not None:
+            return count
+        return sum(1 for item in items if predicate(item))
+
+    def _prepare_count(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+    ) -> Tuple[Optional[int], Iterable[TModel], Optional[Callable[[TModel], bool]]]:
+        """Prepares counting the stored items matching the specification.
+
+        Args:
+            filter_spec: The specification to match the items against.
+
+        Returns:
+            A tuple of the count if it is known without scanning (None otherwise),
+            the lazy candidate items to scan, and the predicate to count them with.
+        """
+        if filter_spec is None:
+            return len(self._db) - self._tombstones, (), None
+
+        items = None
+        if self._indexes:
+            self._ensure_indexes()
+            plan = self._index_planner.plan(filter_spec)
+            if plan is not None:
+                if plan.exact:
+                    return len(plan.positions), (), None
+                db = self._db
+                items = (db[position] for position in plan.positions)
+
+        predicate = SpecificationCompiler().compile(filter_spec)
+        return None, self._iter_items() if items is None else items, predicate
+
+    def _find_item(self, item_id: TIdValueType) -> Optional[TModel]:
+        """Finds an item by its ID, stopping at the first match.
+
+        Args:
+            item_id: The ID of the item to find.
+
+        Returns:
+            The found item, or None if no item with the ID is found.
+        """
+        indexed, position = self._lookup_id_index(item_id)
+        if indexed:
+            return None if position is None else self._db[position]
+
+        predicate = SpecificationCompiler().compile(self._get_id_filter_specification(item_id))
+        return next(filter(predicate, self._iter_items()), None)
+
+    def _find_positions(self, filter_spec: SpecificationInterface[TModel, bool]) -> List[int]:
+        """Returns the positions in `_db` of the items satisfying the specification.
+
+        Args:
+            filter_spec: The specification to match the items against.
+
+        Returns:
+            The list of matching positions in ascending order.
+        """
+        if self._indexes:
+            self._ensure_indexes()
+            plan = self._index_planner.plan(filter_spec)
+            if plan is not None:
+                positions = sorted(plan.positions)
+                if plan.exact:
+                    return positions
+                predicate = SpecificationCompiler().compile(filter_spec)
+                return [position for position in positions if predicate(self._db[position])]
+
+        predicate = SpecificationCompiler().compile(filter_spec)
+        return [
+            position
+            for position, item in enumerate(self._db)
+            if item is not _TOMBSTONE and predicate(item)
+        ]
+
+    def _find_positions_by_ids(self, item_ids: Iterable[TIdValueType]) -> Tuple[Dict[TIdValueType, int], List[TIdValueType]]:
+        """Returns the positions in `_db` of the items with the given IDs.
+
+        IDs answered by the primary-key index are looked up directly, and the rest are matched
+        in a single pass over `_db`.
+
+        Args:
+            item_ids: The IDs of the items to find.
+
+        Returns:
+            A tuple of a dictionary mapping the IDs of the found items to their positions,
+            and the list of IDs no item is found for.
+        """
+        found = {}
+        missing = []
+        unresolved = []
+        for item_id in item_ids:
+            indexed, position = self._lookup_id_index(item_id)
+            if not indexed:
+                unresolved.append(item_id)
+            elif position is None:
+                missing.append(item_id)
+            else:
+                found[item_id] = position
+
+        if unresolved:
+            compiler = SpecificationCompiler()
+            specs = [self._get_id_filter_specification(item_id) for item_id in unresolved]
+            matches_any = compiler.compile(OrSpecification(*specs))
+            pending = [(item_id, compiler.compile(spec)) for item_id, spec in zip(unresolved, specs)]
+            for position, item in enumerate(self._db):
+                if not pending:
+                    break
+                if item is _TOMBSTONE or not matches_any(item):
+                    continue
+                still_pending = []
+                for item_id, predicate in pending:
+                    if predicate(item):
+                        found.setdefault(item_id, position)
+                    else:
+                        still_pending.append((item_id, predicate))
+                pending = still_pending
+            missing.extend(item_id for item_id, _ in pending)
+
+        return found, missing
+
+    def _find_target_positions(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> Tuple[List[int], List[TIdValueType]]:
+        """Returns the positions in `_db` of the items selected by IDs or by a specification.
+
+        Args:
+            target: The IDs of the items, or a specification selecting them.
+
+        Returns:
+            A tuple of the positions of the selected items in ascending order, and the IDs no item is found for.
+        """
+        if isinstance(target, SpecificationInterface):
+            return self._find_positions(target), []
+        found, missing = self._find_positions_by_ids(target)
+        return sorted(set(found.values())), missing
+
+    def _rollback_appended(self, size: int) -> None:
+        """Deletes the items appended to `_db` after it had the given size.
+
+        Args:
+            size: The size of `_db` to roll back to.
+        """
+        self._delete_positions(list(range(size, len(self._db))))
+
+    def _delete_by_id(self, item_id: TIdValueType) -> Optional[TModel]:
+        """Deletes the item with the given ID.
+
+        Args:
+            item_id: The ID of the item to delete.
+
+        Returns:
+            The deleted item, or None if no item with the ID is found.
+        """
+        indexed, position = self._lookup_id_index(item_id)
+        if indexed:
+            positions = [] if position is None else [position]
+        else:
+            positions = self._find_positions(self._get_id_filter_specification(item_id))
+
+        if not positions:
+            return None
+
+        item = self._db[positions[0]]
+        self._delete_positions(positions)
+        return item
+
+    def _delete_positions(self, positions: List[int]) -> None:
+        """Replaces the items at the given positions with tombstones.
+
+        Compacts `_db` when the share of tombstones exceeds `_compaction_ratio`.
+
+        Args:
+            positions: The positions in `_db` of the items to delete.
+        """
+        for position in positions:
+            item = self._db[position]
+            if item is _TOMBSTONE:
+                continue
+            self._remove_from_id_index(item, position)
+            self._remove_from_indexes(item, position)
+            for live_query in self._live_queries:
+                live_query.remove(item)
+            self._db[position] = _TOMBSTONE
+            self._tombstones += 1
+
+        if not self._open_iterators and self._tombstones > len(self._db) * self._compaction_ratio:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drops tombstones from `_db` in place and refreshes position-based indexes."""
+        if not self._tombstones:
+            return
+        self._db[:] = [item for item in self._db if item is not _TOMBSTONE]
+        self._tombstones = 0
+        self._reset_id_index()
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuilds the secondary indexes from `_db` and discards the results of live queries.
+
+        Subclasses modifying `_db` directly should call this method afterwards.
+        """
+        for index in self._indexes:
+            attribute = index.attribute_name
+            index.rebuild(
+                (getattr(item, attribute), position)
+                for position, item in enumerate(self._db)
+                if item is not _TOMBSTONE
+            )
+        self._indexes_source = self._db
+        self._indexes_size = len(self._db)
+        for live_query in self._live_queries:
+            live_query.invalidate()
+
+    def _ensure_indexes(self) -> None:
+        """Rebuilds the secondary indexes if `_db` has been replaced or resized outside the repository."""
+        if self._indexes_source is not self._db or self._indexes_size != len(self._db):
+            self._rebuild_indexes()
+
+    def _remove_from_indexes(self, item: TModel, position: int) -> None:
+        """Removes an item being deleted from the secondary indexes.
+
+        Args:
+            item: The item being deleted.
+            position: The position of the item in `_db`.
+        """
+        if self._indexes_source is not self._db:
+            return
+        for index in self._indexes:
+            index.remove(getattr(item, index.attribute_name), position)
+
+    def _reset_id_index(self) -> None:
+        """Drops the primary-key index so that it is rebuilt on the next lookup by ID.
+
+        Subclasses modifying `_db` directly should call this method afterwards.
+        """
+        self._id_index = None
+        self._id_index_attribute = None
+        self._id_index_source = None
+        self._id_index_size = 0
+
+    def _get_id_index_key(self, item_id: TIdValueType) -> Optional[Tuple[str, Any]]:
+        """Returns the attribute name and the key to look up in the primary-key index for the given ID.
+
+        Args:
+            item_id: The ID of the item to look up.
+
+        Returns:
+            A tuple of the ID attribute name and the expected attribute value,
+            or None if the ID specification is not a plain equality.
+        """
+        spec = self._get_id_filter_specification(item_id)
+        if type(spec) is AttributeSpecification and spec.operator == Operator.E:
+            return spec.attribute_name, spec.attribute_value
+        return None
+
+    def _get_id_index(self, attribute: str) -> Optional[Dict[Any, int]]:
+        """Returns the primary-key index over the given attribute, building it if needed.
+
+        Args:
+            attribute: The name of the ID attribute.
+
+        Returns:
+            The index mapping ID values to positions in `_db`, or None if the ID values are not hashable.
+        """
+        if (
+            self._id_index_attribute == attribute
+            and self._id_index_source is self._db
+            and self._id_index_size == len(self._db)
+        ):
+            return self._id_index
+
+        index = {}
+        try:
+            for position, item in enumerate(self._db):
+                if item is not _TOMBSTONE:
+                    index.setdefault(getattr(item, attribute), position)
+        except TypeError:
+            index = None
+
+        self._id_index = index
+        self._id_index_attribute = attribute
+        self._id_index_source = self._db
+        self._id_index_size = len(self._db)
+        return index
+
+    def _lookup_id_index(self, item_id: TIdValueType) -> Tuple[bool, Optional[int]]:
+        """Looks the position of an item up in the primary-key index.
+
+        Args:
+            item_id: The ID of the item to find.
+
+        Returns:
+            A tuple of a flag telling whether the index could answer the lookup
+            and the position of the found item in `_db` (if any).
+        """
+        key = self._get_id_index_key(item_id)
+        if key is None:
+            return False, None
+
+        attribute, value = key
+        index = self._get_id_index(attribute)
+        if index is None:
+            return False, None
+
+        try:
+            return True, index.get(value)
+        except TypeError:
+            return False, None
+
+    def _index_appended_item(self, item: TModel) -> None:
+        """Registers an item just appended to `_db` in the primary-key and secondary indexes.
+
+        Args:
+            item: The item appended to `_db`.
+        """
+        position = len(self._db) - 1
+        for live_query in self._live_queries:
+            live_query.add(item, position)
+
+        if self._indexes_source is self._db and self._indexes_size == position:
+            self._indexes_size += 1
+            for index in self._indexes:
+                index.add(getattr(item, index.attribute_name), position)
+
+        if self._id_index_source is not self._db:
+            return
+
+        self._id_index_size += 1
+        if self._id_index is None:
+            return
+
+        try:
+            self._id_index.setdefault(getattr(item, self._id_index_attribute), position)
+        except TypeError:
+            self._reset_id_index()
+
+    def _snapshot_indexed_values(self, item: TModel) -> Tuple[Any, List[Any]]:
+        """Captures the indexed attribute values of an item before it is updated.
+
+        Args:
+            item: The item about to be updated.
+
+        Returns:
+            A tuple of the ID attribute value (None if no primary-key index is built)
+            and the values of the attributes covered by the secondary indexes.
+        """
+        id_value = getattr(item, self._id_index_attribute) if self._id_index is not None else None
+        return id_value, [getattr(item, index.attribute_name) for index in self._indexes]
+
+    def _reindex_updated_item(
+        self,
+        item: TModel,
+        snapshot: Tuple[Any, List[Any]],
+        position: Optional[int] = None,
+    ) -> None:
+        """Updates the indexes after an item has been updated in place.
+
+        Args:
+            item: The updated item.
+            snapshot: The indexed values captured by `_snapshot_indexed_values` before the update.
+            position: The position of the item in `_db`, if known.
+        """
+        old_key, old_values = snapshot
+        id_index_valid = self._id_index is not None and self._id_index_source is self._db
+        indexes_valid = bool(self._indexes) and self._indexes_source is self._db
+        if not id_index_valid and not indexes_valid and not self._live_queries:
+            return
+
+        if position is None:
+            position = self._find_stored_position(item, old_key)
+        if position is None:
+            return
+
+        for live_query in self._live_queries:
+            live_query.update(item, position)
+        if not id_index_valid and not indexes_valid:
+            return
+
+        if id_index_valid:
+            new_key = getattr(item, self._id_index_attribute)
+            if new_key is not old_key and new_key != old_key:
+                try:
+                    if self._id_index.get(old_key) == position:
+                        del self._id_index[old_key]
+                    self._id_index.setdefault(new_key, position)
+                except TypeError:
+                    self._reset_id_index()
+
+        if indexes_valid:
+            for index, old_value in zip(self._indexes, old_values):
+                new_value = getattr(item, index.attribute_name)
+                if new_value is not old_value and new_value != old_value:
+                    index.remove(old_value, position)
+                    index.add(new_value, position)
+
+    def _find_stored_position(self, item: TModel, id_value: Any) -> Optional[int]:
+        """Returns the position of the given item object in `_db`.
+
+        Args:
+            item: The stored item.
+            id_value: The value of its ID attribute used to look the position up in the primary-key index.
+
+        Returns:
+            The position of the item, or None if the item is not stored.
+        """
+        if self._id_index is not None and self._id_index_source is self._db:
+            try:
+                position = self._id_index.get(id_value)
+            except TypeError:
+                position = None
+            if position is not None and self._db[position] is item:
+                return position
+
+        for position, stored in enumerate(self._db):
+            if stored is item:
+                return position
+        return None
+
+    def _remove_from_id_index(self, item: TModel, position: int) -> None:
+        """Removes an item being deleted from the primary-key index.
+
+        Args:
+            item: The item being deleted.
+            position: The position of the item in `_db`.
+        """
+        if self._id_index is None or self._id_index_source is not self._db:
+            return
+
+        try:
+            key = getattr(item, self._id_index_attribute)
+            if self._id_index.get(key) == position:
+                del self._id_index[key]
+        except TypeError:
+            self._reset_id_index()
+
+
+class ListBasedCrudRepository(
+    Generic[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    CrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    BaseListBasedRepository[TModel, TIdValueType],
+    abc.ABC,
+):
+    """Implements a synchronous CRUD repository using an in-memory list.
+
+    This class is a concrete implementation of the `CrudRepositoryInterface` using an in-memory list of items.
+    Lookups by ID use the primary-key index maintained by `BaseListBasedRepository`.
+
+    Subclasses can set `_parallel_executor` (typically a `ProcessPoolExecutor`) and `_parallel_threshold`
+    to filter lists of at least `_parallel_threshold` items in parallel. There is no default threshold, since
+    the parallel mode only pays off with several cores and filters costing more per item than sending
+    the values to a worker; measure it with `python -m benchmarks.parallel_filter`. The list is split into `_parallel_partitions` partitions
+    (the number of CPUs if None), which are sent to the executor together with the filter specification,
+    so the specification must be picklable. When the specification consists of the standard specification
+    classes only, just the values of the filtered attributes are sent; otherwise, the items are pickled whole.
+    The results are merged in the original order, and ordering and paging are applied afterwards as usual.
+    """
+    _parallel_executor: Optional[Executor] = None
+    _parallel_threshold: Optional[int] = None
+    _parallel_partitions: Optional[int] = None
+
+    def get_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+    ) -> List[TModel]:
+        """Retrieves a collection of items based on filtering, sorting, and pagination options.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+
+        Returns:
+            A list of TModel instances matching the criteria.
+        """
+        filter_spec = _apply_cursor(filter_spec, order_options, paging_options)
+        if paging_options is not None and (order_options is None or not order_options.options):
+            return list(self._iter_matching(filter_spec, paging_options))
+
+        result, filter_spec = self._select_candidates(filter_spec)
+        result = self._apply_filter(result, filter_spec)
+        result = self._apply_order(result, order_options, _get_paging_end(paging_options))
+        result = self._apply_paging(result, paging_options)
+        return result.copy() if result is self._db else result
+
+    def iter_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[TModel]:
+        """Lazily iterates over a collection of items based on filtering, sorting, and pagination options.
+
+        Without ordering, the items are filtered while iterating, in storage order. Items deleted during
+        the iteration are skipped and items created during the iteration are included. With ordering,
+        the iteration is not streaming: all matching items are sorted before the first one is yielded,
+        and references to all of them are held until the iteration ends.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+            chunk_size: Only validated; the items are read from memory, so they are not fetched in chunks.
+
+        Returns:
+            An iterator over the TModel instances matching the criteria.
+
+        Raises:
+            ValueError: If the chunk size is not positive.
+        """
+        _check_chunk_size(chunk_size)
+        if order_options is None or not order_options.options:
+            filter_spec = _apply_cursor(filter_spec, order_options, paging_options)
+            return self._open_iterator(lambda: self._iter_matching(filter_spec, paging_options))
+        items = self.get_collection(filter_spec, order_options, paging_options)
+        return self._open_iterator(lambda: items)
+
+    def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
+        """Returns the total count of items matching the given filter specification.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the items.
+
+        Returns:
+            The number of items matching the filter.
+        """
+        if filter_spec is not None and self._parallel_executor is not None:
+            items, residual_spec = self._select_candidates(filter_spec)
+            if residual_spec is not None and self._should_parallelize(items):
+                return sum(len(positions) for _, positions in self._match_in_parallel(items, residual_spec))
+        return self._count(filter_spec)
+
+    def get_item(self, item_id: TIdValueType) -> TModel:
+        """Retrieves a single item by its unique identifier.
+
+        Args:
+            item_id: The unique identifier of the item to retrieve.
+
+        Returns:
+            The TModel instance corresponding to the item_id.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        return self._find_by_id(item_id)
+
+    def get_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool = False) -> Dict[TIdValueType, TModel]:
+        """Retrieves multiple items by their unique identifiers.
+
+        The items are looked up in the primary-key index, or found in a single pass over the list.
+
+        Args:
+            item_ids: The unique identifiers of the items to retrieve.
+            skip_missing: Whether IDs with no item are left out of the result instead of raising an exception.
+
+        Returns:
+            A dictionary mapping the IDs to the corresponding TModel instances, in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found and `skip_missing` is False.
+        """
+        item_ids = list(item_ids)
+        found, missing = self._find_positions_by_ids(item_ids)
+        if missing and not skip_missing:
+            raise ItemNotFoundException[TIdValueType](self.model_class, missing[0])
+        return {item_id: self._db[found[item_id]] for item_id in item_ids if item_id in found}
+
+    def exists(self, item_id: TIdValueType) -> bool:
+        """Checks if an item with the specified ID exists in the repository.
+
+        Args:
+            item_id: The unique identifier of the item to check.
+
+        Returns:
+            True if an item with the specified ID exists, False otherwise.
+        """
+        return self._find_item(item_id) is not None
+
+    def create(self, form: TCreateSchema) -> TModel:
+        """Creates a new item in the repository using the provided creation form.
+
+        Args:
+            form: The TCreateSchema instance containing data for the new item.
+
+        Returns:
+            The newly created TModel instance.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        item = self._create_model(form, self._generate_id())
+        self._db.append(item)
+        self._index_appended_item(item)
+        return item
+
+    def update(self, item_id: TIdValueType, form: TUpdateSchema) -> TModel:
+        """Updates an existing item identified by its ID with data from the update form.
+
+        Args:
+            item_id: The unique identifier of the item to update.
+            form: The TUpdateSchema instance containing data for updating the item.
+
+        Returns:
+            The updated TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        item = self._find_by_id(item_id)
+        snapshot = self._snapshot_indexed_values(item)
+        result = self._update_model(item, form)
+        self._reindex_updated_item(item, snapshot)
+        return result
+
+    def delete(self, item_id: int) -> TModel:
+        """Deletes an item from the repository by its ID.
+
+        Args:
+            item_id: The unique identifier of the item to delete.
+
+        Returns:
+            The deleted TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        item = self._delete_by_id(item_id)
+        if item is None:
+            raise ItemNotFoundException[TIdValueType](self.model_class, item_id)
+        return item
+
+    def create_many(self, forms: Iterable[TCreateSchema]) -> List[TModel]:
+        """Creates new items in the repository using the provided creation forms.
+
+        If creating one of the items fails, the items created before it are removed again.
+
+        Args:
+            forms: The TCreateSchema instances containing data for the new items.
+
+        Returns:
+            The list of newly created TModel instances, in the order of the forms.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        size = len(self._db)
+        result = []
+        try:
+            for form in forms:
+                item = self._create_model(form, self._generate_id())
+                self._db.append(item)
+                self._index_appended_item(item)
+                result.append(item)
+        except BaseException:
+            self._rollback_appended(size)
+            raise
+        return result
+
+    def update_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+        form: TUpdateSchema,
+    ) -> List[TModel]:
+        """Updates the items selected by IDs or by a specification with data from the update form.
+
+        The items are found in a single pass (or with the indexes), and nothing is updated
+        if an item with one of the IDs does not exist.
+
+        Args:
+            target: The unique identifiers of the items to update, or a specification selecting them.
+            form: The TUpdateSchema instance containing data for updating the items.
+
+        Returns:
+            The list of updated TModel instances in storage order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        positions, missing = self._find_target_positions(target)
+        if missing:
+            raise ItemNotFoundException[TIdValueType](self.model_class, missing[0])
+
+        result = []
+        for position in positions:
+            item = self._db[position]
+            snapshot = self._snapshot_indexed_values(item)
+            result.append(self._update_model(item, form))
+            self._reindex_updated_item(item, snapshot, position)
+        return result
+
+    def delete_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TModel]:
+        """Deletes the items selected by IDs or by a specification from the repository.
+
+        The items are found in a single pass (or with the indexes), and nothing is deleted
+        if an item with one of the IDs does not exist.
+
+        Args:
+            target: The unique identifiers of the items to delete, or a specification selecting them.
+
+        Returns:
+            The list of deleted TModel instances in storage order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+        """
+        positions, missing = self._find_target_positions(target)
+        if missing:
+            raise ItemNotFoundException[TIdValueType](self.model_class, missing[0])
+
+        result = [self._db[position] for position in positions]
+        self._delete_positions(positions)
+        return result
+
+    @abc.abstractmethod
+    def _create_model(self, form: TCreateSchema, new_id: TIdValueType) -> TModel:
+        """Creates a new item from the provided creation form and ID.
+
+        Args:
+            form: The TCreateSchema instance containing data for the new item.
+            new_id: The new ID for the item.
+
+        Returns:
+            The newly created TModel instance.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _update_model(self, model: TModel, form: TUpdateSchema) -> TModel:
+        """Updates an existing item with data from the update form.
+
+        Args:
+            model: The TModel instance to update.
             form: The TUpdateSchema instance containing data for updating the item.
 
         Returns:
@@ -470,89 +1617,97 @@ class ListBasedCrudRepository(
         Raises:
             ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
         """
-        try:
-            return next(filter(lambda item: self._get_id_filter_specification(item_id).is_satisfied_by(item), self._db))
-        except StopIteration:
+        item = self._find_item(item_id)
+        if item is None:
             raise ItemNotFoundException[TIdValueType](self.model_class, item_id)
+        return item
 
-    def _exclude_by_id(self, item_id: TIdValueType) -> List[TModel]:
-        """Excludes an item from the repository by its ID.
+    def _apply_filter(self, items: List[TModel], filter_spec: Optional[SpecificationInterface[TModel, bool]]) -> List[TModel]:
+        """Applies a filter to the items using the provided filter specification.
 
         Args:
-            item_id: The ID of the item to exclude.
+            items: The list of items to filter.
+            filter_spec: The filter specification to apply.
 
         Returns:
-            A list of items excluding the one with the ID.
+            A list of items satisfying the filter specification.
         """
-        return list(filter(lambda item: not self._get_id_filter_specification(item_id).is_satisfied_by(item), self._db))
+        if filter_spec is None:
+            return items
+
+        if self._should_parallelize(items):
+            result = []
+            for partition, positions in self._match_in_parallel(items, filter_spec):
+                result.extend(partition[position] for position in positions)
+            return result
+
+        return list(filter(SpecificationCompiler().compile(filter_spec), items))
+
+    def _should_parallelize(self, items: List[TModel]) -> bool:
+        """Returns whether the items have to be filtered in parallel.
+
+        Args:
+            items: The items to filter.
+
+        Returns:
+            True if a parallel executor and a threshold are set and the number of items reaches
+            `_parallel_threshold`, False otherwise.
+        """
+        threshold = self._parallel_threshold
+        return self._parallel_executor is not None and threshold is not None and len(items) >= threshold
+
+    def _match_in_parallel(
+        self,
+        items: List[TModel],
+        filter_spec: SpecificationInterface[TModel, bool],
+    ) -> List[Tuple[List[TModel], List[int]]]:
+        """Matches partitions of the items against the specification in `_parallel_executor`.
 
-    @staticmethod
-    def _apply_filter(items: List[TModel], filter_spec: Optional[SpecificationInterface[TModel, bool]]) -> List[TModel]:
-        """Applies a filter to the items using the provided filter specification.
+        Only the positions of the matching items are sent back, so the result refers to the stored objects
+        rather than to their copies unpickled from the workers.
 
         Args:
-            items: The list of items to filter.
-            filter_spec: The filter specification to apply.
+            items: The items to filter.
+            filter_spec: The specification to match the items against.
 
         Returns:
-            A list of items satisfying the filter specification.
+            A list of pairs of a partition and the positions of its matching items, in the original order.
         """
-        if filter_spec is None:
-            return items
-
-        return list(filter(filter_spec.is_satisfied_by, items))
+        partitions = self._parallel_partitions or os.cpu_count() or 1
+        size = max(1, -(-len(items) // partitions))
+        chunks = [items[start:start + size] for start in range(0, len(items), size)]
+
+        attribute_names = _RowCompiler.get_attribute_names(filter_spec)
+        if attribute_names is None:
+            futures = [self._parallel_executor.submit(_match_partition, filter_spec, chunk) for chunk in chunks]
+        else:
+            get_row = operator.attrgetter(*attribute_names)
+            futures = [
+                self._parallel_executor.submit(_match_rows, filter_spec, attribute_names, list(map(get_row, chunk)))
+                for chunk in chunks
+            ]
+        return [(chunk, future.result()) for chunk, future in zip(chunks, futures)]
 
     @staticmethod
-    def _apply_order(items: List[TModel], order_options: Optional[OrderOptions]) -> List[TModel]:
+    def _apply_order(
+        items: List[TModel],
+        order_options: Optional[OrderOptions],
+        limit: Optional[int] = None,
+    ) -> List[TModel]:
         """Applies ordering to the items using the provided order options.
 
         Args:
             items: The list of items to order.
             order_options: The order options to apply.
+            limit: The number of leading items that are needed. If set, the items after it may be omitted.
 
         Returns:
             A list of items sorted according to the order options.
         """
-        if order_options is None:
+        if order_options is None or not order_options.options:
             return items
 
-        def get_none_key(order_option: OrderOption, value_is_none: bool) -> bool:
-            """Returns the key to use for sorting null values.
-
-            Args:
-                order_option: The order option to use.
-                value_is_none: Whether the value is null.
-
-            Returns:
-                The key to use for sorting.
-            """
-            if int(order_option.nones == NonesOrder.FIRST) ^ int(order_option.direction == OrderDirection.DESC):
-                return not value_is_none
-            else:
-                return value_is_none
-
-        def get_sort_key(order_option: OrderOption, item):
-            """Returns the key to use for sorting the item.
-
-            Args:
-                order_option: The order option to use.
-                item: The item to sort.
-
-            Returns:
-                The key to use for sorting.
-            """
-            value = getattr(item, option.attribute)
-            none_key = get_none_key(order_option, value is None)
-            return none_key, value
-
-        for option in reversed(order_options.options):
-            items = sorted(
-                items,
-                key=lambda item: get_sort_key(option, item),
-                reverse=option.direction == OrderDirection.DESC,
-            )
-
-        return items
+        return SortKey(order_options).sort(items, limit)
 
     @staticmethod
     def _apply_paging(items: List[TModel], paging_options: Optional[PagingOptions]) -> List[TModel]:
@@ -568,20 +1723,26 @@ class ListBasedCrudRepository(
         if paging_options is None:
             return items
 
-        return items[paging_options.offset:paging_options.offset + paging_options.limit]
+        offset = paging_options.offset or 0
+        return items[offset:_get_paging_end(paging_options)]
 
 
-class AsyncListBasedCrudRepository(
+class ThreadSafeListBasedCrudRepository(
     Generic[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
-    AsyncCrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    ListBasedCrudRepository[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
     abc.ABC,
 ):
-    """Implements an asynchronous CRUD repository using an in-memory list.
+    """A `ListBasedCrudRepository` that can be shared between threads.
 
-    This class is a concrete implementation of the `AsyncCrudRepositoryInterface` using an in-memory list of items.
-    """
+    Read operations hold a `ReadWriteLock` for reading, so they run concurrently and never block one another,
+    while write operations hold it exclusively. Every read therefore sees the state between two writes.
+    `iter_collection` collects its items while holding the lock and iterates over that snapshot afterwards.
 
-    _db: List[TModel]
+    Write operations may call read operations of the repository (e.g. to check uniqueness in `_create_model`),
+    but read operations must not call write operations. Items must be modified only through the repository.
+    """
+    _lock: ReadWriteLock
+    _index_lock: threading.Lock
 
     def __init__(self, items: Optional[List[TModel]] = None):
         """Initializes the repository with an optional list of items.
@@ -589,7 +1750,145 @@ class AsyncListBasedCrudRepository(
         Args:
             items: The optional list of items to initialize the repository with.
         """
-        self._db = items.copy() if items is not None else []
+        self._lock = ReadWriteLock()
+        self._index_lock = threading.Lock()
+        super().__init__(items)
+
+    def get_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+    ) -> List[TModel]:
+        """Retrieves a collection of items while holding the lock for reading."""
+        with self._lock.read():
+            return super().get_collection(filter_spec, order_options, paging_options)
+
+    def iter_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[TModel]:
+        """Iterates over a snapshot of the collection collected while holding the lock for reading."""
+        _check_chunk_size(chunk_size)
+        return iter(self.get_collection(filter_spec, order_options, paging_options))
+
+    def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
+        """Returns the count of matching items while holding the lock for reading."""
+        with self._lock.read():
+            return super().count(filter_spec)
+
+    def get_item(self, item_id: TIdValueType) -> TModel:
+        """Retrieves a single item while holding the lock for reading."""
+        with self._lock.read():
+            return super().get_item(item_id)
+
+    def get_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool = False) -> Dict[TIdValueType, TModel]:
+        """Retrieves multiple items while holding the lock for reading."""
+        with self._lock.read():
+            return super().get_items(item_ids, skip_missing)
+
+    def exists(self, item_id: TIdValueType) -> bool:
+        """Checks if an item exists while holding the lock for reading."""
+        with self._lock.read():
+            return super().exists(item_id)
+
+    def create(self, form: TCreateSchema) -> TModel:
+        """Creates a new item while holding the lock for writing."""
+        with self._lock.write():
+            return super().create(form)
+
+    def create_many(self, forms: Iterable[TCreateSchema]) -> List[TModel]:
+        """Creates new items while holding the lock for writing."""
+        with self._lock.write():
+            return super().create_many(forms)
+
+    def update(self, item_id: TIdValueType, form: TUpdateSchema) -> TModel:
+        """Updates an item while holding the lock for writing."""
+        with self._lock.write():
+            return super().update(item_id, form)
+
+    def update_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+        form: TUpdateSchema,
+    ) -> List[TModel]:
+        """Updates the selected items while holding the lock for writing."""
+        with self._lock.write():
+            return super().update_many(target, form)
+
+    def delete(self, item_id: TIdValueType) -> TModel:
+        """Deletes an item while holding the lock for writing."""
+        with self._lock.write():
+            return super().delete(item_id)
+
+    def delete_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TModel]:
+        """Deletes the selected items while holding the lock for writing."""
+        with self._lock.write():
+            return super().delete_many(target)
+
+    def register_live_query(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+    ) -> LiveQuery[TModel]:
+        """Registers a live query while holding the lock for writing.
+
+        The query holds the lock for reading while its result is read.
+        """
+        with self._lock.write():
+            live_query = LiveQuery(filter_spec, order_options, self._iter_positioned_items, self._lock)
+            self._live_queries.append(live_query)
+            return live_query
+
+    def unregister_live_query(self, live_query: LiveQuery[TModel]) -> None:
+        """Unregisters a live query while holding the lock for writing."""
+        with self._lock.write():
+            super().unregister_live_query(live_query)
+
+    def _get_id_index(self, attribute: str) -> Optional[Dict[Any, int]]:
+        """Returns the primary-key index, letting a single reader build it when needed."""
+        if (
+            self._id_index_attribute == attribute
+            and self._id_index_source is self._db
+            and self._id_index_size == len(self._db)
+        ):
+            return self._id_index
+        with self._index_lock:
+            return super()._get_id_index(attribute)
+
+    def _ensure_indexes(self) -> None:
+        """Rebuilds the secondary indexes if needed, letting a single reader do it."""
+        if self._indexes_source is self._db and self._indexes_size == len(self._db):
+            return
+        with self._index_lock:
+            super()._ensure_indexes()
+
+
+class AsyncListBasedCrudRepository(
+    Generic[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    AsyncCrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    BaseListBasedRepository[TModel, TIdValueType],
+    abc.ABC,
+):
+    """Implements an asynchronous CRUD repository using an in-memory list.
+
+    This class is a concrete implementation of the `AsyncCrudRepositoryInterface` using an in-memory list of items.
+    Lookups by ID use the primary-key index maintained by `BaseListBasedRepository`.
+
+    By default, scans run synchronously and block the event loop until they finish. Subclasses can
+    set `_scan_chunk_size` to scan the list in chunks and yield to the event loop between them, and
+    `_offload_threshold` to filter and sort larger lists in `_executor` (the default executor of
+    the loop if None). Compaction of the list is postponed while a scan is suspended.
+    """
+    _scan_chunk_size: Optional[int] = None
+    _offload_threshold: Optional[int] = None
+    _executor: Optional[Executor] = None
 
     async def get_collection(
         self,
@@ -607,11 +1906,64 @@ class AsyncListBasedCrudRepository(
         Returns:
             A list of TModel instances matching the criteria.
         """
-        result = self._db.copy()
+        filter_spec = _apply_cursor(filter_spec, order_options, paging_options)
+        if paging_options is not None and (order_options is None or not order_options.options):
+            return await self._select_page(filter_spec, paging_options)
+
+        result, filter_spec = self._select_candidates(filter_spec)
         result = await self._apply_filter(result, filter_spec)
-        result = await self._apply_order(result, order_options)
+        result = await self._apply_order(result, order_options, _get_paging_end(paging_options))
         result = await self._apply_paging(result, paging_options)
-        return result
+        return result.copy() if result is self._db else result
+
+    async def iter_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[TModel]:
+        """Lazily iterates over a collection of items based on filtering, sorting, and pagination options.
+
+        Without ordering, the items are filtered while iterating, in storage order. Items deleted during
+        the iteration are skipped and items created during the iteration are included. With ordering,
+        the iteration is not streaming: all matching items are sorted before the first one is yielded,
+        and references to all of them are held until the iteration ends.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+            chunk_size: Only validated; the items are read from memory, so they are not fetched in chunks.
+
+        Returns:
+            An asynchronous iterator over the TModel instances matching the criteria.
+
+        Raises:
+            ValueError: If the chunk size is not positive.
+        """
+        _check_chunk_size(chunk_size)
+        if order_options is not None and order_options.options:
+            for item in await self.get_collection(filter_spec, order_options, paging_options):
+                yield item
+            return
+
+        items, filter_spec = self._select_candidates(_apply_cursor(filter_spec, order_options, paging_options), lazy=True)
+        predicate = SpecificationCompiler().compile(filter_spec) if filter_spec is not None else None
+        offset = paging_options.offset or 0 if paging_options is not None else 0
+        end = _get_paging_end(paging_options)
+        if end is not None and end <= offset:
+            return
+
+        matched = 0
+        for chunk in self._iter_chunks(items):
+            for item in chunk if predicate is None else filter(predicate, chunk):
+                if matched >= offset:
+                    yield item
+                matched += 1
+                if end is not None and matched >= end:
+                    return
+            await self._yield_to_loop()
 
     async def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
         """Returns the total count of items matching the given filter specification.
@@ -622,8 +1974,15 @@ class AsyncListBasedCrudRepository(
         Returns:
             The number of items matching the filter.
         """
-        filtered = await self._apply_filter(self._db, filter_spec)
-        return len(filtered)
+        count, items, predicate = self._prepare_count(filter_spec)
+        if count is not None:
+            return count
+
+        count = 0
+        for chunk in self._iter_chunks(items):
+            count += sum(1 for item in chunk if predicate(item))
+            await self._yield_to_loop()
+        return count
 
     async def get_item(self, item_id: TIdValueType) -> TModel:
         """Retrieves a single item by its unique identifier.
@@ -639,6 +1998,27 @@ class AsyncListBasedCrudRepository(
         """
         return await self._find_by_id(item_id)
 
+    async def get_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool = False) -> Dict[TIdValueType, TModel]:
+        """Retrieves multiple items by their unique identifiers.
+
+        The items are looked up in the primary-key index, or found in a single pass over the list.
+
+        Args:
+            item_ids: The unique identifiers of the items to retrieve.
+            skip_missing: Whether IDs with no item are left out of the result instead of raising an exception.
+
+        Returns:
+            A dictionary mapping the IDs to the corresponding TModel instances, in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found and `skip_missing` is False.
+        """
+        item_ids = list(item_ids)
+        found, missing = self._find_positions_by_ids(item_ids)
+        if missing and not skip_missing:
+            raise ItemNotFoundException[TIdValueType](self.model_class, missing[0])
+        return {item_id: self._db[found[item_id]] for item_id in item_ids if item_id in found}
+
     async def exists(self, item_id: TIdValueType) -> bool:
         """Returns whether an item with the given ID exists in the repository.
 
@@ -648,8 +2028,7 @@ class AsyncListBasedCrudRepository(
         Returns:
             Whether the item exists.
         """
-        filtered = await self._apply_filter(self._db, self._get_id_filter_specification(item_id))
-        return bool(len(filtered))
+        return self._find_item(item_id) is not None
 
     async def create(self, form: TCreateSchema) -> TModel:
         """Creates a new item in the repository using the provided creation form.
@@ -666,6 +2045,7 @@ class AsyncListBasedCrudRepository(
         """
         item = await self._create_model(form, await self._generate_id())
         self._db.append(item)
+        self._index_appended_item(item)
         return item
 
     async def update(self, item_id: TIdValueType, form: TUpdateSchema) -> TModel:
@@ -684,7 +2064,10 @@ class AsyncListBasedCrudRepository(
             RelationshipConstraintViolation: If a relationship constraint violation occurs.
         """
         item = await self._find_by_id(item_id)
-        return await self._update_model(item, form)
+        snapshot = self._snapshot_indexed_values(item)
+        result = await self._update_model(item, form)
+        self._reindex_updated_item(item, snapshot)
+        return result
 
     async def delete(self, item_id: int) -> TModel:
         """Deletes an item from the repository by its ID.
@@ -698,10 +2081,99 @@ class AsyncListBasedCrudRepository(
         Raises:
             ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
         """
-        item = await self._find_by_id(item_id)
-        self._db = await self._exclude_by_id(item_id)
+        item = self._delete_by_id(item_id)
+        if item is None:
+            raise ItemNotFoundException[TIdValueType](self.model_class, item_id)
         return item
 
+    async def create_many(self, forms: Iterable[TCreateSchema]) -> List[TModel]:
+        """Creates new items in the repository using the provided creation forms.
+
+        If creating one of the items fails, the items created before it are removed again.
+
+        Args:
+            forms: The TCreateSchema instances containing data for the new items.
+
+        Returns:
+            The list of newly created TModel instances, in the order of the forms.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        size = len(self._db)
+        result = []
+        try:
+            for form in forms:
+                item = await self._create_model(form, await self._generate_id())
+                self._db.append(item)
+                self._index_appended_item(item)
+                result.append(item)
+        except BaseException:
+            self._rollback_appended(size)
+            raise
+        return result
+
+    async def update_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+        form: TUpdateSchema,
+    ) -> List[TModel]:
+        """Updates the items selected by IDs or by a specification with data from the update form.
+
+        The items are found in a single pass (or with the indexes), and nothing is updated
+        if an item with one of the IDs does not exist.
+
+        Args:
+            target: The unique identifiers of the items to update, or a specification selecting them.
+            form: The TUpdateSchema instance containing data for updating the items.
+
+        Returns:
+            The list of updated TModel instances in storage order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+        """
+        positions, missing = self._find_target_positions(target)
+        if missing:
+            raise ItemNotFoundException[TIdValueType](self.model_class, missing[0])
+
+        result = []
+        for position in positions:
+            item = self._db[position]
+            snapshot = self._snapshot_indexed_values(item)
+            result.append(await self._update_model(item, form))
+            self._reindex_updated_item(item, snapshot, position)
+        return result
+
+    async def delete_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TModel]:
+        """Deletes the items selected by IDs or by a specification from the repository.
+
+        The items are found in a single pass (or with the indexes), and nothing is deleted
+        if an item with one of the IDs does not exist.
+
+        Args:
+            target: The unique identifiers of the items to delete, or a specification selecting them.
+
+        Returns:
+            The list of deleted TModel instances in storage order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+        """
+        positions, missing = self._find_target_positions(target)
+        if missing:
+            raise ItemNotFoundException[TIdValueType](self.model_class, missing[0])
+
+        result = [self._db[position] for position in positions]
+        self._delete_positions(positions)
+        return result
+
     @abc.abstractmethod
     async def _create_model(self, form: TCreateSchema, new_id: TIdValueType) -> TModel:
         """Creates a new item from the provided creation form and ID.
@@ -758,21 +2230,10 @@ class AsyncListBasedCrudRepository(
         Returns:
             The found item.
         """
-        filtered = await self._apply_filter(self._db, self._get_id_filter_specification(item_id))
-        if not filtered:
+        item = self._find_item(item_id)
+        if item is None:
             raise ItemNotFoundException[TIdValueType](self.model_class, item_id)
-        return filtered[0]
-
-    async def _exclude_by_id(self, item_id: TIdValueType) -> List[TModel]:
-        """Excludes an item with the given ID from the repository.
-
-        Args:
-            item_id: The ID of the item to exclude.
-
-        Returns:
-            The modified repository.
-        """
-        return list(filter(lambda item: not self._get_id_filter_specification(item_id).is_satisfied_by(item), self._db))
+        return item
 
     async def _apply_filter(
         self,
@@ -791,41 +2252,41 @@ class AsyncListBasedCrudRepository(
         if filter_spec is None:
             return items
 
-        return list(filter(filter_spec.is_satisfied_by, items))
+        predicate = SpecificationCompiler().compile(filter_spec)
+        if self._should_offload(items):
+            return await self._offload(self._filter_items, items, predicate)
 
-    @staticmethod
-    async def _apply_order(items: List[TModel], order_options: Optional[OrderOptions]) -> List[TModel]:
+        result = []
+        for chunk in self._iter_chunks(items):
+            result.extend(filter(predicate, chunk))
+            await self._yield_to_loop()
+        return result
+
+    async def _apply_order(
+        self,
+        items: List[TModel],
+        order_options: Optional[OrderOptions],
+        limit: Optional[int] = None,
+    ) -> List[TModel]:
         """Applies sorting to the items using the provided order options.
 
         Args:
             items: The list of items to sort.
             order_options: An optional OrderOptions instance to specify the sorting order.
+            limit: The number of leading items that are needed. If set, the items after it may be omitted.
 
         Returns:
             The sorted list of items.
         """
-        if order_options is None:
+        if order_options is None or not order_options.options:
             return items
 
-        def get_none_key(order_option: OrderOption, value_is_none: bool) -> bool:
-            if int(order_option.nones == NonesOrder.FIRST) ^ int(order_option.direction == OrderDirection.DESC):
-                return not value_is_none
-            else:
-                return value_is_none
-
-        def get_sort_key(order_option: OrderOption, item):
-            value = getattr(item, option.attribute)
-            none_key = get_none_key(order_option, value is None)
-            return none_key, value
-
-        for option in reversed(order_options.options):
-            items = sorted(
-                items,
-                key=lambda item: get_sort_key(option, item),
-                reverse=option.direction == OrderDirection.DESC,
-            )
-
-        return items
+        sort_key = SortKey(order_options)
+        if self._should_offload(items):
+            if items is self._db:
+                items = self._get_items(copy=True)
+            return await self._offload(sort_key.sort, items, limit)
+        return sort_key.sort(items, limit)
 
     @staticmethod
     async def _apply_paging(items: List[TModel], paging_options: Optional[PagingOptions]) -> List[TModel]:
@@ -841,4 +2302,315 @@ class AsyncListBasedCrudRepository(
         if paging_options is None:
             return items
 
-        return items[paging_options.offset:paging_options.offset + paging_options.limit]
+        offset = paging_options.offset or 0
+        return items[offset:_get_paging_end(paging_options)]
+
+    async def _select_page(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+        paging_options: PagingOptions,
+    ) -> List[TModel]:
+        """Returns a page of the unordered items matching the specification.
+
+        The items are filtered lazily, so the scan stops as soon as the page is complete.
+
+        Args:
+            filter_spec: The filter specification to apply.
+            paging_options: The paging options to apply.
+
+        Returns:
+            The items of the page in storage order.
+        """
+        items, filter_spec = self._select_candidates(filter_spec, lazy=True)
+        predicate = SpecificationCompiler().compile(filter_spec) if filter_spec is not None else None
+        end = _get_paging_end(paging_options)
+
+        result = []
+        for chunk in self._iter_chunks(items):
+            matched = chunk if predicate is None else filter(predicate, chunk)
+            result.extend(matched if end is None else itertools.islice(matched, end - len(result)))
+            if end is not None and len(result) >= end:
+                break
+            await self._yield_to_loop()
+        return result[paging_options.offset or 0:]
+
+    def _iter_chunks(self, items: Iterable[TModel]) -> Iterator[Iterable[TModel]]:
+        """Splits the scanned items into chunks of `_scan_chunk_size` items.
+
+        Tombstones are dropped from the chunks, and compaction of `_db` is postponed until
+        the iteration is finished. Without a chunk size, the items are returned as a single chunk.
+
+        Args:
+            items: The items to scan.
+
+        Returns:
+            An iterator over the chunks.
+        """
+        size = self._scan_chunk_size
+        self._open_iterators += 1
+        try:
+            if size is None:
+                yield items
+                return
+
+            iterator = iter(items)
+            while True:
+                chunk = list(itertools.islice(iterator, size))
+                yield [item for item in chunk if item is not _TOMBSTONE]
+                if len(chunk) < size:
+                    return
+        finally:
+            self._open_iterators -= 1
+
+    async def _yield_to_loop(self) -> None:
+        """Lets other tasks run between the chunks of a scan if chunked scanning is enabled."""
+        if self._scan_chunk_size is not None:
+            await asyncio.sleep(0)
+
+    def _should_offload(self, items: List[TModel]) -> bool:
+        """Returns whether processing the items has to be moved to the executor.
+
+        Args:
+            items: The items to process.
+
+        Returns:
+            True if the number of items reaches `_offload_threshold`, False otherwise.
+        """
+        return self._offload_threshold is not None and len(items) >= self._offload_threshold
+
+    async def _offload(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Runs the function in `_executor` without blocking the event loop.
+
+        Compaction of `_db` is postponed until the function returns.
+
+        Args:
+            function: The function to run.
+            *args: The arguments to pass to the function.
+
+        Returns:
+            The result of the function.
+        """
+        loop = asyncio.get_running_loop()
+        self._open_iterators += 1
+        try:
+            return await loop.run_in_executor(self._executor, functools.partial(function, *args))
+        finally:
+            self._open_iterators -= 1
+
+    @staticmethod
+    def _filter_items(items: Iterable[TModel], predicate: Callable[[TModel], bool]) -> List[TModel]:
+        """Filters the items with the predicate, skipping items deleted meanwhile.
+
+        Args:
+            items: The items to filter.
+            predicate: The predicate to match the items against.
+
+        Returns:
+            The list of matching items.
+        """
+        return [item for item in items if item is not _TOMBSTONE and predicate(item)]
+
+
+
+
+def _check_chunk_size(chunk_size: int) -> None:
+    """Checks that the chunk size of an iteration is positive.
+
+    Args:
+        chunk_size: The chunk size to check.
+
+    Raises:
+        ValueError: If the chunk size is not positive.
+    """
+    if chunk_size <= 0:
+        raise ValueError('Chunk size must be positive')
+
+
+def _iter_chunk_paging(paging_options: Optional[PagingOptions], chunk_size: int) -> Iterator[PagingOptions]:
+    """Splits the paging options into consecutive pages of at most `chunk_size` items.
+
+    The pages of cursor paging options keep the cursor and advance the offset after it.
+
+    Args:
+        paging_options: The paging options to split. If None, the pages are not limited in number.
+        chunk_size: The maximum number of items in a page.
+
+    Returns:
+        An iterator over the paging options of the pages.
+    """
+    offset = 0
+    remaining = None
+    after = None
+    if paging_options is not None:
+        offset = paging_options.offset or 0
+        remaining = paging_options.limit
+    if isinstance(paging_options, CursorPagingOptions):
+        after = paging_options.after
+
+    while remaining is None or remaining > 0:
+        limit = chunk_size if remaining is None else min(chunk_size, remaining)
+        if after is None:
+            yield PagingOptions(limit=limit, offset=offset)
+        else:
+            yield CursorPagingOptions(limit=limit, after=after, offset=offset)
+        offset += limit
+        if remaining is not None:
+            remaining -= limit
+
+
+def _apply_cursor(
+    filter_spec: Optional[SpecificationInterface[TModel, bool]],
+    order_options: Optional[OrderOptions],
+    paging_options: Optional[PagingOptions],
+) -> Optional[SpecificationInterface[TModel, bool]]:
+    """Restricts the filter specification to the items following the cursor of cursor paging options.
+
+    Besides the exact comparison of sort keys, the restriction includes a range condition
+    on the first order attribute, so that a `SortedIndex` over it can narrow the candidates down.
+
+    Args:
+        filter_spec: The filter specification to restrict.
+        order_options: The order options the cursor refers to.
+        paging_options: The paging options.
+
+    Returns:
+        The restricted filter specification.
+
+    Raises:
+        ValueError: If the cursor is used without order options or does not match them.
+    """
+    if not isinstance(paging_options, CursorPagingOptions) or paging_options.after is None:
+        return filter_spec
+    if order_options is None or not order_options.options:
+        raise ValueError('Cursor paging requires order options')
+    if len(paging_options.after) != len(order_options.options):
+        raise ValueError('Cursor values do not match the order options')
+
+    first, value = order_options.options[0], paging_options.after[0]
+    nones_spec = AttributeSpecification(first.attribute, None)
+    if value is None:
+        bound_spec = nones_spec if first.nones == NonesOrder.LAST else None
+    else:
+        operator = Operator.GTE if first.direction == OrderDirection.ASC else Operator.LTE
+        bound_spec = AttributeSpecification(first.attribute, value, operator)
+        if first.nones == NonesOrder.LAST:
+            bound_spec = OrSpecification(bound_spec, nones_spec)
+
+    specs = [spec for spec in (filter_spec, bound_spec) if spec is not None]
+    specs.append(_CursorSpecification(order_options, paging_options.after))
+    return AndSpecification(*specs)
+
+def _get_paging_end(paging_options: Optional[PagingOptions]) -> Optional[int]:
+    """Returns the position after the last item of the page.
+
+    Args:
+        paging_options: The paging options.
+
+    Returns:
+        The end position of the page, or None if the page is not limited.
+    """
+    if paging_options is None or paging_options.limit is None:
+        return None
+    return (paging_options.offset or 0) + paging_options.limit
+
+
+class _CursorSpecification(SpecificationInterface[TModel, bool]):
+    """Matches the items sorted strictly after the cursor values."""
+    _order_options: OrderOptions
+    _after: Tuple[Any, ...]
+    _sort_key: SortKey
+    _key: tuple
+
+    def __init__(self, order_options: OrderOptions, after: Tuple[Any, ...]):
+        """Initializes a new _CursorSpecification.
+
+        Args:
+            order_options: The order options the cursor refers to.
+            after: The values of the order attributes of the last seen item.
+        """
+        self._order_options = order_options
+        self._after = after
+        self._sort_key = SortKey(order_options)
+        self._key = self._sort_key.from_values(after)
+
+    def is_satisfied_by(self, model: TModel) -> bool:
+        return self._sort_key.follows(model, self._key)
+
+    def get_fingerprint(self) -> Hashable:
+        """Returns the type of the specification with the fingerprints of the order options and the cursor values.
+
+        Raises:
+            TypeError: If one of the cursor values is unhashable.
+        """
+        return type(self), self._order_options.get_fingerprint(), get_value_fingerprint(self._after)
+
+
+def _match_partition(filter_spec: SpecificationInterface[TModel, bool], items: List[TModel]) -> List[int]:
+    """Returns the positions of the items satisfying the specification.
+
+    Runs in the workers of `ListBasedCrudRepository._parallel_executor`, so it is a module-level function.
+
+    Args:
+        filter_spec: The specification to match the items against.
+        items: The items to check.
+
+    Returns:
+        The positions of the matching items in ascending order.
+    """
+    predicate = SpecificationCompiler().compile(filter_spec)
+    return [position for position, item in enumerate(items) if predicate(item)]
+
+
+def _match_rows(filter_spec: SpecificationInterface[TModel, bool], attribute_names: List[str], rows: List[Any]) -> List[int]:
+    """Returns the positions of the rows of attribute values satisfying the specification.
+
+    Runs in the workers of `ListBasedCrudRepository._parallel_executor`, so it is a module-level function.
+
+    Args:
+        filter_spec: The specification to match the rows against.
+        attribute_names: The names of the attributes, in the order of the row values.
+        rows: The rows of attribute values (single values if there is only one attribute).
+
+    Returns:
+        The positions of the matching rows in ascending order.
+    """
+    if len(attribute_names) == 1:
+        compiler = _RowCompiler(lambda name: _identity)
+    else:
+        positions = {name: position for position, name in enumerate(attribute_names)}
+        compiler = _RowCompiler(lambda name: operator.itemgetter(positions[name]))
+    predicate = compiler.compile(filter_spec)
+    return [position for position, row in enumerate(rows) if predicate(row)]
+
+
+class _RowCompiler(StrictSpecificationCompiler):
+    """Compiles specifications evaluated against rows of attribute values instead of models.
+
+    Only the standard specification classes can be compiled this way, since any other specification
+    expects a model in its `is_satisfied_by`.
+    """
+
+    @staticmethod
+    def get_attribute_names(filter_spec: SpecificationInterface[TModel, bool]) -> Optional[List[str]]:
+        """Returns the names of the attributes the specification reads.
+
+        Args:
+            filter_spec: The specification to inspect.
+
+        Returns:
+            The attribute names in the order of their first use, or None if the specification
+            cannot be evaluated against rows.
+        """
+        names = []
+
+        def getter_factory(name: str) -> Callable[[Any], Any]:
+            if name not in names:
+                names.append(name)
+            return _identity
+
+        try:
+            _RowCompiler(getter_factory).compile(filter_spec)
+        except NotImplementedError:
+            return None
+        return names or None
+
@@ -1,7 +1,10 @@
 import abc
 import re
+from collections.abc import Iterable, Iterator
 from enum import Enum
-from typing import List, TypeVar, Generic
+from typing import List, TypeVar, Generic, Callable, Optional, Tuple, Hashable
+
+from abstractrepo.fingerprint import FingerprintMixin, get_value_fingerprint, get_collection_fingerprint
 
 TResult = TypeVar('TResult')
 TModel = TypeVar('TModel')
@@ -31,7 +34,63 @@ class Operator(Enum):
     NOT_IN = 'NOT_IN'  # Value is not in a list
 
 
-class SpecificationInterface(Generic[TModel, TResult], abc.ABC):
+class LikePattern:
+    """A SQL LIKE pattern translated into a matching function.
+
+    `%` matches any sequence of characters (including an empty one) and `_` matches any single character.
+    All other characters match literally. Patterns of the forms `abc`, `abc%`, `%abc` and `%abc%` are
+    matched with plain string operations; other patterns are compiled into a regular expression once.
+
+    Attributes:
+        pattern: The source LIKE pattern.
+        match: A function returning whether a whole string matches the pattern. Raises TypeError for non-strings.
+    """
+    pattern: str
+    match: Callable[[str], bool]
+
+    def __init__(self, pattern: str):
+        """Initializes a new LikePattern.
+
+        Args:
+            pattern: The LIKE pattern to translate.
+        """
+        self.pattern = pattern
+        self.match = self._translate(pattern)
+
+    def __getstate__(self) -> dict:
+        return {'pattern': self.pattern}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state['pattern'])
+
+    @staticmethod
+    def _translate(pattern: str) -> Callable[[str], bool]:
+        """Builds the matching function for the pattern."""
+        if '_' not in pattern:
+            literal = pattern.strip('%')
+            if '%' not in literal:
+                if pattern.startswith('%') and pattern.endswith('%'):
+                    return lambda string: str.__contains__(string, literal)
+                if pattern.endswith('%'):
+                    return lambda string: str.startswith(string, literal)
+                if pattern.startswith('%'):
+                    return lambda string: str.endswith(string, literal)
+                return lambda string: str.__eq__(string, literal)
+
+        regex = []
+        for char in pattern:
+            if char == '%':
+                if not regex or regex[-1] != '.*':
+                    regex.append('.*')
+            elif char == '_':
+                regex.append('.')
+            else:
+                regex.append(re.escape(char))
+        fullmatch = re.compile(''.join(regex), re.DOTALL).fullmatch
+        return lambda string: fullmatch(string) is not None
+
+
+class SpecificationInterface(FingerprintMixin, Generic[TModel, TResult], abc.ABC):
     """Abstract base class for all specifications.
 
     A specification encapsulates business rules and criteria that can be applied
@@ -54,6 +113,21 @@ class SpecificationInterface(Generic[TModel, TResult], abc.ABC):
         """
         raise NotImplementedError()
 
+    def get_fingerprint(self) -> Hashable:
+        """Returns a hashable value identifying the specification by its structure and operands.
+
+        Specifications with equal fingerprints are satisfied by the same models, so fingerprints can key
+        caches of query results. The built-in specifications compute them from their attributes; other
+        specifications have none unless they override this method.
+
+        Returns:
+            The fingerprint of the specification.
+
+        Raises:
+            TypeError: If the specification cannot be identified by value.
+        """
+        raise TypeError(f'{type(self).__name__} has no fingerprint')
+
 
 class SpecificationConverterInterface(Generic[TModelFrom, TResultFrom, TModelTo, TResultTo], abc.ABC):
     """Abstract base class for converting specifications between different model types.
@@ -108,6 +182,14 @@ class BaseAndSpecification(Generic[TModel, TResult], SpecificationInterface[TMod
         """
         self.specifications = list(specifications)
 
+    def get_fingerprint(self) -> Hashable:
+        """Returns the type of the specification with the fingerprints of the combined specifications.
+
+        Raises:
+            TypeError: If one of the combined specifications has no fingerprint.
+        """
+        return (type(self),) + tuple(spec.get_fingerprint() for spec in self.specifications)
+
 
 class BaseOrSpecification(Generic[TModel, TResult], SpecificationInterface[TModel, TResult], abc.ABC):
     """Base abstract class for OR logical specifications.
@@ -133,6 +215,14 @@ class BaseOrSpecification(Generic[TModel, TResult], SpecificationInterface[TMode
         """
         self.specifications = list(specifications)
 
+    def get_fingerprint(self) -> Hashable:
+        """Returns the type of the specification with the fingerprints of the combined specifications.
+
+        Raises:
+            TypeError: If one of the combined specifications has no fingerprint.
+        """
+        return (type(self),) + tuple(spec.get_fingerprint() for spec in self.specifications)
+
 
 class BaseNotSpecification(Generic[TModel, TResult], SpecificationInterface[TModel, TResult], abc.ABC):
     """Base abstract class for NOT logical specifications.
@@ -157,6 +247,14 @@ class BaseNotSpecification(Generic[TModel, TResult], SpecificationInterface[TMod
         """
         self.specification = specification
 
+    def get_fingerprint(self) -> Hashable:
+        """Returns the type of the specification with the fingerprint of the negated specification.
+
+        Raises:
+            TypeError: If the negated specification has no fingerprint.
+        """
+        return type(self), self.specification.get_fingerprint()
+
 
 class BaseAttributeSpecification(Generic[TModel, TResult], SpecificationInterface[TModel, TResult], abc.ABC):
     """Base abstract class for attribute-based specifications.
@@ -177,6 +275,7 @@ class BaseAttributeSpecification(Generic[TModel, TResult], SpecificationInterfac
     attribute_name: str
     attribute_value: object
     operator: Operator
+    _fingerprint_cache: Optional[Tuple[str, object, Operator, Hashable]] = None
 
     def __init__(self, attribute_name: str, attribute_value: object, operator: Operator = Operator.E):
         """Initializes a new BaseAttributeSpecification.
@@ -190,6 +289,30 @@ class BaseAttributeSpecification(Generic[TModel, TResult], SpecificationInterfac
         self.attribute_value = attribute_value
         self.operator = operator
 
+    def get_fingerprint(self) -> Hashable:
+        """Returns the type of the specification with its attribute name, operator and operand.
+
+        IN and NOT_IN operands are identified by the set of their members, regardless of order and duplicates
+        (see `get_collection_fingerprint`), other operands by their types and values (see `get_value_fingerprint`).
+        Only immutable operands have a fingerprint, so it is cached until one of the attributes is reassigned.
+
+        Raises:
+            TypeError: If the operand is mutable (e.g. a list) or contains unhashable values.
+        """
+        cache = self._fingerprint_cache
+        if cache is not None and cache[0] == self.attribute_name and cache[1] is self.attribute_value \
+                and cache[2] == self.operator:
+            return cache[3]
+
+        value = self.attribute_value
+        if self.operator in (Operator.IN, Operator.NOT_IN) and isinstance(value, (tuple, frozenset)):
+            value_fingerprint = get_collection_fingerprint(value)
+        else:
+            value_fingerprint = get_value_fingerprint(value)
+        fingerprint = type(self), self.attribute_name, self.operator, value_fingerprint
+        self._fingerprint_cache = (self.attribute_name, value, self.operator, fingerprint)
+        return fingerprint
+
 
 class AndSpecification(Generic[TModel], BaseAndSpecification[TModel, bool]):
     """A concrete implementation of an AND logical specification.
@@ -252,8 +375,30 @@ class AttributeSpecification(Generic[TModel], BaseAttributeSpecification[TModel,
     """A concrete implementation of an attribute-based specification.
 
     This specification evaluates a model based on the value of a specific attribute
-    and a given comparison operator.
+    and a given comparison operator. LIKE and ILIKE patterns are translated into a `LikePattern`
+    once and reused until the attribute value or the operator changes.
+
+    IN and NOT_IN accept any non-string collection (list, tuple, set, etc.) as the attribute value.
+    Sets are frozen into a frozenset and lists, dictionaries and one-shot iterators such as generators
+    into a tuple on construction, so later changes to the passed collection do not affect the specification.
     """
+    _like_cache: Optional[Tuple[object, Operator, LikePattern]] = None
+
+    def __init__(self, attribute_name: str, attribute_value: object, operator: Operator = Operator.E):
+        """Initializes a new AttributeSpecification.
+
+        Args:
+            attribute_name: The name of the attribute on the model to check.
+            attribute_value: The value to compare against the attribute.
+            operator: The comparison operator to use. Defaults to Operator.E (equality).
+        """
+        if operator in (Operator.IN, Operator.NOT_IN):
+            if isinstance(attribute_value, (set, frozenset)):
+                attribute_value = frozenset(attribute_value)
+            elif isinstance(attribute_value, (list, dict, Iterator)):
+                attribute_value = tuple(attribute_value)
+        super().__init__(attribute_name, attribute_value, operator)
+
     def is_satisfied_by(self, model: TModel) -> bool:
         """Checks if the model's attribute satisfies the condition defined by the operator and value.
 
@@ -264,7 +409,7 @@ class AttributeSpecification(Generic[TModel], BaseAttributeSpecification[TModel,
             True if the attribute satisfies the condition, False otherwise.
 
         Raises:
-            ValueError: If the attribute value type is not compatible with the operator (e.g., IN/NOT_IN with non-list).
+            ValueError: If the attribute value type is not compatible with the operator (e.g., IN/NOT_IN with non-collection).
             TypeError: If an unsupported operator is provided.
         """
         model_attr = getattr(model, self.attribute_name)
@@ -289,28 +434,58 @@ class AttributeSpecification(Generic[TModel], BaseAttributeSpecification[TModel,
         if self.operator == Operator.LTE:
             return model_attr <= self.attribute_value
         if self.operator == Operator.LIKE:
-            return self._like(str(self.attribute_value), model_attr)
+            return self.get_like_pattern().match(model_attr)
         if self.operator == Operator.ILIKE:
-            return self._like(str(self.attribute_value).lower(), model_attr.lower())
+            return self.get_like_pattern().match(model_attr.lower())
         if self.operator == Operator.IN:
-            if isinstance(self.attribute_value, list):
+            if self.is_collection_value(self.attribute_value):
                 return model_attr in self.attribute_value
-            raise ValueError('Attribute value must be a list')
+            raise ValueError('Attribute value must be a collection')
         if self.operator == Operator.NOT_IN:
-            if isinstance(self.attribute_value, list):
+            if self.is_collection_value(self.attribute_value):
                 return model_attr not in self.attribute_value
-            raise ValueError('Attribute value must be a list')
+            raise ValueError('Attribute value must be a collection')
         raise TypeError(f'Unsupported operator: {self.operator}')
 
+    @staticmethod
+    def is_collection_value(value: object) -> bool:
+        """Returns whether the value is a valid operand for IN and NOT_IN operations.
+
+        Args:
+            value: The attribute value to check.
+
+        Returns:
+            True for iterables other than strings and bytes, False otherwise.
+        """
+        return isinstance(value, Iterable) and not isinstance(value, (str, bytes, bytearray))
+
+    def get_like_pattern(self) -> LikePattern:
+        """Returns the translated pattern for LIKE and ILIKE operations.
+
+        The pattern is the string form of the attribute value, lowercased for ILIKE.
+
+        Returns:
+            The cached LikePattern instance.
+        """
+        cache = self._like_cache
+        if cache is None or cache[0] is not self.attribute_value or cache[1] != self.operator:
+            pattern = str(self.attribute_value)
+            if self.operator == Operator.ILIKE:
+                pattern = pattern.lower()
+            cache = (self.attribute_value, self.operator, LikePattern(pattern))
+            self._like_cache = cache
+        return cache[2]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop('_like_cache', None)
+        state.pop('_fingerprint_cache', None)
+        return state
+
     @staticmethod
     def _like(pattern: str, string: str) -> bool:
         """Helper method for LIKE and ILIKE operations.
 
         Performs a SQL-like pattern match on the given string.
         """
-        # Replace SQL pattern wildcards (%) and (_) with regex equivalents
-        pattern = pattern.replace('%', '.*').replace('_', '.')
-        # Add start and end of string
-        pattern = '^' + pattern + '$'
-        # Check if the string matches the pattern
-        return re.match(pattern, string) is not None
+        return LikePattern(pattern).match(string)
@@ -0,0 +1,1532 @@
+import abc
+import asyncio
+import collections
+import contextlib
+import functools
+import itertools
+import math
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet, Generic, Hashable, Iterable, Iterator, List, \
+    Optional, Sequence, Tuple, TypeVar, Union
+
+from abstractrepo.columnar import ColumnType
+from abstractrepo.compiler import SpecificationCompiler
+from abstractrepo.exceptions import ItemNotFoundException
+from abstractrepo.locking import ReadWriteLock
+from abstractrepo.order import OrderOptions, OrderDirection, NonesOrder, SortKey
+from abstractrepo.paging import PagingOptions, CursorPagingOptions
+from abstractrepo.pool import ConnectionPool
+from abstractrepo.repo import CrudRepositoryInterface, AsyncCrudRepositoryInterface, _apply_cursor, _check_chunk_size, \
+    _get_paging_end
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, NotSpecification, Operator
+
+TModel = TypeVar('TModel')
+TIdValueType = TypeVar('TIdValueType')
+TCreateSchema = TypeVar('TCreateSchema')
+TUpdateSchema = TypeVar('TUpdateSchema')
+
+SqlFragment = Tuple[str, List[Any]]
+
+
+class SqliteSpecificationTranslator:
+    """Translates specifications, order options and paging options into parameterized SQLite clauses.
+
+    `AttributeSpecification`, `AndSpecification`, `OrSpecification` and `NotSpecification` trees are
+    translated into WHERE conditions that select the same rows as `is_satisfied_by` selects models,
+    including the rule that a None attribute fails every comparison with a non-None value: each comparison
+    is guarded with `IS NOT NULL`, so conditions never evaluate to SQL NULL and `NOT` negates them exactly.
+    LIKE is translated into GLOB, which is case-sensitive, and ILIKE into GLOB on the lowercased column.
+
+    Values are compared with SQLite's rules, so the results only differ from Python's when a column holds
+    values of different types (e.g. a TEXT column compared with a number). Conditions that cannot be translated
+    exactly (custom specifications, attributes without a column, operands SQLite cannot bind such as None
+    in a range comparison, NaN or too long IN lists) raise `NotImplementedError`; they have to be evaluated
+    on the models.
+
+    The SQL text depends only on the shape of the specification (see `get_shape`), never on the values,
+    which are all bound as parameters. IN and NOT_IN operands are padded to the next power of two by repeating
+    the last one, so lists of similar sizes share their SQL text as well.
+
+    Attributes:
+        MAX_IN_VALUES: The maximum number of IN and NOT_IN operands bound as parameters.
+    """
+    MAX_IN_VALUES: int = 512
+
+    _columns: FrozenSet[str]
+    _lower_function: str
+
+    def __init__(self, columns: Iterable[str], lower_function: str = 'lower'):
+        """Initializes a new SqliteSpecificationTranslator.
+
+        Args:
+            columns: The names of the attributes stored in columns of the same name.
+            lower_function: The SQL function lowercasing strings for ILIKE. The built-in `lower`
+                            only lowercases ASCII characters, unlike `str.lower`.
+        """
+        self._columns = frozenset(columns)
+        self._lower_function = lower_function
+
+    def translate(self, specification: SpecificationInterface[Any, bool]) -> SqlFragment:
+        """Translates the specification into a WHERE condition.
+
+        Args:
+            specification: The specification to translate.
+
+        Returns:
+            The SQL condition and its parameters.
+
+        Raises:
+            NotImplementedError: If the specification cannot be translated exactly.
+        """
+        shape = self.get_shape(specification)
+        params = []
+        self._collect_parameters(specification, params)
+        return self._build_condition(shape), params
+
+    def get_shape(self, specification: SpecificationInterface[Any, bool]) -> Hashable:
+        """Returns the shape of the specification: everything its SQL text depends on.
+
+        The shape consists of the tree of logical nodes with the attribute names and operators of the conditions,
+        whether each operand is None, and the padded number of IN and NOT_IN operands.
+
+        Args:
+            specification: The specification to describe.
+
+        Returns:
+            A hashable description of the shape.
+
+        Raises:
+            NotImplementedError: If the specification cannot be translated.
+        """
+        spec_type = type(specification)
+        if spec_type is AttributeSpecification:
+            return self._get_attribute_shape(specification)
+        if spec_type is AndSpecification:
+            return ('AND',) + tuple(self.get_shape(spec) for spec in specification.specifications)
+        if spec_type is OrSpecification:
+            return ('OR',) + tuple(self.get_shape(spec) for spec in specification.specifications)
+        if spec_type is NotSpecification:
+            return 'NOT', self.get_shape(specification.specification)
+        raise NotImplementedError(f'Cannot translate {spec_type.__name__}')
+
+    def translate_order(self, order_options: OrderOptions) -> str:
+        """Translates the order options into ORDER BY terms, placing None values as requested.
+
+        Args:
+            order_options: The order options to translate.
+
+        Returns:
+            The comma-separated ORDER BY terms, without the ORDER BY keyword.
+
+        Raises:
+            NotImplementedError: If an order attribute has no column.
+        """
+        return self._build_order(_get_order_shape(order_options))
+
+    def translate_cursor(self, order_options: OrderOptions, after: Sequence[Any]) -> SqlFragment:
+        """Translates a cursor into a condition selecting the rows sorted strictly after it.
+
+        Args:
+            order_options: The order options the cursor refers to.
+            after: The values of the order attributes of the last seen item.
+
+        Returns:
+            The SQL condition and its parameters.
+
+        Raises:
+            NotImplementedError: If an order attribute has no column or a cursor value cannot be bound.
+        """
+        params = []
+        for position, value in enumerate(after):
+            if value is not None:
+                self._check_value(value)
+                # The last value is only compared in the "after" condition, the others in the "equal" one as well.
+                params.extend([value] if position == len(after) - 1 else [value, value])
+        shape = tuple(zip(_get_order_shape(order_options), (value is None for value in after)))
+        return self._build_cursor(shape), params
+
+    @staticmethod
+    def translate_paging(paging_options: PagingOptions) -> SqlFragment:
+        """Translates the limit and offset of the paging options into a LIMIT clause.
+
+        Args:
+            paging_options: The paging options to translate.
+
+        Returns:
+            The LIMIT clause, or an empty string if no limit and no offset are set, and its parameters.
+        """
+        if paging_options.limit is None and not paging_options.offset:
+            return '', []
+        limit = -1 if paging_options.limit is None else paging_options.limit
+        return 'LIMIT ? OFFSET ?', [limit, paging_options.offset or 0]
+
+    @staticmethod
+    def is_bindable(value: Any) -> bool:
+        """Returns whether SQLite binds the value as a parameter without changing comparison results.
+
+        Args:
+            value: The value to check.
+
+        Returns:
+            True for 64-bit integers, floats other than NaN (bound as NULL), strings and bytes.
+        """
+        if isinstance(value, int):
+            return -2 ** 63 <= value < 2 ** 63
+        if isinstance(value, float):
+            return not math.isnan(value)
+        return isinstance(value, (str, bytes))
+
+    def _get_attribute_shape(self, specification: AttributeSpecification[Any]) -> Hashable:
+        """Returns the shape of a single attribute condition.
+
+        Raises:
+            NotImplementedError: If the condition cannot be translated whatever its operand.
+        """
+        name = specification.attribute_name
+        if name not in self._columns:
+            raise NotImplementedError(f'No column for {name}')
+
+        value = specification.attribute_value
+        op = specification.operator
+        if value is None:
+            if op in (Operator.E, Operator.NE):
+                return name, op, None
+            raise NotImplementedError(f'Cannot compare with None using {op}')
+        if op in _COMPARISONS or op in (Operator.LIKE, Operator.ILIKE):
+            return name, op, 1
+        if op in (Operator.IN, Operator.NOT_IN) and AttributeSpecification.is_collection_value(value):
+            size = sum(1 for operand in value if operand is not None)
+            if size > self.MAX_IN_VALUES:
+                raise NotImplementedError('Too many IN operands')
+            return name, op, _get_padded_size(size)
+        raise NotImplementedError(f'Cannot translate {op} with {type(value).__name__}')
+
+    def _collect_parameters(self, specification: SpecificationInterface[Any, bool], params: List[Any]) -> None:
+        """Appends the parameters of a translatable specification to the list, in the order of their placeholders.
+
+        Raises:
+            NotImplementedError: If an operand cannot be bound.
+        """
+        spec_type = type(specification)
+        if spec_type is NotSpecification:
+            self._collect_parameters(specification.specification, params)
+            return
+        if spec_type is not AttributeSpecification:
+            for spec in specification.specifications:
+                self._collect_parameters(spec, params)
+            return
+
+        value, op = specification.attribute_value, specification.operator
+        if value is None:
+            return
+        if op in _COMPARISONS:
+            self._check_value(value)
+            params.append(value)
+        elif op == Operator.LIKE:
+            params.append(_to_glob(str(value)))
+        elif op == Operator.ILIKE:
+            params.append(_to_glob(str(value).lower()))
+        else:
+            operands = [operand for operand in value if operand is not None]
+            for operand in operands:
+                self._check_value(operand)
+            params.extend(operands)
+            params.extend(operands[-1:] * (_get_padded_size(len(operands)) - len(operands)))
+
+    def _build_condition(self, shape: Hashable) -> str:
+        """Builds the SQL condition of a specification shape."""
+        kind = shape[0]
+        if kind == 'AND':
+            return self._join([self._build_condition(child) for child in shape[1:]], 'AND', '1')
+        if kind == 'OR':
+            return self._join([self._build_condition(child) for child in shape[1:]], 'OR', '0')
+        if kind == 'NOT':
+            return f'NOT {self._build_condition(shape[1])}'
+
+        name, op, size = shape
+        column = quote_identifier(name)
+        if size is None:
+            return f'{column} IS NULL' if op == Operator.E else f'{column} IS NOT NULL'
+        if op in _COMPARISONS:
+            return f'({column} IS NOT NULL AND {column} {_COMPARISONS[op]} ?)'
+        if op == Operator.LIKE:
+            return f'({column} IS NOT NULL AND {column} GLOB ?)'
+        if op == Operator.ILIKE:
+            return f'({column} IS NOT NULL AND {self._lower_function}({column}) GLOB ?)'
+        if not size:
+            return '0' if op == Operator.IN else f'{column} IS NOT NULL'
+        keyword = 'IN' if op == Operator.IN else 'NOT IN'
+        return f'({column} IS NOT NULL AND {column} {keyword} ({", ".join("?" * size)}))'
+
+    def _build_order(self, shape: Tuple[Tuple[str, OrderDirection, NonesOrder], ...]) -> str:
+        """Builds the ORDER BY terms of an order options shape."""
+        terms = []
+        for attribute, direction, nones in shape:
+            column = self._get_column(attribute)
+            # SQLite sorts NULL before every value, i.e. first in ascending and last in descending order.
+            if (nones == NonesOrder.FIRST) != (direction == OrderDirection.ASC):
+                terms.append(f'{column} IS NULL {"DESC" if nones == NonesOrder.FIRST else "ASC"}')
+            terms.append(f'{column} {direction.value}')
+        return ', '.join(terms)
+
+    def _build_cursor(self, shape: Tuple[Tuple[Tuple[str, OrderDirection, NonesOrder], bool], ...]) -> str:
+        """Builds the condition of a cursor shape: the order options and whether each cursor value is None."""
+        sql = None
+        for (attribute, direction, nones), is_none in reversed(shape):
+            column = self._get_column(attribute)
+            nones_last = nones == NonesOrder.LAST
+            if is_none:
+                after_sql = '0' if nones_last else f'{column} IS NOT NULL'
+                equal_sql = f'{column} IS NULL'
+            else:
+                comparison = '<' if direction == OrderDirection.DESC else '>'
+                after_sql = f'({column} IS NOT NULL AND {column} {comparison} ?)'
+                if nones_last:
+                    after_sql = f'({after_sql} OR {column} IS NULL)'
+                equal_sql = f'({column} IS NOT NULL AND {column} = ?)'
+            sql = after_sql if sql is None else f'({after_sql} OR ({equal_sql} AND {sql}))'
+        return sql or '0'
+
+    def _get_column(self, attribute: str) -> str:
+        """Returns the quoted column name of the attribute.
+
+        Raises:
+            NotImplementedError: If the attribute has no column.
+        """
+        if attribute not in self._columns:
+            raise NotImplementedError(f'No column for {attribute}')
+        return quote_identifier(attribute)
+
+    def _check_value(self, value: Any) -> None:
+        """Checks that the value can be bound as a parameter.
+
+        Raises:
+            NotImplementedError: If SQLite cannot bind the value exactly.
+        """
+        if not self.is_bindable(value):
+            raise NotImplementedError(f'Cannot bind {value!r}')
+
+    @staticmethod
+    def _join(conditions: List[str], keyword: str, empty: str) -> str:
+        """Combines conditions with AND or OR."""
+        if not conditions:
+            return empty
+        if len(conditions) == 1:
+            return conditions[0]
+        return '(' + f' {keyword} '.join(conditions) + ')'
+
+
+class CachingSqliteSpecificationTranslator(SqliteSpecificationTranslator):
+    """A translator reusing the SQL texts built for specifications, order options and cursors of the same shape.
+
+    Queries usually come in a few shapes with different values, so for a specification of a known shape
+    only the parameters are collected. Stable SQL texts also let `sqlite3` reuse its prepared statements
+    (see the `cached_statements` argument of `sqlite3.connect`).
+
+    The cache keeps the `max_size` most recently used texts and can be shared between threads.
+
+    Attributes:
+        hits: The number of SQL texts taken from the cache.
+        misses: The number of SQL texts built because they were not in the cache.
+    """
+    hits: int
+    misses: int
+    _max_size: int
+    _cache: 'collections.OrderedDict[Hashable, str]'
+    _lock: threading.Lock
+
+    def __init__(self, columns: Iterable[str], lower_function: str = 'lower', max_size: int = 256):
+        """Initializes a new CachingSqliteSpecificationTranslator.
+
+        Args:
+            columns: The names of the attributes stored in columns of the same name.
+            lower_function: The SQL function lowercasing strings for ILIKE.
+            max_size: The maximum number of cached SQL texts.
+
+        Raises:
+            ValueError: If the maximum size is not positive.
+        """
+        if max_size < 1:
+            raise ValueError('Cache size must be positive')
+        super().__init__(columns, lower_function)
+        self.hits = 0
+        self.misses = 0
+        self._max_size = max_size
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Empties the cache and resets the counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _build_condition(self, shape: Hashable) -> str:
+        return self._get_cached(('WHERE', shape), super()._build_condition, shape)
+
+    def _build_order(self, shape: Tuple[Tuple[str, OrderDirection, NonesOrder], ...]) -> str:
+        return self._get_cached(('ORDER', shape), super()._build_order, shape)
+
+    def _build_cursor(self, shape: Tuple[Tuple[Tuple[str, OrderDirection, NonesOrder], bool], ...]) -> str:
+        return self._get_cached(('CURSOR', shape), super()._build_cursor, shape)
+
+    def _get_cached(self, key: Hashable, build: Callable[[Any], str], shape: Any) -> str:
+        """Returns the cached SQL text for the key, building and caching it if needed."""
+        with self._lock:
+            sql = self._cache.get(key)
+            if sql is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return sql
+            self.misses += 1
+
+        sql = build(shape)
+        with self._lock:
+            self._cache[key] = sql
+            if len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+        return sql
+
+
+def quote_identifier(name: str) -> str:
+    """Quotes a table or column name for SQLite.
+
+    Args:
+        name: The name to quote.
+
+    Returns:
+        The name in double quotes, with double quotes inside it doubled.
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def sqlite_lower(value: Any) -> Any:
+    """Lowercases strings like `str.lower`, for registration as an SQLite function used by ILIKE.
+
+    Args:
+        value: The column value.
+
+    Returns:
+        The lowercased string, or the value itself if it is not a string.
+    """
+    return value.lower() if isinstance(value, str) else value
+
+
+class BaseSqliteRepository(abc.ABC, Generic[TModel, TIdValueType]):
+    """Base abstract class for repositories storing their items in an SQLite table.
+
+    Each model attribute declared by `_create_columns` is stored in a column of the same name
+    (see `_SQLITE_TYPES` for the declared SQL types); the `_id_column` column is the primary key.
+    The table and the indexes over `_indexed_columns` are created if they do not exist yet.
+
+    Filters are translated into WHERE clauses by `SqliteSpecificationTranslator`,
+    order options into ORDER BY and paging options into LIMIT and OFFSET, so SQLite selects the rows,
+    using its indexes where possible. Parts of a filter that cannot be translated (e.g. custom specifications)
+    are evaluated on the models: when they are combined with translatable conditions by an `AndSpecification`,
+    only the rows selected by these conditions are read. Order attributes without a column are sorted in Python.
+
+    Items are returned in the order of the rowid when no order options are given, and ties keep that order.
+    When the ID column is an INTEGER primary key, it is the rowid itself.
+
+    The SQL texts are cached by the shape of the filters, order options and cursors, keeping the `_sql_cache_size`
+    most recently used ones (see `CachingSqliteSpecificationTranslator`); set it to 0 to
+    disable the cache.
+
+    Models are built from the rows on every read, so the returned objects are detached from the storage.
+    """
+    _table_name: Optional[str] = None
+    _id_column: str = 'id'
+    _indexed_columns: Tuple[str, ...] = ()
+    _sql_cache_size: int = 256
+    _columns: Dict[str, ColumnType]
+    _translator: SqliteSpecificationTranslator
+
+    def _init_storage(self) -> None:
+        """Reads the declared columns and prepares the translator.
+
+        Raises:
+            ValueError: If no column is declared for the ID attribute.
+        """
+        self._columns = self._create_columns()
+        if self._id_column not in self._columns:
+            raise ValueError(f'No column declared for the ID attribute {self._id_column}')
+        if self._sql_cache_size > 0:
+            self._translator = CachingSqliteSpecificationTranslator(
+                self._columns, _SQLITE_LOWER_FUNCTION, self._sql_cache_size)
+        else:
+            self._translator = SqliteSpecificationTranslator(self._columns, _SQLITE_LOWER_FUNCTION)
+
+    def _prepare_connection(self, connection: sqlite3.Connection) -> None:
+        """Registers the functions used by the queries on a new connection.
+
+        Args:
+            connection: The connection to the database.
+        """
+        connection.create_function(_SQLITE_LOWER_FUNCTION, 1, sqlite_lower)
+
+    def _create_table(self, connection: sqlite3.Connection) -> None:
+        """Creates the table and its indexes if needed.
+
+        Args:
+            connection: The connection to the database.
+        """
+        definitions = []
+        for name, column_type in self._columns.items():
+            definition = f'{quote_identifier(name)} {_SQLITE_TYPES[column_type]}'.rstrip()
+            if name == self._id_column:
+                definition += ' PRIMARY KEY'
+            definitions.append(definition)
+
+        table_name = self._get_table_name()
+        with connection:
+            connection.execute(f'CREATE TABLE IF NOT EXISTS {quote_identifier(table_name)} ({", ".join(definitions)})')
+            for name in self._indexed_columns:
+                index_name = quote_identifier(f'{table_name}_{name}_idx')
+                connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS {index_name} ON {quote_identifier(table_name)} ({quote_identifier(name)})'
+                )
+
+    @abc.abstractmethod
+    def _create_columns(self) -> Dict[str, ColumnType]:
+        """Returns the stored attributes and their column types.
+
+        E.g. `return {'id': ColumnType.INT, 'title': ColumnType.STR, 'rating': ColumnType.FLOAT}`.
+
+        Returns:
+            A dictionary mapping attribute names to column types.
+        """
+        raise NotImplementedError()
+
+    def _build_model(self, values: Dict[str, Any]) -> TModel:
+        """Builds a model from the values stored in a row.
+
+        Args:
+            values: A dictionary mapping attribute names to values.
+
+        Returns:
+            The new model. By default, `model_class` is called with the values as keyword arguments.
+        """
+        return self.model_class(**values)
+
+    def _get_table_name(self) -> str:
+        """Returns the name of the table, by default the lowercased name of the model class."""
+        return self._table_name or self.model_class.__name__.lower()
+
+    def _read_row(self, row: Tuple[Any, ...]) -> Tuple[int, TModel]:
+        """Returns the rowid and the model of a row selected with `_get_select_sql`."""
+        values = dict(zip(self._columns, row[1:]))
+        for name, column_type in self._columns.items():
+            if column_type == ColumnType.BOOL and values[name] is not None:
+                values[name] = bool(values[name])
+        return row[0], self._build_model(values)
+
+    def _get_row_values(self, item: TModel) -> List[Any]:
+        """Returns the values of the columns of the item, in the order of the columns."""
+        return [getattr(item, name) for name in self._columns]
+
+    def _get_select_sql(self, where: str, order: str = '', limit: str = '') -> str:
+        """Returns the SELECT statement reading the rowid and the columns of the rows matching the condition."""
+        columns = ', '.join(map(quote_identifier, self._columns))
+        sql = f'SELECT rowid, {columns} FROM {quote_identifier(self._get_table_name())} WHERE {where}'
+        sql += f' ORDER BY {order + ", " if order else ""}rowid'
+        return f'{sql} {limit}' if limit else sql
+
+    def _fetch(self, connection: sqlite3.Connection, sql: str, params: List[Any]) -> Iterator[Tuple[int, TModel]]:
+        """Executes a SELECT statement built with `_get_select_sql` and yields the rowids and models of the rows."""
+        return map(self._read_row, connection.execute(sql, params))
+
+    def _translate_filter(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+    ) -> Tuple[str, List[Any], Optional[Callable[[TModel], bool]]]:
+        """Translates as much of the filter as possible into a WHERE condition.
+
+        Returns:
+            The SQL condition, its parameters, and the predicate the selected models still have to satisfy
+            (None if the condition selects exactly the matching rows).
+        """
+        if filter_spec is None:
+            return '1', [], None
+        try:
+            sql, params = self._translator.translate(filter_spec)
+            return sql, params, None
+        except NotImplementedError:
+            pass
+
+        if type(filter_spec) is not AndSpecification:
+            return '1', [], SpecificationCompiler().compile(filter_spec)
+
+        conditions, params, rest = [], [], []
+        for spec in filter_spec.specifications:
+            try:
+                sql, spec_params = self._translator.translate(spec)
+            except NotImplementedError:
+                rest.append(spec)
+                continue
+            conditions.append(sql)
+            params.extend(spec_params)
+        return ' AND '.join(conditions) or '1', params, SpecificationCompiler().compile(AndSpecification(*rest))
+
+    def _translate_cursor(
+        self,
+        order_options: Optional[OrderOptions],
+        paging_options: Optional[PagingOptions],
+    ) -> Tuple[str, List[Any]]:
+        """Translates the cursor of cursor paging options into a WHERE condition.
+
+        Raises:
+            ValueError: If the cursor is used without order options or does not match them.
+            NotImplementedError: If the cursor cannot be translated.
+        """
+        if not isinstance(paging_options, CursorPagingOptions) or paging_options.after is None:
+            return '1', []
+        if order_options is None or not order_options.options:
+            raise ValueError('Cursor paging requires order options')
+        if len(paging_options.after) != len(order_options.options):
+            raise ValueError('Cursor values do not match the order options')
+        return self._translator.translate_cursor(order_options, paging_options.after)
+
+    def _select(
+        self,
+        connection: sqlite3.Connection,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+        order_options: Optional[OrderOptions],
+        paging_options: Optional[PagingOptions],
+    ) -> Iterator[TModel]:
+        """Returns an iterator over the items matching the criteria, in the requested order.
+
+        Args:
+            connection: The connection to the database.
+            filter_spec: An optional SpecificationInterface instance to filter the items.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+
+        Returns:
+            An iterator over the matching TModel instances.
+        """
+        try:
+            order = self._translator.translate_order(order_options) if order_options is not None else ''
+            cursor, cursor_params = self._translate_cursor(order_options, paging_options)
+        except NotImplementedError:
+            return iter(self._select_in_python(connection, filter_spec, order_options, paging_options))
+
+        where, params, predicate = self._translate_filter(filter_spec)
+        if cursor != '1':
+            where, params = f'({where}) AND {cursor}', params + cursor_params
+
+        if predicate is None:
+            limit, limit_params = self._translator.translate_paging(paging_options) if paging_options else ('', [])
+            sql = self._get_select_sql(where, order, limit)
+            return (item for _, item in self._fetch(connection, sql, params + limit_params))
+
+        items = (item for _, item in self._fetch(connection, self._get_select_sql(where, order), params) if predicate(item))
+        if paging_options is None:
+            return items
+        end = _get_paging_end(paging_options)
+        return itertools.islice(items, paging_options.offset or 0, end)
+
+    def _select_in_python(
+        self,
+        connection: sqlite3.Connection,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+        order_options: Optional[OrderOptions],
+        paging_options: Optional[PagingOptions],
+    ) -> List[TModel]:
+        """Selects the matching items in rowid order and sorts them in Python.
+
+        Used when an order attribute has no column or the cursor cannot be translated.
+        """
+        filter_spec = _apply_cursor(filter_spec, order_options, paging_options)
+        where, params, predicate = self._translate_filter(filter_spec)
+        items = [item for _, item in self._fetch(connection, self._get_select_sql(where), params)]
+        if predicate is not None:
+            items = [item for item in items if predicate(item)]
+
+        end = _get_paging_end(paging_options)
+        if order_options is not None and order_options.options:
+            items = SortKey(order_options).sort(items, end)
+        if paging_options is not None:
+            items = items[paging_options.offset or 0:end]
+        return items
+
+    def _count(self, connection: sqlite3.Connection, filter_spec: Optional[SpecificationInterface[TModel, bool]]) -> int:
+        """Counts the rows matching the specification, with COUNT(*) if the whole filter is translated."""
+        where, params, predicate = self._translate_filter(filter_spec)
+        if predicate is None:
+            sql = f'SELECT COUNT(*) FROM {quote_identifier(self._get_table_name())} WHERE {where}'
+            return connection.execute(sql, params).fetchone()[0]
+        return sum(1 for _, item in self._fetch(connection, self._get_select_sql(where), params) if predicate(item))
+
+    def _find_rows(self, connection: sqlite3.Connection, item_ids: Iterable[TIdValueType]) -> Dict[Any, Tuple[int, TModel]]:
+        """Returns the rowids and models of the rows with the given IDs, by ID.
+
+        IDs SQLite cannot bind are never found. The IDs are looked up in batches of at most
+        `SqliteSpecificationTranslator.MAX_IN_VALUES` parameters.
+        """
+        item_ids = [item_id for item_id in item_ids if SqliteSpecificationTranslator.is_bindable(item_id)]
+        column = quote_identifier(self._id_column)
+        result = {}
+        for start in range(0, len(item_ids), SqliteSpecificationTranslator.MAX_IN_VALUES):
+            batch = item_ids[start:start + SqliteSpecificationTranslator.MAX_IN_VALUES]
+            sql = self._get_select_sql(f'{column} IN ({", ".join("?" * len(batch))})')
+            for rowid, item in self._fetch(connection, sql, batch):
+                result.setdefault(getattr(item, self._id_column), (rowid, item))
+        return result
+
+    def _exists(self, connection: sqlite3.Connection, item_id: TIdValueType) -> bool:
+        """Returns whether a row with the given ID exists; IDs SQLite cannot bind never exist."""
+        if not SqliteSpecificationTranslator.is_bindable(item_id):
+            return False
+        sql = f'SELECT 1 FROM {quote_identifier(self._get_table_name())} WHERE {quote_identifier(self._id_column)} = ?'
+        return connection.execute(sql, [item_id]).fetchone() is not None
+
+    def _find_row(self, connection: sqlite3.Connection, item_id: TIdValueType) -> Optional[Tuple[int, TModel]]:
+        """Returns the rowid and the model of the row with the given ID, or None if there is no such row."""
+        return self._find_rows(connection, [item_id]).get(item_id)
+
+    def _find_target_rows(
+        self,
+        connection: sqlite3.Connection,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> Tuple[List[Tuple[int, TModel]], List[TIdValueType]]:
+        """Returns the rowids and models of the rows selected by IDs or by a specification in rowid order, and the missing IDs."""
+        if isinstance(target, SpecificationInterface):
+            where, params, predicate = self._translate_filter(target)
+            rows = self._fetch(connection, self._get_select_sql(where), params)
+            return [row for row in rows if predicate is None or predicate(row[1])], []
+
+        item_ids = list(target)
+        found = self._find_rows(connection, item_ids)
+        missing = [item_id for item_id in item_ids if item_id not in found]
+        return sorted(dict(found.values()).items()), missing
+
+    def _get_row(self, connection: sqlite3.Connection, item_id: TIdValueType) -> Tuple[int, TModel]:
+        """Returns the rowid and the model of the row with the given ID.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If there is no such row.
+        """
+        row = self._find_row(connection, item_id)
+        if row is None:
+            raise ItemNotFoundException[TIdValueType](self.model_class, item_id)
+        return row
+
+    def _get_target_rows(
+        self,
+        connection: sqlite3.Connection,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[Tuple[int, TModel]]:
+        """Returns the rowids and models of the rows selected by IDs or by a specification in rowid order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If there is no row with one of the IDs.
+        """
+        rows, missing = self._find_target_rows(connection, target)
+        if missing:
+            raise ItemNotFoundException[TIdValueType](self.model_class, missing[0])
+        return rows
+
+    def _map_found_items(
+        self,
+        item_ids: List[TIdValueType],
+        found: Dict[Any, Tuple[int, TModel]],
+        skip_missing: bool,
+    ) -> Dict[TIdValueType, TModel]:
+        """Maps the IDs to the models of the rows found by `_find_rows`, in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no row was found for one of the IDs and `skip_missing` is False.
+        """
+        result = {}
+        for item_id in item_ids:
+            row = found.get(item_id)
+            if row is not None:
+                result[item_id] = row[1]
+            elif not skip_missing:
+                raise ItemNotFoundException[TIdValueType](self.model_class, item_id)
+        return result
+
+    def _insert_row(self, connection: sqlite3.Connection, item: TModel) -> None:
+        """Inserts the item as a new row."""
+        columns = ', '.join(map(quote_identifier, self._columns))
+        placeholders = ', '.join('?' * len(self._columns))
+        sql = f'INSERT INTO {quote_identifier(self._get_table_name())} ({columns}) VALUES ({placeholders})'
+        connection.execute(sql, self._get_row_values(item))
+
+    def _update_row(self, connection: sqlite3.Connection, rowid: int, item: TModel) -> None:
+        """Writes the values of the item to the row with the given rowid."""
+        assignments = ', '.join(f'{quote_identifier(name)} = ?' for name in self._columns)
+        sql = f'UPDATE {quote_identifier(self._get_table_name())} SET {assignments} WHERE rowid = ?'
+        connection.execute(sql, self._get_row_values(item) + [rowid])
+
+    def _delete_rows(self, connection: sqlite3.Connection, rowids: List[int]) -> None:
+        """Deletes the rows with the given rowids."""
+        table = quote_identifier(self._get_table_name())
+        for start in range(0, len(rowids), SqliteSpecificationTranslator.MAX_IN_VALUES):
+            batch = rowids[start:start + SqliteSpecificationTranslator.MAX_IN_VALUES]
+            connection.execute(f'DELETE FROM {table} WHERE rowid IN ({", ".join("?" * len(batch))})', batch)
+
+
+class SqliteCrudRepository(
+    Generic[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    CrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    BaseSqliteRepository[TModel, TIdValueType],
+    abc.ABC,
+):
+    """Implements a synchronous CRUD repository storing its items in an SQLite table.
+
+    See `BaseSqliteRepository` for the storage. Every write operation runs in its own transaction,
+    so the bulk methods change nothing if they fail. The connection is used by the calling thread only
+    (see `sqlite3.connect`).
+    """
+    _database: str = ':memory:'
+    _connection: sqlite3.Connection
+
+    def __init__(self, items: Optional[List[TModel]] = None, connection: Optional[sqlite3.Connection] = None):
+        """Initializes the repository.
+
+        Args:
+            items: The items to store initially.
+            connection: The connection to the database. If None, a connection to `_database` is opened,
+                        which is a new in-memory database by default.
+
+        Raises:
+            ValueError: If no column is declared for the ID attribute.
+        """
+        self._init_storage()
+        self._connection = connection if connection is not None else sqlite3.connect(self._database)
+        self._prepare_connection(self._connection)
+        self._create_table(self._connection)
+        if items:
+            with self._connection:
+                for item in items:
+                    self._insert_row(self._connection, item)
+
+    def get_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+    ) -> List[TModel]:
+        """Retrieves a collection of items based on filtering, sorting, and pagination options.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+
+        Returns:
+            A list of TModel instances matching the criteria.
+        """
+        return list(self._select(self._connection, filter_spec, order_options, paging_options))
+
+    def iter_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[TModel]:
+        """Lazily iterates over a collection of items read from a single query.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+            chunk_size: Unused, the rows are read one by one as the iteration proceeds.
+
+        Returns:
+            An iterator over the TModel instances matching the criteria.
+
+        Raises:
+            ValueError: If the chunk size is not positive.
+        """
+        _check_chunk_size(chunk_size)
+        return self._select(self._connection, filter_spec, order_options, paging_options)
+
+    def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
+        """Returns the total count of items matching the given filter specification.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the items.
+
+        Returns:
+            The number of items matching the filter.
+        """
+        return self._count(self._connection, filter_spec)
+
+    def get_item(self, item_id: TIdValueType) -> TModel:
+        """Retrieves a single item by its unique identifier.
+
+        Args:
+            item_id: The unique identifier of the item to retrieve.
+
+        Returns:
+            The TModel instance corresponding to the item_id.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        return self._get_row(self._connection, item_id)[1]
+
+    def get_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool = False) -> Dict[TIdValueType, TModel]:
+        """Retrieves multiple items by their unique identifiers.
+
+        Args:
+            item_ids: The unique identifiers of the items to retrieve.
+            skip_missing: Whether IDs with no item are left out of the result instead of raising an exception.
+
+        Returns:
+            A dictionary mapping the IDs to the corresponding TModel instances, in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found and `skip_missing` is False.
+        """
+        item_ids = list(item_ids)
+        return self._map_found_items(item_ids, self._find_rows(self._connection, item_ids), skip_missing)
+
+    def exists(self, item_id: TIdValueType) -> bool:
+        """Checks if an item with the specified ID exists in the repository.
+
+        Args:
+            item_id: The unique identifier of the item to check.
+
+        Returns:
+            True if an item with the specified ID exists, False otherwise.
+        """
+        return self._exists(self._connection, item_id)
+
+    def create(self, form: TCreateSchema) -> TModel:
+        """Creates a new item in the repository using the provided creation form.
+
+        Args:
+            form: The TCreateSchema instance containing data for the new item.
+
+        Returns:
+            The newly created TModel instance.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            sqlite3.Error: If SQLite cannot store the new item.
+        """
+        with self._connection:
+            item = self._create_model(form, self._generate_id())
+            self._insert_row(self._connection, item)
+        return item
+
+    def update(self, item_id: TIdValueType, form: TUpdateSchema) -> TModel:
+        """Updates an existing item identified by its ID with data from the update form.
+
+        Args:
+            item_id: The unique identifier of the item to update.
+            form: The TUpdateSchema instance containing data for updating the item.
+
+        Returns:
+            The updated TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            sqlite3.Error: If SQLite cannot store the updated item.
+        """
+        with self._connection:
+            row = self._get_row(self._connection, item_id)
+            item = self._update_model(row[1], form)
+            self._update_row(self._connection, row[0], item)
+        return item
+
+    def delete(self, item_id: TIdValueType) -> TModel:
+        """Deletes an item from the repository by its ID.
+
+        Args:
+            item_id: The unique identifier of the item to delete.
+
+        Returns:
+            The deleted TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+        """
+        with self._connection:
+            row = self._get_row(self._connection, item_id)
+            self._delete_rows(self._connection, [row[0]])
+        return row[1]
+
+    def create_many(self, forms: Iterable[TCreateSchema]) -> List[TModel]:
+        """Creates new items in the repository using the provided creation forms.
+
+        The items are inserted in a single transaction, which is rolled back if creating one of them fails.
+
+        Args:
+            forms: The TCreateSchema instances containing data for the new items.
+
+        Returns:
+            The list of newly created TModel instances, in the order of the forms.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            sqlite3.Error: If SQLite cannot store a new item.
+        """
+        result = []
+        with self._connection:
+            for form in forms:
+                item = self._create_model(form, self._generate_id())
+                self._insert_row(self._connection, item)
+                result.append(item)
+        return result
+
+    def update_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+        form: TUpdateSchema,
+    ) -> List[TModel]:
+        """Updates the items selected by IDs or by a specification with data from the update form.
+
+        The items are updated in a single transaction, and nothing is updated if an item with one of the IDs
+        does not exist.
+
+        Args:
+            target: The unique identifiers of the items to update, or a specification selecting them.
+            form: The TUpdateSchema instance containing data for updating the items.
+
+        Returns:
+            The list of updated TModel instances in rowid order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            sqlite3.Error: If SQLite cannot store an updated item.
+        """
+        result = []
+        with self._connection:
+            rows = self._get_target_rows(self._connection, target)
+            for rowid, item in rows:
+                item = self._update_model(item, form)
+                self._update_row(self._connection, rowid, item)
+                result.append(item)
+        return result
+
+    def delete_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TModel]:
+        """Deletes the items selected by IDs or by a specification from the repository.
+
+        Nothing is deleted if an item with one of the IDs does not exist.
+
+        Args:
+            target: The unique identifiers of the items to delete, or a specification selecting them.
+
+        Returns:
+            The list of deleted TModel instances in rowid order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+        """
+        with self._connection:
+            rows = self._get_target_rows(self._connection, target)
+            self._delete_rows(self._connection, [rowid for rowid, _ in rows])
+        return [item for _, item in rows]
+
+    @abc.abstractmethod
+    def _create_model(self, form: TCreateSchema, new_id: TIdValueType) -> TModel:
+        """Creates a new item from the provided creation form and ID.
+
+        Args:
+            form: The TCreateSchema instance containing data for the new item.
+            new_id: The new ID for the item.
+
+        Returns:
+            The newly created TModel instance.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _update_model(self, model: TModel, form: TUpdateSchema) -> TModel:
+        """Updates an item read from the storage with data from the update form.
+
+        Args:
+            model: The TModel instance to update.
+            form: The TUpdateSchema instance containing data for updating the item.
+
+        Returns:
+            The updated TModel instance, which is written back to the storage.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _generate_id(self) -> TIdValueType:
+        """Generates a new unique identifier for a new item.
+
+        Returns:
+            The new unique identifier.
+        """
+        raise NotImplementedError()
+
+
+class AsyncSqliteCrudRepository(
+    Generic[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    AsyncCrudRepositoryInterface[TModel, TIdValueType, TCreateSchema, TUpdateSchema],
+    BaseSqliteRepository[TModel, TIdValueType],
+    abc.ABC,
+):
+    """Implements an asynchronous CRUD repository storing its items in an SQLite table.
+
+    See `BaseSqliteRepository` for the storage. The queries run on a dedicated pool of `_max_workers` threads
+    (`_pool_size` if None) with connections taken from a `ConnectionPool` of at most `_pool_size` connections,
+    so the event loop never waits for SQLite. An operation that cannot get a thread and a connection within
+    `_acquire_timeout` seconds raises `PoolTimeoutException`; the wait times are recorded by `pool`.
+
+    Reads run concurrently on their own connections. Write operations run one at a time, each in its own
+    transaction, and exclude the reads while they write: the models are read, updated by the model hooks on
+    the event loop, and written back without another write operation of the repository in between, even
+    when the repository is used from several event loops.
+    Sharing the table with other writers is left to SQLite's locking (see the `timeout` argument of `sqlite3.connect`).
+
+    By default, the connections open a new in-memory database shared between them, which lives until
+    the repository is closed. The connections of a custom `connect` callable are used by several threads,
+    so they have to be opened with `check_same_thread=False`.
+    """
+    _database: str = ':memory:'
+    _pool_size: int = 4
+    _max_workers: Optional[int] = None
+    _acquire_timeout: Optional[float] = None
+    _pool: ConnectionPool[sqlite3.Connection]
+    _executor: ThreadPoolExecutor
+    _lock: ReadWriteLock
+    _write_locks: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]'
+    _write_mutex: threading.Lock
+
+    def __init__(
+        self,
+        items: Optional[List[TModel]] = None,
+        connect: Optional[Callable[[], sqlite3.Connection]] = None,
+    ):
+        """Initializes the repository.
+
+        Args:
+            items: The items to store initially.
+            connect: The callable opening a connection to the database. If None, the connections are opened
+                     to `_database`, which is a new shared in-memory database by default.
+
+        Raises:
+            ValueError: If no column is declared for the ID attribute or the pool size is not positive.
+        """
+        self._init_storage()
+        self._pool = ConnectionPool(
+            functools.partial(self._open_connection, connect or self._get_default_connect()),
+            self._pool_size,
+            self._acquire_timeout,
+        )
+        self._executor = ThreadPoolExecutor(self._max_workers or self._pool_size, 'abstractrepo-sqlite')
+        self._lock = ReadWriteLock()
+        self._write_locks = weakref.WeakKeyDictionary()
+        self._write_mutex = threading.Lock()
+        with self._pool.connection() as connection:
+            self._create_table(connection)
+            if items:
+                self._insert_items(connection, items)
+
+    @property
+    def pool(self) -> ConnectionPool[sqlite3.Connection]:
+        """Returns the connection pool, whose attributes record the time operations waited for a connection."""
+        return self._pool
+
+    async def close(self) -> None:
+        """Waits for the running operations, then stops the worker threads and closes the connections."""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self._pool.close()
+
+    async def get_collection(
+        self,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]] = None,
+        order_options: Optional[OrderOptions] = None,
+        paging_options: Optional[PagingOptions] = None,
+    ) -> List[TModel]:
+        """Retrieves a collection of items based on filtering, sorting, and pagination options.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the collection.
+            order_options: An optional OrderOptions instance to specify the sorting order.
+            paging_options: An optional PagingOptions instance to control pagination.
+
+        Returns:
+            A list of TModel instances matching the criteria.
+
+        Raises:
+            PoolTimeoutException: If no connection became available in time.
+        """
+        return await self._run(self._select_list, filter_spec, order_options, paging_options)
+
+    async def count(self, filter_spec: Optional[SpecificationInterface[TModel, bool]] = None) -> int:
+        """Returns the total count of items matching the given filter specification.
+
+        Args:
+            filter_spec: An optional SpecificationInterface instance to filter the items.
+
+        Returns:
+            The number of items matching the filter.
+
+        Raises:
+            PoolTimeoutException: If no connection became available in time.
+        """
+        return await self._run(self._count, filter_spec)
+
+    async def get_item(self, item_id: TIdValueType) -> TModel:
+        """Retrieves a single item by its unique identifier.
+
+        Args:
+            item_id: The unique identifier of the item to retrieve.
+
+        Returns:
+            The TModel instance corresponding to the item_id.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+            PoolTimeoutException: If no connection became available in time.
+        """
+        return (await self._run(self._get_row, item_id))[1]
+
+    async def get_items(self, item_ids: Iterable[TIdValueType], skip_missing: bool = False) -> Dict[TIdValueType, TModel]:
+        """Retrieves multiple items by their unique identifiers.
+
+        Args:
+            item_ids: The unique identifiers of the items to retrieve.
+            skip_missing: Whether IDs with no item are left out of the result instead of raising an exception.
+
+        Returns:
+            A dictionary mapping the IDs to the corresponding TModel instances, in the order of the IDs.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found and `skip_missing` is False.
+            PoolTimeoutException: If no connection became available in time.
+        """
+        item_ids = list(item_ids)
+        return self._map_found_items(item_ids, await self._run(self._find_rows, item_ids), skip_missing)
+
+    async def exists(self, item_id: TIdValueType) -> bool:
+        """Checks if an item with the specified ID exists in the repository.
+
+        Args:
+            item_id: The unique identifier of the item to check.
+
+        Returns:
+            True if an item with the specified ID exists, False otherwise.
+
+        Raises:
+            PoolTimeoutException: If no connection became available in time.
+        """
+        return await self._run(self._exists, item_id)
+
+    async def create(self, form: TCreateSchema) -> TModel:
+        """Creates a new item in the repository using the provided creation form.
+
+        Args:
+            form: The TCreateSchema instance containing data for the new item.
+
+        Returns:
+            The newly created TModel instance.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            PoolTimeoutException: If no connection became available in time.
+            sqlite3.Error: If SQLite cannot store the new item.
+        """
+        async with self._hold_write_lock():
+            item = await self._create_model(form, await self._generate_id())
+            await self._run_write(self._insert_items, [item])
+        return item
+
+    async def update(self, item_id: TIdValueType, form: TUpdateSchema) -> TModel:
+        """Updates an existing item identified by its ID with data from the update form.
+
+        Args:
+            item_id: The unique identifier of the item to update.
+            form: The TUpdateSchema instance containing data for updating the item.
+
+        Returns:
+            The updated TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            PoolTimeoutException: If no connection became available in time.
+            sqlite3.Error: If SQLite cannot store the updated item.
+        """
+        async with self._hold_write_lock():
+            row = await self._run(self._get_row, item_id)
+            item = await self._update_model(row[1], form)
+            await self._run_write(self._update_items, [(row[0], item)])
+        return item
+
+    async def delete(self, item_id: TIdValueType) -> TModel:
+        """Deletes an item from the repository by its ID.
+
+        Args:
+            item_id: The unique identifier of the item to delete.
+
+        Returns:
+            The deleted TModel instance.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with the specified ID is found.
+            PoolTimeoutException: If no connection became available in time.
+        """
+        async with self._hold_write_lock():
+            row = await self._run(self._get_row, item_id)
+            await self._run_write(self._delete_items, [row[0]])
+        return row[1]
+
+    async def create_many(self, forms: Iterable[TCreateSchema]) -> List[TModel]:
+        """Creates new items in the repository using the provided creation forms.
+
+        The items are inserted in a single transaction, and nothing is inserted if creating one of them fails.
+
+        Args:
+            forms: The TCreateSchema instances containing data for the new items.
+
+        Returns:
+            The list of newly created TModel instances, in the order of the forms.
+
+        Raises:
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            PoolTimeoutException: If no connection became available in time.
+            sqlite3.Error: If SQLite cannot store a new item.
+        """
+        async with self._hold_write_lock():
+            result = [await self._create_model(form, await self._generate_id()) for form in forms]
+            await self._run_write(self._insert_items, result)
+        return result
+
+    async def update_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+        form: TUpdateSchema,
+    ) -> List[TModel]:
+        """Updates the items selected by IDs or by a specification with data from the update form.
+
+        The items are updated in a single transaction, and nothing is updated if an item with one of the IDs
+        does not exist.
+
+        Args:
+            target: The unique identifiers of the items to update, or a specification selecting them.
+            form: The TUpdateSchema instance containing data for updating the items.
+
+        Returns:
+            The list of updated TModel instances in rowid order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+            UniqueConstraintViolation: If a unique constraint violation occurs.
+            RelationshipConstraintViolation: If a relationship constraint violation occurs.
+            PoolTimeoutException: If no connection became available in time.
+            sqlite3.Error: If SQLite cannot store an updated item.
+        """
+        async with self._hold_write_lock():
+            rows = await self._run(self._get_target_rows, target)
+            rows = [(rowid, await self._update_model(item, form)) for rowid, item in rows]
+            await self._run_write(self._update_items, rows)
+        return [item for _, item in rows]
+
+    async def delete_many(
+        self,
+        target: Union[Iterable[TIdValueType], SpecificationInterface[TModel, bool]],
+    ) -> List[TModel]:
+        """Deletes the items selected by IDs or by a specification from the repository.
+
+        Nothing is deleted if an item with one of the IDs does not exist.
+
+        Args:
+            target: The unique identifiers of the items to delete, or a specification selecting them.
+
+        Returns:
+            The list of deleted TModel instances in rowid order.
+
+        Raises:
+            ItemNotFoundException[TIdValueType]: If no item with one of the specified IDs is found.
+            PoolTimeoutException: If no connection became available in time.
+        """
+        async with self._hold_write_lock():
+            rows = await self._run(self._get_target_rows, target)
+            await self._run_write(self._delete_items, [rowid for rowid, _ in rows])
+        return [item for _, item in rows]
+
+    def _get_default_connect(self) -> Callable[[], sqlite3.Connection]:
+        """Returns the callable opening a connection to `_database`, or to a new shared in-memory database."""
+        if self._database == ':memory:':
+            uri = f'file:abstractrepo-{uuid.uuid4().hex}?mode=memory&cache=shared'
+            return functools.partial(sqlite3.connect, uri, uri=True, check_same_thread=False)
+        return functools.partial(sqlite3.connect, self._database, check_same_thread=False)
+
+    def _open_connection(self, connect: Callable[[], sqlite3.Connection]) -> sqlite3.Connection:
+        """Opens and prepares a new connection of the pool."""
+        connection = connect()
+        self._prepare_connection(connection)
+        return connection
+
+    @contextlib.asynccontextmanager
+    async def _hold_write_lock(self) -> AsyncIterator[None]:
+        """Returns a context manager excluding the other write operations of the repository.
+
+        The write operations started on the running event loop queue up on its `asyncio.Lock`. The one holding it
+        then takes `_write_mutex`, shared by all event loops, polling instead of blocking the event loop.
+        Write operations of other event loops are rare, so the mutex is almost always free.
+        """
+        loop = asyncio.get_running_loop()
+        lock = self._write_locks.get(loop)
+        if lock is None:
+            lock = self._write_locks[loop] = asyncio.Lock()
+        async with lock:
+            while not self._write_mutex.acquire(blocking=False):
+                await asyncio.sleep(_WRITE_MUTEX_POLL_INTERVAL)
+            try:
+                yield
+            finally:
+                self._write_mutex.release()
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Runs a read with a connection of the pool in a worker thread.
+
+        Args:
+            function: The function to call with the connection and the arguments.
+            *args: The arguments to pass to the function.
+
+        Returns:
+            The result of the function.
+        """
+        call = functools.partial(self._call, False, time.monotonic(), function, args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def _run_write(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Runs a write with a connection of the pool in a worker thread, excluding the reads."""
+        call = functools.partial(self._call, True, time.monotonic(), function, args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def _call(self, write: bool, submitted: float, function: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+        """Calls the function in a worker thread; the acquire timeout counts from the submission of the call."""
+        with self._pool.connection(waiting_since=submitted) as connection:
+            with self._lock.write() if write else self._lock.read():
+                return function(connection, *args)
+
+    def _select_list(
+        self,
+        connection: sqlite3.Connection,
+        filter_spec: Optional[SpecificationInterface[TModel, bool]],
+        order_options: Optional[OrderOptions],
+        paging_options: Optional[PagingOptions],
+    ) -> List[TModel]:
+        """Reads the items matching the criteria, releasing the statement before the connection is released."""
+        return list(self._select(connection, filter_spec, order_options, paging_options))
+
+    def _insert_items(self, connection: sqlite3.Connection, items: List[TModel]) -> None:
+        """Inserts the items in a single transaction."""
+        with connection:
+            for item in items:
+                self._insert_row(connection, item)
+
+    def _update_items(self, connection: sqlite3.Connection, rows: List[Tuple[int, TModel]]) -> None:
+        """Writes the items to the rows with the given rowids in a single transaction."""
+        with connection:
+            for rowid, item in rows:
+                self._update_row(connection, rowid, item)
+
+    def _delete_items(self, connection: sqlite3.Connection, rowids: List[int]) -> None:
+        """Deletes the rows with the given rowids in a single transaction."""
+        with connection:
+            self._delete_rows(connection, rowids)
+
+    @abc.abstractmethod
+    async def _create_model(self, form: TCreateSchema, new_id: TIdValueType) -> TModel:
+        """Creates a new item from the provided creation form and ID.
+
+        Args:
+            form: The TCreateSchema instance containing data for the new item.
+            new_id: The new ID for the item.
+
+        Returns:
+            The newly created TModel instance.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def _update_model(self, model: TModel, form: TUpdateSchema) -> TModel:
+        """Updates an item read from the storage with data from the update form.
+
+        Args:
+            model: The TModel instance to update.
+            form: The TUpdateSchema instance containing data for updating the item.
+
+        Returns:
+            The updated TModel instance, which is written back to the storage.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def _generate_id(self) -> TIdValueType:
+        """Generates a new unique identifier for a new item.
+
+        Returns:
+            The new unique identifier.
+        """
+        raise NotImplementedError()
+
+
+def _get_order_shape(order_options: OrderOptions) -> Tuple[Tuple[str, OrderDirection, NonesOrder], ...]:
+    """Returns the attributes, directions and None placements of the order options."""
+    return tuple((option.attribute, option.direction, option.nones) for option in order_options.options)
+
+
+def _get_padded_size(size: int) -> int:
+    """Returns the number of placeholders for the given number of IN operands: the next power of two."""
+    return 1 << (size - 1).bit_length() if size else 0
+
+
+def _to_glob(pattern: str) -> str:
+    """Translates a LIKE pattern into a GLOB pattern with the characters special to GLOB escaped."""
+    glob = []
+    for char in pattern:
+        if char == '%':
+            glob.append('*')
+        elif char == '_':
+            glob.append('?')
+        elif char in '*?[':
+            glob.append(f'[{char}]')
+        else:
+            glob.append(char)
+    return ''.join(glob)
+
+
+_COMPARISONS = {
+    Operator.E: '=',
+    Operator.NE: '!=',
+    Operator.GT: '>',
+    Operator.LT: '<',
+    Operator.GTE: '>=',
+    Operator.LTE: '<=',
+}
+
+_SQLITE_TYPES = {
+    ColumnType.INT: 'INTEGER',
+    ColumnType.FLOAT: 'REAL',
+    ColumnType.BOOL: 'INTEGER',
+    ColumnType.STR: 'TEXT',
+    ColumnType.OBJECT: '',
+}
+
+_SQLITE_LOWER_FUNCTION = 'abstractrepo_lower'
+
+_WRITE_MUTEX_POLL_INTERVAL = 0.001
@@ -0,0 +1,208 @@
+import math
+from typing import Any, List, Mapping, Tuple, Union
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from abstractrepo.columnar import ColumnInterface, ArrayColumn, DictionaryColumn
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, NotSpecification, Operator
+
+
+def is_available() -> bool:
+    """Returns whether NumPy is installed, so vectorized evaluation can be used."""
+    return numpy is not None
+
+
+class NumpySpecificationEvaluator:
+    """Evaluates specification trees on the columns of a columnar repository into NumPy boolean masks.
+
+    `AttributeSpecification` conditions on array columns are evaluated with NumPy comparisons
+    (`isin` for IN and NOT_IN), with the None mask of the column applied afterwards.
+    Conditions on dictionary-encoded columns are evaluated once per distinct value and
+    spread to the rows by indexing with the codes. `AndSpecification`, `OrSpecification`
+    and `NotSpecification` map to `&`, `|` and `~`.
+
+    The masks are the same as the results of `is_satisfied_by`, including the rule that a None attribute
+    fails every comparison with a non-None value. Integer columns compared with floats are compared
+    exactly, as in Python. Conditions that cannot be evaluated exactly this way (custom specifications,
+    unusual operands, non-numeric operands on numeric columns) raise `NotImplementedError`.
+
+    NumPy is an optional dependency: install `abstractrepo[numpy]` to use this class.
+    """
+    _columns: Mapping[str, ColumnInterface]
+    _size: int
+
+    def __init__(self, columns: Mapping[str, ColumnInterface], size: int):
+        """Initializes a new NumpySpecificationEvaluator.
+
+        Args:
+            columns: The columns of the repository by attribute name.
+            size: The number of rows in each column.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if numpy is None:
+            raise ImportError('NumPy is required for vectorized evaluation, install abstractrepo[numpy]')
+        self._columns = columns
+        self._size = size
+
+    def evaluate(self, specification: SpecificationInterface[Any, bool]) -> 'numpy.ndarray':
+        """Evaluates the specification for all rows.
+
+        Args:
+            specification: The specification to evaluate.
+
+        Returns:
+            A boolean array with True for the rows satisfying the specification.
+
+        Raises:
+            NotImplementedError: If a node of the specification cannot be evaluated on the columns.
+        """
+        spec_type = type(specification)
+        if spec_type is AttributeSpecification:
+            return self.evaluate_attribute(specification)
+        if spec_type is AndSpecification:
+            result = numpy.ones(self._size, dtype=bool)
+            for spec in specification.specifications:
+                result &= self.evaluate(spec)
+            return result
+        if spec_type is OrSpecification:
+            result = numpy.zeros(self._size, dtype=bool)
+            for spec in specification.specifications:
+                result |= self.evaluate(spec)
+            return result
+        if spec_type is NotSpecification:
+            return ~self.evaluate(specification.specification)
+        raise NotImplementedError(f'Cannot evaluate {spec_type.__name__}')
+
+    def evaluate_attribute(self, specification: AttributeSpecification) -> 'numpy.ndarray':
+        """Evaluates a single attribute condition for all rows.
+
+        Args:
+            specification: The condition to evaluate.
+
+        Returns:
+            A boolean array with True for the rows satisfying the condition.
+
+        Raises:
+            NotImplementedError: If the condition cannot be evaluated on the columns.
+        """
+        column = self._columns.get(specification.attribute_name)
+        if isinstance(column, ArrayColumn):
+            return self._evaluate_array(column, specification)
+        if isinstance(column, DictionaryColumn):
+            table = numpy.frombuffer(column.match_dictionary(specification), dtype=bool)
+            return table[numpy.frombuffer(column.codes, dtype=column.codes.typecode)]
+        if column is not None:
+            return numpy.frombuffer(column.match(specification), dtype=bool).copy()
+        raise NotImplementedError(f'No column for {specification.attribute_name}')
+
+    @staticmethod
+    def _evaluate_array(column: ArrayColumn, specification: AttributeSpecification) -> 'numpy.ndarray':
+        """Evaluates a condition on a numeric column."""
+        values = numpy.frombuffer(column.values, dtype=column.values.typecode)
+        nulls = numpy.frombuffer(column.nulls, dtype=bool)
+        value, op = specification.attribute_value, specification.operator
+
+        if value is None:
+            if op == Operator.E:
+                return nulls.copy()
+            if op == Operator.NE:
+                return ~nulls
+            raise NotImplementedError(f'Cannot compare with None using {op}')
+
+        if op in (Operator.IN, Operator.NOT_IN):
+            if not AttributeSpecification.is_collection_value(value):
+                raise NotImplementedError('IN and NOT_IN require a collection')
+            operands = _to_array_operands(values, [item for item in value if item is not None])
+            matches = numpy.isin(values, operands)
+            if op == Operator.NOT_IN:
+                matches = ~matches
+        elif op in _COMPARATORS:
+            comparison = _to_array_comparison(values, op, value)
+            if isinstance(comparison, bool):
+                matches = numpy.full(len(values), comparison)
+            else:
+                matches = _COMPARATORS[comparison[0]](values, comparison[1])
+        else:
+            raise NotImplementedError(f'Cannot evaluate {op} on a numeric column')
+
+        return matches & ~nulls
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float))
+
+
+def _to_array_operands(values: 'numpy.ndarray', operands: List[Any]) -> List[Any]:
+    """Returns the IN operands that can equal values of the array, converted to the array type.
+
+    Raises:
+        NotImplementedError: If an operand cannot be compared exactly.
+    """
+    result = []
+    for operand in operands:
+        comparison = _to_array_comparison(values, Operator.E, operand)
+        if not isinstance(comparison, bool):
+            result.append(comparison[1])
+    return result
+
+
+def _to_array_comparison(values: 'numpy.ndarray', op: Operator, value: Any) -> Union[bool, Tuple[Operator, Any]]:
+    """Rewrites a comparison with a Python number into an exact comparison with a value of the array type.
+
+    Returns:
+        Either a constant result for all non-None rows, or the operator and the value to compare with.
+
+    Raises:
+        NotImplementedError: If the value cannot be compared exactly.
+    """
+    if not _is_number(value):
+        raise NotImplementedError('Numeric columns can only be compared with numbers')
+
+    if values.dtype.kind == 'f':
+        if isinstance(value, int) and abs(value) > 2 ** 53:
+            raise NotImplementedError('The integer cannot be compared exactly with floats')
+        return op, value
+
+    if isinstance(value, float):
+        if math.isnan(value):
+            return op == Operator.NE
+        if math.isinf(value):
+            return _compare_out_of_range(op, value > 0)
+        if value.is_integer():
+            value = int(value)
+        elif op in (Operator.E, Operator.NE):
+            return op == Operator.NE
+        elif op in (Operator.GT, Operator.GTE):
+            op, value = Operator.GT, math.floor(value)
+        else:
+            op, value = Operator.LT, math.ceil(value)
+
+    limits = numpy.iinfo(values.dtype)
+    if value > limits.max:
+        return _compare_out_of_range(op, True)
+    if value < limits.min:
+        return _compare_out_of_range(op, False)
+    return op, value
+
+
+def _compare_out_of_range(op: Operator, above: bool) -> bool:
+    """Returns the result of comparing any stored value with a value above or below all of them."""
+    if op in (Operator.E, Operator.NE):
+        return op == Operator.NE
+    return (op in (Operator.LT, Operator.LTE)) == above
+
+
+_COMPARATORS = {
+    Operator.E: lambda values, value: values == value,
+    Operator.NE: lambda values, value: values != value,
+    Operator.GT: lambda values, value: values > value,
+    Operator.LT: lambda values, value: values < value,
+    Operator.GTE: lambda values, value: values >= value,
+    Operator.LTE: lambda values, value: values <= value,
+}
@@ -0,0 +1,378 @@
+import random
+from typing import List, Optional
+
+import pytest
+
+from abstractrepo.cache import CachingCrudRepository, AsyncCachingCrudRepository, LruCache, get_query_key
+from abstractrepo.exceptions import ItemNotFoundException
+from abstractrepo.order import OrderOptions, OrderOptionsBuilder, OrderDirection
+from abstractrepo.paging import PagingOptions, CursorPagingOptions
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, NotSpecification, Operator
+from tests.fixtures.models import News, NewsCreateForm, NewsUpdateForm
+from tests.fixtures.repo import ListBasedNewsRepository, AsyncListBasedNewsRepository, SqliteNewsRepository
+
+
+class TitleLengthSpecification(SpecificationInterface[News, bool]):
+    def __init__(self, length: int):
+        self.length = length
+
+    def is_satisfied_by(self, model: News) -> bool:
+        return len(model.title) == self.length
+
+
+class CountingNewsRepository(ListBasedNewsRepository):
+    def __init__(self, items: Optional[List[News]] = None):
+        super().__init__(items)
+        self.reads = 0
+
+    def get_collection(self, filter_spec=None, order_options=None, paging_options=None):
+        self.reads += 1
+        return super().get_collection(filter_spec, order_options, paging_options)
+
+    def count(self, filter_spec=None):
+        self.reads += 1
+        return super().count(filter_spec)
+
+    def get_item(self, item_id):
+        self.reads += 1
+        return super().get_item(item_id)
+
+    def get_items(self, item_ids, skip_missing=False):
+        self.reads += 1
+        return super().get_items(item_ids, skip_missing)
+
+
+class FailingNewsRepository(ListBasedNewsRepository):
+    def _update_model(self, model: News, form: NewsUpdateForm) -> News:
+        if form.title == 'fail':
+            model.title = 'half-updated'
+            raise ValueError('Cannot update')
+        return super()._update_model(model, form)
+
+
+class PartialBulkNewsRepository(ListBasedNewsRepository):
+    def update_many(self, target, form):
+        return [self.update(item_id, form) for item_id in target]
+
+    def delete_many(self, target):
+        return [self.delete(item_id) for item_id in target]
+
+
+class AsyncPartialBulkNewsRepository(AsyncListBasedNewsRepository):
+    async def update_many(self, target, form):
+        return [await self.update(item_id, form) for item_id in target]
+
+    async def delete_many(self, target):
+        return [await self.delete(item_id) for item_id in target]
+
+
+def build_items(rnd: random.Random, size: int) -> List[News]:
+    return [News(id=i, title=rnd.choice(['a', 'b', 'c']), text=rnd.choice(['x', 'y', None])) for i in range(1, size + 1)]
+
+
+def copy_items(items: List[News]) -> List[News]:
+    return [News(id=item.id, title=item.title, text=item.text) for item in items]
+
+
+def random_specification(rnd: random.Random) -> Optional[SpecificationInterface[News, bool]]:
+    return rnd.choice([
+        None,
+        AttributeSpecification('title', rnd.choice(['a', 'b'])),
+        AttributeSpecification('text', None, Operator.NE),
+        AttributeSpecification('id', [1, 2, 3, 30], Operator.IN),
+        OrSpecification(AttributeSpecification('id', 10, Operator.LT), AttributeSpecification('title', 'c')),
+        NotSpecification(AndSpecification(AttributeSpecification('title', 'a'), AttributeSpecification('text', 'x'))),
+        TitleLengthSpecification(1),
+    ])
+
+
+def random_order_options(rnd: random.Random) -> Optional[OrderOptions]:
+    return rnd.choice([
+        None,
+        OrderOptionsBuilder().add('title').add('id', OrderDirection.DESC).build(),
+        OrderOptionsBuilder().add('text', OrderDirection.DESC).add('id').build(),
+    ])
+
+
+def ids(items: List[News]) -> List[int]:
+    return [item.id for item in items]
+
+
+def snapshot(items: List[News]) -> List[tuple]:
+    return [(item.id, item.title, item.text) for item in items]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_caching_repository_matches_uncached(seed: int):
+    rnd = random.Random(seed)
+    items = build_items(rnd, 40)
+    repo = CachingCrudRepository(ListBasedNewsRepository(copy_items(items)), query_cache_size=8)
+    reference = ListBasedNewsRepository(copy_items(items))
+    repo.repository._next_id = reference._next_id = 100
+
+    for _ in range(80):
+        action = rnd.randrange(8)
+        form = NewsUpdateForm(title=rnd.choice(['a', 'b', 'c']), text=rnd.choice(['x', None]))
+        if action == 0:
+            forms = [NewsCreateForm(title=rnd.choice(['a', 'c']), text='y') for _ in range(rnd.randint(1, 2))]
+            assert snapshot(repo.create_many(forms)) == snapshot(reference.create_many(forms))
+        elif action == 1:
+            item_id = rnd.randrange(1, 110)
+            if reference.exists(item_id):
+                assert snapshot([repo.update(item_id, form)]) == snapshot([reference.update(item_id, form)])
+            else:
+                with pytest.raises(ItemNotFoundException):
+                    repo.update(item_id, form)
+        elif action == 2:
+            spec = random_specification(rnd) or AttributeSpecification('id', 5, Operator.LT)
+            assert snapshot(repo.update_many(spec, form)) == snapshot(reference.update_many(spec, form))
+        elif action == 3:
+            item_id = rnd.randrange(1, 110)
+            if reference.exists(item_id):
+                assert snapshot([repo.delete(item_id)]) == snapshot([reference.delete(item_id)])
+        elif action == 4:
+            target = [item_id for item_id in rnd.sample(range(1, 110), 3) if reference.exists(item_id)]
+            assert snapshot(repo.delete_many(target)) == snapshot(reference.delete_many(target))
+
+        for _ in range(3):
+            spec = random_specification(rnd)
+            order_options = random_order_options(rnd)
+            paging_options = rnd.choice([None, PagingOptions(limit=5), PagingOptions(limit=4, offset=2)])
+            assert snapshot(repo.get_collection(spec, order_options, paging_options)) == \
+                snapshot(reference.get_collection(spec, order_options, paging_options))
+            assert repo.count(spec) == reference.count(spec)
+            item_ids = rnd.sample(range(1, 110), 4)
+            assert snapshot(repo.get_items(item_ids, skip_missing=True).values()) == \
+                snapshot(reference.get_items(item_ids, skip_missing=True).values())
+            assert repo.exists(item_ids[0]) == reference.exists(item_ids[0])
+
+    assert repo.query_cache.hits > 0 and repo.item_cache.hits > 0
+
+
+def test_caching_repository_serves_reads_from_cache():
+    inner = CountingNewsRepository([News(id=1, title='a'), News(id=2, title='b'), News(id=3, title='c')])
+    repo = CachingCrudRepository(inner)
+    spec = AttributeSpecification('title', ['a', 'b'], Operator.IN)
+
+    first = repo.get_collection(spec)
+    first.clear()
+    assert ids(repo.get_collection(AttributeSpecification('title', ('a', 'b'), Operator.IN))) == [1, 2]
+    assert repo.count(spec) == repo.count(spec) == 2
+    assert repo.get_item(1) is repo.get_item(1)
+    assert list(repo.get_items([1, 2, 3])) == [1, 2, 3]
+    assert repo.exists(2) and not repo.exists(4)
+    assert inner.reads == 4
+
+    custom = TitleLengthSpecification(1)
+    repo.get_collection(custom)
+    repo.get_collection(custom)
+    assert inner.reads == 6
+
+    repo.clear_cache()
+    repo.get_item(1)
+    assert inner.reads == 7
+
+
+def test_caching_repository_invalidates_precisely():
+    inner = CountingNewsRepository([News(id=1, title='a'), News(id=2, title='b'), News(id=3, title='c', text='x')])
+    inner._next_id = 3
+    repo = CachingCrudRepository(inner)
+    title_a = AttributeSpecification('title', 'a')
+    title_b = AttributeSpecification('title', 'b')
+    repo.get_collection(title_a)
+    repo.count(title_b)
+    repo.get_item(3)
+    reads = inner.reads
+
+    repo.update(3, NewsUpdateForm(title='c', text='y'))
+    assert repo.get_item(3).text == 'y'
+    assert ids(repo.get_collection(title_a)) == [1] and repo.count(title_b) == 1
+    assert inner.reads == reads
+
+    repo.update(1, NewsUpdateForm(title='c'))
+    assert ids(repo.get_collection(title_a)) == []
+    assert repo.count(title_b) == 1
+    assert inner.reads == reads + 2
+
+    repo.create(NewsCreateForm(title='b'))
+    assert repo.count(title_b) == 2
+    assert ids(repo.get_collection(title_a)) == []
+    assert inner.reads == reads + 3
+
+    repo.delete_many(title_b)
+    assert repo.count(title_b) == 0
+    with pytest.raises(ItemNotFoundException):
+        repo.get_item(2)
+
+
+def test_caching_repository_skips_results_read_during_writes():
+    class WritingDuringReadRepository(ListBasedNewsRepository):
+        writer = None
+
+        def get_collection(self, filter_spec=None, order_options=None, paging_options=None):
+            result = super().get_collection(filter_spec, order_options, paging_options)
+            if self.writer is not None:
+                writer, self.writer = self.writer, None
+                writer()
+            return result
+
+    inner = WritingDuringReadRepository([News(id=1, title='a'), News(id=2, title='b')])
+    repo = CachingCrudRepository(inner)
+    spec = AttributeSpecification('title', 'a')
+    inner.writer = lambda: repo.update(2, NewsUpdateForm(title='a'))
+    assert ids(repo.get_collection(spec)) == [1]
+    assert ids(repo.get_collection(spec)) == [1, 2]
+
+
+def test_caching_repository_failed_writes():
+    repo = CachingCrudRepository(FailingNewsRepository([News(id=1, title='a'), News(id=2, title='b')]))
+    title_a = AttributeSpecification('title', 'a')
+    assert repo.count(title_a) == 1
+    assert repo.get_item(1).title == 'a'
+
+    with pytest.raises(ValueError):
+        repo.update_many([1], NewsUpdateForm(title='fail'))
+    assert repo.count(title_a) == 0
+    assert repo.get_item(1).title == 'half-updated'
+
+    with pytest.raises(ItemNotFoundException):
+        repo.delete_many([2, 3])
+    assert repo.get_item(2).title == 'b'
+
+
+def test_caching_repository_partially_applied_bulk_writes():
+    repo = CachingCrudRepository(PartialBulkNewsRepository([News(id=1, title='a'), News(id=2, title='b')]))
+    title_c = AttributeSpecification('title', 'c')
+    assert repo.get_item(1).title == 'a' and repo.count(title_c) == 0
+
+    with pytest.raises(ItemNotFoundException):
+        repo.update_many([1, 99], NewsUpdateForm(title='c'))
+    assert repo.get_item(1).title == 'c'
+    assert repo.count(title_c) == 1
+
+    assert repo.get_item(2).title == 'b' and repo.count() == 2
+    with pytest.raises(ItemNotFoundException):
+        repo.delete_many([2, 99])
+    assert not repo.exists(2)
+    with pytest.raises(ItemNotFoundException):
+        repo.get_item(2)
+    assert repo.count() == 1
+
+
+@pytest.mark.asyncio
+async def test_async_caching_repository_partially_applied_bulk_writes():
+    repo = AsyncCachingCrudRepository(AsyncPartialBulkNewsRepository([News(id=1, title='a'), News(id=2, title='b')]))
+    title_c = AttributeSpecification('title', 'c')
+    assert (await repo.get_item(1)).title == 'a' and await repo.count(title_c) == 0
+
+    with pytest.raises(ItemNotFoundException):
+        await repo.update_many([1, 99], NewsUpdateForm(title='c'))
+    assert (await repo.get_item(1)).title == 'c'
+    assert await repo.count(title_c) == 1
+
+    assert await repo.count() == 2
+    with pytest.raises(ItemNotFoundException):
+        await repo.delete_many([2, 99])
+    assert await repo.count() == 1
+
+
+def test_caching_repository_wraps_sqlite():
+    repo = CachingCrudRepository(SqliteNewsRepository([News(id=1, title='a'), News(id=2, title='b')]), ttl=60)
+    repo.repository._next_id = 2
+    spec = AttributeSpecification('title', 'a')
+    assert ids(repo.get_collection(spec)) == [1]
+    repo.update_many([2], NewsUpdateForm(title='a'))
+    assert ids(repo.get_collection(spec)) == [1, 2]
+    assert repo.get_item(2).title == 'a'
+
+    with pytest.raises(ValueError):
+        CachingCrudRepository(SqliteNewsRepository(), ttl=0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", range(5))
+async def test_async_caching_repository_matches_uncached(seed: int):
+    rnd = random.Random(seed)
+    items = build_items(rnd, 30)
+    repo = AsyncCachingCrudRepository(AsyncListBasedNewsRepository(copy_items(items)), query_cache_size=8)
+    reference = ListBasedNewsRepository(copy_items(items))
+    repo.repository._next_id = reference._next_id = 100
+
+    for _ in range(40):
+        action = rnd.randrange(5)
+        form = NewsUpdateForm(title=rnd.choice(['a', 'b', 'c']), text=rnd.choice(['x', None]))
+        if action == 0:
+            assert snapshot([await repo.create(NewsCreateForm(title='a'))]) == snapshot([reference.create(NewsCreateForm(title='a'))])
+        elif action == 1:
+            item_id = rnd.randrange(1, 105)
+            if reference.exists(item_id):
+                assert snapshot([await repo.update(item_id, form)]) == snapshot([reference.update(item_id, form)])
+        elif action == 2:
+            spec = random_specification(rnd) or AttributeSpecification('id', 5, Operator.LT)
+            assert snapshot(await repo.update_many(spec, form)) == snapshot(reference.update_many(spec, form))
+        elif action == 3:
+            item_id = rnd.randrange(1, 105)
+            if reference.exists(item_id):
+                assert snapshot([await repo.delete(item_id)]) == snapshot([reference.delete(item_id)])
+
+        for _ in range(3):
+            spec = random_specification(rnd)
+            order_options = random_order_options(rnd)
+            assert snapshot(await repo.get_collection(spec, order_options)) == snapshot(reference.get_collection(spec, order_options))
+            assert await repo.count(spec) == reference.count(spec)
+            item_id = rnd.randrange(1, 105)
+            assert await repo.exists(item_id) == reference.exists(item_id)
+            if reference.exists(item_id):
+                assert snapshot([await repo.get_item(item_id)]) == snapshot([reference.get_item(item_id)])
+
+    assert snapshot([item async for item in repo.iter_collection(chunk_size=7)]) == snapshot(reference.get_collection())
+    assert repo.query_cache.hits > 0
+
+
+def test_lru_cache():
+    now = [0.0]
+    cache = LruCache(2, ttl=10, clock=lambda: now[0])
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None and cache.evictions == 1
+    assert [key for key, _ in cache.items()] == ['a', 'c']
+
+    now[0] = 5
+    cache.put('a', 4)
+    now[0] = 12
+    assert cache.get('c', 'expired') == 'expired'
+    assert cache.items() == [('a', 4)]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.pop('a')
+    cache.pop('missing')
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        LruCache(0)
+    with pytest.raises(ValueError):
+        LruCache(1, ttl=0)
+
+
+def test_query_key():
+    order_options = OrderOptionsBuilder().add('title').build()
+    key = get_query_key(AttributeSpecification('id', [1, 2], Operator.IN), order_options, PagingOptions(limit=5))
+    assert key == get_query_key(AttributeSpecification('id', (1, 2), Operator.IN), OrderOptionsBuilder().add('title').build(),
+                                PagingOptions(limit=5))
+    assert key == get_query_key(AttributeSpecification('id', (2, 1, 2), Operator.IN), order_options, PagingOptions(limit=5))
+    assert key != get_query_key(AttributeSpecification('id', [1, 2], Operator.IN), order_options, PagingOptions(limit=6))
+    assert key != get_query_key(AttributeSpecification('id', [1, 2], Operator.IN), order_options, CursorPagingOptions(limit=5))
+    assert get_query_key(AttributeSpecification('id', {1, 2}, Operator.IN), None, None) == \
+        get_query_key(AttributeSpecification('id', frozenset([2, 1]), Operator.IN), None, None)
+    assert get_query_key(AttributeSpecification('id', 1), None, None) != get_query_key(AttributeSpecification('id', True), None, None)
+    assert get_query_key(AttributeSpecification('id', (1, 2)), None, None) == get_query_key(AttributeSpecification('id', (1, 2)), None, None)
+    assert get_query_key(AttributeSpecification('id', [1, 2]), None, None) is None
+    assert get_query_key(AttributeSpecification('id', [[1]], Operator.IN), None, None) is None
+    assert get_query_key(NotSpecification(TitleLengthSpecification(1)), None, None) is None
+    assert get_query_key(None, None, CursorPagingOptions(limit=5, after=((1,),))) == \
+        get_query_key(None, None, CursorPagingOptions(limit=5, after=((1,),)))
+    assert get_query_key(None, None, CursorPagingOptions(limit=5, after=([1],))) is None
+    assert get_query_key(AttributeSpecification('id', [bytearray(b'1')], Operator.IN), None, None) is None
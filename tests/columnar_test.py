@@ -0,0 +1,311 @@
+import random
+from typing import Any, List, Optional
+
+import pytest
+
+from abstractrepo.columnar import ColumnType, create_column
+from abstractrepo.exceptions import ItemNotFoundException
+from abstractrepo.order import OrderOptionsBuilder, OrderDirection, NonesOrder
+from abstractrepo.paging import PagingOptions, CursorPageResolver
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, NotSpecification, Operator
+from tests.fixtures.models import News, NewsCreateForm, NewsUpdateForm
+from tests.fixtures.repo import ListBasedNewsRepository, ColumnarNewsRepository, AsyncListBasedNewsRepository, \
+    AsyncColumnarNewsRepository
+
+
+class TitleLengthSpecification(SpecificationInterface[News, bool]):
+    def __init__(self, length: int):
+        self.length = length
+
+    def is_satisfied_by(self, model: News) -> bool:
+        return len(model.title) == self.length
+
+
+COLUMN_VALUES = {
+    ColumnType.INT: [3, None, -7, 0, 3, 10 ** 12],
+    ColumnType.FLOAT: [1.5, None, -2.0, 0.0, 1.5, 1e9],
+    ColumnType.BOOL: [True, None, False, True],
+    ColumnType.STR: ['abc', None, 'Abd', '', 'abc', 'x_y'],
+    ColumnType.OBJECT: [(1, 2), None, 'abc', 5, (1, 2)],
+}
+
+CONDITION_VALUES = {
+    ColumnType.INT: [3, -7, 2.5, None, [3, 0], (None, 10 ** 12), True],
+    ColumnType.FLOAT: [1.5, -2, None, [0.0, 1e9]],
+    ColumnType.BOOL: [True, False, None, [False], 1],
+    ColumnType.STR: ['abc', 'ab%', 'A_D', '%', None, ['abc', ''], 'x\\_y'],
+    ColumnType.OBJECT: [(1, 2), 5, None, [5, 'abc']],
+}
+
+
+@pytest.mark.parametrize("column_type", list(ColumnType))
+def test_column_match(column_type: ColumnType):
+    column = create_column(column_type)
+    values = COLUMN_VALUES[column_type]
+    for value in values:
+        column.append(value)
+    assert [column.get(position) for position in range(len(values))] == values
+
+    class Row:
+        def __init__(self, value: Any):
+            self.value = value
+
+    for operator in Operator:
+        for condition_value in CONDITION_VALUES[column_type]:
+            spec = AttributeSpecification('value', condition_value, operator)
+            try:
+                expected = [spec.is_satisfied_by(Row(value)) for value in values]
+            except (TypeError, ValueError, AttributeError):
+                continue
+            try:
+                actual = column.match(spec)
+            except NotImplementedError:
+                continue
+            assert [bool(flag) for flag in actual] == expected, (operator, condition_value)
+
+
+@pytest.mark.parametrize("column_type", list(ColumnType))
+def test_column_modification(column_type: ColumnType):
+    column = create_column(column_type)
+    values = COLUMN_VALUES[column_type]
+    for value in values:
+        column.append(value)
+
+    column.set(0, None)
+    column.set(1, values[0])
+    expected = [None, values[0]] + values[2:]
+    assert [column.get(position) for position in range(len(column))] == expected
+    get = column.get_getter()
+    assert [get(position) for position in range(len(column))] == expected
+
+    column.keep(bytes([0, 1] * len(values))[:len(values)])
+    assert [column.get(position) for position in range(len(column))] == expected[1::2]
+
+    column.truncate(1)
+    assert len(column) == 1 and column.get(0) == values[0]
+
+
+def test_dictionary_column_drops_unused_values():
+    column = create_column(ColumnType.STR)
+    for value in ['a', 'b', 'c', 'b']:
+        column.append(value)
+    column.keep(b'\x00\x01\x00\x01')
+    assert len(column._dictionary) == 2
+    assert [column.get(0), column.get(1)] == ['b', 'b']
+
+
+def test_array_column_rejects_unsupported_values():
+    column = create_column(ColumnType.INT)
+    with pytest.raises(TypeError):
+        column.append('abc')
+    with pytest.raises(TypeError):
+        column.append(1.5)
+    with pytest.raises(TypeError):
+        column.append(2 ** 63)
+    assert len(column) == 0
+
+    column.append(1)
+    with pytest.raises(TypeError):
+        column.set(0, -2 ** 64)
+    assert column.get(0) == 1
+    with pytest.raises(TypeError):
+        create_column(ColumnType.FLOAT).append(10 ** 400)
+
+    with pytest.raises(TypeError):
+        create_column('INT')
+
+
+def random_specification(rnd: random.Random, depth: int = 0) -> SpecificationInterface[News, bool]:
+    kind = rnd.randrange(6 if depth < 2 else 2)
+    if kind == 0:
+        return AttributeSpecification('id', rnd.randint(0, 120), rnd.choice([Operator.E, Operator.GT, Operator.LTE, Operator.NE]))
+    if kind == 1:
+        attribute = rnd.choice(['title', 'text'])
+        return rnd.choice([
+            AttributeSpecification(attribute, rnd.choice(['a', 'b', 'c', None])),
+            AttributeSpecification(attribute, rnd.choice(['a', 'b', None]), Operator.NE),
+            AttributeSpecification(attribute, ['a', 'c'], Operator.IN),
+            AttributeSpecification(attribute, 'b', Operator.GTE),
+            AttributeSpecification(attribute, 'A%', Operator.ILIKE),
+        ])
+    if kind == 2:
+        return AndSpecification(*(random_specification(rnd, depth + 1) for _ in range(rnd.randint(1, 3))))
+    if kind == 3:
+        return OrSpecification(*(random_specification(rnd, depth + 1) for _ in range(rnd.randint(1, 3))))
+    if kind == 4:
+        return NotSpecification(random_specification(rnd, depth + 1))
+    return TitleLengthSpecification(1)
+
+
+def random_items(rnd: random.Random, size: int) -> List[News]:
+    return [
+        News(id=i, title=rnd.choice(['a', 'b', 'c', 'dd']), text=rnd.choice(['a', 'b', 'c', None]))
+        for i in range(size)
+    ]
+
+
+def assert_same_items(actual: List[News], expected: List[News]):
+    assert [vars(item) for item in actual] == [vars(item) for item in expected]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_columnar_matches_list_based(seed: int):
+    rnd = random.Random(seed)
+    items = random_items(rnd, 60)
+    reference = ListBasedNewsRepository([News(**vars(item)) for item in items])
+    repo = ColumnarNewsRepository(items)
+    reference._next_id = repo._next_id = 100
+
+    for _ in range(40):
+        action = rnd.randrange(5)
+        if action == 0:
+            forms = [NewsCreateForm(title=rnd.choice(['a', 'e']), text=rnd.choice(['b', None])) for _ in range(rnd.randint(1, 3))]
+            assert_same_items(repo.create_many(forms), reference.create_many(forms))
+        elif action == 1:
+            ids = rnd.sample(range(120), 3)
+            form = NewsUpdateForm(title=rnd.choice(['a', 'c']), text=rnd.choice(['a', None]))
+            if all(reference.exists(item_id) for item_id in ids):
+                assert_same_items(repo.update_many(ids, form), reference.update_many(ids, form))
+            else:
+                with pytest.raises(ItemNotFoundException):
+                    repo.update_many(ids, form)
+        elif action == 2:
+            spec = random_specification(rnd)
+            assert_same_items(repo.delete_many(spec), reference.delete_many(spec))
+        elif action == 3:
+            item_id = rnd.randrange(120)
+            if reference.exists(item_id):
+                assert_same_items([repo.delete(item_id)], [reference.delete(item_id)])
+            else:
+                with pytest.raises(ItemNotFoundException):
+                    repo.delete(item_id)
+
+        spec = random_specification(rnd) if rnd.random() < 0.8 else None
+        builder = OrderOptionsBuilder()
+        for attribute in rnd.sample(['title', 'text', 'id'], rnd.randint(0, 3)):
+            builder.add(attribute, rnd.choice(list(OrderDirection)), rnd.choice([None, NonesOrder.FIRST, NonesOrder.LAST]))
+        order_options = builder.build()
+        paging_options = rnd.choice([None, PagingOptions(limit=5), PagingOptions(limit=7, offset=3), PagingOptions(offset=50)])
+
+        assert_same_items(
+            repo.get_collection(spec, order_options, paging_options),
+            reference.get_collection(spec, order_options, paging_options),
+        )
+        assert repo.count(spec) == reference.count(spec)
+
+    assert_same_items(list(repo.get_items(range(120), skip_missing=True).values()),
+                      list(reference.get_items(range(120), skip_missing=True).values()))
+    assert repo._tombstones <= len(repo._alive) * repo._compaction_ratio
+
+
+def test_columnar_cursor_pagination():
+    rnd = random.Random(0)
+    repo = ColumnarNewsRepository(random_items(rnd, 50))
+    order_options = OrderOptionsBuilder().add('text', OrderDirection.DESC).add('id').build()
+    expected = [item.id for item in repo.get_collection(order_options=order_options)]
+
+    resolver = CursorPageResolver(7, order_options)
+    actual = []
+    cursor = None
+    while True:
+        page = repo.get_collection(order_options=order_options, paging_options=resolver.get_page(cursor))
+        actual.extend(item.id for item in page)
+        cursor = resolver.get_next_cursor(page)
+        if cursor is None:
+            break
+    assert actual == expected
+
+
+def test_columnar_items_are_detached():
+    repo = ColumnarNewsRepository()
+    created = repo.create(NewsCreateForm(title='Title', text='Text'))
+    created.title = 'Changed'
+    item = repo.get_item(created.id)
+    assert item.title == 'Title'
+    assert item is not repo.get_item(created.id)
+
+    updated = repo.update(created.id, NewsUpdateForm(title='Updated'))
+    assert vars(updated) == vars(repo.get_item(created.id))
+
+
+def test_columnar_rejects_unsupported_values():
+    repo = ColumnarNewsRepository()
+    repo.create(NewsCreateForm(title='Title 1'))
+
+    with pytest.raises(TypeError):
+        repo.create_many([NewsCreateForm(title='Title 2'), NewsCreateForm(title=['unhashable'])])
+    assert repo.count() == 1 and not repo.exists(2)
+
+    with pytest.raises(TypeError):
+        repo.update(1, NewsUpdateForm(title='Title', text=['unhashable']))
+    assert vars(repo.get_item(1)) == vars(News(id=1, title='Title 1'))
+
+    with pytest.raises(TypeError):
+        ColumnarNewsRepository([News(id=1, title='Title 1'), News(id=2 ** 63, title='Title 2')])
+
+
+def test_columnar_requires_id_column():
+    class NoIdRepository(ColumnarNewsRepository):
+        def _create_columns(self):
+            return {'title': ColumnType.STR}
+
+    with pytest.raises(ValueError):
+        NoIdRepository()
+
+
+@pytest.mark.parametrize("vectorize", [True, False])
+def test_columnar_skips_incomparable_values_outside_candidates(vectorize: bool):
+    class Repository(ColumnarNewsRepository):
+        _vectorize = vectorize
+
+    items = [News(id=1, title='a', text='a'), News(id=2, title='b', text=2), News(id=3, title='c', text=3)]
+    reference = ListBasedNewsRepository([News(**vars(item)) for item in items])
+    repo = Repository(items)
+    repo.delete(1)
+    reference.delete(1)
+
+    for spec in [
+        AttributeSpecification('text', 5, Operator.LT),
+        AndSpecification(AttributeSpecification('title', 'c'), AttributeSpecification('text', 5, Operator.LT)),
+        OrSpecification(AttributeSpecification('title', 'b'), AttributeSpecification('text', 3, Operator.GTE)),
+    ]:
+        assert_same_items(repo.get_collection(spec), reference.get_collection(spec))
+        assert repo.count(spec) == reference.count(spec)
+
+    repo = Repository([News(id=1, title='a', text='a'), News(id=2, title='b', text=2)])
+    assert_same_items(
+        repo.get_collection(AndSpecification(AttributeSpecification('title', 'b'), AttributeSpecification('text', 5, Operator.LT))),
+        [News(id=2, title='b', text=2)],
+    )
+    with pytest.raises(TypeError):
+        repo.get_collection(AttributeSpecification('text', 5, Operator.LT))
+
+
+@pytest.mark.asyncio
+async def test_async_columnar_matches_list_based():
+    rnd = random.Random(1)
+    items = random_items(rnd, 40)
+    reference = AsyncListBasedNewsRepository([News(**vars(item)) for item in items])
+    repo = AsyncColumnarNewsRepository(items)
+    reference._next_id = repo._next_id = 100
+
+    forms = [NewsCreateForm(title='e', text=None), NewsCreateForm(title='a', text='b')]
+    assert_same_items(await repo.create_many(forms), await reference.create_many(forms))
+    spec = OrSpecification(AttributeSpecification('text', None), TitleLengthSpecification(2))
+    form = NewsUpdateForm(title='z', text='z')
+    assert_same_items(await repo.update_many(spec, form), await reference.update_many(spec, form))
+    assert_same_items([await repo.delete(3)], [await reference.delete(3)])
+
+    order_options = OrderOptionsBuilder().add('title', OrderDirection.DESC).add('id').build()
+    for spec in [None, AttributeSpecification('title', 'a'), NotSpecification(AttributeSpecification('text', 'z'))]:
+        assert_same_items(
+            await repo.get_collection(spec, order_options, PagingOptions(limit=10, offset=2)),
+            await reference.get_collection(spec, order_options, PagingOptions(limit=10, offset=2)),
+        )
+        assert await repo.count(spec) == await reference.count(spec)
+
+    assert vars(await repo.get_item(5)) == vars(await reference.get_item(5))
+    assert await repo.exists(101) and not await repo.exists(3)
+    with pytest.raises(ItemNotFoundException):
+        await repo.update(3, form)
@@ -0,0 +1,46 @@
+from typing import Tuple, List
+
+import pytest
+
+from abstractrepo.compiler import SpecificationCompiler
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, NotSpecification, \
+    OrSpecification, Operator
+from tests.fixtures.models import News
+from tests.providers.filter import data_provider_for_news_filter
+
+NEWS = [News(id=i, title=f'Title {i}', text=f'Text {i}') for i in range(1, 102)] + [
+    News(id=102, title='Title for None text', text=None),
+]
+
+
+@pytest.mark.parametrize("test_case", data_provider_for_news_filter())
+def test_compiled_specification(test_case: Tuple[SpecificationInterface[News, bool], List[News]]):
+    filter_spec, _ = test_case
+    predicate = SpecificationCompiler().compile(filter_spec)
+    assert [bool(predicate(news)) for news in NEWS] == [bool(filter_spec.is_satisfied_by(news)) for news in NEWS]
+
+
+@pytest.mark.parametrize("filter_spec", [
+    AttributeSpecification('text', 'Text 1', Operator.NE),
+    AttributeSpecification('text', None, Operator.NE),
+    NotSpecification(AttributeSpecification('text', 'Text 1')),
+    NotSpecification(AttributeSpecification('text', ['Text 1'], Operator.IN)),
+    AttributeSpecification('text', ['Text 1', None], Operator.NOT_IN),
+    OrSpecification(),
+])
+def test_compiled_specification_none_semantics(filter_spec: SpecificationInterface[News, bool]):
+    predicate = SpecificationCompiler().compile(filter_spec)
+    assert [bool(predicate(news)) for news in NEWS] == [bool(filter_spec.is_satisfied_by(news)) for news in NEWS]
+
+
+def test_compiled_specification_errors():
+    news = News(id=1, title='Title 1')
+
+    with pytest.raises(ValueError):
+        SpecificationCompiler().compile(AttributeSpecification('id', 12, Operator.IN))(news)
+
+    with pytest.raises(TypeError):
+        SpecificationCompiler().compile(AttributeSpecification('id', None, Operator.GT))(news)
+
+    with pytest.raises(TypeError):
+        SpecificationCompiler().compile(AttributeSpecification('id', 12, 'UnsupportedOperator'))(news)
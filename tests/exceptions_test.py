@@ -1,4 +1,5 @@
-from abstractrepo.exceptions import RelationViolationException, UniqueViolationException, ItemNotFoundException
+from abstractrepo.exceptions import RelationViolationException, UniqueViolationException, ItemNotFoundException, \
+    PoolTimeoutException, RepositoryExceptionInterface
 from abstractrepo.specification import AttributeSpecification
 from tests.fixtures.models import User
 
@@ -50,3 +51,12 @@ def test_relation_violation_exception():
         assert e.cls == User
         assert e.action == 'update'
         assert e.form == {'username': 'test'}
+
+
+def test_pool_timeout_exception():
+    try:
+        raise PoolTimeoutException(0.5)
+    except TimeoutError as e:
+        assert str(e) == 'No connection available within 0.5 seconds'
+        assert isinstance(e, RepositoryExceptionInterface)
+        assert e.timeout == 0.5
@@ -3,7 +3,8 @@ from typing import Tuple, List
 
 import pytest
 
-from abstractrepo.specification import SpecificationInterface, AttributeSpecification, Operator
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, NotSpecification, Operator, LikePattern
 from tests.fixtures.models import News
 from tests.fixtures.repo import ListBasedNewsRepository, AsyncListBasedNewsRepository
 from tests.providers.filter import data_provider_for_news_filter, data_provider_for_news_repo, \
@@ -54,3 +55,144 @@ async def test_filter_errors_async(repo: AsyncListBasedNewsRepository):
 
     with pytest.raises(TypeError):
         await repo.get_collection(AttributeSpecification('id', 12, 'UnsupportedOperator'))
+
+
+@pytest.mark.parametrize("pattern, string, expected", [
+    ('', '', True),
+    ('', 'a', False),
+    ('%', 'multi\nline', True),
+    ('Title%', 'Title 1', True),
+    ('Title%', 'A Title', False),
+    ('%1', 'Title 1', True),
+    ('%tle%', 'Title 1', True),
+    ('Title_1', 'Title 1', True),
+    ('Title.1', 'Title 1', False),
+    ('Title.1', 'Title.1', True),
+    ('(a+)%', '(a+) b', True),
+    ('(a+)%', 'aa b', False),
+    ('T%e%1', 'Title 1', True),
+    ('T%e%2', 'Title 1', False),
+])
+def test_like_pattern(pattern: str, string: str, expected: bool):
+    assert LikePattern(pattern).match(string) is expected
+    assert AttributeSpecification('title', pattern, Operator.LIKE).is_satisfied_by(News(id=1, title=string)) is expected
+    assert AttributeSpecification('title', pattern.upper(), Operator.ILIKE).is_satisfied_by(News(id=1, title=string)) is expected
+
+
+def test_like_pattern_follows_attribute_value():
+    spec = AttributeSpecification('title', 'Title%', Operator.LIKE)
+    assert spec.is_satisfied_by(News(id=1, title='Title 1'))
+
+    spec.attribute_value = 'News%'
+    assert not spec.is_satisfied_by(News(id=1, title='Title 1'))
+    assert pickle.loads(pickle.dumps(spec)).is_satisfied_by(News(id=1, title='News 1'))
+
+
+@pytest.mark.parametrize("repo", data_provider_for_news_repo(20))
+@pytest.mark.parametrize("operand", [
+    [3, 5, 7],
+    (3, 5, 7),
+    {3, 5, 7},
+    frozenset([3, 5, 7]),
+    range(3, 8, 2),
+    [[1], 3, 5, 7],
+])
+def test_filter_in_collections(repo: ListBasedNewsRepository, operand):
+    in_spec = AttributeSpecification('id', operand, Operator.IN)
+    not_in_spec = AttributeSpecification('id', in_spec.attribute_value, Operator.NOT_IN)
+
+    assert [item.id for item in repo.get_collection(in_spec)] == [3, 5, 7]
+    assert [item.id for item in repo.get_collection(not_in_spec)] == [i for i in range(1, 21) if i not in (3, 5, 7)]
+    assert repo.count(in_spec) == 3
+    assert in_spec.is_satisfied_by(News(id=5, title='Title 5'))
+    assert not not_in_spec.is_satisfied_by(News(id=5, title='Title 5'))
+
+
+@pytest.mark.parametrize("repo", data_provider_for_news_repo(20))
+def test_filter_in_iterator(repo: ListBasedNewsRepository):
+    spec = AttributeSpecification('id', (i for i in (3, 5, 7)), Operator.IN)
+    assert spec.attribute_value == (3, 5, 7)
+    assert [item.id for item in repo.get_collection(spec)] == [3, 5, 7]
+    assert [item.id for item in repo.get_collection(spec)] == [3, 5, 7]
+
+
+@pytest.mark.parametrize("repo", data_provider_for_news_repo(20))
+def test_filter_in_string_operand(repo: ListBasedNewsRepository):
+    with pytest.raises(ValueError):
+        repo.get_collection(AttributeSpecification('title', 'Title 1', Operator.IN))
+
+
+class IdParitySpecification(SpecificationInterface[News, bool]):
+    def is_satisfied_by(self, model: News) -> bool:
+        return model.id % 2 == 0
+
+
+def test_specification_equality():
+    spec = AndSpecification(
+        AttributeSpecification('id', [1, 2], Operator.IN),
+        NotSpecification(AttributeSpecification('title', 'Title%', Operator.LIKE)),
+    )
+    same = AndSpecification(
+        AttributeSpecification('id', (1, 2), Operator.IN),
+        NotSpecification(AttributeSpecification('title', 'Title%', Operator.LIKE)),
+    )
+    assert spec == same
+    assert hash(spec) == hash(same)
+    assert len({spec, same}) == 1
+    assert spec != OrSpecification(*same.specifications)
+    assert spec != AndSpecification(*reversed(same.specifications))
+
+    assert AttributeSpecification('id', {1, 2}, Operator.IN) == AttributeSpecification('id', frozenset([2, 1]), Operator.IN)
+    assert AttributeSpecification('id', [1, 2], Operator.IN) == AttributeSpecification('id', (2, 1, 1), Operator.IN)
+    assert hash(AttributeSpecification('id', [1, 2], Operator.IN)) == hash(AttributeSpecification('id', [2, 1, 2], Operator.IN))
+    assert AttributeSpecification('id', [1, 2], Operator.NOT_IN) == AttributeSpecification('id', {2: 'b', 1: 'a'}, Operator.NOT_IN)
+    assert AttributeSpecification('id', [1, 2], Operator.IN) != AttributeSpecification('id', [1, 2, 3], Operator.IN)
+    assert AttributeSpecification('id', [1, 2], Operator.IN) != AttributeSpecification('id', [1, 2], Operator.NOT_IN)
+    assert AttributeSpecification('id', [1, 2]) != AttributeSpecification('id', (1, 2))
+    assert AttributeSpecification('id', 1) != AttributeSpecification('id', True)
+    assert AttributeSpecification('id', 1) != AttributeSpecification('id', 1, Operator.GTE)
+    assert AttributeSpecification('id', 1) != AttributeSpecification('title', 1)
+
+
+def test_specification_equality_falls_back_to_identity():
+    spec = IdParitySpecification()
+    assert spec == spec
+    assert spec != IdParitySpecification()
+    assert hash(spec) == hash(spec)
+    assert NotSpecification(spec) != NotSpecification(spec)
+    assert AttributeSpecification('id', [bytearray(b'1')], Operator.IN) != AttributeSpecification('id', [bytearray(b'1')], Operator.IN)
+    with pytest.raises(TypeError):
+        spec.get_fingerprint()
+
+
+def test_specification_fingerprint_follows_attributes():
+    spec = AttributeSpecification('id', 1)
+    fingerprint = spec.get_fingerprint()
+    assert spec.get_fingerprint() is fingerprint
+
+    spec.attribute_value = 2
+    assert spec == AttributeSpecification('id', 2)
+    spec.operator = Operator.GT
+    assert spec == AttributeSpecification('id', 2, Operator.GT)
+    spec.attribute_name = 'title'
+    assert spec == AttributeSpecification('title', 2, Operator.GT)
+
+    operand = [1, 2]
+    spec = AttributeSpecification('id', operand, Operator.IN)
+    specs = {spec}
+    operand.append(3)
+    assert spec.attribute_value == (1, 2)
+    assert spec in specs
+    assert spec == AttributeSpecification('id', [1, 2], Operator.IN)
+
+    mutable = AttributeSpecification('id', operand)
+    mutable_hash = hash(mutable)
+    operand.append(4)
+    assert hash(mutable) == mutable_hash
+    assert mutable != AttributeSpecification('id', operand)
+    with pytest.raises(TypeError):
+        mutable.get_fingerprint()
+
+    restored = pickle.loads(pickle.dumps(spec))
+    assert '_fingerprint_cache' not in restored.__dict__
+    assert restored == spec
@@ -1,10 +1,13 @@
 import abc
-from typing import Optional, List, Type
+from typing import Optional, List, Type, Dict
 
+from abstractrepo.columnar import ColumnType, ColumnarCrudRepository, AsyncColumnarCrudRepository
 from abstractrepo.exceptions import ItemNotFoundException, UniqueViolationException
+from abstractrepo.index import IndexInterface, HashIndex, SortedIndex
 from abstractrepo.specification import SpecificationInterface, Operator, AttributeSpecification
 from abstractrepo.repo import CrudRepositoryInterface, ListBasedCrudRepository, AsyncCrudRepositoryInterface, \
-    AsyncListBasedCrudRepository
+    AsyncListBasedCrudRepository, ThreadSafeListBasedCrudRepository
+from abstractrepo.sql import SqliteCrudRepository, AsyncSqliteCrudRepository
 from tests.fixtures.models import News, NewsCreateForm, NewsUpdateForm, User, UserCreateForm, UserUpdateForm
 
 
@@ -24,15 +27,9 @@ class AsyncUserRepositoryInterface(AsyncCrudRepositoryInterface[User, int, UserC
     pass
 
 
-class ListBasedNewsRepository(
-    ListBasedCrudRepository[News, int, NewsCreateForm, NewsUpdateForm],
-    NewsRepositoryInterface,
-):
-    _next_id: int
-
-    def __init__(self, items: Optional[List[News]] = None):
-        super().__init__(items)
-        self._next_id = 0
+class NewsModelMixin:
+    """Model hooks shared by the News repositories of the synchronous backends."""
+    _next_id: int = 0
 
     @property
     def model_class(self) -> Type[News]:
@@ -54,19 +51,10 @@ class ListBasedNewsRepository(
         self._next_id += 1
         return self._next_id
 
-    def _get_id_filter_specification(self, item_id: int) -> SpecificationInterface[News, bool]:
-        return AttributeSpecification('id', item_id, Operator.E)
 
-
-class AsyncListBasedNewsRepository(
-    AsyncListBasedCrudRepository[News, int, NewsCreateForm, NewsUpdateForm],
-    AsyncNewsRepositoryInterface,
-):
-    _next_id: int
-
-    def __init__(self, items: Optional[List[News]] = None):
-        super().__init__(items)
-        self._next_id = 0
+class AsyncNewsModelMixin:
+    """Model hooks shared by the News repositories of the asynchronous backends."""
+    _next_id: int = 0
 
     @property
     def model_class(self) -> Type[News]:
@@ -88,10 +76,87 @@ class AsyncListBasedNewsRepository(
         self._next_id += 1
         return self._next_id
 
+
+class ListBasedNewsRepository(
+    NewsModelMixin,
+    ListBasedCrudRepository[News, int, NewsCreateForm, NewsUpdateForm],
+    NewsRepositoryInterface,
+):
     def _get_id_filter_specification(self, item_id: int) -> SpecificationInterface[News, bool]:
         return AttributeSpecification('id', item_id, Operator.E)
 
 
+class AsyncListBasedNewsRepository(
+    AsyncNewsModelMixin,
+    AsyncListBasedCrudRepository[News, int, NewsCreateForm, NewsUpdateForm],
+    AsyncNewsRepositoryInterface,
+):
+    def _get_id_filter_specification(self, item_id: int) -> SpecificationInterface[News, bool]:
+        return AttributeSpecification('id', item_id, Operator.E)
+
+
+class IndexedListBasedNewsRepository(ListBasedNewsRepository):
+    def _create_indexes(self) -> List[IndexInterface]:
+        return [HashIndex('title'), HashIndex('text'), SortedIndex('id')]
+
+
+class AsyncIndexedListBasedNewsRepository(AsyncListBasedNewsRepository):
+    def _create_indexes(self) -> List[IndexInterface]:
+        return [HashIndex('title'), HashIndex('text'), SortedIndex('id')]
+
+
+class ThreadSafeListBasedNewsRepository(
+    NewsModelMixin,
+    ThreadSafeListBasedCrudRepository[News, int, NewsCreateForm, NewsUpdateForm],
+    NewsRepositoryInterface,
+):
+    def _get_id_filter_specification(self, item_id: int) -> SpecificationInterface[News, bool]:
+        return AttributeSpecification('id', item_id, Operator.E)
+
+    def _create_indexes(self) -> List[IndexInterface]:
+        return [HashIndex('title'), SortedIndex('id')]
+
+
+class ColumnarNewsRepository(
+    NewsModelMixin,
+    ColumnarCrudRepository[News, int, NewsCreateForm, NewsUpdateForm],
+    NewsRepositoryInterface,
+):
+    def _create_columns(self) -> Dict[str, ColumnType]:
+        return {'id': ColumnType.INT, 'title': ColumnType.STR, 'text': ColumnType.STR}
+
+
+class AsyncColumnarNewsRepository(
+    AsyncNewsModelMixin,
+    AsyncColumnarCrudRepository[News, int, NewsCreateForm, NewsUpdateForm],
+    AsyncNewsRepositoryInterface,
+):
+    def _create_columns(self) -> Dict[str, ColumnType]:
+        return {'id': ColumnType.INT, 'title': ColumnType.STR, 'text': ColumnType.STR}
+
+
+class SqliteNewsRepository(
+    NewsModelMixin,
+    SqliteCrudRepository[News, int, NewsCreateForm, NewsUpdateForm],
+    NewsRepositoryInterface,
+):
+    _indexed_columns = ('title',)
+
+    def _create_columns(self) -> Dict[str, ColumnType]:
+        return {'id': ColumnType.INT, 'title': ColumnType.STR, 'text': ColumnType.STR}
+
+
+class AsyncSqliteNewsRepository(
+    AsyncNewsModelMixin,
+    AsyncSqliteCrudRepository[News, int, NewsCreateForm, NewsUpdateForm],
+    AsyncNewsRepositoryInterface,
+):
+    _indexed_columns = ('title',)
+
+    def _create_columns(self) -> Dict[str, ColumnType]:
+        return {'id': ColumnType.INT, 'title': ColumnType.STR, 'text': ColumnType.STR}
+
+
 class ListBasedUserRepository(
     ListBasedCrudRepository[User, int, UserCreateForm, UserUpdateForm],
     UserRepositoryInterface,
@@ -0,0 +1,176 @@
+import random
+import threading
+from typing import List, Optional
+
+import pytest
+
+from abstractrepo.order import OrderOptions, OrderOptionsBuilder, OrderDirection, NonesOrder
+from abstractrepo.paging import PagingOptions, CursorPagingOptions, CursorPageResolver
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, NotSpecification, Operator
+from tests.fixtures.models import News, NewsCreateForm, NewsUpdateForm
+from tests.fixtures.repo import ListBasedNewsRepository, AsyncListBasedNewsRepository, \
+    IndexedListBasedNewsRepository, ThreadSafeListBasedNewsRepository
+
+
+class FailingSpecification(SpecificationInterface[News, bool]):
+    def is_satisfied_by(self, model: News) -> bool:
+        if model.title == 'fail':
+            raise ValueError('Cannot evaluate')
+        return True
+
+
+def random_specification(rnd: random.Random) -> Optional[SpecificationInterface[News, bool]]:
+    return rnd.choice([
+        None,
+        AttributeSpecification('title', rnd.choice(['a', 'b'])),
+        AttributeSpecification('text', None, Operator.NE),
+        OrSpecification(AttributeSpecification('id', 30, Operator.LT), AttributeSpecification('title', 'c')),
+        NotSpecification(AndSpecification(AttributeSpecification('title', 'a'), AttributeSpecification('text', 'x'))),
+    ])
+
+
+def random_order_options(rnd: random.Random) -> Optional[OrderOptions]:
+    if rnd.random() < 0.2:
+        return None
+    builder = OrderOptionsBuilder()
+    for attribute in rnd.sample(['title', 'text', 'id'], rnd.randint(1, 2)):
+        builder.add(attribute, rnd.choice(list(OrderDirection)), rnd.choice([None, NonesOrder.FIRST, NonesOrder.LAST]))
+    return builder.build()
+
+
+def random_items(rnd: random.Random, size: int) -> List[News]:
+    return [
+        News(id=i, title=rnd.choice(['a', 'b', 'c']), text=rnd.choice(['x', 'y', None]))
+        for i in range(1, size + 1)
+    ]
+
+
+def ids(items: List[News]) -> List[int]:
+    return [item.id for item in items]
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("repo_class", [ListBasedNewsRepository, IndexedListBasedNewsRepository])
+def test_live_query_follows_changes(repo_class, seed: int):
+    rnd = random.Random(seed)
+    repo = repo_class(random_items(rnd, 40))
+    repo._next_id = 100
+    queries = [repo.register_live_query(random_specification(rnd), random_order_options(rnd)) for _ in range(4)]
+
+    for step in range(60):
+        action = rnd.randrange(5)
+        if action == 0:
+            repo.create_many([NewsCreateForm(title=rnd.choice(['a', 'c']), text=rnd.choice(['x', None]))
+                              for _ in range(rnd.randint(1, 3))])
+        elif action == 1:
+            item_id = rnd.randrange(1, 120)
+            if repo.exists(item_id):
+                repo.update(item_id, NewsUpdateForm(title=rnd.choice(['a', 'b', 'c']), text=rnd.choice(['x', 'y', None])))
+        elif action == 2:
+            repo.update_many(random_specification(rnd) or [], NewsUpdateForm(title=rnd.choice(['b', 'c']), text='y'))
+        elif action == 3:
+            repo.delete_many([item_id for item_id in rnd.sample(range(1, 120), 5) if repo.exists(item_id)])
+        elif step % 3 == 0:
+            repo.delete_many(random_specification(rnd) or [])
+
+        for query in queries:
+            paging_options = rnd.choice([None, PagingOptions(limit=5), PagingOptions(limit=7, offset=3)])
+            assert ids(query.get_collection(paging_options)) == \
+                ids(repo.get_collection(query.filter_spec, query.order_options, paging_options))
+            assert query.count() == repo.count(query.filter_spec)
+
+
+def test_live_query_cursor_pagination():
+    rnd = random.Random(0)
+    repo = ListBasedNewsRepository(random_items(rnd, 50))
+    order_options = OrderOptionsBuilder().add('text', OrderDirection.DESC, NonesOrder.LAST).add('id').build()
+    query = repo.register_live_query(AttributeSpecification('title', 'c', Operator.NE), order_options)
+    repo.update(3, NewsUpdateForm(title='a', text=None))
+    repo.delete(7)
+
+    resolver = CursorPageResolver(6, order_options)
+    actual = []
+    cursor = None
+    while True:
+        page = query.get_collection(resolver.get_page(cursor))
+        assert ids(page) == ids(repo.get_collection(query.filter_spec, order_options, resolver.get_page(cursor)))
+        actual.extend(ids(page))
+        cursor = resolver.get_next_cursor(page)
+        if cursor is None:
+            break
+    assert actual == ids(repo.get_collection(query.filter_spec, order_options))
+
+    unordered = repo.register_live_query()
+    with pytest.raises(ValueError):
+        unordered.get_collection(CursorPagingOptions(limit=5, after=('x', 1)))
+    with pytest.raises(ValueError):
+        query.get_collection(CursorPagingOptions(limit=5, after=('x',)))
+
+
+def test_live_query_recovers_from_evaluation_errors():
+    repo = ListBasedNewsRepository([News(id=1, title='a'), News(id=2, title='b')])
+    repo._next_id = 2
+    query = repo.register_live_query(FailingSpecification())
+    assert ids(query.get_collection()) == [1, 2]
+
+    repo.update(1, NewsUpdateForm(title='fail'))
+    with pytest.raises(ValueError):
+        query.get_collection()
+
+    repo.update(1, NewsUpdateForm(title='c'))
+    repo.create(NewsCreateForm(title='d'))
+    assert ids(query.get_collection()) == [1, 2, 3]
+
+
+def test_unregister_live_query():
+    repo = ListBasedNewsRepository([News(id=1, title='a')])
+    query = repo.register_live_query()
+    assert query.count() == 1
+
+    repo.unregister_live_query(query)
+    repo.delete(1)
+    assert query.count() == 1
+    with pytest.raises(ValueError):
+        repo.unregister_live_query(query)
+
+
+def test_thread_safe_live_query():
+    repo = ThreadSafeListBasedNewsRepository(random_items(random.Random(0), 20))
+    repo._next_id = 20
+    order_options = OrderOptionsBuilder().add('title').add('id', OrderDirection.DESC).build()
+    query = repo.register_live_query(AttributeSpecification('title', 'c', Operator.NE), order_options)
+
+    def write(offset: int):
+        for i in range(50):
+            repo.create(NewsCreateForm(title=['a', 'b', 'c'][(i + offset) % 3]))
+            repo.update(1 + (i + offset) % 20, NewsUpdateForm(title=['a', 'b', 'c'][i % 3]))
+
+    threads = [threading.Thread(target=write, args=(offset,)) for offset in range(3)]
+    for thread in threads:
+        thread.start()
+    for _ in range(50):
+        page = query.get_collection(PagingOptions(limit=10))
+        assert all(item.title != 'c' for item in page)
+    for thread in threads:
+        thread.join()
+
+    assert ids(query.get_collection()) == ids(repo.get_collection(query.filter_spec, order_options))
+    repo.unregister_live_query(query)
+
+
+@pytest.mark.asyncio
+async def test_async_live_query():
+    rnd = random.Random(1)
+    repo = AsyncListBasedNewsRepository(random_items(rnd, 30))
+    repo._next_id = 30
+    order_options = OrderOptionsBuilder().add('title', OrderDirection.DESC).build()
+    query = repo.register_live_query(AttributeSpecification('text', None, Operator.NE), order_options)
+
+    await repo.create(NewsCreateForm(title='z', text='x'))
+    await repo.update_many(AttributeSpecification('title', 'a'), NewsUpdateForm(title='b', text=None))
+    await repo.delete_many(range(1, 25))
+    await repo.delete(31)
+
+    assert ids(query.get_collection()) == ids(await repo.get_collection(query.filter_spec, order_options))
+    assert query.count() == await repo.count(query.filter_spec)
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from abstractrepo.locking import ReadWriteLock
+from abstractrepo.specification import AttributeSpecification
+from tests.fixtures.models import NewsCreateForm, NewsUpdateForm
+from tests.fixtures.repo import ThreadSafeListBasedNewsRepository
+
+
+def test_readers_do_not_block_each_other():
+    lock = ReadWriteLock()
+    readers_inside = threading.Barrier(4, timeout=5)
+
+    def reader():
+        with lock.read():
+            readers_inside.wait()
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not readers_inside.broken
+
+
+def test_writer_is_exclusive():
+    lock = ReadWriteLock()
+    events = []
+
+    lock.acquire_read()
+    writer = threading.Thread(target=lambda: (lock.acquire_write(), events.append('write'), lock.release_write()))
+    writer.start()
+    time.sleep(0.05)
+    assert events == []
+
+    late_reader = threading.Thread(target=lambda: (lock.acquire_read(), events.append('read'), lock.release_read()))
+    late_reader.start()
+    time.sleep(0.05)
+    assert events == []
+
+    lock.release_read()
+    writer.join(5)
+    late_reader.join(5)
+    assert events == ['write', 'read']
+
+
+def test_reentrancy():
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                with lock.read():
+                    pass
+        with lock.read():
+            pass
+
+    with lock.read():
+        with lock.read():
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+
+    with pytest.raises(RuntimeError):
+        lock.release_read()
+    with pytest.raises(RuntimeError):
+        lock.release_write()
+
+    with lock.write():
+        pass
+
+
+def test_thread_safe_repository_consistency():
+    repo = ThreadSafeListBasedNewsRepository()
+    repo.create_many(NewsCreateForm(title='Title', text='initial') for _ in range(200))
+    errors = []
+    stop = threading.Event()
+
+    def writer(offset: int):
+        for i in range(offset, 200, 4):
+            repo.update(i + 1, NewsUpdateForm(title='Title', text='updated'))
+            if i % 8 == 0:
+                repo.delete(i + 1)
+            repo.create(NewsCreateForm(title='Title', text='created'))
+
+    def reader():
+        while not stop.is_set():
+            items = repo.get_collection(AttributeSpecification('title', 'Title'))
+            texts = [item.text for item in items]
+            if len(set(item.id for item in items)) != len(items):
+                errors.append('duplicates')
+            if texts.count('created') + texts.count('updated') + texts.count('initial') != len(items):
+                errors.append('texts')
+
+    readers = [threading.Thread(target=reader) for _ in range(3)]
+    writers = [threading.Thread(target=writer, args=(offset,)) for offset in range(4)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert repo.count() == 200 - 25 + 200
+    assert repo.count(AttributeSpecification('text', 'initial')) == 0
+    assert len(repo.get_items(range(201, 401))) == 200
@@ -1,9 +1,11 @@
 import pickle
+import random
 from typing import Tuple, List
 
 import pytest
 
-from abstractrepo.order import OrderOptions
+from abstractrepo.order import OrderOption, OrderOptions, OrderOptionsBuilder, OrderDirection, NonesOrder
+from abstractrepo.paging import PagingOptions
 from tests.fixtures.repo import ListBasedNewsRepository, AsyncListBasedNewsRepository
 from tests.fixtures.models import News
 from tests.providers.order import data_provider_for_news_order
@@ -24,3 +26,84 @@ async def test_order_async(test_case: Tuple[List[News], OrderOptions, List[News]
     repo = AsyncListBasedNewsRepository(input_news)
     actual = await repo.get_collection(order_options=order_options)
     assert pickle.dumps(actual) == pickle.dumps(expected)
+
+
+def sort_by_passes(items: List[News], order_options: OrderOptions) -> List[News]:
+    for option in reversed(order_options.options):
+        def get_sort_key(item, option=option):
+            value = getattr(item, option.attribute)
+            if int(option.nones == NonesOrder.FIRST) ^ int(option.direction == OrderDirection.DESC):
+                return value is not None, value
+            return value is None, value
+
+        items = sorted(items, key=get_sort_key, reverse=option.direction == OrderDirection.DESC)
+    return items
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_order_matches_multi_pass_sort(seed: int):
+    rnd = random.Random(seed)
+    items = [
+        News(id=i, title=rnd.choice(['a', 'b', 'c']), text=rnd.choice(['x', 'y', None]))
+        for i in range(50)
+    ]
+    builder = OrderOptionsBuilder()
+    for attribute in rnd.sample(['title', 'text', 'id'], rnd.randint(1, 3)):
+        builder.add(attribute, rnd.choice(list(OrderDirection)), rnd.choice([None, NonesOrder.FIRST, NonesOrder.LAST]))
+    order_options = builder.build()
+
+    expected = [item.id for item in sort_by_passes(items, order_options)]
+    actual = [item.id for item in ListBasedNewsRepository(items).get_collection(order_options=order_options)]
+    assert actual == expected
+
+
+def random_order_case(seed: int) -> Tuple[List[News], OrderOptions, PagingOptions]:
+    rnd = random.Random(seed)
+    items = [
+        News(id=i, title=rnd.choice(['a', 'b', 'c', None]), text=rnd.choice(['x', 'y', None]))
+        for i in range(200)
+    ]
+    builder = OrderOptionsBuilder()
+    for attribute in rnd.sample(['title', 'text', 'id'], rnd.randint(1, 3)):
+        builder.add(attribute, rnd.choice(list(OrderDirection)), rnd.choice([None, NonesOrder.FIRST, NonesOrder.LAST]))
+    paging_options = PagingOptions(rnd.choice([None, 0, 1, 5, 20, 300]), rnd.choice([None, 0, 3, 190]))
+    return items, builder.build(), paging_options
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_paged_order_matches_full_sort(seed: int):
+    items, order_options, paging_options = random_order_case(seed)
+    offset = paging_options.offset or 0
+    end = None if paging_options.limit is None else offset + paging_options.limit
+
+    expected = [item.id for item in sort_by_passes(items, order_options)][offset:end]
+    actual = ListBasedNewsRepository(items).get_collection(order_options=order_options, paging_options=paging_options)
+    assert [item.id for item in actual] == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", range(40))
+async def test_paged_order_matches_full_sort_async(seed: int):
+    items, order_options, paging_options = random_order_case(seed)
+    offset = paging_options.offset or 0
+    end = None if paging_options.limit is None else offset + paging_options.limit
+
+    expected = [item.id for item in sort_by_passes(items, order_options)][offset:end]
+    actual = await AsyncListBasedNewsRepository(items).get_collection(order_options=order_options, paging_options=paging_options)
+    assert [item.id for item in actual] == expected
+
+
+def test_order_options_equality():
+    options = OrderOptionsBuilder().add('title').add('id', OrderDirection.DESC).build()
+    same = OrderOptions(
+        OrderOption('title', OrderDirection.ASC, NonesOrder.LAST),
+        OrderOption('id', OrderDirection.DESC, NonesOrder.FIRST),
+    )
+    assert options == same
+    assert hash(options) == hash(same)
+    assert options == pickle.loads(pickle.dumps(options))
+    assert options != OrderOptionsBuilder().add('id', OrderDirection.DESC).add('title').build()
+    assert options != OrderOptionsBuilder().add('title').add('id', OrderDirection.DESC, NonesOrder.LAST).build()
+    assert OrderOption('id', OrderDirection.ASC) == OrderOption('id', OrderDirection.ASC, NonesOrder.LAST)
+    assert OrderOption('id', OrderDirection.ASC) != OrderOption('id', OrderDirection.DESC)
+    assert OrderOptions() == OrderOptions()
@@ -0,0 +1,184 @@
+import datetime
+import decimal
+import random
+import uuid
+from typing import List, Tuple
+
+import pytest
+
+from abstractrepo.order import OrderOptions, OrderOptionsBuilder, OrderDirection, NonesOrder
+from abstractrepo.paging import PagingOptions, CursorPagingOptions, CursorPageResolver
+from abstractrepo.repo import CrudRepositoryInterface, _apply_cursor
+from abstractrepo.specification import AttributeSpecification, Operator
+from tests.fixtures.models import News
+from tests.fixtures.repo import ListBasedNewsRepository, AsyncListBasedNewsRepository, IndexedListBasedNewsRepository, \
+    AsyncIndexedListBasedNewsRepository
+
+
+@pytest.mark.parametrize("values", [
+    (),
+    (None,),
+    (1, 'abc', None, True, 2.5),
+    (-(10 ** 30), float('inf'), '', 'юникод'),
+    (datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc), datetime.date(2024, 5, 1)),
+    (decimal.Decimal('1.10'), uuid.UUID('12345678-1234-5678-1234-567812345678')),
+])
+def test_cursor_encoding(values: tuple):
+    cursor = CursorPagingOptions.encode_cursor(values)
+    assert isinstance(cursor, str)
+    assert '=' not in cursor
+    decoded = CursorPagingOptions.decode_cursor(cursor)
+    assert decoded == values
+    assert [type(value) for value in decoded] == [type(value) for value in values]
+
+
+@pytest.mark.parametrize("cursor", ['', '!!!', 'e30', 'WzFd', 'W1sieCIsMV1d', 'W1siaSIsIjEiXV0'])
+def test_invalid_cursor(cursor: str):
+    with pytest.raises(ValueError):
+        CursorPagingOptions.decode_cursor(cursor)
+
+
+def test_unsupported_cursor_value():
+    with pytest.raises(ValueError):
+        CursorPagingOptions.encode_cursor([object()])
+
+
+def test_cursor_page_resolver():
+    resolver = CursorPageResolver(2, OrderOptionsBuilder().add('title').add('id').build())
+    first_page = resolver.get_page()
+    assert first_page.limit == 2 and first_page.after is None
+
+    items = [News(id=3, title='a'), News(id=1, title='b')]
+    cursor = resolver.get_next_cursor(items)
+    assert resolver.get_page(cursor).after == ('b', 1)
+    assert resolver.get_next_cursor(items[:1]) is None
+    assert resolver.get_next_cursor([]) is None
+
+    with pytest.raises(ValueError):
+        resolver.get_page(CursorPagingOptions.encode_cursor(['b']))
+
+
+def random_cursor_case(seed: int) -> Tuple[List[News], OrderOptions]:
+    rnd = random.Random(seed)
+    items = [
+        News(id=i, title=rnd.choice(['a', 'b', 'c', None]), text=rnd.choice(['x', 'y', None]))
+        for i in range(60)
+    ]
+    rnd.shuffle(items)
+    builder = OrderOptionsBuilder()
+    for attribute in rnd.sample(['title', 'text'], rnd.randint(0, 2)):
+        builder.add(attribute, rnd.choice(list(OrderDirection)), rnd.choice([None, NonesOrder.FIRST, NonesOrder.LAST]))
+    builder.add('id', rnd.choice(list(OrderDirection)))
+    return items, builder.build()
+
+
+@pytest.mark.parametrize("repo_class", [ListBasedNewsRepository, IndexedListBasedNewsRepository])
+@pytest.mark.parametrize("seed", range(20))
+def test_cursor_pagination(repo_class, seed: int):
+    items, order_options = random_cursor_case(seed)
+    repo = repo_class(items)
+    filter_spec = AttributeSpecification('id', 5, Operator.GTE) if seed % 2 else None
+    expected = [item.id for item in repo.get_collection(filter_spec, order_options)]
+
+    resolver = CursorPageResolver(7, order_options)
+    actual = []
+    cursor = None
+    while True:
+        page = repo.get_collection(filter_spec, order_options, resolver.get_page(cursor))
+        actual.extend(item.id for item in page)
+        cursor = resolver.get_next_cursor(page)
+        if cursor is None:
+            break
+
+    assert actual == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("repo_class", [AsyncListBasedNewsRepository, AsyncIndexedListBasedNewsRepository])
+@pytest.mark.parametrize("seed", range(20))
+async def test_cursor_pagination_async(repo_class, seed: int):
+    items, order_options = random_cursor_case(seed)
+    repo = repo_class(items)
+    expected = [item.id for item in await repo.get_collection(order_options=order_options)]
+
+    resolver = CursorPageResolver(7, order_options)
+    actual = []
+    cursor = None
+    while True:
+        page = await repo.get_collection(order_options=order_options, paging_options=resolver.get_page(cursor))
+        actual.extend(item.id for item in page)
+        cursor = resolver.get_next_cursor(page)
+        if cursor is None:
+            break
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize("use_default", [False, True])
+def test_iter_collection_with_cursor(use_default):
+    items, order_options = random_cursor_case(0)
+    repo = ListBasedNewsRepository(items)
+    ordered = repo.get_collection(order_options=order_options)
+    resolver = CursorPageResolver(10, order_options)
+    after = CursorPagingOptions.decode_cursor(resolver.get_cursor(ordered[9]))
+
+    iter_collection = CrudRepositoryInterface.iter_collection if use_default else ListBasedNewsRepository.iter_collection
+    actual = iter_collection(repo, None, order_options, CursorPagingOptions(limit=25, after=after), 4)
+    assert list(actual) == ordered[10:35]
+
+
+def test_cursor_requires_order_options():
+    repo = ListBasedNewsRepository([News(id=1, title='a')])
+    assert repo.get_collection(paging_options=CursorPagingOptions(limit=1)) == repo.get_collection()
+    with pytest.raises(ValueError):
+        repo.get_collection(paging_options=CursorPagingOptions(limit=1, after=(1,)))
+    with pytest.raises(ValueError):
+        list(repo.iter_collection(paging_options=CursorPagingOptions(limit=1, after=(1,))))
+    with pytest.raises(ValueError):
+        repo.get_collection(
+            order_options=OrderOptionsBuilder().add('id').build(),
+            paging_options=CursorPagingOptions(limit=1, after=(1, 2)),
+        )
+
+
+def test_cursor_paging_options_offset():
+    repo = ListBasedNewsRepository([News(id=i, title='a') for i in range(10)])
+    order_options = OrderOptionsBuilder().add('id').build()
+    page = repo.get_collection(order_options=order_options, paging_options=CursorPagingOptions(limit=3, after=(2,), offset=1))
+    assert [item.id for item in page] == [4, 5, 6]
+    assert isinstance(CursorPagingOptions(), PagingOptions)
+
+
+def test_paging_options_equality():
+    assert PagingOptions(limit=5, offset=10) == PagingOptions(limit=5, offset=10)
+    assert hash(PagingOptions(limit=5, offset=10)) == hash(PagingOptions(limit=5, offset=10))
+    assert PagingOptions(limit=5) != PagingOptions(limit=5, offset=10)
+    assert PagingOptions(limit=5) != CursorPagingOptions(limit=5)
+
+    assert CursorPagingOptions(limit=5, after=('Title', 1)) == CursorPagingOptions(limit=5, after=('Title', 1))
+    assert hash(CursorPagingOptions(limit=5, after=('Title', 1))) == hash(CursorPagingOptions(limit=5, after=('Title', 1)))
+    assert CursorPagingOptions(limit=5, after=('Title', 1)) != CursorPagingOptions(limit=5, after=('Title', 2))
+    assert CursorPagingOptions(limit=5, after=(1,)) != CursorPagingOptions(limit=5, after=(True,))
+    assert CursorPagingOptions(limit=5) != CursorPagingOptions(limit=5, after=(1,))
+
+    options = CursorPagingOptions(limit=5, after=(bytearray(b'1'),))
+    assert options == options
+    assert options != CursorPagingOptions(limit=5, after=(bytearray(b'1'),))
+    assert hash(options) == hash(options)
+
+
+def test_cursor_restriction_equality():
+    order_options = OrderOptionsBuilder().add('title').add('id').build()
+    spec = AttributeSpecification('text', 'a')
+    restricted = _apply_cursor(spec, order_options, CursorPagingOptions(limit=5, after=('Title', 1)))
+    same = _apply_cursor(
+        AttributeSpecification('text', 'a'),
+        OrderOptionsBuilder().add('title').add('id').build(),
+        CursorPagingOptions(limit=5, after=('Title', 1)),
+    )
+    assert restricted == same
+    assert hash(restricted) == hash(same)
+    assert restricted != _apply_cursor(spec, order_options, CursorPagingOptions(limit=5, after=('Title', 2)))
+    assert restricted != _apply_cursor(
+        spec, OrderOptionsBuilder().add('title').add('id', OrderDirection.DESC).build(), CursorPagingOptions(limit=5, after=('Title', 1)),
+    )
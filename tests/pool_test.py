@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+
+from abstractrepo.exceptions import PoolTimeoutException
+from abstractrepo.pool import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self, number: int):
+        self.number = number
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnector:
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self) -> FakeConnection:
+        connection = FakeConnection(len(self.opened))
+        self.opened.append(connection)
+        return connection
+
+
+def test_pool_opens_connections_lazily():
+    connector = FakeConnector()
+    pool = ConnectionPool(connector, 2)
+    assert pool.open_connections == 0
+
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+
+    second = pool.acquire()
+    assert second is not first
+    assert len(connector.opened) == 2 and pool.open_connections == 2
+    pool.release(first)
+    pool.release(second)
+    assert pool.acquire() is second
+    assert pool.acquisitions == 4 and pool.timeouts == 0
+
+
+def test_pool_waits_for_released_connection():
+    pool = ConnectionPool(FakeConnector(), 1)
+    connection = pool.acquire()
+    acquired = []
+
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    assert acquired == [] and pool.waiting == 1
+
+    pool.release(connection)
+    waiter.join()
+    assert acquired == [connection]
+    assert pool.waiting == 0
+    assert pool.max_wait_time >= 0.04 and pool.wait_time >= pool.max_wait_time
+
+
+def test_pool_acquire_timeout():
+    pool = ConnectionPool(FakeConnector(), 1, timeout=0.05)
+    connection = pool.acquire()
+    with pytest.raises(PoolTimeoutException) as info:
+        pool.acquire()
+    assert info.value.timeout == 0.05
+
+    start = time.monotonic()
+    with pytest.raises(PoolTimeoutException):
+        pool.acquire(timeout=10, waiting_since=time.monotonic() - 10)
+    assert time.monotonic() - start < 1
+    assert pool.timeouts == 2 and pool.acquisitions == 1
+
+    pool.release(connection)
+    with pool.connection() as same:
+        assert same is connection
+
+
+def test_pool_connect_failure_frees_slot():
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError('Cannot connect')
+        return FakeConnection(len(attempts))
+
+    pool = ConnectionPool(connect, 1, timeout=0.05)
+    with pytest.raises(OSError):
+        pool.acquire()
+    assert pool.open_connections == 0
+    assert pool.acquire().number == 2
+
+
+def test_pool_close():
+    connector = FakeConnector()
+    pool = ConnectionPool(connector, 2)
+    idle, used = pool.acquire(), pool.acquire()
+    pool.release(idle)
+
+    pool.close()
+    assert idle.closed and not used.closed
+    pool.release(used)
+    assert used.closed and pool.open_connections == 0
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_pool_close_wakes_waiters():
+    pool = ConnectionPool(FakeConnector(), 1)
+    connection = pool.acquire()
+    errors = []
+
+    def wait():
+        try:
+            pool.acquire()
+        except RuntimeError as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.05)
+    pool.close()
+    waiter.join(5)
+    assert len(errors) == 1
+    pool.release(connection)
+    assert connection.closed
+
+
+def test_pool_validation():
+    with pytest.raises(ValueError):
+        ConnectionPool(FakeConnector(), 0)
+    with pytest.raises(ValueError):
+        ConnectionPool(FakeConnector(), 1, timeout=-1)
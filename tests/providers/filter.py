@@ -3,32 +3,45 @@ from typing import Generator, Tuple, List
 from abstractrepo.specification import SpecificationInterface, AttributeSpecification, Operator, AndSpecification, \
     OrSpecification, NotSpecification
 from tests.fixtures.repo import ListBasedNewsRepository, NewsRepositoryInterface, \
-    AsyncListBasedNewsRepository, AsyncNewsRepositoryInterface
+    AsyncListBasedNewsRepository, AsyncNewsRepositoryInterface, IndexedListBasedNewsRepository, \
+    AsyncIndexedListBasedNewsRepository, ThreadSafeListBasedNewsRepository, ColumnarNewsRepository, \
+    AsyncColumnarNewsRepository, SqliteNewsRepository, AsyncSqliteNewsRepository
 from tests.fixtures.models import News, NewsCreateForm
 
 
 def data_provider_for_news_repo(size: int, with_no_text_item: bool = False) -> Generator[NewsRepositoryInterface, None, None]:
-    repo = ListBasedNewsRepository()
-    for i in range(size - int(with_no_text_item)):
-        repo.create(NewsCreateForm(title=f'Title {i+1}', text=f'Text {i+1}'))
+    for repo_class in (
+        ListBasedNewsRepository, IndexedListBasedNewsRepository, ThreadSafeListBasedNewsRepository, ColumnarNewsRepository,
+        SqliteNewsRepository,
+    ):
+        repo = repo_class()
+        for i in range(size - int(with_no_text_item)):
+            repo.create(NewsCreateForm(title=f'Title {i+1}', text=f'Text {i+1}'))
 
-    if with_no_text_item:
-        repo.create(NewsCreateForm(title=f'Title for None text', text=None))
+        if with_no_text_item:
+            repo.create(NewsCreateForm(title=f'Title for None text', text=None))
 
-    yield repo
+        yield repo
 
 
 def data_provider_for_news_repo_async(size: int, with_no_text_item: bool = False) -> Generator[AsyncNewsRepositoryInterface, None, None]:
     # Helper function to run async generator to completion
     async def collect():
-        repo = AsyncListBasedNewsRepository()
-        for i in range(size - int(with_no_text_item)):
-            await repo.create(NewsCreateForm(title=f'Title {i + 1}', text=f'Text {i + 1}'))
+        repos = []
+        for repo_class in (
+            AsyncListBasedNewsRepository, AsyncIndexedListBasedNewsRepository, AsyncColumnarNewsRepository,
+            AsyncSqliteNewsRepository,
+        ):
+            repo = repo_class()
+            for i in range(size - int(with_no_text_item)):
+                await repo.create(NewsCreateForm(title=f'Title {i + 1}', text=f'Text {i + 1}'))
 
-        if with_no_text_item:
-            await repo.create(NewsCreateForm(title=f'Title for None text', text=None))
+            if with_no_text_item:
+                await repo.create(NewsCreateForm(title=f'Title for None text', text=None))
+
+            repos.append(repo)
 
-        return [repo]
+        return repos
 
     # Run the async collection synchronously
     import asyncio
@@ -0,0 +1,682 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import pytest
+
+from abstractrepo.exceptions import ItemNotFoundException, UniqueViolationException
+from abstractrepo.order import OrderOptionsBuilder, OrderDirection
+from abstractrepo.paging import PagingOptions
+from abstractrepo.repo import CrudRepositoryInterface, AsyncCrudRepositoryInterface
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, Operator
+from tests.fixtures.models import News, NewsCreateForm, NewsUpdateForm, UserCreateForm
+from tests.fixtures.repo import ListBasedNewsRepository, AsyncListBasedNewsRepository, IndexedListBasedNewsRepository, \
+    AsyncIndexedListBasedNewsRepository, ListBasedUserRepository, AsyncListBasedUserRepository
+
+
+class ListBasedNewsRepositoryWithCompositeIdSpec(ListBasedNewsRepository):
+    def _get_id_filter_specification(self, item_id: int) -> SpecificationInterface[News, bool]:
+        return AndSpecification(AttributeSpecification('id', item_id))
+
+
+class AsyncListBasedNewsRepositoryWithCompositeIdSpec(AsyncListBasedNewsRepository):
+    def _get_id_filter_specification(self, item_id: int) -> SpecificationInterface[News, bool]:
+        return AndSpecification(AttributeSpecification('id', item_id))
+
+
+@pytest.mark.parametrize("repo_class", [ListBasedNewsRepository, ListBasedNewsRepositoryWithCompositeIdSpec])
+def test_id_lookup(repo_class):
+    repo = repo_class([News(id=100, title='Initial')])
+    for i in range(10):
+        repo.create(NewsCreateForm(title=f'Title {i+1}', text=f'Text {i+1}'))
+
+    assert repo.get_item(100).title == 'Initial'
+    assert repo.get_item(5).title == 'Title 5'
+    assert repo.exists(10)
+    assert not repo.exists(11)
+
+    repo.update(5, NewsUpdateForm(title='Title 5 updated'))
+    assert repo.get_item(5).title == 'Title 5 updated'
+
+    assert repo.delete(5).title == 'Title 5 updated'
+    assert not repo.exists(5)
+    with pytest.raises(ItemNotFoundException):
+        repo.get_item(5)
+
+    item = repo.create(NewsCreateForm(title='Title 11'))
+    assert repo.get_item(item.id) is item
+    assert len(repo.get_collection()) == 11
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("repo_class", [AsyncListBasedNewsRepository, AsyncListBasedNewsRepositoryWithCompositeIdSpec])
+async def test_id_lookup_async(repo_class):
+    repo = repo_class([News(id=100, title='Initial')])
+    for i in range(10):
+        await repo.create(NewsCreateForm(title=f'Title {i+1}', text=f'Text {i+1}'))
+
+    assert (await repo.get_item(100)).title == 'Initial'
+    assert (await repo.get_item(5)).title == 'Title 5'
+    assert await repo.exists(10)
+    assert not await repo.exists(11)
+
+    await repo.update(5, NewsUpdateForm(title='Title 5 updated'))
+    assert (await repo.get_item(5)).title == 'Title 5 updated'
+
+    assert (await repo.delete(5)).title == 'Title 5 updated'
+    assert not await repo.exists(5)
+    with pytest.raises(ItemNotFoundException):
+        await repo.get_item(5)
+
+    item = await repo.create(NewsCreateForm(title='Title 11'))
+    assert await repo.get_item(item.id) is item
+    assert len(await repo.get_collection()) == 11
+
+
+def test_id_index_follows_id_change():
+    class MovingNewsRepository(ListBasedNewsRepository):
+        def _update_model(self, model: News, form: NewsUpdateForm) -> News:
+            model.id = model.id + 1000
+            return super()._update_model(model, form)
+
+    repo = MovingNewsRepository()
+    repo.create(NewsCreateForm(title='Title 1'))
+    repo.update(1, NewsUpdateForm(title='Title 1 moved'))
+
+    assert not repo.exists(1)
+    assert repo.get_item(1001).title == 'Title 1 moved'
+
+
+def test_id_index_rebuilt_after_direct_modification():
+    repo = ListBasedNewsRepository()
+    repo.create(NewsCreateForm(title='Title 1'))
+    assert repo.exists(1)
+
+    repo._db.append(News(id=42, title='Appended directly'))
+    assert repo.get_item(42).title == 'Appended directly'
+
+
+@pytest.mark.parametrize("repo_class", [ListBasedNewsRepository, ListBasedNewsRepositoryWithCompositeIdSpec])
+def test_delete_keeps_order_and_storage(repo_class):
+    repo = repo_class()
+    for i in range(100):
+        repo.create(NewsCreateForm(title=f'Title {i+1}'))
+    db = repo._db
+
+    for i in range(1, 101, 3):
+        repo.delete(i)
+        assert not repo.exists(i)
+
+    expected = [i for i in range(1, 101) if i % 3 != 1]
+    assert repo._db is db
+    assert [item.id for item in repo.get_collection()] == expected
+    assert repo.count() == len(expected)
+    assert all(repo.get_item(i).id == i for i in expected)
+
+    for i in expected:
+        repo.delete(i)
+
+    assert repo.get_collection() == []
+    assert repo.count() == 0
+    assert repo._db is db
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("repo_class", [AsyncListBasedNewsRepository, AsyncListBasedNewsRepositoryWithCompositeIdSpec])
+async def test_delete_keeps_order_and_storage_async(repo_class):
+    repo = repo_class()
+    for i in range(100):
+        await repo.create(NewsCreateForm(title=f'Title {i+1}'))
+    db = repo._db
+
+    for i in range(1, 101, 3):
+        await repo.delete(i)
+        assert not await repo.exists(i)
+
+    expected = [i for i in range(1, 101) if i % 3 != 1]
+    assert repo._db is db
+    assert [item.id for item in await repo.get_collection()] == expected
+    assert await repo.count() == len(expected)
+
+    for i in expected:
+        await repo.delete(i)
+
+    assert await repo.get_collection() == []
+    assert repo._db is db
+
+
+def test_indexes_follow_modifications():
+    specs = [
+        AttributeSpecification('title', 'Title 7'),
+        AttributeSpecification('text', None),
+        AttributeSpecification('id', 40, Operator.GT),
+        AttributeSpecification('id', [3, 5, 70], Operator.IN),
+        AttributeSpecification('title', ['Title 3', 'Title 4'], Operator.NOT_IN),
+        AndSpecification(AttributeSpecification('id', 10, Operator.GTE), AttributeSpecification('text', 'Text 12')),
+        OrSpecification(AttributeSpecification('id', 3, Operator.LTE), AttributeSpecification('title', 'Title 50')),
+        AndSpecification(AttributeSpecification('id', 90, Operator.GT), AttributeSpecification('text', '%9', Operator.LIKE)),
+    ]
+    repo = ListBasedNewsRepository()
+    indexed_repo = IndexedListBasedNewsRepository()
+
+    def check():
+        for spec in specs:
+            expected = [item.id for item in repo.get_collection(spec)]
+            assert [item.id for item in indexed_repo.get_collection(spec)] == expected
+            assert indexed_repo.count(spec) == len(expected)
+
+    for r in (repo, indexed_repo):
+        for i in range(100):
+            r.create(NewsCreateForm(title=f'Title {i+1}', text=f'Text {i+1}' if i % 10 else None))
+    check()
+
+    for r in (repo, indexed_repo):
+        r.update(7, NewsUpdateForm(title='Title 50', text='Text 12'))
+        r.update(12, NewsUpdateForm(title='Title 7', text=None))
+    check()
+
+    for r in (repo, indexed_repo):
+        for i in range(1, 100, 2):
+            r.delete(i)
+    check()
+
+    for r in (repo, indexed_repo):
+        r.create(NewsCreateForm(title='Title 7', text='Text 12'))
+    check()
+
+
+class CountingSpecification(SpecificationInterface[News, bool]):
+    def __init__(self, specification: SpecificationInterface[News, bool]):
+        self.specification = specification
+        self.calls = 0
+
+    def is_satisfied_by(self, model: News) -> bool:
+        self.calls += 1
+        return self.specification.is_satisfied_by(model)
+
+
+def test_get_collection_result_is_detached():
+    repo = ListBasedNewsRepository()
+    for i in range(5):
+        repo.create(NewsCreateForm(title=f'Title {i+1}'))
+
+    result = repo.get_collection()
+    assert result is not repo._db
+    result.clear()
+    assert repo.count() == 5
+
+
+@pytest.mark.parametrize("repo_class", [ListBasedNewsRepository, IndexedListBasedNewsRepository])
+def test_unordered_page_stops_scanning(repo_class):
+    repo = repo_class()
+    for i in range(100):
+        repo.create(NewsCreateForm(title=f'Title {i+1}', text='even' if i % 2 else 'odd'))
+    repo.delete(2)
+
+    spec = CountingSpecification(AttributeSpecification('text', 'even'))
+    page = repo.get_collection(spec, paging_options=PagingOptions(limit=3, offset=2))
+    assert [item.id for item in page] == [8, 10, 12]
+    assert spec.calls == 11
+
+    assert [item.id for item in repo.get_collection(paging_options=PagingOptions(limit=3))] == [1, 3, 4]
+    assert [item.id for item in repo.get_collection(paging_options=PagingOptions(offset=97))] == [99, 100]
+    assert [item.id for item in repo.get_collection(AttributeSpecification('text', 'odd'), paging_options=PagingOptions(2, 1))] == [3, 5]
+
+
+@pytest.mark.asyncio
+async def test_unordered_page_stops_scanning_async():
+    repo = AsyncListBasedNewsRepository()
+    for i in range(100):
+        await repo.create(NewsCreateForm(title=f'Title {i+1}', text='even' if i % 2 else 'odd'))
+    await repo.delete(2)
+
+    spec = CountingSpecification(AttributeSpecification('text', 'even'))
+    page = await repo.get_collection(spec, paging_options=PagingOptions(limit=3, offset=2))
+    assert [item.id for item in page] == [8, 10, 12]
+    assert spec.calls == 11
+
+    result = await repo.get_collection()
+    assert result is not repo._db
+    assert [item.id for item in await repo.get_collection(paging_options=PagingOptions(limit=3))] == [1, 3, 4]
+
+
+def iter_collection_cases():
+    yield None, None, None
+    yield AttributeSpecification('text', 'even'), None, None
+    yield AttributeSpecification('text', 'even'), None, PagingOptions(limit=7, offset=3)
+    yield None, OrderOptionsBuilder().add('id', OrderDirection.DESC).build(), PagingOptions(limit=25)
+    yield AttributeSpecification('id', 10, Operator.GT), OrderOptionsBuilder().add('text').build(), PagingOptions(offset=80)
+    yield None, None, PagingOptions(limit=0)
+
+
+@pytest.mark.parametrize("repo_class", [ListBasedNewsRepository, IndexedListBasedNewsRepository])
+@pytest.mark.parametrize("use_default", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 4, 1000])
+def test_iter_collection(repo_class, use_default, chunk_size):
+    repo = repo_class()
+    for i in range(100):
+        repo.create(NewsCreateForm(title=f'Title {i+1}', text='even' if i % 2 else 'odd'))
+    repo.delete(50)
+
+    iter_collection = CrudRepositoryInterface.iter_collection if use_default else repo_class.iter_collection
+    for filter_spec, order_options, paging_options in iter_collection_cases():
+        expected = repo.get_collection(filter_spec, order_options, paging_options)
+        actual = iter_collection(repo, filter_spec, order_options, paging_options, chunk_size)
+        assert list(actual) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_default", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 4, 1000])
+async def test_iter_collection_async(use_default, chunk_size):
+    repo = AsyncListBasedNewsRepository()
+    for i in range(100):
+        await repo.create(NewsCreateForm(title=f'Title {i+1}', text='even' if i % 2 else 'odd'))
+    await repo.delete(50)
+
+    iter_collection = AsyncCrudRepositoryInterface.iter_collection if use_default else AsyncListBasedNewsRepository.iter_collection
+    for filter_spec, order_options, paging_options in iter_collection_cases():
+        expected = await repo.get_collection(filter_spec, order_options, paging_options)
+        actual = [item async for item in iter_collection(repo, filter_spec, order_options, paging_options, chunk_size)]
+        assert actual == expected
+
+
+def test_iter_collection_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        list(ListBasedNewsRepository().iter_collection(chunk_size=0))
+    with pytest.raises(ValueError):
+        list(CrudRepositoryInterface.iter_collection(ListBasedNewsRepository(), chunk_size=0))
+
+
+@pytest.mark.parametrize("repo_class", [ListBasedNewsRepository, IndexedListBasedNewsRepository])
+def test_iter_collection_survives_deletes(repo_class):
+    repo = repo_class()
+    for i in range(100):
+        repo.create(NewsCreateForm(title=f'Title {i+1}', text='even' if i % 2 else 'odd'))
+    db = repo._db
+
+    seen = []
+    for item in repo.iter_collection(AttributeSpecification('text', 'odd')):
+        seen.append(item.id)
+        if item.id + 1 <= 100:
+            repo.delete(item.id + 1)
+        if item.id + 2 <= 100 and item.id % 4 == 1:
+            repo.delete(item.id + 2)
+
+    assert seen == [i for i in range(1, 101) if i % 4 == 1]
+    assert len(repo._db) == 100
+    repo.delete(1)
+    assert repo._db is db
+    assert len(repo._db) == 49
+    assert [item.id for item in repo.get_collection()] == [i for i in range(2, 101) if i % 4 in (0, 1)]
+
+
+
+@pytest.mark.parametrize("repo_class", [ListBasedNewsRepository, IndexedListBasedNewsRepository])
+def test_iter_collection_survives_deletes_before_first_item(repo_class):
+    repo = repo_class()
+    for i in range(10):
+        repo.create(NewsCreateForm(title='t1' if i + 1 in (3, 9) else f'Title {i+1}', text=None))
+
+    iterator = repo.iter_collection(AttributeSpecification('title', 't1'))
+    for i in range(1, 8):
+        repo.delete(i)
+
+    assert [item.id for item in iterator] == [9]
+    assert [item.id for item in repo.get_collection()] == [8, 9, 10]
+
+class CountingIdSpecNewsRepository(ListBasedNewsRepository):
+    last_spec = None
+
+    def _get_id_filter_specification(self, item_id: int) -> SpecificationInterface[News, bool]:
+        self.last_spec = CountingSpecification(AttributeSpecification('id', item_id))
+        return self.last_spec
+
+
+class AsyncCountingIdSpecNewsRepository(AsyncListBasedNewsRepository):
+    last_spec = None
+
+    def _get_id_filter_specification(self, item_id: int) -> SpecificationInterface[News, bool]:
+        self.last_spec = CountingSpecification(AttributeSpecification('id', item_id))
+        return self.last_spec
+
+
+def test_count_and_exists_short_circuit():
+    repo = CountingIdSpecNewsRepository()
+    for i in range(100):
+        repo._db.append(News(id=i + 1, title=f'Title {i+1}', text='even' if i % 2 else 'odd'))
+
+    assert repo.exists(10)
+    assert repo.last_spec.calls == 10
+    assert not repo.exists(1000)
+    assert repo.last_spec.calls == 100
+
+    repo.delete(5)
+    assert repo.count() == 99
+    assert repo.count(AttributeSpecification('text', 'odd')) == 49
+    assert repo.count(CountingSpecification(AttributeSpecification('text', 'odd'))) == 49
+
+
+@pytest.mark.asyncio
+async def test_count_and_exists_short_circuit_async():
+    repo = AsyncCountingIdSpecNewsRepository()
+    for i in range(100):
+        repo._db.append(News(id=i + 1, title=f'Title {i+1}', text='even' if i % 2 else 'odd'))
+
+    assert await repo.exists(10)
+    assert repo.last_spec.calls == 10
+    assert not await repo.exists(1000)
+    assert repo.last_spec.calls == 100
+
+    await repo.delete(5)
+    assert await repo.count() == 99
+    assert await repo.count(AttributeSpecification('text', 'odd')) == 49
+
+
+def test_count_with_indexes():
+    repo = IndexedListBasedNewsRepository()
+    for i in range(100):
+        repo.create(NewsCreateForm(title=f'Title {i+1}', text='even' if i % 2 else 'odd'))
+    repo.delete(5)
+
+    assert repo.count(AttributeSpecification('text', 'odd')) == 49
+    assert repo.count(AttributeSpecification('id', 90, Operator.GTE)) == 11
+    assert repo.count(AndSpecification(
+        AttributeSpecification('id', 50, Operator.LT),
+        AttributeSpecification('title', 'Title 1%', Operator.LIKE),
+    )) == 11
+
+
+@pytest.mark.parametrize("repo_class", [
+    ListBasedNewsRepository,
+    ListBasedNewsRepositoryWithCompositeIdSpec,
+    IndexedListBasedNewsRepository,
+])
+def test_bulk_operations(repo_class):
+    repo = repo_class()
+    created = repo.create_many(NewsCreateForm(title=f'Title {i+1}', text=f'Text {i % 3}') for i in range(30))
+    assert [item.id for item in created] == list(range(1, 31))
+    assert repo.count() == 30
+
+    updated = repo.update_many([7, 3, 3, 20], NewsUpdateForm(title='Updated', text='Text 9'))
+    assert [item.id for item in updated] == [3, 7, 20]
+    assert [item.id for item in repo.get_collection(AttributeSpecification('text', 'Text 9'))] == [3, 7, 20]
+
+    updated = repo.update_many(AttributeSpecification('text', 'Text 0'), NewsUpdateForm(title='By spec', text='Text 0'))
+    assert [item.id for item in updated] == [1, 4, 10, 13, 16, 19, 22, 25, 28]
+    assert repo.count(AttributeSpecification('title', 'By spec')) == 9
+
+    with pytest.raises(ItemNotFoundException):
+        repo.update_many([1, 100], NewsUpdateForm(title='Missing'))
+    assert repo.count(AttributeSpecification('title', 'Missing')) == 0
+
+    with pytest.raises(ItemNotFoundException):
+        repo.delete_many([2, 100])
+    assert repo.count() == 30
+
+    deleted = repo.delete_many([5, 2, 30])
+    assert [item.id for item in deleted] == [2, 5, 30]
+    deleted = repo.delete_many(AttributeSpecification('title', 'By spec'))
+    assert [item.id for item in deleted] == [1, 4, 10, 13, 16, 19, 22, 25, 28]
+    assert repo.delete_many(AttributeSpecification('title', 'By spec')) == []
+
+    expected = [i for i in range(1, 31) if i not in (1, 2, 4, 5, 10, 13, 16, 19, 22, 25, 28, 30)]
+    assert [item.id for item in repo.get_collection()] == expected
+    assert all(repo.get_item(i).id == i for i in expected)
+    assert repo.count(AttributeSpecification('text', 'Text 9')) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("repo_class", [
+    AsyncListBasedNewsRepository,
+    AsyncListBasedNewsRepositoryWithCompositeIdSpec,
+    AsyncIndexedListBasedNewsRepository,
+])
+async def test_bulk_operations_async(repo_class):
+    repo = repo_class()
+    created = await repo.create_many(NewsCreateForm(title=f'Title {i+1}', text=f'Text {i % 3}') for i in range(30))
+    assert [item.id for item in created] == list(range(1, 31))
+
+    updated = await repo.update_many([7, 3, 20], NewsUpdateForm(title='Updated', text='Text 9'))
+    assert [item.id for item in updated] == [3, 7, 20]
+    updated = await repo.update_many(AttributeSpecification('text', 'Text 0'), NewsUpdateForm(title='By spec', text='Text 0'))
+    assert len(updated) == 9
+
+    with pytest.raises(ItemNotFoundException):
+        await repo.delete_many([2, 100])
+    assert await repo.count() == 30
+
+    deleted = await repo.delete_many(AttributeSpecification('title', 'By spec'))
+    assert len(deleted) == 9
+    deleted = await repo.delete_many([3, 2])
+    assert [item.id for item in deleted] == [2, 3]
+    assert await repo.count() == 19
+    assert await repo.count(AttributeSpecification('text', 'Text 9')) == 2
+
+
+def test_create_many_rolls_back():
+    repo = ListBasedUserRepository()
+    repo.create(UserCreateForm(username='first', password='pass', display_name='First'))
+
+    with pytest.raises(UniqueViolationException):
+        repo.create_many([
+            UserCreateForm(username='second', password='pass', display_name='Second'),
+            UserCreateForm(username='third', password='pass', display_name='Third'),
+            UserCreateForm(username='second', password='pass', display_name='Second again'),
+        ])
+
+    assert [user.username for user in repo.get_collection()] == ['first']
+    assert repo.count() == 1
+    assert not repo.exists(2)
+
+
+@pytest.mark.asyncio
+async def test_create_many_rolls_back_async():
+    repo = AsyncListBasedUserRepository()
+    with pytest.raises(UniqueViolationException):
+        await repo.create_many([
+            UserCreateForm(username='second', password='pass', display_name='Second'),
+            UserCreateForm(username='second', password='pass', display_name='Second again'),
+        ])
+    assert await repo.count() == 0
+
+
+def test_bulk_operations_default_implementation():
+    repo = ListBasedNewsRepository()
+    created = CrudRepositoryInterface.create_many(repo, [NewsCreateForm(title='Title 1'), NewsCreateForm(title='Title 2')])
+    assert [item.id for item in created] == [1, 2]
+
+    updated = CrudRepositoryInterface.update_many(repo, [2, 1, 2], NewsUpdateForm(title='Updated'))
+    assert [item.id for item in updated] == [2, 1]
+    updated = CrudRepositoryInterface.update_many(repo, AttributeSpecification('id', 1), NewsUpdateForm(title='Title 1'))
+    assert [item.id for item in updated] == [1]
+
+    with pytest.raises(ItemNotFoundException):
+        CrudRepositoryInterface.update_many(repo, [1, 99, 2], NewsUpdateForm(title='Changed'))
+    with pytest.raises(ItemNotFoundException):
+        CrudRepositoryInterface.delete_many(repo, [1, 99])
+    assert [item.title for item in repo.get_collection()] == ['Title 1', 'Updated']
+
+    deleted = CrudRepositoryInterface.delete_many(repo, AttributeSpecification('title', 'Updated'))
+    assert [item.id for item in deleted] == [2]
+    deleted = CrudRepositoryInterface.delete_many(repo, [1])
+    assert [item.id for item in deleted] == [1]
+    assert repo.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_operations_default_implementation_async():
+    repo = AsyncListBasedNewsRepository()
+    created = await AsyncCrudRepositoryInterface.create_many(repo, [NewsCreateForm(title='Title 1'), NewsCreateForm(title='Title 2')])
+    assert [item.id for item in created] == [1, 2]
+
+    updated = await AsyncCrudRepositoryInterface.update_many(repo, AttributeSpecification('id', 2), NewsUpdateForm(title='Updated'))
+    assert [item.id for item in updated] == [2]
+    with pytest.raises(ItemNotFoundException):
+        await AsyncCrudRepositoryInterface.update_many(repo, [1, 99], NewsUpdateForm(title='Changed'))
+    with pytest.raises(ItemNotFoundException):
+        await AsyncCrudRepositoryInterface.delete_many(repo, [1, 99])
+    assert [item.title for item in await repo.get_collection()] == ['Title 1', 'Updated']
+
+    deleted = await AsyncCrudRepositoryInterface.delete_many(repo, AttributeSpecification('title', 'Updated'))
+    assert [item.id for item in deleted] == [2]
+    assert [item.id for item in await AsyncCrudRepositoryInterface.delete_many(repo, [1, 1])] == [1]
+    assert await repo.count() == 0
+
+
+@pytest.mark.parametrize("repo_class", [ListBasedNewsRepository, ListBasedNewsRepositoryWithCompositeIdSpec])
+@pytest.mark.parametrize("use_default", [False, True])
+def test_get_items(repo_class, use_default):
+    repo = repo_class()
+    repo.create_many(NewsCreateForm(title=f'Title {i+1}') for i in range(20))
+    repo.delete(4)
+    get_items = CrudRepositoryInterface.get_items if use_default else repo_class.get_items
+
+    result = get_items(repo, iter([15, 3, 7]))
+    assert list(result) == [15, 3, 7]
+    assert [item.title for item in result.values()] == ['Title 15', 'Title 3', 'Title 7']
+
+    assert list(get_items(repo, [4, 2, 100], skip_missing=True)) == [2]
+    assert get_items(repo, []) == {}
+    with pytest.raises(ItemNotFoundException):
+        get_items(repo, [2, 4])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("repo_class", [AsyncListBasedNewsRepository, AsyncListBasedNewsRepositoryWithCompositeIdSpec])
+@pytest.mark.parametrize("use_default", [False, True])
+async def test_get_items_async(repo_class, use_default):
+    repo = repo_class()
+    await repo.create_many(NewsCreateForm(title=f'Title {i+1}') for i in range(20))
+    await repo.delete(4)
+    get_items = AsyncCrudRepositoryInterface.get_items if use_default else repo_class.get_items
+
+    result = await get_items(repo, [15, 3, 7])
+    assert [item.title for item in result.values()] == ['Title 15', 'Title 3', 'Title 7']
+    assert list(await get_items(repo, [4, 2, 100], skip_missing=True)) == [2]
+    with pytest.raises(ItemNotFoundException):
+        await get_items(repo, [2, 4])
+
+
+class CooperativeNewsRepository(AsyncIndexedListBasedNewsRepository):
+    _scan_chunk_size = 7
+
+
+class OffloadingNewsRepository(AsyncListBasedNewsRepository):
+    _scan_chunk_size = 7
+    _offload_threshold = 20
+
+
+def cooperative_cases():
+    yield None, None, None
+    yield AttributeSpecification('text', 'even'), None, None
+    yield AttributeSpecification('text', 'even'), None, PagingOptions(limit=7, offset=3)
+    yield AttributeSpecification('title', 'Title 1%', Operator.LIKE), None, PagingOptions(limit=0)
+    yield None, None, PagingOptions(offset=95)
+    yield None, OrderOptionsBuilder().add('id', OrderDirection.DESC).build(), PagingOptions(limit=25)
+    yield AttributeSpecification('id', 10, Operator.GT), OrderOptionsBuilder().add('text').build(), PagingOptions(offset=80)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("repo_class", [CooperativeNewsRepository, OffloadingNewsRepository])
+async def test_cooperative_scans(repo_class):
+    repo = repo_class()
+    reference = AsyncListBasedNewsRepository()
+    for r in (repo, reference):
+        await r.create_many(NewsCreateForm(title=f'Title {i+1}', text='even' if i % 2 else 'odd') for i in range(100))
+        await r.delete(50)
+
+    for filter_spec, order_options, paging_options in cooperative_cases():
+        expected = await reference.get_collection(filter_spec, order_options, paging_options)
+        expected_ids = [item.id for item in expected]
+        assert [item.id for item in await repo.get_collection(filter_spec, order_options, paging_options)] == expected_ids
+        assert [item.id async for item in repo.iter_collection(filter_spec, order_options, paging_options)] == expected_ids
+        assert await repo.count(filter_spec) == await reference.count(filter_spec)
+    assert repo._open_iterators == 0
+
+
+@pytest.mark.asyncio
+async def test_cooperative_scan_yields_to_loop():
+    repo = CooperativeNewsRepository()
+    await repo.create_many(NewsCreateForm(title=f'Title {i+1}', text='even' if i % 2 else 'odd') for i in range(100))
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def deleter():
+        for i in range(1, 101, 2):
+            await repo.delete(i)
+            await asyncio.sleep(0)
+
+    task = asyncio.ensure_future(ticker())
+    try:
+        spec = CountingSpecification(AttributeSpecification('text', 'even'))
+        result, _ = await asyncio.gather(repo.get_collection(spec), deleter())
+    finally:
+        task.cancel()
+
+    assert len(ticks) > 10
+    assert [item.id for item in result] == list(range(2, 101, 2))
+    assert repo._open_iterators == 0
+    assert await repo.count() == 50
+
+
+def parallel_cases():
+    yield AttributeSpecification('text', 'even'), None, None
+    yield OrSpecification(
+        AttributeSpecification('title', 'Title 1%', Operator.LIKE),
+        AttributeSpecification('id', [3, 50, 77], Operator.IN),
+    ), OrderOptionsBuilder().add('text', OrderDirection.DESC).add('id').build(), PagingOptions(limit=10, offset=2)
+    yield AttributeSpecification('id', 1000, Operator.GT), None, None
+    yield AndSpecification(
+        AttributeSpecification('text', 'odd'),
+        AttributeSpecification('id', 20, Operator.GT),
+    ), OrderOptionsBuilder().add('id', OrderDirection.DESC).build(), None
+    yield CountingSpecification(AttributeSpecification('text', 'even')), None, PagingOptions(limit=5)
+
+
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_parallel_filter(executor_class):
+    with executor_class(2) as executor:
+        class ParallelNewsRepository(IndexedListBasedNewsRepository):
+            _parallel_executor = executor
+            _parallel_threshold = 10
+            _parallel_partitions = 3
+
+        repo = ParallelNewsRepository()
+        reference = ListBasedNewsRepository()
+        for r in (repo, reference):
+            r.create_many(NewsCreateForm(title=f'Title {i+1}', text='even' if i % 2 else 'odd') for i in range(100))
+            r.delete(50)
+
+        for filter_spec, order_options, paging_options in parallel_cases():
+            expected = [item.id for item in reference.get_collection(filter_spec, order_options, paging_options)]
+            actual = repo.get_collection(filter_spec, order_options, paging_options)
+            assert [item.id for item in actual] == expected
+            assert all(repo.get_item(item.id) is item for item in actual)
+            assert repo.count(filter_spec) == reference.count(filter_spec)
+
+
+def test_parallel_filter_requires_threshold():
+    class RecordingExecutor(ThreadPoolExecutor):
+        submitted = 0
+
+        def submit(self, *args, **kwargs):
+            RecordingExecutor.submitted += 1
+            return super().submit(*args, **kwargs)
+
+    with RecordingExecutor(1) as executor:
+        class ParallelNewsRepository(ListBasedNewsRepository):
+            _parallel_executor = executor
+
+        repo = ParallelNewsRepository()
+        repo.create_many(NewsCreateForm(title=f'Title {i+1}') for i in range(100))
+        assert repo.count(AttributeSpecification('title', 'Title 1%', Operator.LIKE)) == 12
+        assert RecordingExecutor.submitted == 0
+
+        ParallelNewsRepository._parallel_threshold = 10
+        assert repo.count(AttributeSpecification('title', 'Title 1%', Operator.LIKE)) == 12
+        assert RecordingExecutor.submitted > 0
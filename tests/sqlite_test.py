@@ -0,0 +1,483 @@
+import asyncio
+import random
+import sqlite3
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+from abstractrepo.exceptions import ItemNotFoundException, PoolTimeoutException
+from abstractrepo.order import OrderOptionsBuilder, OrderDirection, NonesOrder
+from abstractrepo.paging import PagingOptions, CursorPagingOptions, CursorPageResolver
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, NotSpecification, Operator
+from abstractrepo.sql import SqliteSpecificationTranslator, CachingSqliteSpecificationTranslator
+from tests.fixtures.models import News, NewsCreateForm, NewsUpdateForm
+from tests.fixtures.repo import ListBasedNewsRepository, SqliteNewsRepository, AsyncSqliteNewsRepository
+
+
+class TitleLengthSpecification(SpecificationInterface[News, bool]):
+    def __init__(self, length: int):
+        self.length = length
+
+    def is_satisfied_by(self, model: News) -> bool:
+        return len(model.title) == self.length
+
+
+class FailingSqliteNewsRepository(SqliteNewsRepository):
+    def _create_model(self, form: NewsCreateForm, new_id: int) -> News:
+        if form.title == 'fail':
+            raise ValueError('Cannot create')
+        return super()._create_model(form, new_id)
+
+
+TRANSLATED_CASES = [
+    AttributeSpecification('text', None),
+    AttributeSpecification('text', None, Operator.NE),
+    AttributeSpecification('text', 'b'),
+    NotSpecification(AttributeSpecification('text', 'b')),
+    NotSpecification(AttributeSpecification('text', 'b', Operator.NE)),
+    AttributeSpecification('id', 3, Operator.GT),
+    AttributeSpecification('id', 2.5, Operator.LTE),
+    AttributeSpecification('title', 'a%', Operator.LIKE),
+    AttributeSpecification('title', 'A_', Operator.LIKE),
+    AttributeSpecification('title', 'A%', Operator.ILIKE),
+    AttributeSpecification('title', '%*%', Operator.LIKE),
+    AttributeSpecification('title', '[a]', Operator.LIKE),
+    AttributeSpecification('title', 'É%', Operator.ILIKE),
+    AttributeSpecification('text', ['a', None, 'c'], Operator.IN),
+    NotSpecification(AttributeSpecification('text', ['a', None], Operator.NOT_IN)),
+    AttributeSpecification('text', [], Operator.IN),
+    AttributeSpecification('text', (), Operator.NOT_IN),
+    OrSpecification(AttributeSpecification('text', 'a'), NotSpecification(AttributeSpecification('id', 2, Operator.LT))),
+    AndSpecification(),
+    OrSpecification(),
+]
+
+UNTRANSLATED_CASES = [
+    AttributeSpecification('id', None, Operator.GT),
+    AttributeSpecification('id', float('nan'), Operator.NE),
+    AttributeSpecification('id', 2 ** 70, Operator.LT),
+    AttributeSpecification('id', (1, 2)),
+    AttributeSpecification('rating', 1),
+    AttributeSpecification('text', list(range(1000)), Operator.IN),
+    TitleLengthSpecification(1),
+    AndSpecification(AttributeSpecification('id', 1), TitleLengthSpecification(1)),
+]
+
+TITLES = ['a', 'ab', 'A', 'Ab', 'a*', '[a]', 'é', 'Éa', 'a_b']
+
+
+def build_items() -> List[News]:
+    return [News(id=i + 1, title=title, text=[None, 'a', 'b'][i % 3]) for i, title in enumerate(TITLES)]
+
+
+@pytest.mark.parametrize("spec", TRANSLATED_CASES)
+def test_translate(spec: SpecificationInterface[News, bool]):
+    translator = SqliteSpecificationTranslator(['id', 'title', 'text'])
+    translator.translate(spec)
+
+    items = build_items()
+    repo = SqliteNewsRepository(items)
+    assert [item.id for item in repo.get_collection(spec)] == [item.id for item in items if spec.is_satisfied_by(item)]
+    assert repo.count(spec) == sum(1 for item in items if spec.is_satisfied_by(item))
+
+
+@pytest.mark.parametrize("spec", UNTRANSLATED_CASES)
+def test_translate_refuses(spec: SpecificationInterface[News, bool]):
+    translator = SqliteSpecificationTranslator(['id', 'title', 'text'])
+    with pytest.raises(NotImplementedError):
+        translator.translate(spec)
+
+
+def test_untranslated_conditions_are_evaluated_on_models():
+    items = build_items()
+    repo = SqliteNewsRepository(items)
+    spec = AndSpecification(AttributeSpecification('text', None, Operator.NE), TitleLengthSpecification(2))
+    expected = [item.id for item in items if spec.is_satisfied_by(item)]
+    assert [item.id for item in repo.get_collection(spec)] == expected
+    assert [item.id for item in repo.get_collection(spec, paging_options=PagingOptions(limit=1, offset=1))] == expected[1:2]
+    assert repo.count(spec) == len(expected)
+    assert [item.id for item in repo.delete_many(spec)] == expected
+    assert repo.count() == len(items) - len(expected)
+
+    with pytest.raises(ValueError):
+        repo.get_collection(AttributeSpecification('id', 1, Operator.IN))
+    with pytest.raises(TypeError):
+        repo.get_collection(AttributeSpecification('id', None, Operator.GT))
+
+
+def test_order_translation():
+    translator = SqliteSpecificationTranslator(['id', 'text'])
+    order_options = OrderOptionsBuilder() \
+        .add('text', OrderDirection.ASC, NonesOrder.FIRST) \
+        .add('id', OrderDirection.DESC, NonesOrder.FIRST) \
+        .build()
+    assert translator.translate_order(order_options) == '"text" ASC, "id" IS NULL DESC, "id" DESC'
+    assert translator.translate_paging(PagingOptions(offset=5)) == ('LIMIT ? OFFSET ?', [-1, 5])
+    assert translator.translate_paging(PagingOptions()) == ('', [])
+
+
+def test_translation_cache_reuses_sql_of_same_shape():
+    translator = CachingSqliteSpecificationTranslator(['id', 'title', 'text'])
+    sql, params = translator.translate(AndSpecification(AttributeSpecification('id', 3, Operator.GT),
+                                                        AttributeSpecification('text', None)))
+    assert (translator.hits, translator.misses) == (0, 3)
+    assert params == [3]
+
+    assert translator.translate(AndSpecification(AttributeSpecification('id', 7, Operator.GT),
+                                                 AttributeSpecification('text', None))) == (sql, [7])
+    assert (translator.hits, translator.misses) == (1, 3)
+
+    other_sql, _ = translator.translate(AndSpecification(AttributeSpecification('id', 7, Operator.GT),
+                                                         AttributeSpecification('text', 'a')))
+    assert other_sql != sql
+    assert (translator.hits, translator.misses) == (2, 5)
+
+    translator.clear()
+    assert (translator.hits, translator.misses) == (0, 0)
+    translator.translate(AttributeSpecification('id', 1))
+    assert translator.misses == 1
+
+
+def test_translation_cache_buckets_in_lists():
+    translator = CachingSqliteSpecificationTranslator(['id', 'text'])
+    sql, params = translator.translate(AttributeSpecification('id', [1, 2, None, 3], Operator.IN))
+    assert params == [1, 2, 3, 3]
+    assert translator.translate(AttributeSpecification('id', [4, 5, 6, 7], Operator.IN)) == (sql, [4, 5, 6, 7])
+    assert translator.translate(AttributeSpecification('id', [1, 2, 3, 4, 5], Operator.IN))[0] != sql
+    assert translator.hits == 1
+
+    items = build_items()
+    repo = SqliteNewsRepository(items)
+    for values in ([1, 2, 3], [2, 5, 8, 9, 4], [None, 7]):
+        for op in (Operator.IN, Operator.NOT_IN):
+            spec = AttributeSpecification('id', values, op)
+            assert [item.id for item in repo.get_collection(spec)] == \
+                [item.id for item in items if spec.is_satisfied_by(item)]
+
+
+def test_translation_cache_evicts_least_recently_used():
+    translator = CachingSqliteSpecificationTranslator(['id', 'title', 'text'], max_size=2)
+    translator.translate(AttributeSpecification('id', 1))
+    translator.translate(AttributeSpecification('title', 'a'))
+    translator.translate(AttributeSpecification('id', 2))
+    translator.translate(AttributeSpecification('text', 'a'))
+    assert (translator.hits, translator.misses) == (1, 3)
+
+    translator.translate(AttributeSpecification('id', 3))
+    translator.translate(AttributeSpecification('title', 'b'))
+    assert (translator.hits, translator.misses) == (2, 4)
+
+    order_options = OrderOptionsBuilder().add('text', OrderDirection.DESC, NonesOrder.LAST).add('id').build()
+    assert translator.translate_order(order_options) == translator.translate_order(order_options)
+    assert translator.translate_cursor(order_options, ['a', 1]) == translator.translate_cursor(order_options, ['a', 1])
+    assert translator.hits == 4
+
+    with pytest.raises(ValueError):
+        CachingSqliteSpecificationTranslator(['id'], max_size=0)
+
+
+def random_specification(rnd: random.Random, depth: int = 0) -> SpecificationInterface[News, bool]:
+    kind = rnd.randrange(6 if depth < 2 else 2)
+    if kind == 0:
+        return AttributeSpecification('id', rnd.randint(0, 120), rnd.choice([Operator.E, Operator.GT, Operator.LTE, Operator.NE]))
+    if kind == 1:
+        attribute = rnd.choice(['title', 'text'])
+        return rnd.choice([
+            AttributeSpecification(attribute, rnd.choice(['a', 'b', 'c', None])),
+            AttributeSpecification(attribute, rnd.choice(['a', 'b', None]), Operator.NE),
+            AttributeSpecification(attribute, ['a', 'c'], Operator.IN),
+            AttributeSpecification(attribute, 'b', Operator.GTE),
+            AttributeSpecification(attribute, 'A%', Operator.ILIKE),
+        ])
+    if kind == 2:
+        return AndSpecification(*(random_specification(rnd, depth + 1) for _ in range(rnd.randint(1, 3))))
+    if kind == 3:
+        return OrSpecification(*(random_specification(rnd, depth + 1) for _ in range(rnd.randint(1, 3))))
+    if kind == 4:
+        return NotSpecification(random_specification(rnd, depth + 1))
+    return TitleLengthSpecification(1)
+
+
+def assert_same_items(actual: List[News], expected: List[News]):
+    assert [vars(item) for item in actual] == [vars(item) for item in expected]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_sqlite_matches_list_based(seed: int):
+    rnd = random.Random(seed)
+    items = [
+        News(id=i, title=rnd.choice(['a', 'b', 'c', 'dd']), text=rnd.choice(['a', 'b', 'c', None]))
+        for i in range(60)
+    ]
+    reference = ListBasedNewsRepository([News(**vars(item)) for item in items])
+    repo = SqliteNewsRepository(items)
+    reference._next_id = repo._next_id = 100
+
+    for _ in range(40):
+        action = rnd.randrange(5)
+        if action == 0:
+            forms = [NewsCreateForm(title=rnd.choice(['a', 'e']), text=rnd.choice(['b', None])) for _ in range(rnd.randint(1, 3))]
+            assert_same_items(repo.create_many(forms), reference.create_many(forms))
+        elif action == 1:
+            ids = rnd.sample(range(120), 3)
+            form = NewsUpdateForm(title=rnd.choice(['a', 'c']), text=rnd.choice(['a', None]))
+            if all(reference.exists(item_id) for item_id in ids):
+                assert_same_items(repo.update_many(ids, form), reference.update_many(ids, form))
+            else:
+                with pytest.raises(ItemNotFoundException):
+                    repo.update_many(ids, form)
+        elif action == 2:
+            spec = random_specification(rnd)
+            assert_same_items(repo.delete_many(spec), reference.delete_many(spec))
+        elif action == 3:
+            item_id = rnd.randrange(120)
+            if reference.exists(item_id):
+                assert_same_items([repo.delete(item_id)], [reference.delete(item_id)])
+            else:
+                with pytest.raises(ItemNotFoundException):
+                    repo.delete(item_id)
+
+        spec = random_specification(rnd) if rnd.random() < 0.8 else None
+        builder = OrderOptionsBuilder()
+        for attribute in rnd.sample(['title', 'text', 'id'], rnd.randint(0, 3)):
+            builder.add(attribute, rnd.choice(list(OrderDirection)), rnd.choice([None, NonesOrder.FIRST, NonesOrder.LAST]))
+        order_options = builder.build()
+        paging_options = rnd.choice([None, PagingOptions(limit=5), PagingOptions(limit=7, offset=3), PagingOptions(offset=50)])
+
+        assert_same_items(
+            repo.get_collection(spec, order_options, paging_options),
+            reference.get_collection(spec, order_options, paging_options),
+        )
+        assert repo.count(spec) == reference.count(spec)
+
+    assert_same_items(list(repo.get_items(range(120), skip_missing=True).values()),
+                      list(reference.get_items(range(120), skip_missing=True).values()))
+
+
+class LengthNews(News):
+    @property
+    def length(self) -> int:
+        return len(self.title)
+
+
+class LengthSqliteNewsRepository(SqliteNewsRepository):
+    def _build_model(self, values: Dict[str, Any]) -> News:
+        return LengthNews(**values)
+
+
+@pytest.mark.parametrize("attribute", ['text', 'length'])
+def test_sqlite_cursor_pagination(attribute: str):
+    rnd = random.Random(0)
+    items = [LengthNews(id=i, title=rnd.choice(['a', 'bb', 'ccc']), text=rnd.choice(['a', 'b', None])) for i in range(50)]
+    repo = LengthSqliteNewsRepository(items)
+    order_options = OrderOptionsBuilder().add(attribute, OrderDirection.DESC, NonesOrder.LAST).add('id').build()
+    expected = [item.id for item in ListBasedNewsRepository(items).get_collection(order_options=order_options)]
+    assert [item.id for item in repo.get_collection(order_options=order_options)] == expected
+
+    resolver = CursorPageResolver(7, order_options)
+    actual = []
+    cursor = None
+    while True:
+        page = repo.get_collection(order_options=order_options, paging_options=resolver.get_page(cursor))
+        actual.extend(item.id for item in page)
+        cursor = resolver.get_next_cursor(page)
+        if cursor is None:
+            break
+    assert actual == expected
+
+    with pytest.raises(ValueError):
+        repo.get_collection(paging_options=CursorPagingOptions(limit=5, after=('a', 1)))
+    with pytest.raises(ValueError):
+        repo.get_collection(order_options=order_options, paging_options=CursorPagingOptions(limit=5, after=('a',)))
+
+
+def test_sqlite_iter_collection():
+    repo = SqliteNewsRepository([News(id=i, title=str(i % 3)) for i in range(1, 11)])
+    order_options = OrderOptionsBuilder().add('title').build()
+    iterator = repo.iter_collection(AttributeSpecification('title', '0', Operator.NE), order_options, PagingOptions(limit=4, offset=1))
+    assert [item.id for item in iterator] == [4, 7, 10, 2]
+    with pytest.raises(ValueError):
+        repo.iter_collection(chunk_size=0)
+
+
+def test_sqlite_transactions():
+    repo = FailingSqliteNewsRepository([News(id=1, title='a')])
+    repo._next_id = 1
+    with pytest.raises(ValueError):
+        repo.create_many([NewsCreateForm(title='b'), NewsCreateForm(title='fail')])
+    assert repo.count() == 1 and not repo.exists(2)
+
+    with pytest.raises(ItemNotFoundException):
+        repo.delete_many([1, 5])
+    with pytest.raises(ItemNotFoundException):
+        repo.update(5, NewsUpdateForm(title='c'))
+    assert repo.exists(1) and not repo.exists((1,))
+    assert list(repo.get_items([1, (1,), 'x'], skip_missing=True)) == [1]
+
+
+def test_sqlite_items_are_detached():
+    repo = SqliteNewsRepository()
+    created = repo.create(NewsCreateForm(title='Title', text='Text'))
+    created.title = 'Changed'
+    assert repo.get_item(created.id).title == 'Title'
+    assert repo.get_item(created.id) is not repo.get_item(created.id)
+
+
+def test_sqlite_shared_connection(tmp_path):
+    path = str(tmp_path / 'news.db')
+    connection = sqlite3.connect(path)
+    SqliteNewsRepository(connection=connection).create_many([NewsCreateForm(title='a'), NewsCreateForm(title='b', text='x')])
+    connection.close()
+
+    repo = SqliteNewsRepository(connection=sqlite3.connect(path))
+    assert [vars(item) for item in repo.get_collection()] == [
+        {'id': 1, 'title': 'a', 'text': None},
+        {'id': 2, 'title': 'b', 'text': 'x'},
+    ]
+    indexes = repo._connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+    assert ('news_title_idx',) in indexes
+
+
+class FailingAsyncSqliteNewsRepository(AsyncSqliteNewsRepository):
+    async def _create_model(self, form: NewsCreateForm, new_id: int) -> News:
+        if form.title == 'fail':
+            raise ValueError('Cannot create')
+        return await super()._create_model(form, new_id)
+
+
+class SingleConnectionAsyncSqliteNewsRepository(AsyncSqliteNewsRepository):
+    _pool_size = 1
+    _acquire_timeout = 0.05
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", range(5))
+async def test_async_sqlite_matches_list_based(seed: int):
+    rnd = random.Random(seed)
+    items = [News(id=i, title=rnd.choice(['a', 'b', 'c']), text=rnd.choice(['a', 'b', None])) for i in range(1, 60)]
+    repo = AsyncSqliteNewsRepository(items)
+    reference = SqliteNewsRepository(items)
+    repo._next_id = reference._next_id = 100
+
+    for _ in range(20):
+        form = NewsUpdateForm(title=rnd.choice(['a', 'b', 'c']), text=rnd.choice(['a', None]))
+        spec = random_specification(rnd)
+        action = rnd.randrange(3)
+        if action == 0:
+            forms = [NewsCreateForm(title=rnd.choice(['a', 'd']), text='b') for _ in range(rnd.randint(1, 3))]
+            assert_same_items(await repo.create_many(forms), reference.create_many(forms))
+        elif action == 1:
+            assert_same_items(await repo.update_many(spec, form), reference.update_many(spec, form))
+        else:
+            assert_same_items(await repo.delete_many(spec), reference.delete_many(spec))
+
+        order_options = OrderOptionsBuilder().add(rnd.choice(['title', 'text']), rnd.choice(list(OrderDirection))).build()
+        spec = random_specification(rnd)
+        paging_options = rnd.choice([None, PagingOptions(limit=5, offset=2)])
+        assert_same_items(await repo.get_collection(spec, order_options, paging_options),
+                          reference.get_collection(spec, order_options, paging_options))
+        assert await repo.count(spec) == reference.count(spec)
+
+    assert_same_items([item async for item in repo.iter_collection(chunk_size=7)], reference.get_collection())
+    assert_same_items(list((await repo.get_items(range(120), skip_missing=True)).values()),
+                      list(reference.get_items(range(120), skip_missing=True).values()))
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_async_sqlite_concurrent_operations():
+    repo = AsyncSqliteNewsRepository()
+    await asyncio.gather(*(repo.create(NewsCreateForm(title='a', text=str(i))) for i in range(40)))
+    assert sorted(item.id for item in await repo.get_collection()) == list(range(1, 41))
+
+    async def read():
+        items = await repo.get_collection()
+        assert len({item.title for item in items}) == 1
+        return items
+
+    results = await asyncio.gather(*(
+        repo.update_many(AttributeSpecification('id', 0, Operator.GT), NewsUpdateForm(title=str(i))) if i % 4 == 0 else read()
+        for i in range(40)
+    ))
+    assert all(len(result) == 40 for result in results)
+    assert repo.pool.open_connections <= 4
+    assert repo.pool.acquisitions >= 70 and repo.pool.timeouts == 0
+    await repo.close()
+
+
+class CountingAsyncSqliteNewsRepository(AsyncSqliteNewsRepository):
+    async def _update_model(self, model: News, form: NewsUpdateForm) -> News:
+        await asyncio.sleep(0.001)
+        model.title = str(int(model.title) + 1)
+        return model
+
+
+def test_async_sqlite_writes_from_several_event_loops():
+    repo = CountingAsyncSqliteNewsRepository([News(id=1, title='0')])
+
+    async def increment():
+        await asyncio.gather(*(repo.update(1, NewsUpdateForm(title='')) for _ in range(20)))
+
+    threads = [threading.Thread(target=asyncio.run, args=(increment(),)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert asyncio.run(repo.get_item(1)).title == '60'
+    asyncio.run(repo.close())
+
+
+@pytest.mark.asyncio
+async def test_async_sqlite_acquire_timeout():
+    repo = SingleConnectionAsyncSqliteNewsRepository([News(id=1, title='a')])
+    connection = repo.pool.acquire()
+    with pytest.raises(PoolTimeoutException):
+        await repo.count()
+    assert repo.pool.timeouts == 1
+
+    repo.pool.release(connection)
+    assert await repo.count() == 1
+    await repo.close()
+    with pytest.raises(RuntimeError):
+        await repo.count()
+
+
+@pytest.mark.asyncio
+async def test_async_sqlite_transactions():
+    repo = FailingAsyncSqliteNewsRepository([News(id=1, title='a')])
+    repo._next_id = 1
+    with pytest.raises(ValueError):
+        await repo.create_many([NewsCreateForm(title='b'), NewsCreateForm(title='fail')])
+    assert await repo.count() == 1
+
+    with pytest.raises(ItemNotFoundException):
+        await repo.delete_many([1, 5])
+    with pytest.raises(ItemNotFoundException):
+        await repo.update(5, NewsUpdateForm(title='c'))
+    with pytest.raises(ItemNotFoundException):
+        await repo.get_item(5)
+    assert await repo.exists(1) and not await repo.exists((1,))
+    assert (await repo.update(1, NewsUpdateForm(title='c'))).title == 'c'
+    assert (await repo.delete(1)).title == 'c'
+    assert await repo.count() == 0
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_async_sqlite_file_database(tmp_path):
+    path = str(tmp_path / 'news.db')
+
+    def connect() -> sqlite3.Connection:
+        return sqlite3.connect(path, check_same_thread=False)
+
+    repo = AsyncSqliteNewsRepository(connect=connect)
+    await repo.create_many([NewsCreateForm(title='a'), NewsCreateForm(title='b', text='x')])
+    await repo.close()
+
+    assert [vars(item) for item in SqliteNewsRepository(connection=sqlite3.connect(path)).get_collection()] == [
+        {'id': 1, 'title': 'a', 'text': None},
+        {'id': 2, 'title': 'b', 'text': 'x'},
+    ]
@@ -0,0 +1,169 @@
+import random
+from typing import Any, Dict, List
+
+import pytest
+
+from abstractrepo import vectorized
+from abstractrepo.columnar import ColumnType, create_column
+from abstractrepo.specification import SpecificationInterface, AttributeSpecification, AndSpecification, \
+    OrSpecification, NotSpecification, Operator
+from tests.fixtures.models import News
+from tests.fixtures.repo import ColumnarNewsRepository
+
+numpy = pytest.importorskip('numpy')
+
+
+class Row:
+    def __init__(self, **values: Any):
+        self.__dict__.update(values)
+
+
+COLUMNS = {
+    'i': (ColumnType.INT, [0, 1, -1, 2, 3, None, 2 ** 62, -(2 ** 62), 7]),
+    'f': (ColumnType.FLOAT, [0.0, 1.0, -1.5, 2.5, float('nan'), None, float('inf'), 1e300, 3.0]),
+    'b': (ColumnType.BOOL, [True, False, None, True, False, True, None, False, True]),
+    's': (ColumnType.STR, ['a', 'b', None, 'ab', 'A', '', 'b', None, 'a_b']),
+    'o': (ColumnType.OBJECT, [1, 'a', None, (1,), 2.5, 'b', None, 0, 'a']),
+}
+
+OPERANDS = [
+    0, 1, -1, 2, 2.5, -1.5, 3.0, 2 ** 62, 2 ** 70, -(2 ** 70), 2 ** 60 + 0.5, float('nan'), float('inf'),
+    float('-inf'), True, False, None, 'a', 'b', 'a%', 'A_', '%b',
+]
+
+COLLECTION_OPERANDS = [[], [1, 2.5], [None, 3], [2 ** 62, 'a'], ('a', 'ab'), {0, -1}, [float('nan')], [2.0, 7.5]]
+
+
+def build_columns() -> Dict[str, Any]:
+    columns = {}
+    for name, (column_type, values) in COLUMNS.items():
+        column = create_column(column_type)
+        for value in values:
+            column.append(value)
+        columns[name] = column
+    return columns
+
+
+def build_rows() -> List[Row]:
+    size = len(next(iter(COLUMNS.values()))[1])
+    return [Row(**{name: values[position] for name, (_, values) in COLUMNS.items()}) for position in range(size)]
+
+
+def attribute_cases(name: str):
+    for operator in Operator:
+        operands = COLLECTION_OPERANDS if operator in (Operator.IN, Operator.NOT_IN) else OPERANDS
+        for operand in operands:
+            yield AttributeSpecification(name, operand, operator)
+
+
+@pytest.mark.parametrize("name", list(COLUMNS))
+def test_evaluate_attribute(name: str):
+    rows = build_rows()
+    evaluator = vectorized.NumpySpecificationEvaluator(build_columns(), len(rows))
+    for spec in attribute_cases(name):
+        try:
+            expected = [spec.is_satisfied_by(row) for row in rows]
+        except (TypeError, ValueError, AttributeError):
+            expected = None
+
+        try:
+            actual = evaluator.evaluate_attribute(spec)
+        except NotImplementedError:
+            continue
+        except (TypeError, ValueError, AttributeError):
+            assert expected is None, (spec.operator, spec.attribute_value)
+            continue
+
+        assert expected is not None, (spec.operator, spec.attribute_value)
+        assert actual.dtype == bool
+        assert actual.tolist() == expected, (spec.operator, spec.attribute_value)
+
+
+def random_specification(rnd: random.Random, depth: int = 0) -> SpecificationInterface[Row, bool]:
+    kind = rnd.randrange(4 if depth < 3 else 1)
+    if kind == 0:
+        name = rnd.choice(['i', 'f', 'b', 's'])
+        if name == 's':
+            return AttributeSpecification(name, rnd.choice(['a', 'b', 'a%', None]), rnd.choice([Operator.E, Operator.NE, Operator.LIKE]))
+        return AttributeSpecification(
+            name,
+            rnd.choice([0, 1, 2.5, -1, None, True]),
+            rnd.choice([Operator.E, Operator.NE, Operator.GT, Operator.LTE]),
+        )
+    if kind == 1:
+        return AndSpecification(*(random_specification(rnd, depth + 1) for _ in range(rnd.randint(1, 3))))
+    if kind == 2:
+        return OrSpecification(*(random_specification(rnd, depth + 1) for _ in range(rnd.randint(1, 3))))
+    return NotSpecification(random_specification(rnd, depth + 1))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_evaluate_tree(seed: int):
+    spec = random_specification(random.Random(seed))
+    rows = build_rows()
+    try:
+        expected = [spec.is_satisfied_by(row) for row in rows]
+    except TypeError:
+        return
+
+    evaluator = vectorized.NumpySpecificationEvaluator(build_columns(), len(rows))
+    try:
+        actual = evaluator.evaluate(spec)
+    except NotImplementedError:
+        return
+    assert actual.tolist() == expected
+
+
+def test_evaluate_refuses_custom_specifications():
+    class CustomSpecification(SpecificationInterface[Row, bool]):
+        def is_satisfied_by(self, model: Row) -> bool:
+            return True
+
+    evaluator = vectorized.NumpySpecificationEvaluator(build_columns(), len(build_rows()))
+    with pytest.raises(NotImplementedError):
+        evaluator.evaluate(AndSpecification(AttributeSpecification('i', 1), CustomSpecification()))
+    with pytest.raises(NotImplementedError):
+        evaluator.evaluate(AttributeSpecification('missing', 1))
+
+
+def test_repository_uses_vectorized_evaluation(monkeypatch):
+    rnd = random.Random(0)
+    items = [News(id=i, title=rnd.choice(['a', 'b', None]), text=rnd.choice(['x', None])) for i in range(200)]
+    repo = ColumnarNewsRepository(items)
+    repo.delete_many(range(0, 200, 3))
+
+    class PlainColumnarNewsRepository(ColumnarNewsRepository):
+        _vectorize = False
+
+    reference = PlainColumnarNewsRepository(items)
+    reference.delete_many(range(0, 200, 3))
+
+    evaluated = []
+    evaluate = vectorized.NumpySpecificationEvaluator.evaluate
+    monkeypatch.setattr(
+        vectorized.NumpySpecificationEvaluator, 'evaluate',
+        lambda self, spec: evaluated.append(spec) or evaluate(self, spec),
+    )
+
+    for _ in range(30):
+        spec = rnd.choice([AndSpecification, OrSpecification])(
+            rnd.choice([
+                AttributeSpecification('id', rnd.randrange(200), Operator.GT),
+                AttributeSpecification('id', 99.5, Operator.LTE),
+                AttributeSpecification('id', [1, 5, 7.0], Operator.NOT_IN),
+            ]),
+            NotSpecification(AttributeSpecification(rnd.choice(['title', 'text']), rnd.choice(['a', 'x', None]))),
+        )
+        assert [item.id for item in repo.get_collection(spec)] == [item.id for item in reference.get_collection(spec)]
+        assert repo.count(spec) == reference.count(spec)
+    assert evaluated
+
+
+def test_missing_numpy(monkeypatch):
+    monkeypatch.setattr(vectorized, 'numpy', None)
+    assert not vectorized.is_available()
+    with pytest.raises(ImportError):
+        vectorized.NumpySpecificationEvaluator({}, 0)
+
+    repo = ColumnarNewsRepository([News(id=1, title='a'), News(id=2, title='b')])
+    assert [item.id for item in repo.get_collection(AttributeSpecification('title', 'b'))] == [2]